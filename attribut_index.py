@@ -0,0 +1,313 @@
+"""
+Ordered attribut index used by MayaObject.
+Keep attributs in maya order with constant time lookup, rename and move, log time position and delete.
+@autor : Nathan Boyaval
+@Version : 0.0.4
+@Update : 2025/02/19
+"""
+
+from collections.abc import Mapping, Sequence
+
+
+class IndexNode () :
+    """Linked list node, one per attribut"""
+
+    __slots__ = ("name", "value", "prev", "next", "slot")
+
+    def __init__ (self, name, value) -> None :
+        self.name = name
+        self.value = value
+        self.prev = None
+        self.next = None
+        # Index in AttributIndex.slots
+        self.slot = 0
+
+
+class AttributIndex () :
+    """
+    Attributs by name, in order.
+
+    Attributs are stored in a doubly linked list with a name dict, so lookup, rename
+    and move up/down do not depend on attribut count. Each attribut also has a slot,
+    slots are in attribut order and deleted attributs leave an empty slot. A Fenwick tree
+    counts used slots : position and delete are O(log n), moving an attribut swaps slots.
+    The name list is cached and only built again when it is read after a delete.
+    """
+
+    def __init__ (self, items = ()) -> None :
+        """
+        Keywords:
+            items -- (name, value) pairs, in order
+        """
+        self.nodes: dict = {}
+        self.head: IndexNode = None
+        self.tail: IndexNode = None
+        # Attribut name of each slot, None for deleted attributs
+        self.slots: list = []
+        # Fenwick tree of used slots, tree[i] counts used slots in (i - lowbit(i), i], 1 based
+        self.tree: list = [0]
+        self.order_cache: list = []
+        self.cache_valid: bool = True
+
+        for name, value in items :
+            self.append(name, value)
+
+    def __len__ (self) -> int :
+        return len(self.nodes)
+
+    def __contains__ (self, name) -> bool :
+        return name in self.nodes
+
+    def __iter__ (self) :
+        return iter(self.names())
+
+    def __getitem__ (self, name) :
+        return self.nodes[name].value
+
+    def get (self, name, default = None) :
+        """Get attribut value, default if name is not in index"""
+        node = self.nodes.get(name)
+        if node is None :
+            return default
+        return node.value
+
+    def names (self) -> list :
+        """Attribut names in order. Cached list, do not edit it"""
+        if not self.cache_valid :
+            self.order_cache = [name for name in self.slots if name is not None]
+            self.cache_valid = True
+        return self.order_cache
+
+    def values (self) -> list :
+        """Attribut values in order"""
+        return [self.nodes[name].value for name in self.names()]
+
+    def items (self) -> list :
+        """(name, value) pairs in order"""
+        return [(name, self.nodes[name].value) for name in self.names()]
+
+    def position (self, name) -> int :
+        """Get attribut position, raise KeyError if name is not in index"""
+        return self.used_slots(self.nodes[name].slot + 1) - 1
+
+    #######################################################################################################################
+    #                Slots
+    #######################################################################################################################
+    def used_slots (self, count) -> int :
+        """Count of used slots in the first count slots"""
+        tree = self.tree
+        total = 0
+        while count > 0 :
+            total += tree[count]
+            count &= count - 1
+        return total
+
+    def add_slot (self, name) -> int :
+        """Add a used slot at the end and return it"""
+        self.slots.append(name)
+        index = len(self.slots)
+        # Node covers (index - lowbit, index], the new slot and slots before it
+        self.tree.append(1 + self.used_slots(index - 1) - self.used_slots(index - (index & -index)))
+        return index - 1
+
+    def free_slot (self, slot) -> None :
+        """Mark slot empty, empty slots at the end are dropped"""
+        self.slots[slot] = None
+        index = slot + 1
+        size = len(self.slots)
+        while index <= size :
+            self.tree[index] -= 1
+            index += index & -index
+        # Last tree node only covers last slots
+        while self.slots and self.slots[-1] is None :
+            self.slots.pop()
+            self.tree.pop()
+
+    def compact (self) -> None :
+        """Drop empty slots, once they are more than used ones"""
+        self.slots = []
+        self.tree = [0]
+        node = self.head
+        while node is not None :
+            self.slots.append(node.name)
+            node.slot = len(self.slots) - 1
+            node = node.next
+        tree = self.tree
+        tree.extend([1] * len(self.slots))
+        for index in range(1, len(tree)) :
+            parent = index + (index & -index)
+            if parent < len(tree) :
+                tree[parent] += tree[index]
+
+    #######################################################################################################################
+    #                Edit
+    #######################################################################################################################
+    def append (self, name, value) -> None :
+        """Add attribut at the end, raise KeyError if name is already used"""
+        if name in self.nodes :
+            raise KeyError ("Attribut {} already in index".format(name))
+
+        node = IndexNode(name, value)
+        self.nodes[name] = node
+        if self.tail is None :
+            self.head = node
+        else :
+            self.tail.next = node
+            node.prev = self.tail
+        self.tail = node
+        node.slot = self.add_slot(name)
+
+        if self.cache_valid :
+            self.order_cache.append(name)
+
+    def remove (self, name) :
+        """Remove attribut and return its value, raise KeyError if name is not in index"""
+        node = self.nodes.pop(name)
+        if node.prev is None :
+            self.head = node.next
+        else :
+            node.prev.next = node.next
+        if node.next is None :
+            self.tail = node.prev
+        else :
+            node.next.prev = node.prev
+
+        # Removing the last attribut keep name list valid
+        if self.cache_valid and node.next is None :
+            self.order_cache.pop()
+        else :
+            self.cache_valid = False
+        self.free_slot(node.slot)
+        if len(self.slots) > 2 * len(self.nodes) + 16 :
+            self.compact()
+        return node.value
+
+    def rename (self, name, new_name) -> None :
+        """Rename attribut and keep its position"""
+        if new_name == name :
+            return
+        if new_name in self.nodes :
+            raise KeyError ("Attribut {} already in index".format(new_name))
+
+        node = self.nodes.pop(name)
+        node.name = new_name
+        self.nodes[new_name] = node
+        self.slots[node.slot] = new_name
+
+        if self.cache_valid :
+            self.order_cache[self.position(new_name)] = new_name
+
+    def swap_with_next (self, node) -> bool :
+        """Swap node with the next one, return False if node is the last one"""
+        next_node = node.next
+        if next_node is None :
+            return False
+
+        before, after = node.prev, next_node.next
+        if before is None :
+            self.head = next_node
+        else :
+            before.next = next_node
+        if after is None :
+            self.tail = node
+        else :
+            after.prev = node
+        next_node.prev, next_node.next = before, node
+        node.prev, node.next = next_node, after
+
+        # Both slots stay used, used slot counts do not change
+        node.slot, next_node.slot = next_node.slot, node.slot
+        self.slots[node.slot], self.slots[next_node.slot] = node.name, next_node.name
+
+        if self.cache_valid :
+            position = self.position(next_node.name)
+            self.order_cache[position], self.order_cache[position + 1] = next_node.name, node.name
+        return True
+
+    def move (self, name, offset) -> int :
+        """
+        Move attribut by offset, negative offset move it up. Stop at first or last position
+
+        Returns :
+            new attribut position
+        """
+        node = self.nodes[name]
+        for _ in range(abs(offset)) :
+            if offset < 0 :
+                if node.prev is None or not self.swap_with_next(node.prev) :
+                    break
+            elif not self.swap_with_next(node) :
+                break
+        return self.position(name)
+
+    def move_up (self, name) -> int :
+        """Move attribut one position up, return new position"""
+        return self.move(name, -1)
+
+    def move_down (self, name) -> int :
+        """Move attribut one position down, return new position"""
+        return self.move(name, 1)
+
+
+class AttributNamesView (Sequence) :
+    """
+    Read only attribut names of an AttributIndex, the name list is only built when
+    names are read by position or iterated. Behaves like a list of names : index
+    raises ValueError and views compare equal to lists
+    """
+
+    __hash__ = None
+
+    def __init__ (self, attributs) -> None :
+        self.attributs = attributs
+
+    def __repr__ (self) -> str :
+        return "AttributNamesView({!r})".format(self.attributs.names())
+
+    def __eq__ (self, other) -> bool :
+        if isinstance(other, (AttributNamesView, list, tuple)) :
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __getitem__ (self, position) :
+        return self.attributs.names()[position]
+
+    def __iter__ (self) :
+        return iter(self.attributs.names())
+
+    def __len__ (self) -> int :
+        return len(self.attributs)
+
+    def __contains__ (self, name) -> bool :
+        return name in self.attributs
+
+    def index (self, name, start = 0, stop = None) -> int :
+        """Position of name, raise ValueError if name is not in index or not between start and stop"""
+        if name in self.attributs :
+            position = self.attributs.position(name)
+            start, stop, step = slice(start, stop).indices(len(self.attributs))
+            if start <= position < stop :
+                return position
+        raise ValueError ("{!r} is not in list".format(name))
+
+
+class AttributDicView (Mapping) :
+    """
+    Read only {name : {"class" : Attribut, "index" : int}} view over an AttributIndex,
+    kept for code using MayaObject.attributs_dic
+    """
+
+    def __init__ (self, index) -> None :
+        self.index = index
+
+    def __getitem__ (self, name) -> dict :
+        return {"class" : self.index[name], "index" : self.index.position(name)}
+
+    def __iter__ (self) :
+        return iter(self.index.names())
+
+    def __len__ (self) -> int :
+        return len(self.index)
+
+    def __contains__ (self, name) -> bool :
+        return name in self.index
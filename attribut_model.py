@@ -0,0 +1,204 @@
+"""
+Qt models over MayaObject custom attributs, used by AttributManagerUI list view.
+Rows are read from MayaObject attribut index, attribut fields are only read when a
+view asks for them.
+@autor : Nathan Boyaval
+@Version : 0.0.4
+@Update : 2025/02/19
+"""
+
+from PySide2 import QtCore
+
+# Rows added to model each time the view scrolls to the end
+fetch_batch_size: int = 256
+
+# Custom data roles
+AttributRole = QtCore.Qt.UserRole + 1
+NameRole = QtCore.Qt.UserRole + 2
+
+
+class AttributListModel (QtCore.QAbstractListModel) :
+    """
+    List model backed by MayaObject.attributs.
+
+    Rows are fetched by batch (canFetchMore / fetchMore) so a view only creates what it
+    shows. Display role only needs attribut name, other fields are read when asked.
+    """
+
+    def __init__ (self, maya_object = None, parent = None) -> None :
+        super(AttributListModel, self).__init__(parent)
+        self.maya_object = None
+        self.fetched_count: int = 0
+        self.set_maya_object(maya_object)
+
+    def set_maya_object (self, maya_object) -> None :
+        """Show another MayaObject, None for an empty model"""
+        self.beginResetModel()
+        self.maya_object = maya_object
+        self.fetched_count = min(fetch_batch_size, self.total_count())
+        self.endResetModel()
+
+    def total_count (self) -> int :
+        if self.maya_object is None :
+            return 0
+        return self.maya_object.custom_attributs_count
+
+    def names (self) -> list :
+        if self.maya_object is None :
+            return []
+        return self.maya_object.attributs.names()
+
+    #######################################################################################################################
+    #                Qt model interface
+    #######################################################################################################################
+    def rowCount (self, parent = QtCore.QModelIndex()) -> int :
+        if parent.isValid() :
+            return 0
+        return self.fetched_count
+
+    def canFetchMore (self, parent = QtCore.QModelIndex()) -> bool :
+        if parent.isValid() :
+            return False
+        return self.fetched_count < self.total_count()
+
+    def fetchMore (self, parent = QtCore.QModelIndex()) -> None :
+        if parent.isValid() :
+            return
+        count = min(fetch_batch_size, self.total_count() - self.fetched_count)
+        if count <= 0 :
+            return
+        self.beginInsertRows(QtCore.QModelIndex(), self.fetched_count, self.fetched_count + count - 1)
+        self.fetched_count += count
+        self.endInsertRows()
+
+    def data (self, index, role = QtCore.Qt.DisplayRole) :
+        if not index.isValid() or index.row() >= self.fetched_count :
+            return None
+        name = self.names()[index.row()]
+        if role in (QtCore.Qt.DisplayRole, NameRole) :
+            return name
+        if role == AttributRole :
+            return self.maya_object.get_attribut_object(name)
+        if role == QtCore.Qt.ToolTipRole :
+            # Only field read outside of names, asked when mouse stays on a row
+            return self.maya_object.get_attribut_object(name).attribute_type
+        return None
+
+    def flags (self, index) :
+        if not index.isValid() :
+            return QtCore.Qt.NoItemFlags
+        return QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable
+
+    #######################################################################################################################
+    #                Updates
+    #######################################################################################################################
+    def row_of (self, attribut) -> int :
+        """Row of an attribut, -1 if it is not fetched yet"""
+        if self.maya_object is None or attribut not in self.maya_object.attributs :
+            return -1
+        row = self.maya_object.attributs.position(attribut)
+        return row if row < self.fetched_count else -1
+
+    def index_of (self, attribut) -> QtCore.QModelIndex :
+        """Model index of an attribut, rows are fetched up to it if needed"""
+        if self.maya_object is None or attribut not in self.maya_object.attributs :
+            return QtCore.QModelIndex()
+        row = self.maya_object.attributs.position(attribut)
+        while row >= self.fetched_count :
+            self.fetchMore()
+        return self.index(row, 0)
+
+    def refresh_attribut (self, attribut) -> None :
+        """Refresh one row after an attribut edit"""
+        row = self.row_of(attribut)
+        if row >= 0 :
+            index = self.index(row, 0)
+            self.dataChanged.emit(index, index)
+
+    def rename_attribut (self, attribut, new_name) -> str or None :
+        """Rename an attribut with MayaObject.edit_long_name, row stays in place"""
+        result = self.maya_object.edit_long_name(attribut, new_name)
+        if result is not None :
+            self.refresh_attribut(result)
+        return result
+
+    def move_attribut (self, attribut, offset) -> int :
+        """
+        Move an attribut with MayaObject.move_attribut, only moved rows are updated
+
+        Returns :
+            new row
+        """
+        row = self.maya_object.attributs.position(attribut)
+        new_row = max(0, min(row + offset, self.total_count() - 1))
+        if new_row == row :
+            return row
+        # Fetch rows up to destination so both rows exist in views
+        while max(row, new_row) >= self.fetched_count :
+            self.fetchMore()
+        # Qt destination is the row before which moved row is inserted
+        destination = new_row + 1 if new_row > row else new_row
+        self.beginMoveRows(QtCore.QModelIndex(), row, row, QtCore.QModelIndex(), destination)
+        self.maya_object.move_attribut(attribut, new_row - row)
+        self.endMoveRows()
+        return new_row
+
+    def add_attribut (self, attribut) -> None :
+        """Add an attribut with MayaObject.add_attribut, appended rows are inserted when fetched"""
+        if attribut in self.maya_object.attributs :
+            return
+        fully_fetched = not self.canFetchMore()
+        if fully_fetched :
+            row = self.total_count()
+            self.beginInsertRows(QtCore.QModelIndex(), row, row)
+        self.maya_object.add_attribut(attribut)
+        if fully_fetched :
+            self.fetched_count += 1
+            self.endInsertRows()
+
+    def delete_attribut (self, attribut) -> None :
+        """Delete an attribut with MayaObject.delete_attribut"""
+        row = self.row_of(attribut)
+        if row < 0 :
+            self.maya_object.delete_attribut(attribut)
+            return
+        self.beginRemoveRows(QtCore.QModelIndex(), row, row)
+        self.maya_object.delete_attribut(attribut)
+        self.fetched_count -= 1
+        self.endRemoveRows()
+
+
+class AttributFilterModel (QtCore.QSortFilterProxyModel) :
+    """Filter attributs by name (wildcard, case insensitive) and sort them by name"""
+
+    def __init__ (self, parent = None) -> None :
+        super(AttributFilterModel, self).__init__(parent)
+        self.setFilterCaseSensitivity(QtCore.Qt.CaseInsensitive)
+        self.setSortCaseSensitivity(QtCore.Qt.CaseInsensitive)
+        self.setFilterRole(NameRole)
+        self.setSortRole(NameRole)
+        # Rows keep maya order until sort is asked
+        self.sort(-1)
+
+    def fetch_all (self) -> None :
+        """Filter and sort need every name, fetching only adds rows (names are already loaded)"""
+        source = self.sourceModel()
+        while source is not None and source.canFetchMore() :
+            source.fetchMore()
+
+    def set_pattern (self, pattern) -> None :
+        """Show attributs matching a wildcard pattern ("*switch*"), every attribut if empty"""
+        if pattern :
+            self.fetch_all()
+        self.setFilterWildcard(pattern)
+
+    def set_sorted (self, state) -> None :
+        """Sort by name, or use maya order"""
+        if state :
+            self.fetch_all()
+        self.sort(0 if state else -1)
+
+    def attribut_name (self, proxy_index) -> str or None :
+        if not proxy_index.isValid() :
+            return None
+        return self.mapToSource(proxy_index).data(NameRole)
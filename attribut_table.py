@@ -0,0 +1,210 @@
+"""
+Column storage for many attributs.
+Numeric fields are kept in typed arrays and names in a string table, Attribut objects
+become small views over one table row.
+@autor : Nathan Boyaval
+@Version : 0.0.4
+@Update : 2025/02/19
+"""
+
+from array import array
+
+from nb_attribut_control import manage_attr as mattr
+from nb_attribut_control import snapshot as snap
+
+# Bit of each state field in flags column
+flag_bits: dict = {
+    "has_max_value" : 1,
+    "has_min_value" : 2,
+    "in_channel_box" : 4,
+    "keyable" : 8,
+    "locked" : 16,
+    }
+# Fields stored in a double column
+number_fields: tuple = ("value", "defaut_value", "max_value", "min_value")
+# Fields stored as string table index
+string_fields: tuple = ("maya_obj", "long_name", "nice_name", "short_name", "attribute_type", "enum_list")
+# Limits are None when attribut has no limit
+limit_flags: dict = {"max_value" : "has_max_value", "min_value" : "has_min_value"}
+
+
+class AttributTable () :
+    """
+    Attribut fields by column.
+
+    Strings are interned in one string table, numbers are stored in array('d') columns,
+    states in one array('B') bit field. Matrix values and connections are stored apart,
+    only for the rows that have them.
+    """
+
+    def __init__ (self) -> None :
+        self.strings: list = []
+        self.string_ids: dict = {}
+        self.string_columns: dict = {field : array("I") for field in string_fields}
+        self.number_columns: dict = {field : array("d") for field in number_fields}
+        self.flags: array = array("B")
+        # {row : value} for values that are not numbers (matrix)
+        self.objects: dict = {}
+        # Rows whose value was left out of their snapshot (see snapshot.lazy_value_types),
+        # read by TableAttribut when first used
+        self.unread_values: set = set()
+        # {row : (incom_connections, outcom_connections)}
+        self.connections: dict = {}
+
+    def __len__ (self) -> int :
+        return len(self.flags)
+
+    def intern (self, string) -> int :
+        """Get string index in string table, add string if needed"""
+        string_id = self.string_ids.get(string)
+        if string_id is None :
+            string_id = len(self.strings)
+            self.strings.append(string)
+            self.string_ids[string] = string_id
+        return string_id
+
+    def append (self, maya_obj, attr_snapshot) -> int :
+        """
+        Add a row from an attribut snapshot dict
+
+        Returns :
+            new row index
+        """
+        row = len(self.flags)
+        for field in string_fields :
+            value = maya_obj if field == "maya_obj" else attr_snapshot[field]
+            self.string_columns[field].append(self.intern(value or ""))
+        for field in number_fields :
+            self.number_columns[field].append(0.0)
+        self.flags.append(0)
+        for field in flag_bits :
+            self.set(row, field, attr_snapshot[field])
+        for field in number_fields :
+            if field in attr_snapshot :
+                self.set(row, field, attr_snapshot[field])
+        if "value" not in attr_snapshot :
+            self.unread_values.add(row)
+        if attr_snapshot["incom_connections"] or attr_snapshot["outcom_connections"] :
+            self.connections[row] = (attr_snapshot["incom_connections"], attr_snapshot["outcom_connections"])
+        return row
+
+    #######################################################################################################################
+    #                Get / set
+    #######################################################################################################################
+    def get (self, row, field) :
+        """Get one field of a row"""
+        if field in flag_bits :
+            return bool(self.flags[row] & flag_bits[field])
+        if field in limit_flags :
+            if not self.flags[row] & flag_bits[limit_flags[field]] :
+                return None
+            return self.cast(row, self.number_columns[field][row])
+        if field == "value" :
+            if row in self.objects :
+                return self.objects[row]
+            return self.cast(row, self.number_columns["value"][row])
+        if field in number_fields :
+            return self.cast(row, self.number_columns[field][row])
+        if field in string_fields :
+            return self.strings[self.string_columns[field][row]]
+        if field == "incom_connections" :
+            return self.connections.get(row, ((), ()))[0]
+        if field == "outcom_connections" :
+            return self.connections.get(row, ((), ()))[1]
+        raise KeyError (field)
+
+    def set (self, row, field, value) -> None :
+        """Set one field of a row"""
+        if field in flag_bits :
+            if value :
+                self.flags[row] |= flag_bits[field]
+            else :
+                self.flags[row] &= ~flag_bits[field] & 0xFF
+        elif field in number_fields :
+            if field == "value" :
+                self.unread_values.discard(row)
+            if isinstance(value, (list, tuple)) :
+                self.objects[row] = value
+            else :
+                self.objects.pop(row, None)
+                self.number_columns[field][row] = float(value or 0)
+        elif field in string_fields :
+            self.string_columns[field][row] = self.intern(value or "")
+        elif field == "incom_connections" :
+            self.connections[row] = (value, self.get(row, "outcom_connections"))
+        elif field == "outcom_connections" :
+            self.connections[row] = (self.get(row, "incom_connections"), value)
+        else :
+            raise KeyError (field)
+
+    def cast (self, row, value) :
+        """Convert a stored double back to attribut type, like Attribut fields"""
+        return snap.cast_number(self.strings[self.string_columns["attribute_type"][row]], value)
+
+    def view (self, row, backend = None) -> "TableAttribut" :
+        """Get an Attribut view over a row"""
+        return TableAttribut(self, row, backend)
+
+
+def table_field (field) -> property :
+    """Attribut field stored in table row"""
+    def getter (self) :
+        return self.table.get(self.row, field)
+    def setter (self, value) :
+        self.table.set(self.row, field, value)
+    return property(getter, setter)
+
+
+class TableAttribut () :
+    """
+    Attribut whose fields are stored in an AttributTable row.
+    Same methods as Attribut, the object itself only holds table, row and commit state.
+    """
+
+    __slots__ = ("table", "row", "cmds", "dirty_fields", "committed_name")
+
+    def __init__ (self, table, row, backend = None) -> None :
+        self.table = table
+        self.row = row
+        self.cmds = backend or mattr.get_backend()
+        self.dirty_fields = mattr.no_dirty_fields
+        self.committed_name = self.long_name
+
+    def load_from_snapshot (self, attr_snapshot) -> None :
+        for field, value in attr_snapshot.items() :
+            self.table.set(self.row, field, value)
+        self.clear_dirty()
+
+    @property
+    def value (self) :
+        if self.row in self.table.unread_values :
+            self.table.set(self.row, "value", self.cmds.getAttr("{}.{}".format(self.maya_obj, self.committed_name)))
+        return self.table.get(self.row, "value")
+
+    @value.setter
+    def value (self, value) -> None :
+        self.table.set(self.row, "value", value)
+
+    def is_loaded (self, field) -> bool :
+        """Table rows hold every field, but values left out of snapshots"""
+        return field != "value" or self.row not in self.table.unread_values
+
+    def invalidate (self, fields = None) -> None :
+        """Read fields from maya again, edited fields are kept"""
+        name = self.committed_name
+        attr_snapshot = snap.load_node_snapshot(self.maya_obj, [name], self.cmds, fields)[name]
+        for field, value in attr_snapshot.items() :
+            if field not in self.dirty_fields :
+                self.table.set(self.row, field, value)
+        if "value" not in attr_snapshot and "value" in snap.resolve_groups(fields) and "value" not in self.dirty_fields :
+            self.table.unread_values.add(self.row)
+
+for field in string_fields + number_fields + tuple(flag_bits) + ("incom_connections", "outcom_connections") :
+    if field == "value" :
+        continue
+    setattr(TableAttribut, field, table_field(field))
+
+# Use Attribut methods, not subclassing keeps Attribut slots out of views
+for name, member in vars(mattr.Attribut).items() :
+    if callable(member) and not name.startswith("__") and name not in vars(TableAttribut) :
+        setattr(TableAttribut, name, member)
@@ -0,0 +1,790 @@
+"""
+Maya command backends.
+manage_attr only talks to maya through a backend : maya.cmds in a maya session,
+or an in memory scene to load, profile and benchmark the module without maya.
+@autor : Nathan Boyaval
+@Version : 0.0.4
+@Update : 2025/02/19
+"""
+
+import re
+
+
+# Mel procedures behind query_attribut_strings and query_attribut_numbers : every custom attribut
+# of a node is queried in one mel call instead of one command per field and attribut.
+# Numbers are returned in a float array, mel string conversion would round them
+attribut_query_procs: str = """
+global proc string[] nbQueryAttributStrings (string $node, string $attrs[]) {
+    string $result[];
+    for ($attr in $attrs) {
+        string $type = `attributeQuery -node $node -attributeType $attr`;
+        string $enum = "";
+        if ($type == "enum") {
+            string $fields[] = `attributeQuery -node $node -listEnum $attr`;
+            $enum = $fields[0];
+        }
+        $result[size($result)] = $type;
+        $result[size($result)] = `attributeQuery -node $node -niceName $attr`;
+        $result[size($result)] = `attributeQuery -node $node -shortName $attr`;
+        $result[size($result)] = $enum;
+    }
+    return $result;
+}
+
+global proc float[] nbQueryAttributNumbers (string $node, string $attrs[], int $value) {
+    string $numericTypes[] = {
+        "bool", "long", "short", "byte", "char", "enum", "float", "double", "doubleAngle", "doubleLinear"
+        };
+    float $result[];
+    for ($attr in $attrs) {
+        string $type = `attributeQuery -node $node -attributeType $attr`;
+        float $numbers[] = {0, 0, 0, 0, 0, 0};
+        if (stringArrayContains($type, $numericTypes)) {
+            if ($value) {
+                $numbers[0] = `getAttr ($node + "." + $attr)`;
+            }
+            float $defaut[] = `attributeQuery -node $node -listDefault $attr`;
+            $numbers[1] = $defaut[0];
+            if ($type != "enum" && `attributeQuery -node $node -minExists $attr`) {
+                float $minimum[] = `attributeQuery -node $node -minimum $attr`;
+                $numbers[2] = 1;
+                $numbers[3] = $minimum[0];
+            }
+            if ($type != "enum" && `attributeQuery -node $node -maxExists $attr`) {
+                float $maximum[] = `attributeQuery -node $node -maximum $attr`;
+                $numbers[4] = 1;
+                $numbers[5] = $maximum[0];
+            }
+        }
+        for ($number in $numbers) {
+            $result[size($result)] = $number;
+        }
+    }
+    return $result;
+}
+"""
+
+def mel_string_array (strings) -> str :
+    """Mel string array literal, ["a", "b"] -> {"a", "b"}"""
+    return "{{{}}}".format(", ".join('"{}"'.format(string) for string in strings))
+
+
+class CmdsBackend () :
+    """
+    maya.cmds backend, every command is the maya.cmds command with the same name.
+    Attribut queries of a whole node (query_attribut_strings, query_attribut_numbers) run mel procedures
+    """
+
+    name: str = "maya"
+
+    def __init__ (self) -> None :
+        import maya.cmds
+        import maya.mel
+        self.cmds_module = maya.cmds
+        self.mel_module = maya.mel
+        self.procs_loaded: bool = False
+
+    def __getattr__ (self, command) :
+        func = getattr(self.cmds_module, command)
+        # Keep command on instance, next calls skip __getattr__
+        setattr(self, command, func)
+        return func
+
+    def eval_proc (self, proc, *args) :
+        """Call a mel procedure of attribut_query_procs, procedures are sourced on first call"""
+        if not self.procs_loaded :
+            self.mel_module.eval(attribut_query_procs)
+            self.procs_loaded = True
+        return self.mel_module.eval("{}({})".format(proc, ", ".join(args))) or []
+
+    def query_attribut_strings (self, node, attributs) -> list :
+        """
+        Attribut type, nice name, short name and enum list of each attribut, in one mel call
+
+        Returns :
+            flat list, 4 strings by attribut, empty enum list for other types
+        """
+        return self.eval_proc("nbQueryAttributStrings", '"{}"'.format(node), mel_string_array(attributs))
+
+    def query_attribut_numbers (self, node, attributs, value = True) -> list :
+        """
+        Value, defaut, has minimum, minimum, has maximum and maximum of each attribut, in one mel call
+
+        Keywords:
+            value -- read values, 0.0 is returned for values if False
+
+        Returns :
+            flat list of floats, 6 by attribut, 0.0 for attributs without numeric value
+        """
+        return self.eval_proc(
+            "nbQueryAttributNumbers", '"{}"'.format(node), mel_string_array(attributs), str(int(value)),
+            )
+
+    def recreating_in_place (self, plug) -> None :
+        """
+        Package command called before an attribut is deleted and created again by a rename or retype.
+        Maya creates attributs last, nothing to do
+        """
+
+
+#######################################################################################################################
+#                In memory scene
+#######################################################################################################################
+
+# Built-in attributs of in memory nodes, by node type
+built_in_attributs: dict = {
+    "default" : ["message", "caching", "frozen", "isHistoricallyInteresting", "nodeState"],
+    "transform" : [
+        "message", "caching", "frozen", "isHistoricallyInteresting", "nodeState",
+        "visibility", "translate", "translateX", "translateY", "translateZ",
+        "rotate", "rotateX", "rotateY", "rotateZ", "scale", "scaleX", "scaleY", "scaleZ",
+        ],
+    "animCurve" : ["message", "caching", "frozen", "isHistoricallyInteresting", "nodeState", "input", "output"],
+    }
+built_in_keyable: set = {
+    "visibility", "translateX", "translateY", "translateZ",
+    "rotateX", "rotateY", "rotateZ", "scaleX", "scaleY", "scaleZ",
+    }
+# Anim curve type of keyed attributs, by attribut type
+anim_curve_types: dict = {"doubleAngle" : "animCurveTA", "doubleLinear" : "animCurveTL"}
+built_in_types: dict = {"joint" : "transform", "nurbsCurve" : "default"}
+built_in_types.update({
+    curve_type : "animCurve" for curve_type in ("animCurveTA", "animCurveTL", "animCurveTT", "animCurveTU")
+    })
+
+integer_types: set = {"bool", "long", "short", "byte", "char", "enum"}
+numeric_types: set = integer_types | {"float", "double", "doubleAngle", "doubleLinear"}
+
+def nice_name_from (long_name) -> str :
+    """Maya like nice name, "ikFkSwitch" -> "Ik Fk Switch" """
+    words = re.sub(r"([a-z0-9])([A-Z])", r"\1 \2", long_name).replace("_", " ").split()
+    return " ".join(word[0].upper() + word[1:] for word in words)
+
+
+class MemoryAttribut () :
+    """Custom attribut of an in memory node"""
+
+    __slots__ = (
+        "long_name", "short_name", "nice_name", "attribute_type",
+        "default", "has_min", "has_max", "min_value", "max_value", "enum_name",
+        "value", "keyable", "channel_box", "locked",
+        )
+
+    def __init__ (self, long_name, short_name, attribute_type) -> None :
+        self.long_name = long_name
+        self.short_name = short_name or long_name
+        self.nice_name = nice_name_from(long_name)
+        self.attribute_type = attribute_type
+        self.default = 0
+        self.has_min = False
+        self.has_max = False
+        self.min_value = 0
+        self.max_value = 0
+        self.enum_name = ""
+        self.value = 0
+        self.keyable = False
+        self.channel_box = False
+        self.locked = False
+
+    def cast (self, value) :
+        """Convert value to attribut type"""
+        if self.attribute_type == "bool" :
+            return bool(value)
+        if self.attribute_type in integer_types :
+            return int(value)
+        return float(value)
+
+    def clamp (self, value) :
+        """Keep value in attribut limits"""
+        if self.has_min and value < self.min_value :
+            value = self.min_value
+        if self.has_max and value > self.max_value :
+            value = self.max_value
+        return self.cast(value)
+
+
+class MemoryNode () :
+    """In memory maya node : type, custom attributs in creation order, connections and anim curve keys"""
+
+    __slots__ = ("name", "node_type", "attributs", "short_names", "connections", "keys")
+
+    def __init__ (self, name, node_type) -> None :
+        self.name = name
+        self.node_type = node_type
+        self.attributs: dict = {}
+        self.short_names: dict = {}
+        # [source node, source attribut, destination node, destination attribut]
+        self.connections: list = []
+        # {time : value} keys of anim curves, linear between keys
+        self.keys: dict = {}
+
+    def find (self, attr) -> MemoryAttribut or None :
+        """Get custom attribut from long or short name"""
+        attribut = self.attributs.get(attr)
+        if attribut is None :
+            long_name = self.short_names.get(attr)
+            if long_name is not None :
+                attribut = self.attributs[long_name]
+        return attribut
+
+    def built_in (self) -> list :
+        node_type = built_in_types.get(self.node_type, self.node_type)
+        return built_in_attributs.get(node_type, built_in_attributs["default"])
+
+
+class MemoryBackend () :
+    """
+    In memory stand-in of maya.cmds.
+
+    Implements the commands and flags used by this package, with maya return values
+    (None for empty lists, lists for attributeQuery values) and maya errors
+    (RuntimeError on locked or missing attributs, ValueError on missing objects).
+    """
+
+    name: str = "memory"
+
+    def __init__ (self) -> None :
+        self.nodes: dict = {}
+        self.undo_chunk_depth: int = 0
+        # Open scene file, empty for an unsaved scene
+        self.scene_name: str = ""
+        # Selected nodes, in selection order
+        self.selection: list = []
+
+    #######################################################################################################################
+    #                Helpers
+    #######################################################################################################################
+    def get_node (self, node) -> MemoryNode :
+        try :
+            return self.nodes[node]
+        except KeyError :
+            raise ValueError ("No object matches name: {}".format(node))
+
+    def split_plug (self, plug) -> tuple :
+        """Split "node.attr" in (MemoryNode, attribut name)"""
+        node, _, attr = plug.partition(".")
+        return self.get_node(node), attr
+
+    def get_attribut (self, plug = None, node = None, attr = None) -> MemoryAttribut :
+        """Get custom attribut from "node.attr" or node and attr"""
+        if plug is not None :
+            node_obj, attr = self.split_plug(plug)
+        else :
+            node_obj = self.get_node(node)
+        attribut = node_obj.find(attr)
+        if attribut is None :
+            raise RuntimeError ("No attribute named {}.{}".format(node_obj.name, attr))
+        return attribut
+
+    def anim_curve (self, plug) -> MemoryNode or None :
+        """Anim curve node driving "node.attr", or the curve itself when plug is a curve name"""
+        node_obj, attr = self.split_plug(plug)
+        if not attr :
+            return node_obj if built_in_types.get(node_obj.node_type) == "animCurve" else None
+        attribut = node_obj.find(attr)
+        attr = attribut.long_name if attribut else attr
+        for connection in node_obj.connections :
+            if connection[2] == node_obj.name and connection[3] == attr :
+                source_obj = self.nodes[connection[0]]
+                if built_in_types.get(source_obj.node_type) == "animCurve" :
+                    return source_obj
+        return None
+
+    def evaluate (self, curve_obj, time) -> float :
+        """Value of an anim curve at time, keys are linear and held before first and after last key"""
+        times = sorted(curve_obj.keys)
+        if time <= times[0] :
+            return curve_obj.keys[times[0]]
+        for previous, next_time in zip(times, times[1:]) :
+            if time <= next_time :
+                ratio = (time - previous) / (next_time - previous)
+                return curve_obj.keys[previous] + (curve_obj.keys[next_time] - curve_obj.keys[previous]) * ratio
+        return curve_obj.keys[times[-1]]
+
+    def time_list (self, time) -> list :
+        """maya time flag value as [(start, end)] ranges, None for every time"""
+        if time is None :
+            return None
+        if not isinstance(time, list) :
+            time = [time]
+        return [item if isinstance(item, tuple) else (item, item) for item in time]
+
+    def plug_exists (self, node_obj, attr) -> bool :
+        return node_obj.find(attr) is not None or attr in node_obj.built_in()
+
+    def long_plug (self, node_obj, attr) -> str :
+        attribut = node_obj.find(attr)
+        return "{}.{}".format(node_obj.name, attribut.long_name if attribut else attr)
+
+    #######################################################################################################################
+    #                Nodes
+    #######################################################################################################################
+    def createNode (self, node_type, name = None, **kwargs) -> str :
+        base_name = name or "{}1".format(node_type)
+        node_name = base_name
+        suffix = 1
+        while node_name in self.nodes :
+            node_name = "{}{}".format(base_name.rstrip("0123456789"), suffix)
+            suffix += 1
+        self.nodes[node_name] = MemoryNode(node_name, node_type)
+        return node_name
+
+    def delete (self, *nodes, **kwargs) -> None :
+        for node in nodes :
+            for name in ([node] if isinstance(node, str) else node) :
+                node_obj = self.get_node(name)
+                for connection in list(node_obj.connections) :
+                    self.remove_connection(connection)
+                del self.nodes[name]
+                if name in self.selection :
+                    self.selection.remove(name)
+
+    def objectType (self, node, **kwargs) -> str :
+        return self.get_node(node).node_type
+
+    def objExists (self, name) -> bool :
+        node, _, attr = name.partition(".")
+        node_obj = self.nodes.get(node)
+        if node_obj is None :
+            return False
+        return not attr or self.plug_exists(node_obj, attr)
+
+    def ls (self, *args, type = None, selection = False, **kwargs) -> list :
+        if kwargs :
+            raise RuntimeError ("ls : unsupported flags {}".format(list(kwargs)))
+        types = [type] if isinstance(type, str) else type
+        names = None
+        if args :
+            names = set()
+            for arg in args :
+                names.update([arg] if isinstance(arg, str) else arg)
+        # Selected nodes are listed in selection order, like maya
+        candidates = self.selection if selection else self.nodes
+        return [
+            name for name in candidates
+            if (types is None or self.nodes[name].node_type in types) and (names is None or name in names)
+            ]
+
+    def select (self, *nodes, clear = False, add = False, deselect = False) -> None :
+        if clear :
+            self.selection = []
+            return
+        names = []
+        for node in nodes :
+            names += [node] if isinstance(node, str) else list(node)
+        for name in names :
+            self.get_node(name)
+        if deselect :
+            self.selection = [name for name in self.selection if name not in names]
+            return
+        if not add :
+            self.selection = []
+        self.selection += [name for name in dict.fromkeys(names) if name not in self.selection]
+
+    def file (self, *args, query = False, sceneName = False, **kwargs) -> str :
+        if query and sceneName :
+            return self.scene_name
+        raise RuntimeError ("file : only sceneName query is supported")
+
+    def undoInfo (self, *args, **kwargs) :
+        if kwargs.get("openChunk") :
+            self.undo_chunk_depth += 1
+        elif kwargs.get("closeChunk") :
+            self.undo_chunk_depth -= 1
+        elif kwargs.get("query") :
+            return True
+        return None
+
+    def warning (self, message) -> None :
+        print ("# Warning: {}".format(message))
+
+    def error (self, message) -> None :
+        raise RuntimeError (message)
+
+    #######################################################################################################################
+    #                Attributs
+    #######################################################################################################################
+    def listAttr (
+        self, node, userDefined = False, keyable = False, locked = False, channelBox = False, **kwargs
+        ) -> list or None :
+        node_obj = self.get_node(node)
+        attributs = []
+        if not userDefined :
+            for attr in node_obj.built_in() :
+                if locked or channelBox or (keyable and attr not in built_in_keyable) :
+                    continue
+                attributs.append(attr)
+        for attribut in node_obj.attributs.values() :
+            if keyable and not attribut.keyable :
+                continue
+            if locked and not attribut.locked :
+                continue
+            if channelBox and not (attribut.channel_box and not attribut.keyable) :
+                continue
+            attributs.append(attribut.long_name)
+        return attributs or None
+
+    def attributeQuery (self, attr, node = None, **flags) :
+        node_obj = self.get_node(node)
+        if flags.get("exists") :
+            return self.plug_exists(node_obj, attr)
+        attribut = self.get_attribut(node = node, attr = attr)
+
+        if flags.get("niceName") :
+            return attribut.nice_name
+        if flags.get("shortName") :
+            return attribut.short_name
+        if flags.get("longName") :
+            return attribut.long_name
+        if flags.get("attributeType") :
+            return attribut.attribute_type
+        if flags.get("listDefault") :
+            return [attribut.default]
+        if flags.get("maxExists") :
+            return attribut.has_max
+        if flags.get("minExists") :
+            return attribut.has_min
+        if flags.get("maximum") :
+            return [attribut.max_value]
+        if flags.get("minimum") :
+            return [attribut.min_value]
+        if flags.get("listEnum") :
+            return [attribut.enum_name] if attribut.attribute_type == "enum" else None
+        if flags.get("keyable") :
+            return attribut.keyable
+        if flags.get("channelBox") :
+            return attribut.channel_box and not attribut.keyable
+        if flags.get("hidden") :
+            return not (attribut.keyable or attribut.channel_box)
+        raise RuntimeError ("attributeQuery : unsupported flags {}".format(list(flags)))
+
+    def query_attribut_strings (self, node, attributs) -> list :
+        """Package command, see CmdsBackend.query_attribut_strings"""
+        result = []
+        for attr in attributs :
+            attribut = self.get_attribut(node = node, attr = attr)
+            enum_name = attribut.enum_name if attribut.attribute_type == "enum" else ""
+            result += [attribut.attribute_type, attribut.nice_name, attribut.short_name, enum_name]
+        return result
+
+    def recreating_in_place (self, plug) -> None :
+        """Package command, see CmdsBackend.recreating_in_place. Attributs are created last like in maya"""
+
+    def query_attribut_numbers (self, node, attributs, value = True) -> list :
+        """Package command, see CmdsBackend.query_attribut_numbers. Numbers are floats like a mel float array"""
+        result = []
+        for attr in attributs :
+            attribut = self.get_attribut(node = node, attr = attr)
+            if attribut.attribute_type not in numeric_types :
+                result += [0.0] * 6
+                continue
+            limits = attribut.attribute_type != "enum"
+            has_min = limits and attribut.has_min
+            has_max = limits and attribut.has_max
+            result += [
+                float(attribut.value) if value else 0.0, float(attribut.default),
+                float(has_min), float(attribut.min_value) if has_min else 0.0,
+                float(has_max), float(attribut.max_value) if has_max else 0.0,
+                ]
+        return result
+
+    def attributeName (self, plug, nice = False, long = False, short = False) -> str :
+        attribut = self.get_attribut(plug)
+        if nice :
+            return attribut.nice_name
+        if short :
+            return attribut.short_name
+        return attribut.long_name
+
+    def getAttr (
+        self, plug, lock = False, keyable = False, channelBox = False, type = False, time = None, **kwargs
+        ) :
+        attribut = self.get_attribut(plug)
+        if time is not None :
+            curve_obj = self.anim_curve(plug)
+            if curve_obj is not None :
+                return attribut.clamp(self.evaluate(curve_obj, time))
+        if lock :
+            return attribut.locked
+        if keyable :
+            return attribut.keyable
+        if channelBox :
+            return attribut.channel_box and not attribut.keyable
+        if type :
+            return attribut.attribute_type
+        if attribut.attribute_type == "matrix" :
+            return list(attribut.value)
+        return attribut.value
+
+    def setAttr (self, plug, *values, lock = None, keyable = None, channelBox = None, **kwargs) -> None :
+        attribut = self.get_attribut(plug)
+        if values :
+            if attribut.locked :
+                raise RuntimeError ("The attribute '{}' is locked or connected and cannot be modified.".format(plug))
+            if attribut.attribute_type == "matrix" :
+                attribut.value = list(values[0])
+            else :
+                attribut.value = attribut.clamp(values[0])
+        if keyable is not None :
+            attribut.keyable = keyable
+        if channelBox is not None :
+            attribut.channel_box = channelBox
+        if lock is not None :
+            attribut.locked = lock
+
+    def addAttr (self, target, edit = False, **flags) -> None :
+        if edit :
+            return self.edit_attribut(target, **flags)
+
+        node_obj = self.get_node(target)
+        long_name = flags.get("longName") or flags.get("ln")
+        short_name = flags.get("shortName") or flags.get("sn")
+        attribute_type = flags.get("attributeType") or flags.get("at") or "double"
+        if not long_name :
+            raise RuntimeError ("addAttr : longName is needed")
+        if self.plug_exists(node_obj, long_name) or (short_name and self.plug_exists(node_obj, short_name)) :
+            raise RuntimeError ("Found attribute name clash on {}.{}".format(target, long_name))
+        if attribute_type not in numeric_types and attribute_type != "matrix" :
+            raise RuntimeError ("Unknown attribute type {}".format(attribute_type))
+
+        attribut = MemoryAttribut(long_name, short_name, attribute_type)
+        if attribute_type == "matrix" :
+            attribut.value = [float(i % 5 == 0) for i in range(16)]
+        node_obj.attributs[long_name] = attribut
+        if short_name :
+            node_obj.short_names[short_name] = long_name
+
+        if "keyable" in flags :
+            attribut.keyable = flags["keyable"]
+        if attribute_type != "matrix" :
+            self.edit_attribut_flags(attribut, flags)
+            attribut.value = attribut.clamp(attribut.default)
+        elif flags.get("niceName") :
+            attribut.nice_name = flags["niceName"]
+
+    def edit_attribut (self, plug, **flags) -> None :
+        """addAttr(edit = True)"""
+        attribut = self.get_attribut(plug)
+        if "keyable" in flags :
+            attribut.keyable = flags["keyable"]
+        self.edit_attribut_flags(attribut, flags)
+        if attribut.attribute_type != "matrix" :
+            attribut.value = attribut.clamp(attribut.value)
+
+    def edit_attribut_flags (self, attribut, flags) -> None :
+        if flags.get("niceName") :
+            attribut.nice_name = flags["niceName"]
+        if "defaultValue" in flags :
+            attribut.default = attribut.cast(flags["defaultValue"])
+        if "minValue" in flags :
+            attribut.min_value = attribut.cast(flags["minValue"])
+            attribut.has_min = True
+        if "maxValue" in flags :
+            attribut.max_value = attribut.cast(flags["maxValue"])
+            attribut.has_max = True
+        if "hasMinValue" in flags :
+            attribut.has_min = bool(flags["hasMinValue"])
+        if "hasMaxValue" in flags :
+            attribut.has_max = bool(flags["hasMaxValue"])
+        if "enumName" in flags :
+            attribut.enum_name = flags["enumName"]
+        if attribut.has_min and attribut.has_max and attribut.min_value > attribut.max_value :
+            raise RuntimeError ("Minimum value {} is greater than maximum value {} on {}".format(
+                attribut.min_value, attribut.max_value, attribut.long_name
+                ))
+
+    def deleteAttr (self, plug = None, attribute = None, **kwargs) -> None :
+        if attribute is not None :
+            plug = "{}.{}".format(plug, attribute)
+        node_obj, attr = self.split_plug(plug)
+        attribut = self.get_attribut(plug)
+        if attribut.locked :
+            raise RuntimeError ("Cannot delete locked attribute '{}'.".format(plug))
+        for connection in list(node_obj.connections) :
+            if (connection[0] == node_obj.name and connection[1] == attribut.long_name) or \
+               (connection[2] == node_obj.name and connection[3] == attribut.long_name) :
+                self.remove_connection(connection)
+        del node_obj.attributs[attribut.long_name]
+        node_obj.short_names.pop(attribut.short_name, None)
+
+    def renameAttr (self, plug, new_name) -> str :
+        node_obj, attr = self.split_plug(plug)
+        attribut = self.get_attribut(plug)
+        if self.plug_exists(node_obj, new_name) :
+            raise RuntimeError ("Found attribute name clash on {}.{}".format(node_obj.name, new_name))
+        old_name = attribut.long_name
+        attribut.long_name = new_name
+        node_obj.attributs = {
+            (new_name if name == old_name else name) : value for name, value in node_obj.attributs.items()
+            }
+        for connection in node_obj.connections :
+            for index in (0, 2) :
+                if connection[index] == node_obj.name and connection[index + 1] == old_name :
+                    connection[index + 1] = new_name
+        return new_name
+
+    #######################################################################################################################
+    #                Keys
+    #######################################################################################################################
+    def setKeyframe (self, plug, time = 1.0, value = None, **kwargs) -> int :
+        attribut = self.get_attribut(plug)
+        curve_obj = self.anim_curve(plug)
+        if curve_obj is None :
+            node_obj, attr = self.split_plug(plug)
+            curve = self.createNode(
+                anim_curve_types.get(attribut.attribute_type, "animCurveTU"),
+                name = "{}_{}".format(node_obj.name, attribut.long_name),
+                )
+            self.connectAttr("{}.output".format(curve), plug)
+            curve_obj = self.nodes[curve]
+        for start, end in self.time_list(time) :
+            curve_obj.keys[float(start)] = float(attribut.value if value is None else value)
+        return 1
+
+    def keyframe (
+        self, *targets, query = False, eval = False, time = None, valueChange = False, timeChange = False,
+        keyframeCount = False, **kwargs
+        ) :
+        if not query :
+            raise RuntimeError ("keyframe : only query is supported")
+        ranges = self.time_list(time)
+        result = []
+        for target in targets :
+            for plug in ([target] if isinstance(target, str) else target) :
+                curve_obj = self.anim_curve(plug)
+                if curve_obj is None :
+                    continue
+                if eval :
+                    result += [self.evaluate(curve_obj, start) for start, end in ranges]
+                    continue
+                times = [
+                    key_time for key_time in sorted(curve_obj.keys)
+                    if ranges is None or any(start <= key_time <= end for start, end in ranges)
+                    ]
+                if keyframeCount :
+                    result.append(len(times))
+                elif valueChange :
+                    result += [curve_obj.keys[key_time] for key_time in times]
+                else :
+                    result += times
+        if keyframeCount :
+            return sum(result)
+        return result or None
+
+    def cutKey (self, *targets, time = None, clear = True, **kwargs) -> int :
+        ranges = self.time_list(time)
+        count = 0
+        for target in targets :
+            for plug in ([target] if isinstance(target, str) else target) :
+                curve_obj = self.anim_curve(plug)
+                if curve_obj is None :
+                    continue
+                for key_time in list(curve_obj.keys) :
+                    if ranges is None or any(start <= key_time <= end for start, end in ranges) :
+                        del curve_obj.keys[key_time]
+                        count += 1
+                # Curves without keys are deleted
+                if not curve_obj.keys :
+                    self.delete(curve_obj.name)
+        return count
+
+    #######################################################################################################################
+    #                Connections
+    #######################################################################################################################
+    def connectAttr (self, source, destination, force = False, **kwargs) -> None :
+        source_node, source_attr = self.split_plug(source)
+        destination_node, destination_attr = self.split_plug(destination)
+        for node_obj, attr, plug in ((source_node, source_attr, source), (destination_node, destination_attr, destination)) :
+            if not self.plug_exists(node_obj, attr) :
+                raise RuntimeError ("The source or destination attribute '{}' was not found.".format(plug))
+
+        source_attr = self.long_plug(source_node, source_attr).split(".", 1)[1]
+        destination_attr = self.long_plug(destination_node, destination_attr).split(".", 1)[1]
+        for connection in list(destination_node.connections) :
+            if connection[2] == destination_node.name and connection[3] == destination_attr :
+                if not force :
+                    raise RuntimeError ("'{}' already has an incoming connection".format(destination))
+                self.remove_connection(connection)
+
+        connection = [source_node.name, source_attr, destination_node.name, destination_attr]
+        source_node.connections.append(connection)
+        if destination_node is not source_node :
+            destination_node.connections.append(connection)
+
+    def disconnectAttr (self, source, destination, **kwargs) -> None :
+        source_node, source_attr = self.split_plug(source)
+        destination_node, destination_attr = self.split_plug(destination)
+        source_attr = self.long_plug(source_node, source_attr).split(".", 1)[1]
+        destination_attr = self.long_plug(destination_node, destination_attr).split(".", 1)[1]
+        for connection in list(source_node.connections) :
+            if connection == [source_node.name, source_attr, destination_node.name, destination_attr] :
+                self.remove_connection(connection)
+                return
+        raise RuntimeError ("There is no connection from '{}' to '{}' to disconnect".format(source, destination))
+
+    def remove_connection (self, connection) -> None :
+        for node in (connection[0], connection[2]) :
+            node_obj = self.nodes.get(node)
+            if node_obj is not None and connection in node_obj.connections :
+                node_obj.connections.remove(connection)
+
+    def listConnections (
+        self, target, connections = False, plugs = False, source = True, destination = True, **kwargs
+        ) -> list or None :
+        if isinstance(target, (list, tuple)) :
+            result = []
+            for item in target :
+                result += self.listConnections(
+                    item, connections = connections, plugs = plugs, source = source, destination = destination,
+                    ) or []
+            return result or None
+
+        node, _, attr = target.partition(".")
+        node_obj = self.get_node(node)
+        if attr :
+            attribut = node_obj.find(attr)
+            attr = attribut.long_name if attribut else attr
+
+        result = []
+        for connection in node_obj.connections :
+            # Connection seen from node as a source, other side is the destination
+            sides = []
+            if destination and connection[0] == node_obj.name :
+                sides.append((connection[1], connection[2], connection[3]))
+            if source and connection[2] == node_obj.name :
+                sides.append((connection[3], connection[0], connection[1]))
+            for node_attr, other_node, other_attr in sides :
+                if attr and node_attr != attr :
+                    continue
+                if connections :
+                    result.append("{}.{}".format(node_obj.name, node_attr))
+                result.append("{}.{}".format(other_node, other_attr) if plugs else other_node)
+        return result or None
+
+
+#######################################################################################################################
+#                Current backend
+#######################################################################################################################
+
+current_backend: list = [None]
+# Functions wrapping maya.cmds backend when it is created by get_backend
+backend_wrappers: list = []
+
+def set_backend (backend) -> object :
+    """Set backend used when no backend is given to Attribut, MayaObject and module functions"""
+    current_backend[0] = backend
+    return backend
+
+def get_backend () -> object :
+    """Get current backend, maya.cmds backend if none was set"""
+    if current_backend[0] is None :
+        try :
+            backend = CmdsBackend()
+        except ImportError :
+            raise RuntimeError (
+                "maya.cmds is not available, set a backend first : backend.set_backend(backend.MemoryBackend())"
+                )
+        for wrapper in backend_wrappers :
+            backend = wrapper(backend)
+        current_backend[0] = backend
+    return current_backend[0]
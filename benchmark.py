@@ -0,0 +1,901 @@
+"""
+Benchmarks for attribut loading and editing, run from a maya session or mayapy :
+    from nb_attribut_control import benchmark
+    benchmark.bench_load_calls("ctrl_1")
+or without maya, on an in memory scene (see backend.MemoryBackend)
+@autor : Nathan Boyaval
+@Version : 0.0.4
+@Update : 2025/02/19
+"""
+
+import argparse
+import collections
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from nb_attribut_control import manage_attr as mattr
+from nb_attribut_control import range_check
+from nb_attribut_control import snapshot as snap
+from nb_attribut_control.attribut_index import AttributIndex
+from nb_attribut_control.backend import get_backend, MemoryBackend
+
+
+class CountingBackend () :
+    """Wrap a maya commands backend and count each command call"""
+
+    def __init__ (self, backend) -> None :
+        self.backend = backend
+        self.name = backend.name
+        self.calls = collections.Counter()
+
+    def __getattr__ (self, command) :
+        func = getattr(self.backend, command)
+
+        def wrapper (*args, **kwargs) :
+            self.calls[command] += 1
+            return func(*args, **kwargs)
+        return wrapper
+
+    def total (self) -> int :
+        return sum(self.calls.values())
+
+    def reset (self) -> None :
+        self.calls.clear()
+
+
+class FailingBackend (CountingBackend) :
+    """Counting backend raising a maya error on a given call of a command, used to check rollbacks"""
+
+    def __init__ (self, backend, command = "addAttr", call = 1) -> None :
+        super().__init__(backend)
+        self.failing_command = command
+        self.failing_call = call
+
+    def __getattr__ (self, command) :
+        wrapper = super().__getattr__(command)
+        if command != self.failing_command :
+            return wrapper
+
+        def failing (*args, **kwargs) :
+            if self.calls[command] + 1 == self.failing_call :
+                self.calls[command] += 1
+                raise RuntimeError ("{} failed on call {}".format(command, self.failing_call))
+            return wrapper(*args, **kwargs)
+        return failing
+
+
+def load_attribut_before (node, attr, cmds) -> dict :
+    """Queries of Attribut.load_maya_attribut before snapshots, one command per field"""
+    plug = "{}.{}".format(node, attr)
+    data = {
+        "nice_name" : cmds.attributeQuery(attr, node = node, niceName = True),
+        "short_name" : cmds.attributeQuery(attr, node = node, shortName = True),
+        "value" : cmds.getAttr(plug),
+        "defaut_value" : cmds.attributeQuery(attr, node = node, listDefault = True),
+        "has_max_value" : cmds.attributeQuery(attr, node = node, maxExists = True),
+        "has_min_value" : cmds.attributeQuery(attr, node = node, minExists = True),
+        "enum_list" : cmds.attributeQuery(attr, node = node, listEnum = True),
+        }
+    data["max_value"] = cmds.attributeQuery(attr, node = node, maximum = True) if data["has_max_value"] else None
+    data["min_value"] = cmds.attributeQuery(attr, node = node, minimum = True) if data["has_min_value"] else None
+    data["attribute_type"] = cmds.attributeQuery(attr, node = node, attributeType = True)
+    data["in_channel_box"] = cmds.attributeQuery(attr, node = node, channelBox = True)
+    data["keyable"] = cmds.attributeQuery(attr, node = node, keyable = True)
+    data["locked"] = cmds.getAttr(plug, lock = True)
+    data["incom_connections"] = cmds.listConnections(plug, plugs = True, destination = True, source = False)
+    data["outcom_connections"] = cmds.listConnections(plug, plugs = True, destination = False, source = True)
+    return data
+
+def bench_load_calls (node, loader = "cmds", backend = None) -> dict :
+    """
+    Compare maya calls needed to load node custom attributs : with one command per field
+    like before snapshots, with one snapshot per attribut and with one snapshot for the node
+
+    Keywords:
+        node -- maya object with custom attributs
+        loader -- snapshot loader name (see snapshot.snapshot_loaders)
+        backend -- maya commands backend, current backend if None
+
+    Returns :
+        {"attributs" : int, "before" : {...}, "per_attribut" : {...}, "bulk" : {...}}
+    """
+    snap.set_snapshot_loader(loader)
+    counter = CountingBackend(backend or get_backend())
+    attributs = mattr.get_custom_attr_names(node, backend = counter)
+    count = max(len(attributs), 1)
+    result = {"attributs" : len(attributs)}
+
+    counter.reset()
+    start = time.perf_counter()
+    for attr in attributs :
+        load_attribut_before(node, attr, counter)
+    elapsed = time.perf_counter() - start
+    result["before"] = {
+        "calls" : counter.total(),
+        "calls_per_attribut" : counter.total() / count,
+        "seconds" : elapsed,
+        }
+
+    counter.reset()
+    start = time.perf_counter()
+    for attr in attributs :
+        mattr.Attribut(node, long_name = attr, in_maya = True, backend = counter)
+    elapsed = time.perf_counter() - start
+    result["per_attribut"] = {
+        "calls" : counter.total(),
+        "calls_per_attribut" : counter.total() / count,
+        "seconds" : elapsed,
+        }
+
+    counter.reset()
+    start = time.perf_counter()
+    node_snapshot = snap.load_node_snapshot(node, attributs, counter)
+    for attr in attributs :
+        mattr.Attribut(node, long_name = attr, snapshot = node_snapshot[attr], backend = counter)
+    elapsed = time.perf_counter() - start
+    result["bulk"] = {
+        "calls" : counter.total(),
+        "calls_per_attribut" : counter.total() / count,
+        "seconds" : elapsed,
+        }
+
+    print ("{} attributs on {}".format(result["attributs"], node))
+    for mode in ("before", "per_attribut", "bulk") :
+        print ("{:<14}{:>8} calls{:>10.2f} calls/attribut{:>10.4f} s".format(
+            mode, result[mode]["calls"], result[mode]["calls_per_attribut"], result[mode]["seconds"]
+            ))
+    return result
+
+
+def bench_attribut_index (count = 10000) -> dict :
+    """
+    Compare attribut list and dict used before AttributIndex with AttributIndex :
+    fill, rename, delete and move up, on count attributs
+
+    Returns :
+        {"list" : {operation : seconds}, "index" : {operation : seconds}}
+    """
+    names = ["attribut{}".format(i) for i in range(count)]
+    renamed = names[count // 2]
+    moved = names[-1]
+    result = {"list" : {}, "index" : {}}
+
+    # Previous MayaObject storage
+    start = time.perf_counter()
+    custom_attributs = list(names)
+    attributs_dic = {}
+    for attr in custom_attributs :
+        attributs_dic[attr] = {"class" : None, "index" : custom_attributs.index(attr)}
+    result["list"]["fill"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    attributs_dic["renamed"] = attributs_dic.pop(renamed)
+    custom_attributs[custom_attributs.index(renamed)] = "renamed"
+    result["list"]["rename"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    custom_attributs.remove(names[0])
+    attributs_dic.pop(names[0])
+    for index, attr in enumerate(attributs_dic) :
+        attributs_dic[attr]["index"] = index
+    result["list"]["delete"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    position = custom_attributs.index(moved)
+    custom_attributs[position - 1], custom_attributs[position] = custom_attributs[position], custom_attributs[position - 1]
+    attributs_dic[moved]["index"] -= 1
+    attributs_dic[custom_attributs[position]]["index"] += 1
+    result["list"]["move_up"] = time.perf_counter() - start
+
+    # AttributIndex
+    start = time.perf_counter()
+    index = AttributIndex((name, None) for name in names)
+    result["index"]["fill"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index.rename(renamed, "renamed")
+    result["index"]["rename"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index.remove(names[0])
+    result["index"]["delete"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index.move_up(moved)
+    result["index"]["move_up"] = time.perf_counter() - start
+
+    print ("{} attributs".format(count))
+    print ("{:<10}{:>14}{:>14}".format("operation", "list (s)", "index (s)"))
+    for operation in result["list"] :
+        print ("{:<10}{:>14.6f}{:>14.6f}".format(operation, result["list"][operation], result["index"][operation]))
+    return result
+
+
+#######################################################################################################################
+#                Scaling suite
+#######################################################################################################################
+
+# Synthetic attribut definitions, used in turn on each control
+synthetic_attributs: tuple = (
+    {"attributeType" : "double", "minValue" : 0.0, "maxValue" : 1.0, "defaultValue" : 0.0, "keyable" : True},
+    {"attributeType" : "long", "minValue" : 0, "maxValue" : 10, "defaultValue" : 1, "keyable" : True},
+    {"attributeType" : "bool", "defaultValue" : 1, "keyable" : True},
+    {"attributeType" : "enum", "enumName" : "world:local:parent", "keyable" : True},
+    {"attributeType" : "doubleAngle", "defaultValue" : 0.0},
+    {"attributeType" : "float", "defaultValue" : 0.5},
+    )
+
+def build_control (backend, name, attribut_count) -> str :
+    """Create a transform with attribut_count custom attributs, return its name"""
+    node = backend.createNode("transform", name = name)
+    for index in range(attribut_count) :
+        flags = synthetic_attributs[index % len(synthetic_attributs)]
+        backend.addAttr(node, longName = "customAttr{}".format(index), **flags)
+    return node
+
+def build_scene (backend, control_count, attribut_count) -> list :
+    """Create control_count controls with attribut_count custom attributs each"""
+    return [
+        build_control(backend, "ctrl{}".format(index), attribut_count) for index in range(control_count)
+        ]
+
+def measure (func, backend) -> dict :
+    """Run func(backend) and return seconds, backend calls and peak memory"""
+    counter = CountingBackend(backend)
+    tracemalloc.start()
+    start = time.perf_counter()
+    func(counter)
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"seconds" : seconds, "calls" : counter.total(), "peak_bytes" : peak}
+
+def bench_object (attribut_count, backend = None) -> dict :
+    """Time MayaObject operations on one control with attribut_count custom attributs"""
+    backend = backend or MemoryBackend()
+    node = build_control(backend, "bench_ctrl", attribut_count)
+    maya_object = [None]
+    result = {}
+
+    def init (counter) :
+        maya_object[0] = mattr.MayaObject(node, backend = counter)
+    result["init"] = measure(init, backend)
+
+    def create_attributs_class (counter) :
+        maya_object[0].cmds = counter
+        maya_object[0].attributs = AttributIndex()
+        maya_object[0].create_attributs_class()
+    result["create_attributs_class"] = measure(create_attributs_class, backend)
+
+    attributs = list(maya_object[0].custom_attributs)
+
+    def commit_one (counter) :
+        maya_object[0].cmds = counter
+        attr_class = maya_object[0].get_attribut_object(attributs[-1])
+        attr_class.cmds = counter
+        attr_class.set_lock(not attr_class.locked)
+        maya_object[0].commit_attributs()
+    result["commit_one"] = measure(commit_one, backend)
+
+    def commit_all (counter) :
+        maya_object[0].cmds = counter
+        for attr_class in maya_object[0].attributs.values() :
+            attr_class.cmds = counter
+            attr_class.set_keyable(not attr_class.keyable)
+        maya_object[0].commit_attributs()
+    result["commit_all"] = measure(commit_all, backend)
+
+    def reorder_last_up (counter) :
+        maya_object[0].cmds = counter
+        for attr_class in maya_object[0].attributs.values() :
+            attr_class.cmds = counter
+        maya_object[0].move_attribut_up(attributs[-1])
+        maya_object[0].reorder_attributs()
+    result["reorder_last_up"] = measure(reorder_last_up, backend)
+
+    def edit_each (counter) :
+        for attr in attributs :
+            maya_object[0].set_keyable(attr, True)
+            maya_object[0].set_lock(attr, False)
+    result["edit_each"] = measure(edit_each, backend)
+
+    def edit_attributs (counter) :
+        maya_object[0].edit_attributs({"keyable" : False, "locked" : False}, "customAttr*")
+    result["edit_attributs"] = measure(edit_attributs, backend)
+
+    def query_attributs (counter) :
+        maya_object[0].query_attributs(("long_name", "keyable", "value"), columns = True)
+    result["query_attributs"] = measure(query_attributs, backend)
+
+    def commit_dry_run (counter) :
+        maya_object[0].cmds = counter
+        for attr_class in maya_object[0].attributs.values() :
+            attr_class.cmds = counter
+            attr_class.set_keyable(not attr_class.keyable)
+        maya_object[0].commit_attributs(dry_run = True)
+    result["commit_dry_run"] = measure(commit_dry_run, backend)
+
+    # Keyable edits of dry run are put back too
+    def commit_rollback (counter) :
+        failing = FailingBackend(counter, "addAttr", 2)
+        maya_object[0].cmds = failing
+        for attr_class in maya_object[0].attributs.values() :
+            attr_class.cmds = failing
+        maya_object[0].edit_long_name(attributs[-1], "renamedAttr")
+        try :
+            maya_object[0].commit_attributs()
+        except mattr.CommitError :
+            pass
+    result["commit_rollback"] = measure(commit_rollback, backend)
+
+    def delete_attribut (counter) :
+        for attr in attributs[:10] :
+            maya_object[0].delete_attribut(attr)
+        maya_object[0].custom_attributs
+    result["delete_attribut"] = measure(delete_attribut, backend)
+
+    return result
+
+def bench_scene (control_count, attribut_count = 20, backend = None) -> dict :
+    """Time loading a MayaObject for each control of a scene"""
+    backend = backend or MemoryBackend()
+    controls = build_scene(backend, control_count, attribut_count)
+
+    def load_scene (counter) :
+        for control in controls :
+            mattr.MayaObject(control, backend = counter)
+    def load_scene_lazy (counter) :
+        for control in controls :
+            mattr.MayaObject(control, backend = counter, lazy = True)
+    return {
+        "load_scene" : measure(load_scene, backend),
+        "load_scene_lazy" : measure(load_scene_lazy, backend),
+        }
+
+def bench_object_set (control_count = 3000, attribut_count = 20, backend = None) -> dict :
+    """Time loading control_count controls in a MayaObjectSet, locking one attribut on all and commiting"""
+    from nb_attribut_control.object_set import MayaObjectSet
+
+    backend = backend or MemoryBackend()
+    controls = build_scene(backend, control_count, attribut_count)
+    object_set = [None]
+
+    def load (counter) :
+        object_set[0] = MayaObjectSet(controls, backend = counter)
+    def edit (counter) :
+        object_set[0].apply("customAttr1", "set_lock", True)
+    def commit (counter) :
+        object_set[0].cmds = counter
+        for maya_object in object_set[0] :
+            maya_object.cmds = counter
+            for attr_class in maya_object.attributs.values() :
+                attr_class.cmds = counter
+        object_set[0].commit()
+
+    return {
+        "object_set_load" : measure(load, backend),
+        "object_set_edit" : measure(edit, backend),
+        "object_set_commit" : measure(commit, backend),
+        }
+
+def bench_scanner (control_count = 3000, attribut_count = 20, backend = None) -> dict :
+    """Time a scene scan, then find / inconsistent queries and one node rescan"""
+    from nb_attribut_control.scene_scanner import SceneScanner
+
+    backend = backend or MemoryBackend()
+    controls = build_scene(backend, control_count, attribut_count)
+    # Drift one definition
+    backend.addAttr("{}.customAttr0".format(controls[-1]), edit = True, maxValue = 2.0)
+    scanner = [None]
+
+    def scan (counter) :
+        scanner[0] = SceneScanner(backend = counter)
+        scanner[0].scan(controls)
+    def find (counter) :
+        scanner[0].find("customAttr1")
+    def inconsistent (counter) :
+        scanner[0].inconsistent()
+    def rescan (counter) :
+        scanner[0].cmds = counter
+        scanner[0].rescan(controls[:1])
+
+    result = {
+        "scanner_scan" : measure(scan, backend),
+        "scanner_find" : measure(find, backend),
+        "scanner_inconsistent" : measure(inconsistent, backend),
+        "scanner_rescan" : measure(rescan, backend),
+        }
+    return result
+
+def check_commit_rollback (attribut_count = 20, failing_call = 2) -> list :
+    """
+    Rename, edit, add and delete attributs, make a maya command fail during commit and
+    compare the node with the node before commit
+
+    Returns :
+        list of (attribut name, field) not put back, empty if rollback is exact
+    """
+    backend = MemoryBackend()
+    node = build_control(backend, "rollback_ctrl", attribut_count)
+    other = backend.createNode("transform", name = "rollback_driver")
+    backend.connectAttr("{}.customAttr1".format(node), "{}.translateX".format(other))
+    backend.connectAttr("{}.translateY".format(other), "{}.customAttr2".format(node))
+    backend.setAttr("{}.customAttr1".format(node), lock = True)
+    order = backend.listAttr(node, userDefined = True)
+    before = snap.load_node_snapshot(node, None, backend)
+
+    failing = FailingBackend(backend, "addAttr", failing_call)
+    maya_object = mattr.MayaObject(node, backend = failing, lazy = True)
+    maya_object.edit_long_name("customAttr1", "renamed_attr")
+    maya_object.set_keyable("customAttr3", False)
+    maya_object.delete_attribut("customAttr2")
+    maya_object.add_attribut("new_attr")
+    try :
+        maya_object.commit_attributs()
+    except mattr.CommitError :
+        pass
+    else :
+        return [(None, "commit did not fail")]
+
+    errors = []
+    if backend.listAttr(node, userDefined = True) != order :
+        errors.append((None, "order"))
+    after = snap.load_node_snapshot(node, None, backend)
+    for attr, attr_snapshot in before.items() :
+        for field, value in attr_snapshot.items() :
+            if attr not in after or after[attr][field] != value :
+                errors.append((attr, field))
+    return errors
+
+def check_schema_round_trip (schema) -> list :
+    """
+    Write a node schema as json and binary, read both back
+
+    Returns :
+        list of (format, attribut name) that did not read back the same, empty if round trip is exact
+    """
+    from nb_attribut_control import schema as mschema
+
+    errors = []
+    json_file = io.StringIO()
+    mschema.write_json([schema], json_file)
+    json_file.seek(0)
+    binary_file = io.BytesIO()
+    mschema.write_binary([schema], binary_file)
+    binary_file.seek(0)
+    for file_format, schemas in (("json", mschema.read_json(json_file)), ("binary", mschema.read_binary(binary_file))) :
+        if len(schemas) != 1 or schemas[0]["node"] != schema["node"] :
+            errors.append((file_format, None))
+            continue
+        read_attributs = {attribut["long_name"] : attribut for attribut in schemas[0]["attributs"]}
+        for attribut in schema["attributs"] :
+            if read_attributs.get(attribut["long_name"]) != attribut :
+                errors.append((file_format, attribut["long_name"]))
+        if [attribut["long_name"] for attribut in schemas[0]["attributs"]] != list(read_attributs) :
+            errors.append((file_format, None))
+    return errors
+
+def bench_schema (attribut_count = 1000, control_count = 100, backend = None) -> dict :
+    """
+    Compare json and binary schema files, size and speed, and time applying a schema
+
+    Returns :
+        {"json_bytes" : int, "binary_bytes" : int, "round_trip_errors" : list, measures...}
+    """
+    from nb_attribut_control import schema as mschema
+
+    backend = backend or MemoryBackend()
+    node = build_control(backend, "schema_ctrl", attribut_count)
+    schema = mschema.object_schema(mattr.MayaObject(node, backend = backend, lazy = True))
+    # Rig schema : same layout saved for every control
+    schemas = [dict(schema, node = "ctrl{}".format(index)) for index in range(control_count)]
+    files = {}
+
+    def write_json (counter) :
+        files["json"] = io.StringIO()
+        mschema.write_json(schemas, files["json"])
+    def read_json (counter) :
+        files["json"].seek(0)
+        mschema.read_json(files["json"])
+    def write_binary (counter) :
+        files["binary"] = io.BytesIO()
+        mschema.write_binary(schemas, files["binary"])
+    def read_binary (counter) :
+        files["binary"].seek(0)
+        for node_schema in mschema.iter_binary(files["binary"]) :
+            pass
+
+    result = {
+        "schema_write_json" : measure(write_json, backend),
+        "schema_read_json" : measure(read_json, backend),
+        "schema_write_binary" : measure(write_binary, backend),
+        "schema_read_binary" : measure(read_binary, backend),
+        }
+    result["json_bytes"] = len(files["json"].getvalue().encode("utf-8"))
+    result["binary_bytes"] = len(files["binary"].getvalue())
+    result["round_trip_errors"] = check_schema_round_trip(schema)
+
+    targets = build_scene(backend, min(control_count, 100), 0)
+    def apply (counter) :
+        mschema.apply_schema(schema, targets, backend = counter)
+    result["schema_apply"] = measure(apply, backend)
+    return result
+
+def bench_mirror (control_count = 500, attribut_count = 40, backend = None) -> dict :
+    """
+    Time copying a layout of attribut_count attributs on control_count empty controls,
+    mirroring it on the other side, then copying it again when targets are already up to date
+
+    Returns :
+        {"copy_layout" / "mirror_layouts" / "copy_again" : measure, "diff_sizes" : [min, max] of first copy,
+        "negated" : True if mirrored limits are swapped and negated}
+    """
+    from nb_attribut_control import mirror
+
+    backend = backend or MemoryBackend()
+    source = build_control(backend, "L_source_ctrl", attribut_count)
+    # customAttr0 is a double between 0 and 1
+    backend.setAttr("{}.customAttr0".format(source), 0.25)
+    left = [backend.createNode("transform", name = "L_ctrl{}".format(index)) for index in range(control_count)]
+    for index in range(control_count) :
+        backend.createNode("transform", name = "R_ctrl{}".format(index))
+    result = {}
+
+    def copy (counter) :
+        result["copy"] = mirror.copy_layout(source, left, backend = counter)
+    def mirror_all (counter) :
+        result["mirror"] = mirror.mirror_layouts(left, backend = counter, negate = ["customAttr0"])
+    def copy_again (counter) :
+        result["again"] = mirror.copy_layout(source, left, backend = counter)
+
+    result["copy_layout"] = measure(copy, backend)
+    result["mirror_layouts"] = measure(mirror_all, backend)
+    result["copy_again"] = measure(copy_again, backend)
+    sizes = [len(diff) for diff in result.pop("copy")["diffs"].values()]
+    result["diff_sizes"] = [min(sizes), max(sizes)] if sizes else [0, 0]
+    result["mirror_skipped"] = len(result.pop("mirror")["skipped"])
+    result["again_commands"] = result.pop("again")["commands"]
+
+    mirrored = mattr.MayaObject("R_ctrl0", backend = backend).get_attribut_object("customAttr0")
+    result["negated"] = (mirrored.value, mirrored.min_value, mirrored.max_value) == (-0.25, -1.0, 0.0)
+    return result
+
+class DictAttribut () :
+    """Attribut layout before __slots__, used as memory reference"""
+
+    def __init__ (self, maya_obj, attr_snapshot) -> None :
+        self.cmds = None
+        self.maya_obj = maya_obj
+        for field in snap.snapshot_fields :
+            setattr(self, field, attr_snapshot[field])
+        self.incom_connections = list(self.incom_connections)
+        self.outcom_connections = list(self.outcom_connections)
+        self.dirty_fields = {}
+        self.committed_name = self.long_name
+
+def synthetic_snapshots (backend, attribut_count, attributs_per_node = 50) -> list :
+    """[(node, attribut snapshot)] of attribut_count attributs, values change from one attribut to the next"""
+    node = build_control(backend, "synthetic_ctrl", len(synthetic_attributs))
+    templates = list(snap.load_node_snapshot(node, backend = backend).values())
+    snapshots = []
+    for index in range(attribut_count) :
+        data = dict(templates[index % len(templates)])
+        data["long_name"] = "customAttr{}".format(index % attributs_per_node)
+        data["value"] = data["value"] + index * 0.5 if data["attribute_type"] != "bool" else data["value"]
+        snapshots.append(("ctrl{}".format(index // attributs_per_node), data))
+    return snapshots
+
+def bench_memory (attribut_count = 100000, attributs_per_node = 50) -> dict :
+    """
+    Compare memory used by attribut_count attributs stored as :
+    dict based objects wrapped in {"class", "index"} dicts, slotted Attribut, and AttributTable views
+
+    Returns :
+        {layout : bytes}
+    """
+    from nb_attribut_control.attribut_table import AttributTable
+
+    backend = MemoryBackend()
+    snapshots = synthetic_snapshots(backend, attribut_count, attributs_per_node)
+
+    def dict_layout () :
+        return [
+            {"class" : DictAttribut(maya_obj, data), "index" : index}
+            for index, (maya_obj, data) in enumerate(snapshots)
+            ]
+    def slots_layout () :
+        return [
+            mattr.Attribut(maya_obj, long_name = data["long_name"], snapshot = data, backend = backend)
+            for maya_obj, data in snapshots
+            ]
+    def table_layout () :
+        table = AttributTable()
+        return table, [table.view(table.append(maya_obj, data), backend) for maya_obj, data in snapshots]
+
+    result = {}
+    for name, func in (("dict", dict_layout), ("slots", slots_layout), ("table", table_layout)) :
+        tracemalloc.start()
+        kept = func()
+        result[name] = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del kept
+
+    print ("{} attributs".format(attribut_count))
+    for name, size in result.items() :
+        print ("{:<8}{:>12.1f} MB{:>10.0f} bytes/attribut".format(name, size / 1e6, size / attribut_count))
+    return result
+
+def bench_ranges (attribut_count = 100000) -> dict :
+    """
+    Time range checks of attribut_count attributs, slotted Attribut and AttributTable views,
+    with numpy and without. Values grow with attribut index, so many are out of limits
+
+    Returns :
+        {"attribut_numpy" / "attribut_lists" / "table_numpy" : seconds, "errors" : {check : count},
+        "same_errors" : True if every mode found the same errors}
+    """
+    from nb_attribut_control.attribut_table import AttributTable
+
+    backend = MemoryBackend()
+    snapshots = synthetic_snapshots(backend, attribut_count)
+    attributs = [
+        mattr.Attribut(maya_obj, long_name = data["long_name"], snapshot = data, backend = backend)
+        for maya_obj, data in snapshots
+        ]
+    table = AttributTable()
+    views = [table.view(table.append(maya_obj, data), backend) for maya_obj, data in snapshots]
+
+    numpy_module = range_check.numpy
+    modes = [("attribut_lists", attributs, None)]
+    if numpy_module is not None :
+        modes += [("attribut_numpy", attributs, numpy_module), ("table_numpy", views, numpy_module)]
+    result = {}
+    reports = []
+    try :
+        for name, checked, module in modes :
+            range_check.numpy = module
+            start = time.perf_counter()
+            reports.append(range_check.check_ranges(checked))
+            result[name] = time.perf_counter() - start
+    finally :
+        range_check.numpy = numpy_module
+    result["errors"] = reports[0].summary()
+    result["same_errors"] = all(report.errors == reports[0].errors for report in reports)
+
+    print ("{} attributs, errors {}".format(attribut_count, result["errors"]))
+    for name, checked, module in modes :
+        print ("{:<16}{:>10.4f} s".format(name, result[name]))
+    return result
+
+def bench_sampling (attribut_count = 100, frame_count = 2000, backend = None) -> dict :
+    """
+    Time sampling attribut_count keyed attributs over frame_count frames, sampling again from
+    cache, and writing samples as keys on another control then sampling them back
+
+    Returns :
+        {"sample" / "sample_cached" / "write_keys" : measure, "per_frame_calls" : getAttr calls
+        needed frame by frame, "round_trip" : True if written keys give sampled values back}
+    """
+    backend = backend or MemoryBackend()
+    source = build_control(backend, "sampled_ctrl", attribut_count)
+    target = build_control(backend, "keyed_ctrl", attribut_count)
+    for index in range(attribut_count) :
+        if synthetic_attributs[index % len(synthetic_attributs)]["attributeType"] == "enum" :
+            continue
+        plug = "{}.customAttr{}".format(source, index)
+        for frame, value in ((1, 0), (frame_count // 2, index % 7), (frame_count, 1)) :
+            backend.setKeyframe(plug, time = frame, value = value)
+    objects = {}
+    result = {}
+
+    def sample (counter) :
+        objects["source"] = mattr.MayaObject(source, backend = counter, lazy = True)
+        counter.reset()
+        result["samples"] = objects["source"].sample_attributs(1, frame_count)
+    def sample_cached (counter) :
+        objects["source"].sample_attributs(1, frame_count)
+    def write_keys (counter) :
+        objects["target"] = mattr.MayaObject(target, backend = counter, lazy = True)
+        counter.reset()
+        objects["target"].write_keys(result["samples"])
+
+    result["sample"] = measure(sample, backend)
+    result["sample_cached"] = measure(sample_cached, backend)
+    result["write_keys"] = measure(write_keys, backend)
+    samples = result.pop("samples")
+    result["per_frame_calls"] = len(samples.names) * frame_count
+    written = mattr.MayaObject(target, backend = backend, lazy = True).sample_attributs(1, frame_count)
+    result["round_trip"] = written.columns() == samples.columns()
+    return result
+
+def bench_snapshot_cache (control_count = 200, attribut_count = 100, path = None, backend = None) -> dict :
+    """
+    Time loading controls with an empty snapshot cache, again from the cache file in a new
+    cache object (tool opened again), then after one control changed
+
+    Returns :
+        {"cold" / "warm" / "one_changed" : measure, "same_snapshots" : True if cached snapshots
+        match maya ones, "definition_edit_seen" : True if a nice name edited outside of the cache
+        is read again, "stats" : cache report after last load}
+    """
+    from nb_attribut_control import snapshot_cache
+
+    backend = backend or MemoryBackend()
+    backend.scene_name = "bench_rig.ma"
+    nodes = build_scene(backend, control_count, attribut_count)
+    path = path or os.path.join(tempfile.gettempdir(), "nb_bench_snapshot_cache.bin")
+    if os.path.exists(path) :
+        os.remove(path)
+    result = {}
+    snapshots = {}
+
+    def load (name) :
+        def run (counter) :
+            cache = snapshot_cache.SnapshotCache(path)
+            snapshots[name] = snapshot_cache.load_snapshots(nodes, cache, counter)
+            result["stats"] = cache.report()
+            cache.close()
+        return run
+
+    result["cold"] = measure(load("cold"), backend)
+    result["warm"] = measure(load("warm"), backend)
+    backend.addAttr(nodes[0], longName = "addedAttr", attributeType = "double")
+    result["one_changed"] = measure(load("one_changed"), backend)
+    result["same_snapshots"] = snapshots["cold"] == snapshots["warm"] and \
+        list(snapshots["one_changed"][nodes[0]])[-1] == "addedAttr"
+    backend.addAttr(nodes[1] + ".customAttr0", edit = True, niceName = "Edited Nice Name")
+    load("definition_edit")(backend)
+    result["definition_edit_seen"] = \
+        snapshots["definition_edit"][nodes[1]]["customAttr0"]["nice_name"] == "Edited Nice Name"
+    os.remove(path)
+    return result
+
+def bench_startup (
+    modules = ("nb_attribut_control.launcher", "nb_attribut_control.ui"), object_name = None,
+    ) -> dict :
+    """
+    Time module imports in a new python process, then first and second window opens in this
+    session. An open window is closed first. Run from mayapy or python, not from maya gui
+
+    Keywords:
+        modules -- modules to import
+        object_name -- maya object shown, an in memory control outside of maya
+
+    Returns :
+        {"import" : {module : seconds, None if import failed}, "first_open" : seconds, "second_open" : seconds},
+        opens are None without PySide2
+    """
+    result = {"import" : {}, "first_open" : None, "second_open" : None}
+    env = dict(os.environ, PYTHONPATH = os.pathsep.join(path for path in sys.path if path))
+    code = "import time; start = time.perf_counter(); import {}; print(time.perf_counter() - start)"
+    for module in modules :
+        process = subprocess.run(
+            [sys.executable, "-c", code.format(module)], stdout = subprocess.PIPE, stderr = subprocess.PIPE,
+            universal_newlines = True, env = env,
+            )
+        result["import"][module] = float(process.stdout.strip()) if process.returncode == 0 else None
+    for module, seconds in result["import"].items() :
+        print ("import {:<36}{}".format(module, "failed" if seconds is None else "{:.4f} s".format(seconds)))
+
+    try :
+        from PySide2 import QtWidgets
+    except ImportError :
+        return result
+    from nb_attribut_control import launcher
+    from nb_attribut_control.backend import set_backend
+
+    application = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    parent = None
+    try :
+        import maya.OpenMayaUI
+    except ImportError :
+        # No maya main window, no maya scene
+        parent = QtWidgets.QWidget()
+        backend = set_backend(MemoryBackend())
+        object_name = object_name or build_control(backend, "startup_ctrl", 100)
+
+    launcher.close()
+    for name in ("first_open", "second_open") :
+        start = time.perf_counter()
+        launcher.show(object_name, parent)
+        application.processEvents()
+        result[name] = time.perf_counter() - start
+    launcher.close()
+    print ("first open {:.4f} s, second open {:.4f} s".format(result["first_open"], result["second_open"]))
+    return result
+
+def bench_scaling (
+    attribut_counts = (10, 100, 1000, 10000), control_counts = (1, 10, 100, 1000, 5000),
+    ) -> dict :
+    """
+    Run object and scene benchmarks on an in memory scene
+
+    Returns :
+        {"object" : {attribut count : {operation : measure}}, "scene" : {control count : {...}}}
+    """
+    results = {"object" : {}, "scene" : {}}
+    for count in attribut_counts :
+        results["object"][str(count)] = bench_object(count)
+    for count in control_counts :
+        results["scene"][str(count)] = bench_scene(count)
+        results["scene"][str(count)].update(bench_object_set(count))
+        results["scene"][str(count)].update(bench_scanner(count))
+    return results
+
+def flatten_results (results, prefix = "") -> dict :
+    """{"object" : {"10" : {"init" : {...}}}} -> {"object/10/init" : {...}}"""
+    flat = {}
+    for key, value in results.items() :
+        path = "{}/{}".format(prefix, key) if prefix else key
+        if isinstance(value, dict) and "seconds" not in value :
+            flat.update(flatten_results(value, path))
+        else :
+            flat[path] = value
+    return flat
+
+def compare_results (results, baseline, tolerance = 0.25) -> list :
+    """
+    Compare results with a baseline
+
+    Keywords:
+        results -- bench_scaling results
+        baseline -- bench_scaling results stored before
+        tolerance -- allowed ratio over baseline for seconds and peak memory, backend calls must not grow
+
+    Returns :
+        list of (measure path, field, baseline value, new value) regressions
+    """
+    regressions = []
+    baseline = flatten_results(baseline)
+    for path, measures in flatten_results(results).items() :
+        if path not in baseline :
+            continue
+        for field, allowed in (("seconds", 1 + tolerance), ("peak_bytes", 1 + tolerance), ("calls", 1)) :
+            old_value, new_value = baseline[path].get(field), measures.get(field)
+            if old_value is None or new_value is None :
+                continue
+            if new_value > old_value * allowed :
+                regressions.append((path, field, old_value, new_value))
+    return regressions
+
+def print_results (results) -> None :
+    print ("{:<40}{:>12}{:>12}{:>14}".format("measure", "seconds", "calls", "peak (KB)"))
+    for path, measures in flatten_results(results).items() :
+        print ("{:<40}{:>12.4f}{:>12}{:>14.1f}".format(
+            path, measures["seconds"], measures["calls"], measures["peak_bytes"] / 1024.0
+            ))
+
+def main (argv = None) -> int :
+    """Command line : python -m nb_attribut_control.benchmark --output results.json --baseline baseline.json"""
+    parser = argparse.ArgumentParser(description = "Attribut manager scaling benchmarks")
+    parser.add_argument("--attributs", type = int, nargs = "+", default = [10, 100, 1000, 10000])
+    parser.add_argument("--controls", type = int, nargs = "+", default = [1, 10, 100, 1000, 5000])
+    parser.add_argument("--output", help = "write results to this json file")
+    parser.add_argument("--baseline", help = "compare results with this json file")
+    parser.add_argument("--tolerance", type = float, default = 0.25)
+    args = parser.parse_args(argv)
+
+    results = bench_scaling(args.attributs, args.controls)
+    print_results(results)
+
+    if args.output :
+        with open(args.output, "w") as output_file :
+            json.dump(results, output_file, indent = 2)
+
+    if args.baseline :
+        with open(args.baseline) as baseline_file :
+            regressions = compare_results(results, json.load(baseline_file), args.tolerance)
+        for path, field, old_value, new_value in regressions :
+            print ("Regression {} {} : {} -> {}".format(path, field, old_value, new_value))
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__" :
+    sys.exit(main())
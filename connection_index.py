@@ -0,0 +1,129 @@
+"""
+Connections of many nodes, read with one listConnections query per direction.
+Used by commits to put back the connections of attributs that are created again.
+@autor : Nathan Boyaval
+@Version : 0.0.4
+@Update : 2025/02/19
+"""
+
+import re
+
+from nb_attribut_control.backend import get_backend
+from nb_attribut_control.instrument import operation
+
+
+def pairs_from (connections) -> list :
+    """Flat listConnections(connections = True, plugs = True) result to (node plug, other plug) pairs"""
+    connections = connections or []
+    return list(zip(connections[::2], connections[1::2]))
+
+
+class ConnectionIndex () :
+    """
+    {(node, attribut) : connections} of a node set.
+
+    Connections are stored as (source plug, destination plug) pairs, keyed by both
+    of their plugs that belong to indexed nodes.
+    """
+
+    def __init__ (self, nodes = (), backend = None) -> None :
+        self.cmds = backend or get_backend()
+        self.nodes: set = set()
+        # {"node.attr" : [(source plug, destination plug)]}
+        self.by_plug: dict = {}
+        self.query_count: int = 0
+        if nodes :
+            self.build(nodes)
+
+    @operation("connection_index_build")
+    def build (self, nodes) -> "ConnectionIndex" :
+        """Index connections of nodes, two queries for all nodes"""
+        nodes = [node for node in dict.fromkeys(nodes) if node not in self.nodes]
+        if not nodes :
+            return self
+        self.nodes.update(nodes)
+        # Node plug is the source, other plug the destination
+        outgoing = self.cmds.listConnections(
+            nodes, connections = True, plugs = True, source = False, destination = True,
+            )
+        incoming = self.cmds.listConnections(
+            nodes, connections = True, plugs = True, source = True, destination = False,
+            )
+        self.query_count += 2
+        for node_plug, other_plug in pairs_from(outgoing) :
+            self.add((node_plug, other_plug))
+        for node_plug, other_plug in pairs_from(incoming) :
+            self.add((other_plug, node_plug))
+        return self
+
+    def add (self, connection) -> None :
+        for plug in connection :
+            if plug.split(".", 1)[0] in self.nodes :
+                connections = self.by_plug.setdefault(plug, [])
+                # A connection between two plugs of one node is listed twice
+                if connection not in connections :
+                    connections.append(connection)
+
+    def connections (self, node, attribut) -> list :
+        """(source plug, destination plug) pairs of an attribut"""
+        return list(self.by_plug.get("{}.{}".format(node, attribut), ()))
+
+    def incoming (self, node, attribut) -> list :
+        plug = "{}.{}".format(node, attribut)
+        return [source for source, destination in self.by_plug.get(plug, ()) if destination == plug]
+
+    def outgoing (self, node, attribut) -> list :
+        plug = "{}.{}".format(node, attribut)
+        return [destination for source, destination in self.by_plug.get(plug, ()) if source == plug]
+
+
+def rename_plug (plug, renames) -> str :
+    """Rename attribut of a plug with {old plug : new plug}, children and indices of the plug are kept"""
+    node, _, attr = plug.partition(".")
+    base = re.split(r"[.\[]", attr, 1)[0]
+    new_plug = renames.get("{}.{}".format(node, base))
+    if new_plug is None :
+        return plug
+    return new_plug + attr[len(base):]
+
+@operation("reconnect")
+def reconnect (saved, backend = None) -> dict :
+    """
+    Connect saved connections again, plugs of recreated attributs renamed
+
+    Keywords:
+        saved -- [(old plug, new plug, locked, connections)], connections as (source, destination) pairs.
+            locked new plugs are unlocked while connecting and locked again
+        backend -- maya commands backend, current backend if None
+
+    Returns :
+        {"reconnected" : [(source, destination)], "failed" : [(source, destination, error)], "commands" : int}
+    """
+    cmds = backend or get_backend()
+    report = {"reconnected" : [], "failed" : [], "commands" : 0}
+    # Connections between two recreated attributs need both plugs renamed
+    renames = {old_plug : new_plug for old_plug, new_plug, locked, connections in saved}
+    locked_plugs = [new_plug for old_plug, new_plug, locked, connections in saved if locked]
+    for plug in locked_plugs :
+        cmds.setAttr(plug, lock = False)
+    report["commands"] += len(locked_plugs)
+
+    done = set()
+    for old_plug, new_plug, locked, connections in saved :
+        for source, destination in connections :
+            connection = (rename_plug(source, renames), rename_plug(destination, renames))
+            if connection in done :
+                continue
+            done.add(connection)
+            report["commands"] += 1
+            try :
+                cmds.connectAttr(connection[0], connection[1], force = True)
+            except RuntimeError as error :
+                report["failed"].append(connection + (str(error),))
+                continue
+            report["reconnected"].append(connection)
+
+    for plug in locked_plugs :
+        cmds.setAttr(plug, lock = True)
+    report["commands"] += len(locked_plugs)
+    return report
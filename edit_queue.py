@@ -0,0 +1,156 @@
+"""
+Edit queue between editor widgets and MayaObject.
+Repeated edits of the same field are merged, and the merged batch is committed in one
+undo chunk once edits pause.
+@autor : Nathan Boyaval
+@Version : 0.0.4
+@Update : 2025/02/19
+"""
+
+from nb_attribut_control.instrument import operation
+from nb_attribut_control.transaction import CommitError
+
+
+def run_deferred (callback) -> None :
+    """Run callback when maya is idle, right away outside of maya"""
+    try :
+        import maya.utils
+    except ImportError :
+        callback()
+        return
+    maya.utils.executeDeferred(callback)
+
+
+class EditQueue () :
+    """
+    Merge Attribut edits and commit them together.
+
+        queue = EditQueue(maya_object, timer = qt_timer)
+        queue.push("ikFkSwitch", "set_maximum_value", 2.0)   # every spin box tick
+        queue.push("ikFkSwitch", "set_maximum_value", 3.0)   # replaces previous one
+
+    Edits are keyed by Attribut object and method, so an attribut renamed by a queued
+    edit still gets its other edits. Only the last value of each field is applied.
+    """
+
+    def __init__ (self, maya_object, timer = None, scheduler = run_deferred) -> None :
+        """
+        Keywords:
+            maya_object -- MayaObject to edit
+            timer -- single shot timer restarted on each push (QTimer or anything with start / stop),
+                its timeout must call flush_deferred. None to flush by hand
+            scheduler -- runs flush outside of widget callbacks, maya idle queue by default
+        """
+        self.maya_object = maya_object
+        self.timer = timer
+        self.scheduler = scheduler
+        # {(Attribut, method) : args}, in first push order
+        self.edits: dict = {}
+        self.flush_scheduled: bool = False
+        # Class order changed, flush reorders maya attributs
+        self.order_changed: bool = False
+        # Called with list of edited attribut names after each flush
+        self.flush_callbacks: list = []
+        # Called with CommitError and list of edited attribut names when a flush commit fails.
+        # Flush raises the error when there is no error callback
+        self.error_callbacks: list = []
+        self.pushed_count: int = 0
+        self.merged_count: int = 0
+        self.flush_count: int = 0
+
+    def __len__ (self) -> int :
+        return len(self.edits)
+
+    def push (self, attribut, method, *args) -> None :
+        """
+        Queue an edit, replacing a queued edit of the same attribut field
+
+        Keywords:
+            attribut -- attribut name
+            method -- MayaObject edit method (edit_long_name, set_lock, set_maximum_value, ...)
+            args -- method arguments, attribut name excluded
+        """
+        attr_class = self.maya_object.get_attribut_object(attribut)
+        if attr_class is None :
+            return
+        key = (attr_class, method)
+        self.pushed_count += 1
+        if key in self.edits :
+            self.merged_count += 1
+        self.edits[key] = args
+        if self.timer is not None :
+            self.timer.start()
+
+    def push_order (self) -> None :
+        """Queue a maya order update, MayaObject class order was changed (Up / Down)"""
+        self.order_changed = True
+        self.pushed_count += 1
+        if self.timer is not None :
+            self.timer.start()
+
+    def clear (self) -> None :
+        """Drop queued edits"""
+        self.edits = {}
+        self.order_changed = False
+        if self.timer is not None :
+            self.timer.stop()
+
+    def flush_deferred (self) -> None :
+        """Ask scheduler to flush, only once until flush ran"""
+        if self.flush_scheduled or not (self.edits or self.order_changed) :
+            return
+        self.flush_scheduled = True
+        self.scheduler(self.flush)
+
+    @operation("edit_queue_flush")
+    def flush (self) -> int :
+        """
+        Apply queued edits and commit them in one undo chunk
+
+        Returns :
+            count of maya commands called, 0 if commit failed and error callbacks were called
+        """
+        self.flush_scheduled = False
+        if self.timer is not None :
+            self.timer.stop()
+        edits, order_changed = self.edits, self.order_changed
+        self.edits, self.order_changed = {}, False
+        if not (edits or order_changed) :
+            return 0
+
+        edited = {}
+        for (attr_class, method), args in edits.items() :
+            # Attribut may have been deleted since edit was queued
+            name = attr_class.long_name
+            if self.maya_object.get_attribut_object(name) is not attr_class :
+                continue
+            getattr(self.maya_object, method)(name, *args)
+            edited[attr_class] = None
+
+        self.flush_count += 1
+        names = [attr_class.long_name for attr_class in edited]
+        try :
+            if order_changed :
+                command_count = self.maya_object.reorder_attributs()
+            else :
+                command_count = self.maya_object.commit_attributs()
+        except CommitError as error :
+            # Flush often runs from maya idle queue, nobody would see the error
+            # Edits stay dirty on the object, maya order is updated with the next flush
+            self.order_changed = self.order_changed or order_changed
+            if not self.error_callbacks :
+                raise
+            for callback in self.error_callbacks :
+                callback(error, names)
+            return 0
+        for callback in self.flush_callbacks :
+            callback(names)
+        return command_count
+
+    def stats (self) -> dict :
+        return {
+            "pushed" : self.pushed_count,
+            "merged" : self.merged_count,
+            "flushes" : self.flush_count,
+            "pending" : len(self.edits) + self.order_changed,
+            }
@@ -0,0 +1,293 @@
+"""
+Opt-in instrumentation of maya commands and attribut operations.
+
+    from nb_attribut_control import instrument
+    with instrument.profile() as recorder :
+        manage_attr.MayaObject("ctrl_1")
+    print (recorder.report_text())
+
+Or set NB_ATTR_PROFILE=<report.json> (and NB_ATTR_TRACE=<trace.json> for a chrome
+trace file) before maya starts, reports are written when maya exits.
+NB_ATTR_PROFILE=1 prints the report instead of writing it.
+@autor : Nathan Boyaval
+@Version : 0.0.4
+@Update : 2025/02/19
+"""
+
+import atexit
+import collections
+import functools
+import json
+import os
+import threading
+import time
+
+from nb_attribut_control import backend as mbackend
+
+# Recorder in use, None when instrumentation is off
+active_recorder: list = [None]
+
+
+class LatencyStats () :
+    """Call count, total time and power of 2 microseconds histogram"""
+
+    __slots__ = ("count", "total", "minimum", "maximum", "histogram")
+
+    def __init__ (self) -> None :
+        self.count = 0
+        self.total = 0.0
+        self.minimum = None
+        self.maximum = 0.0
+        # {bucket : count}, bucket n holds durations under 2**n microseconds
+        self.histogram = collections.Counter()
+
+    def add (self, seconds) -> None :
+        self.count += 1
+        self.total += seconds
+        if self.minimum is None or seconds < self.minimum :
+            self.minimum = seconds
+        if seconds > self.maximum :
+            self.maximum = seconds
+        self.histogram[int(seconds * 1e6).bit_length()] += 1
+
+    def percentile (self, ratio) -> float :
+        """Approximate percentile in seconds, upper bound of histogram bucket"""
+        target = self.count * ratio
+        seen = 0
+        for bucket in sorted(self.histogram) :
+            seen += self.histogram[bucket]
+            if seen >= target :
+                return min((2 ** bucket) / 1e6, self.maximum)
+        return self.maximum
+
+    def as_dict (self) -> dict :
+        return {
+            "count" : self.count,
+            "total" : self.total,
+            "mean" : self.total / self.count if self.count else 0.0,
+            "min" : self.minimum or 0.0,
+            "max" : self.maximum,
+            "p50" : self.percentile(0.5),
+            "p95" : self.percentile(0.95),
+            "histogram_us" : {str(2 ** bucket) : count for bucket, count in sorted(self.histogram.items())},
+            }
+
+
+class Recorder () :
+    """Collect command and operation statistics, and trace events if asked"""
+
+    def __init__ (self, trace = False) -> None :
+        self.commands: dict = collections.defaultdict(LatencyStats)
+        self.operations: dict = collections.defaultdict(LatencyStats)
+        # {operation : {command : count}}
+        self.commands_by_operation: dict = collections.defaultdict(collections.Counter)
+        self.trace: bool = trace
+        self.trace_events: list = []
+        self.stack = threading.local()
+        self.start_time: float = time.perf_counter()
+
+    def current_operation (self) -> str :
+        stack = getattr(self.stack, "names", None)
+        return stack[-1] if stack else None
+
+    def add_trace_event (self, name, category, start, seconds) -> None :
+        self.trace_events.append({
+            "name" : name,
+            "cat" : category,
+            "ph" : "X",
+            "ts" : (start - self.start_time) * 1e6,
+            "dur" : seconds * 1e6,
+            "pid" : os.getpid(),
+            "tid" : threading.get_ident(),
+            })
+
+    def record_command (self, command, start, seconds) -> None :
+        self.commands[command].add(seconds)
+        self.commands_by_operation[self.current_operation()][command] += 1
+        if self.trace :
+            self.add_trace_event(command, "command", start, seconds)
+
+    def run_operation (self, name, func, args, kwargs) :
+        """Call func inside a named operation"""
+        if not hasattr(self.stack, "names") :
+            self.stack.names = []
+        self.stack.names.append(name)
+        start = time.perf_counter()
+        try :
+            return func(*args, **kwargs)
+        finally :
+            seconds = time.perf_counter() - start
+            self.stack.names.pop()
+            self.operations[name].add(seconds)
+            if self.trace :
+                self.add_trace_event(name, "operation", start, seconds)
+
+    def wrap (self, backend) -> "InstrumentedBackend" :
+        """Return backend with every command recorded"""
+        return InstrumentedBackend(backend, self)
+
+    #######################################################################################################################
+    #                Reports
+    #######################################################################################################################
+    def report (self) -> dict :
+        """Report as a json serializable dict"""
+        return {
+            "commands" : {name : stats.as_dict() for name, stats in self.commands.items()},
+            "operations" : {name : stats.as_dict() for name, stats in self.operations.items()},
+            "commands_by_operation" : {
+                str(operation) : dict(counts) for operation, counts in self.commands_by_operation.items()
+                },
+            }
+
+    def report_text (self) -> str :
+        """Report as text tables, slowest first"""
+        lines = []
+        for title, stats_dic in (("Operation", self.operations), ("Command", self.commands)) :
+            lines.append("{:<32}{:>10}{:>12}{:>12}{:>12}{:>12}".format(
+                title, "calls", "total (ms)", "mean (us)", "p95 (us)", "max (us)"
+                ))
+            for name, stats in sorted(stats_dic.items(), key = lambda item : -item[1].total) :
+                lines.append("{:<32}{:>10}{:>12.3f}{:>12.1f}{:>12.1f}{:>12.1f}".format(
+                    name, stats.count, stats.total * 1e3, stats.total / stats.count * 1e6,
+                    stats.percentile(0.95) * 1e6, stats.maximum * 1e6,
+                    ))
+            lines.append("")
+        return "\n".join(lines)
+
+    def write_report (self, path) -> None :
+        with open(path, "w") as report_file :
+            json.dump(self.report(), report_file, indent = 2)
+
+    def write_trace (self, path) -> None :
+        """Write a chrome://tracing (trace event format) file"""
+        with open(path, "w") as trace_file :
+            json.dump({"traceEvents" : self.trace_events, "displayTimeUnit" : "ms"}, trace_file)
+
+
+class InstrumentedBackend () :
+    """
+    Wrap a maya commands backend, time every command in a recorder.
+    Commands are only recorded while the recorder is active, objects keeping this
+    backend after disable call the wrapped backend directly
+    """
+
+    def __init__ (self, backend, recorder) -> None :
+        self.backend = backend
+        self.recorder = recorder
+        self.name = backend.name
+
+    def __getattr__ (self, command) :
+        func = getattr(self.backend, command)
+        recorder = self.recorder
+
+        def wrapper (*args, **kwargs) :
+            if active_recorder[0] is not recorder :
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try :
+                return func(*args, **kwargs)
+            finally :
+                recorder.record_command(command, start, time.perf_counter() - start)
+        # Keep wrapper on instance, next calls skip __getattr__
+        setattr(self, command, wrapper)
+        return wrapper
+
+
+def operation (name) :
+    """Decorator naming a high level operation, only a recorder check when instrumentation is off"""
+    def decorator (func) :
+        @functools.wraps(func)
+        def wrapper (*args, **kwargs) :
+            recorder = active_recorder[0]
+            if recorder is None :
+                return func(*args, **kwargs)
+            return recorder.run_operation(name, func, args, kwargs)
+        return wrapper
+    return decorator
+
+
+#######################################################################################################################
+#                Enable / disable
+#######################################################################################################################
+
+def enable (trace = False) -> Recorder :
+    """Start recording, current backend is replaced by an instrumented one"""
+    if active_recorder[0] is not None :
+        return active_recorder[0]
+    recorder = Recorder(trace = trace)
+    recorder.original_backend = mbackend.get_backend()
+    mbackend.set_backend(recorder.wrap(recorder.original_backend))
+    active_recorder[0] = recorder
+    return recorder
+
+def disable () -> Recorder :
+    """Stop recording and restore current backend, return recorder"""
+    recorder = active_recorder[0]
+    if recorder is None :
+        return None
+    if recorder.wrap in mbackend.backend_wrappers :
+        mbackend.backend_wrappers.remove(recorder.wrap)
+    mbackend.set_backend(recorder.original_backend)
+    active_recorder[0] = None
+    return recorder
+
+
+class profile () :
+    """
+    Context manager recording commands and operations
+
+    Keywords:
+        trace_path -- write a chrome trace file on exit
+        report_path -- write json report on exit
+    """
+
+    def __init__ (self, trace_path = None, report_path = None) -> None :
+        self.trace_path = trace_path
+        self.report_path = report_path
+
+    def __enter__ (self) -> Recorder :
+        self.recorder = enable(trace = bool(self.trace_path))
+        return self.recorder
+
+    def __exit__ (self, *args) -> None :
+        disable()
+        if self.report_path :
+            self.recorder.write_report(self.report_path)
+        if self.trace_path :
+            self.recorder.write_trace(self.trace_path)
+
+
+def enable_from_environment () -> Recorder or None :
+    """
+    Enable instrumentation if NB_ATTR_PROFILE or NB_ATTR_TRACE is set, write files at exit
+
+    Environment :
+        NB_ATTR_PROFILE -- json report path, or 1 to print the report instead of writing it.
+            The report is also printed when only NB_ATTR_TRACE is set
+        NB_ATTR_TRACE -- chrome trace file path
+    """
+    report_path = os.environ.get("NB_ATTR_PROFILE")
+    trace_path = os.environ.get("NB_ATTR_TRACE")
+    if not report_path and not trace_path :
+        return None
+
+    recorder = Recorder(trace = bool(trace_path))
+    recorder.original_backend = mbackend.current_backend[0]
+    if recorder.original_backend is None :
+        # Backend is created when first needed, maya may not be initialized yet
+        mbackend.backend_wrappers.append(recorder.wrap)
+    else :
+        mbackend.set_backend(recorder.wrap(recorder.original_backend))
+    active_recorder[0] = recorder
+
+    def write_files () :
+        if report_path and report_path != "1" :
+            recorder.write_report(report_path)
+        else :
+            print (recorder.report_text())
+        if trace_path :
+            recorder.write_trace(trace_path)
+    atexit.register(write_files)
+    return recorder
+
+enable_from_environment()
@@ -0,0 +1,66 @@
+"""
+Light entry point of the attribut manager window, safe to import from userSetup or a shelf.
+Qt, the window module and maya ui are imported on first open, the window is built once
+and only reads attributs again when opened again.
+
+    from nb_attribut_control import launcher
+    launcher.show()
+@autor : Nathan Boyaval
+@Version : 0.0.4
+@Update : 2025/02/19
+"""
+
+import importlib
+
+# Window kept between opens, None until first open
+window_instance: list = [None]
+
+
+def is_valid (window) -> bool :
+    """Return True if window was not deleted by Qt (maya new scene, parent closed)"""
+    if window is None :
+        return False
+    try :
+        import shiboken2
+    except ImportError :
+        return True
+    return shiboken2.isValid(window)
+
+def get_window (parent = None) -> object :
+    """Existing window, built on first call"""
+    window = window_instance[0]
+    if not is_valid(window) :
+        from nb_attribut_control import ui
+        window = window_instance[0] = ui.AttributManagerUI(parent)
+    return window
+
+def show (object_name = None, parent = None) -> object :
+    """
+    Open the window, or bring back the open one and read attributs again
+
+    Keywords:
+        object_name -- maya object to show, selected object if None (see AttributManagerUI.refresh)
+        parent -- parent widget of a new window, maya main window if None
+
+    Returns :
+        AttributManagerUI
+    """
+    window = get_window(parent)
+    window.refresh(object_name)
+    window.show()
+    window.raise_()
+    window.activateWindow()
+    return window
+
+def close () -> None :
+    """Close window and forget it, next show builds a new one"""
+    window = window_instance[0]
+    window_instance[0] = None
+    if is_valid(window) :
+        window.close()
+        window.deleteLater()
+
+def preload () -> None :
+    """Import window modules when maya is idle, first show then only builds widgets"""
+    from nb_attribut_control.edit_queue import run_deferred
+    run_deferred(lambda : importlib.import_module("nb_attribut_control.ui"))
@@ -0,0 +1,279 @@
+"""
+Keep MayaObject in sync with the scene.
+Attribut added / removed / renamed / changed events of edited nodes are merged and
+applied once per idle cycle, only affected Attribut objects are patched.
+@autor : Nathan Boyaval
+@Version : 0.0.4
+@Update : 2025/02/19
+"""
+
+import abc
+import contextlib
+
+from nb_attribut_control import manage_attr as mattr
+from nb_attribut_control import snapshot as snap
+from nb_attribut_control.edit_queue import run_deferred
+from nb_attribut_control.instrument import operation
+
+# Event kinds sent by event sources
+event_kinds: tuple = ("added", "removed", "renamed", "changed")
+
+
+#######################################################################################################################
+#                Event sources
+#######################################################################################################################
+
+class EventSource (abc.ABC) :
+    """
+    Attribut events of nodes.
+
+    Callbacks are called with (kind, node, attribut, old_name, fields) :
+        kind -- one of event_kinds
+        attribut -- attribut name, new name for renamed
+        old_name -- name before rename, None if source does not know it
+        fields -- field groups changed (see snapshot.field_groups), None if unknown
+    """
+
+    @abc.abstractmethod
+    def subscribe (self, node, callback) -> object :
+        """Call callback on node attribut events, return a handle for unsubscribe"""
+
+    @abc.abstractmethod
+    def unsubscribe (self, handle) -> None :
+        """Stop calling a subscribed callback"""
+
+
+class LocalEventSource (EventSource) :
+    """Event source driven by hand, stands in for maya callbacks outside of maya"""
+
+    def __init__ (self) -> None :
+        # {handle : (node, callback)}
+        self.callbacks: dict = {}
+        self.next_handle: int = 0
+
+    def subscribe (self, node, callback) -> int :
+        self.next_handle += 1
+        self.callbacks[self.next_handle] = (node, callback)
+        return self.next_handle
+
+    def unsubscribe (self, handle) -> None :
+        self.callbacks.pop(handle, None)
+
+    def emit (self, kind, node, attribut, old_name = None, fields = None) -> None :
+        """Send an event to node subscribers"""
+        if kind not in event_kinds :
+            raise ValueError ("Unknown event kind {}; Available : {}".format(kind, event_kinds))
+        for callback_node, callback in list(self.callbacks.values()) :
+            if callback_node == node :
+                callback(kind, node, attribut, old_name, fields)
+
+
+class MayaEventSource (EventSource) :
+    """Event source using OpenMaya 2.0 MNodeMessage attribut changed callbacks"""
+
+    def __init__ (self) -> None :
+        import maya.api.OpenMaya as om
+        self.om = om
+        message = om.MNodeMessage
+        # (message bit, kind, changed field groups), first matching bit wins
+        self.messages = (
+            (message.kAttributeAdded, "added", None),
+            (message.kAttributeRemoved, "removed", None),
+            (message.kAttributeRenamed, "renamed", None),
+            (message.kAttributeLocked | message.kAttributeUnlocked, "changed", ("flags",)),
+            (message.kAttributeKeyable | message.kAttributeUnkeyable, "changed", ("flags",)),
+            (message.kAttributeSet, "changed", ("value",)),
+            (message.kConnectionMade | message.kConnectionBroken, "changed", ("connections",)),
+            )
+
+    def subscribe (self, node, callback) -> int :
+        selection = self.om.MSelectionList()
+        selection.add(node)
+
+        def on_attribute_changed (message, plug, other_plug, client_data) :
+            for bit, kind, fields in self.messages :
+                if message & bit :
+                    # Maya does not give the name before rename
+                    callback(kind, node, plug.partialName(useLongNames = True), None, fields)
+                    return
+        return self.om.MNodeMessage.addAttributeChangedCallback(selection.getDependNode(0), on_attribute_changed)
+
+    def unsubscribe (self, handle) -> None :
+        self.om.MMessage.removeCallback(handle)
+
+
+#######################################################################################################################
+#                Sync
+#######################################################################################################################
+
+class LiveSync () :
+    """
+    Patch a MayaObject from attribut events.
+
+    Events are merged until the scheduler runs apply : renames are chained, each
+    touched attribut is compared once with maya. Edited fields are never overwritten.
+    """
+
+    def __init__ (self, maya_object, source = None, scheduler = run_deferred) -> None :
+        """
+        Keywords:
+            maya_object -- MayaObject to keep in sync
+            source -- EventSource, MayaEventSource if None
+            scheduler -- runs apply once per idle cycle, maya idle queue by default
+        """
+        self.maya_object = maya_object
+        self.source = source if source is not None else MayaEventSource()
+        self.scheduler = scheduler
+        self.handle = None
+        self.suspend_depth: int = 0
+        self.apply_scheduled: bool = False
+        # {new name : old name} known renames, chained
+        self.renames: dict = {}
+        # {attribut : changed field groups, None for every group}
+        self.touched: dict = {}
+        # A rename without old name, index is compared with maya attribut list
+        self.unknown_rename: bool = False
+        self.event_count: int = 0
+        self.apply_count: int = 0
+
+    def start (self) -> "LiveSync" :
+        if self.handle is None :
+            self.handle = self.source.subscribe(self.maya_object.object_name, self.on_event)
+        return self
+
+    def stop (self) -> None :
+        if self.handle is not None :
+            self.source.unsubscribe(self.handle)
+            self.handle = None
+
+    @contextlib.contextmanager
+    def suspended (self) :
+        """Ignore events, used while our own commit edits maya"""
+        self.suspend_depth += 1
+        try :
+            yield
+        finally :
+            self.suspend_depth -= 1
+
+    def commit (self) -> int :
+        """Commit MayaObject without syncing back its own edits"""
+        with self.suspended() :
+            return self.maya_object.commit_attributs()
+
+    #######################################################################################################################
+    #                Events
+    #######################################################################################################################
+    def on_event (self, kind, node, attribut, old_name = None, fields = None) -> None :
+        if self.suspend_depth :
+            return
+        self.event_count += 1
+        if kind == "renamed" :
+            if old_name is None :
+                self.unknown_rename = True
+            else :
+                # a -> b then b -> c is a -> c
+                old_name = self.renames.pop(old_name, old_name)
+                if old_name != attribut :
+                    self.renames[attribut] = old_name
+                if old_name in self.touched :
+                    self.touched[attribut] = self.touched.pop(old_name)
+        if kind == "renamed" :
+            fields = ("names",)
+        elif kind != "changed" :
+            fields = None
+        if attribut in self.touched :
+            previous = self.touched[attribut]
+            fields = None if previous is None or fields is None else previous + tuple(fields)
+        self.touched[attribut] = None if fields is None else tuple(fields)
+
+        if not self.apply_scheduled :
+            self.apply_scheduled = True
+            self.scheduler(self.apply)
+
+    @operation("live_sync_apply")
+    def apply (self) -> list :
+        """
+        Patch MayaObject with merged events
+
+        Returns :
+            names of patched attributs
+        """
+        self.apply_scheduled = False
+        renames, touched, unknown_rename = self.renames, self.touched, self.unknown_rename
+        self.renames, self.touched, self.unknown_rename = {}, {}, False
+        if not touched :
+            return []
+        self.apply_count += 1
+
+        maya_object = self.maya_object
+        cmds = maya_object.cmds
+        node = maya_object.object_name
+        patched = []
+
+        # Committed name -> Attribut, index keys differ for attributs renamed and not commited
+        by_committed = {
+            attr_class.committed_name : attr_class for attr_class in maya_object.attributs.values()
+            if attr_class.committed_name is not None
+            }
+        maya_names = cmds.listAttr(node, userDefined = True) or []
+        maya_set = set(maya_names)
+
+        if unknown_rename :
+            # Pair vanished index attributs with new maya ones, in order
+            vanished = [name for name in by_committed if name not in maya_set and name not in renames.values()]
+            appeared = [name for name in maya_names if name not in by_committed and name not in renames]
+            if len(vanished) == len(appeared) :
+                renames.update(zip(appeared, vanished))
+
+        for new_name, old_name in renames.items() :
+            attr_class = by_committed.pop(old_name, None)
+            if attr_class is None or new_name not in maya_set :
+                continue
+            self.rename(attr_class, new_name)
+            by_committed[new_name] = attr_class
+            touched.setdefault(new_name, ("names",))
+
+        for attribut, fields in touched.items() :
+            attr_class = by_committed.get(attribut)
+            if attribut not in maya_set :
+                if attr_class is not None and not attr_class.is_dirty() :
+                    self.remove(attr_class)
+                    patched.append(attribut)
+                continue
+            if attr_class is None :
+                if attribut not in maya_object.attributs :
+                    self.add(attribut)
+                    patched.append(attribut)
+                continue
+            # Changed fields are read again when next used
+            attr_class.invalidate(fields)
+            patched.append(attr_class.long_name)
+        return patched
+
+    def rename (self, attr_class, new_name) -> None :
+        """Attribut renamed in maya, a local rename not commited yet is kept"""
+        if "long_name" not in attr_class.dirty_fields :
+            self.maya_object.attributs.rename(attr_class.long_name, new_name)
+            attr_class.long_name = new_name
+        attr_class.committed_name = new_name
+
+    def remove (self, attr_class) -> None :
+        """Attribut deleted in maya, nothing to delete on commit"""
+        self.maya_object.attributs.remove(attr_class.long_name)
+
+    def add (self, attribut) -> None :
+        """Attribut created in maya, names only, other fields are loaded when read"""
+        maya_object = self.maya_object
+        # Table rows hold every field
+        fields = None if maya_object.table is not None else ("names",)
+        node_snapshot = snap.load_node_snapshot(maya_object.object_name, [attribut], maya_object.cmds, fields)
+        if maya_object.table is not None :
+            attr_class = maya_object.table.view(
+                maya_object.table.append(maya_object.object_name, node_snapshot[attribut]), maya_object.cmds,
+                )
+        else :
+            attr_class = mattr.Attribut(
+                maya_object.object_name, long_name = attribut,
+                snapshot = node_snapshot[attribut], backend = maya_object.cmds,
+                )
+        maya_object.attributs.append(attribut, attr_class)
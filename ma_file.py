@@ -0,0 +1,679 @@
+"""
+Edit custom attributs of maya ascii (.ma) files without maya.
+A .ma file is read as a stream of statements into an in memory scene that MayaObject
+can edit (see backend.MemoryBackend). Written files only change the statements of
+edited attributs, every other byte is copied as is.
+
+    python -m nb_attribut_control.ma_file rigs/ --lock "*Switch" --max "*Switch" 1 --workers 8
+
+@autor : Nathan Boyaval
+@Version : 0.0.4
+@Update : 2025/02/19
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import fnmatch
+import os
+import re
+import shlex
+import sys
+import time
+
+from nb_attribut_control.backend import MemoryAttribut, MemoryBackend, MemoryNode, nice_name_from, numeric_types
+
+# addAttr flags read into the in memory scene, other flags are kept as they are
+managed_add_flags: dict = {
+    "-ln" : "longName", "-longName" : "longName",
+    "-sn" : "shortName", "-shortName" : "shortName",
+    "-nn" : "niceName", "-niceName" : "niceName",
+    "-at" : "attributeType", "-attributeType" : "attributeType",
+    "-min" : "minValue", "-minValue" : "minValue",
+    "-max" : "maxValue", "-maxValue" : "maxValue",
+    "-dv" : "defaultValue", "-defaultValue" : "defaultValue",
+    "-en" : "enumName", "-enumName" : "enumName",
+    "-k" : "keyable", "-keyable" : "keyable",
+    }
+# Attributs with these addAttr flags are left to maya (children, multi, data types)
+foreign_add_flags: set = {
+    "-dt", "-dataType", "-p", "-parent", "-m", "-multi", "-nc", "-numberOfChildren", "-uac", "-usedAsColor",
+    }
+# setAttr flags read into the in memory scene
+managed_set_flags: dict = {
+    "-k" : "keyable", "-keyable" : "keyable",
+    "-l" : "locked", "-lock" : "locked",
+    "-cb" : "channel_box", "-channelBox" : "channel_box",
+    }
+true_words: set = {"true", "on", "yes", "1"}
+false_words: set = {"false", "off", "no", "0"}
+
+plug_pattern = re.compile(rb'^\s*setAttr\b[^"]*"\.([A-Za-z_][A-Za-z0-9_]*)"')
+escape_pattern = re.compile(rb"\\.")
+
+
+def quote (string) -> str :
+    return '"{}"'.format(string.replace("\\", "\\\\").replace('"', '\\"'))
+
+def format_value (value) -> str :
+    if isinstance(value, bool) :
+        return "yes" if value else "no"
+    if isinstance(value, float) and value.is_integer() :
+        return str(int(value))
+    return repr(value)
+
+def parse_word (word) :
+    """Convert a .ma value token to bool, int or float"""
+    lower = word.lower()
+    if lower in true_words - {"1"} :
+        return True
+    if lower in false_words - {"0"} :
+        return False
+    try :
+        return int(word)
+    except ValueError :
+        return float(word)
+
+def split_flags (tokens) -> list :
+    """[-flag, value, -flag, ...] -> [[flag, value or None], ...], positional tokens get None as flag"""
+    flags = []
+    index = 0
+    while index < len(tokens) :
+        token = tokens[index]
+        if re.match(r"^-[A-Za-z]", token) :
+            has_value = index + 1 < len(tokens) and not re.match(r"^-[A-Za-z]", tokens[index + 1])
+            flags.append([token, tokens[index + 1] if has_value else None])
+            index += 2 if has_value else 1
+        else :
+            flags.append([None, token])
+            index += 1
+    return flags
+
+
+#######################################################################################################################
+#                Statements
+#######################################################################################################################
+
+def iter_statements (file_) :
+    """
+    Split a binary .ma stream in statements, without holding more than one statement
+
+    Yields :
+        (start, end, text) -- start of first line, end of last line (newline included), statement bytes
+    """
+    offset = 0
+    start = None
+    parts = []
+    quotes = 0
+    for line in file_ :
+        line_start = offset
+        offset += len(line)
+        if start is None :
+            stripped = line.strip()
+            if not stripped or stripped.startswith(b"//") :
+                continue
+            start = line_start
+        parts.append(line)
+        quotes += (escape_pattern.sub(b"", line) if b"\\" in line else line).count(b'"')
+        if quotes % 2 == 0 and line.rstrip().endswith(b";") :
+            yield start, offset, b"".join(parts)
+            start = None
+            parts = []
+            quotes = 0
+    if parts :
+        yield start, offset, b"".join(parts)
+
+def split_commands (text) -> list :
+    """Split statement text on ; outside of quotes, for lines holding many commands"""
+    commands = []
+    current = []
+    in_quote = False
+    escaped = False
+    for char in text :
+        current.append(char)
+        if escaped :
+            escaped = False
+        elif char == "\\" :
+            escaped = True
+        elif char == '"' :
+            in_quote = not in_quote
+        elif char == ";" and not in_quote :
+            commands.append("".join(current).strip())
+            current = []
+    if "".join(current).strip() :
+        commands.append("".join(current).strip())
+    return commands
+
+def tokenize (command) -> list :
+    """Command text without ; to tokens, quotes removed"""
+    lexer = shlex.shlex(command.rstrip().rstrip(";"), posix = True)
+    lexer.whitespace_split = True
+    lexer.commenters = ""
+    return list(lexer)
+
+
+class MaRecord () :
+    """Statements of one custom attribut in the source file"""
+
+    __slots__ = ("attribut", "add_span", "add_flags", "set_spans", "value_written", "original")
+
+    def __init__ (self, attribut, add_span, add_flags) -> None :
+        self.attribut = attribut
+        self.add_span = add_span
+        self.add_flags = add_flags
+        self.set_spans: list = []
+        # A setAttr statement holds the attribut value
+        self.value_written: bool = False
+        self.original = None
+
+
+class MaBlock () :
+    """Statements of one node in the source file"""
+
+    __slots__ = ("name", "create_end", "last_add_end", "block_end", "records", "foreign")
+
+    def __init__ (self, name, create_end) -> None :
+        self.name = name
+        self.create_end = create_end
+        self.last_add_end = create_end
+        self.block_end = create_end
+        self.records: list = []
+        # Node has statements this module can not rewrite, its attributs are not loaded
+        self.foreign: bool = False
+
+
+def attribut_state (attribut) -> tuple :
+    return tuple(getattr(attribut, slot) for slot in attribut.__slots__)
+
+# Index of value in attribut_state
+value_index: int = MemoryAttribut.__slots__.index("value")
+
+
+#######################################################################################################################
+#                Backend
+#######################################################################################################################
+
+class MaBackend (MemoryBackend) :
+    """
+    In memory scene read from a .ma file, written back with only edited statements changed.
+
+    Nodes created by createNode are loaded, custom attributs with addAttr / setAttr /
+    connectAttr statements this module can rewrite are visible to MayaObject. Other
+    attributs (compound, multi, data types) and every other statement are kept as is.
+    """
+
+    name: str = "ma"
+
+    def __init__ (self, path) -> None :
+        super(MaBackend, self).__init__()
+        self.path = path
+        self.blocks: dict = {}
+        # [(span, connection, original connection)]
+        self.connection_records: list = []
+        self.last_statement_end: int = 0
+        self.statement_count: int = 0
+        # (node, record, position) of an attribut deleted to be created again in place, see recreating_in_place
+        self.in_place: tuple = None
+        self.parse()
+
+    #######################################################################################################################
+    #                Read
+    #######################################################################################################################
+    def parse (self) -> None :
+        block = None
+        with open(self.path, "rb") as file_ :
+            for start, end, text in iter_statements(file_) :
+                self.statement_count += 1
+                self.last_statement_end = end
+                command = text.lstrip()[:12]
+                if command.startswith(b"setAttr") :
+                    # Most statements are built-in attributs setAttr (mesh data...), skip them without tokenizing
+                    match = plug_pattern.match(text)
+                    if block is None or block.foreign or match is None :
+                        if block is not None :
+                            block.block_end = end
+                        continue
+                    if self.get_node(block.name).find(match.group(1).decode()) is None :
+                        block.block_end = end
+                        continue
+
+                if not command.startswith((b"createNode", b"select", b"addAttr", b"setAttr", b"connectAttr")) :
+                    if block is not None :
+                        block.block_end = end
+                    continue
+
+                decoded = text.decode("utf-8", "surrogateescape")
+                commands = split_commands(decoded) if decoded.count(";") > 1 else [decoded]
+                if len(commands) > 1 :
+                    # Many commands on one line, can not be rewritten alone
+                    if block is not None and not commands[0].startswith("createNode") :
+                        self.set_foreign(block)
+                        block.block_end = end
+                        continue
+                tokens = tokenize(commands[0])
+                name = tokens[0]
+
+                if name == "createNode" :
+                    block = self.read_create_node(tokens, end)
+                elif name == "select" :
+                    block = None
+                elif name == "connectAttr" :
+                    self.read_connect_attr(tokens, (start, end))
+                elif block is not None and not block.foreign :
+                    block.block_end = end
+                    if name == "addAttr" :
+                        self.read_add_attr(block, tokens, (start, end))
+                    else :
+                        self.read_set_attr(block, tokens, (start, end))
+
+        for block in self.blocks.values() :
+            for record in block.records :
+                record.original = attribut_state(record.attribut)
+        for record in self.connection_records :
+            record[2] = list(record[1])
+
+    def read_create_node (self, tokens, end) -> MaBlock :
+        flags = split_flags(tokens[1:])
+        node_type = next((value for flag, value in flags if flag is None), "transform")
+        name = next((value for flag, value in flags if flag in ("-n", "-name")), node_type)
+        parent = next((value for flag, value in flags if flag in ("-p", "-parent")), None)
+        if name in self.nodes and parent :
+            name = "{}|{}".format(parent, name)
+        self.nodes[name] = MemoryNode(name, node_type)
+        block = self.blocks[name] = MaBlock(name, end)
+        return block
+
+    def set_foreign (self, block) -> None :
+        block.foreign = True
+        node_obj = self.nodes[block.name]
+        node_obj.attributs = {}
+        node_obj.short_names = {}
+        block.records = []
+
+    def read_add_attr (self, block, tokens, span) -> None :
+        flags = split_flags(tokens[1:])
+        add_flags = {}
+        for flag, value in flags :
+            if flag in foreign_add_flags :
+                return
+            if flag in managed_add_flags :
+                add_flags[managed_add_flags[flag]] = value
+        attribute_type = add_flags.get("attributeType", "double")
+        if "longName" not in add_flags or (attribute_type not in numeric_types) :
+            return
+
+        for key in ("minValue", "maxValue", "defaultValue") :
+            if key in add_flags :
+                add_flags[key] = parse_word(add_flags[key])
+        if "keyable" in add_flags :
+            add_flags["keyable"] = add_flags["keyable"].lower() in true_words
+        try :
+            MemoryBackend.addAttr(self, block.name, **add_flags)
+        except RuntimeError :
+            return
+        node_obj = self.nodes[block.name]
+        record = MaRecord(node_obj.attributs[add_flags["longName"]], span, flags)
+        block.records.append(record)
+        block.last_add_end = span[1]
+
+    def read_set_attr (self, block, tokens, span) -> None :
+        flags = split_flags(tokens[1:])
+        positional = [value for flag, value in flags if flag is None]
+        plug = positional[0]
+        record = next(
+            (record for record in block.records if plug[1:] in (record.attribut.long_name, record.attribut.short_name)),
+            None,
+            )
+        if record is None or any(flag is not None and flag not in managed_set_flags for flag, value in flags) :
+            # setAttr this module does not read is kept where it is
+            return
+        attribut = record.attribut
+        for flag, value in flags :
+            if flag is not None :
+                setattr(attribut, managed_set_flags[flag], value.lower() in true_words)
+        if len(positional) > 1 :
+            attribut.value = attribut.cast(parse_word(positional[1]))
+            record.value_written = True
+        record.set_spans.append(span)
+
+    def read_connect_attr (self, tokens, span) -> None :
+        plugs = [value for flag, value in split_flags(tokens[1:]) if flag is None]
+        if len(plugs) != 2 :
+            return
+        nodes = []
+        for plug in plugs :
+            node, _, attr = plug.partition(".")
+            node_obj = self.nodes.get(node)
+            if node_obj is None or self.blocks[node].foreign :
+                nodes.append((node_obj, attr, False))
+            else :
+                attribut = node_obj.find(attr)
+                nodes.append((node_obj, attribut.long_name if attribut else attr, attribut is not None))
+        if not (nodes[0][2] or nodes[1][2]) or nodes[0][0] is None or nodes[1][0] is None :
+            return
+        connection = [nodes[0][0].name, nodes[0][1], nodes[1][0].name, nodes[1][1]]
+        nodes[0][0].connections.append(connection)
+        if nodes[1][0] is not nodes[0][0] :
+            nodes[1][0].connections.append(connection)
+        self.connection_records.append([span, connection, None])
+
+    def recreating_in_place (self, plug) -> None :
+        """
+        Package command, see CmdsBackend.recreating_in_place.
+        Next addAttr on the node takes the statements and flags of the deleted attribut,
+        its statement is rewritten in place and the attribut keeps its position
+        """
+        node_obj, attr = self.split_plug(plug)
+        attribut = node_obj.find(attr)
+        block = self.blocks.get(node_obj.name)
+        record = next((record for record in block.records if record.attribut is attribut), None) if block else None
+        if record is None :
+            self.in_place = None
+            return
+        self.in_place = (node_obj.name, record, list(node_obj.attributs).index(attribut.long_name))
+
+    def addAttr (self, target, edit = False, **flags) -> None :
+        in_place, self.in_place = self.in_place, None
+        MemoryBackend.addAttr(self, target, edit = edit, **flags)
+        if edit or in_place is None or in_place[0] != target :
+            return
+        node, record, position = in_place
+        node_obj = self.nodes[node]
+        long_name = flags.get("longName") or flags.get("ln")
+        record.attribut = node_obj.attributs[long_name]
+        names = [name for name in node_obj.attributs if name != long_name]
+        names.insert(position, long_name)
+        node_obj.attributs = {name : node_obj.attributs[name] for name in names}
+
+    def connectAttr (self, source, destination, force = False, **kwargs) -> None :
+        """Built-in attributs of .ma nodes are not known, plugs that are not custom attributs are accepted as is"""
+        source_node, source_attr = self.split_plug(source)
+        destination_node, destination_attr = self.split_plug(destination)
+        source_attr = self.long_plug(source_node, source_attr).split(".", 1)[1]
+        destination_attr = self.long_plug(destination_node, destination_attr).split(".", 1)[1]
+        for connection in list(destination_node.connections) :
+            if connection[2] == destination_node.name and connection[3] == destination_attr :
+                if not force :
+                    raise RuntimeError ("'{}' already has an incoming connection".format(destination))
+                self.remove_connection(connection)
+        connection = [source_node.name, source_attr, destination_node.name, destination_attr]
+        source_node.connections.append(connection)
+        if destination_node is not source_node :
+            destination_node.connections.append(connection)
+
+    #######################################################################################################################
+    #                Write
+    #######################################################################################################################
+    def add_attr_statement (self, attribut, flags = ()) -> str :
+        """addAttr statement of an attribut, flags not managed here are kept from flags"""
+        parts = ["addAttr"]
+        for flag, value in flags :
+            if flag is None or flag in managed_add_flags :
+                continue
+            parts.append(flag)
+            if value is not None :
+                parts.append(value)
+        if attribut.keyable :
+            parts += ["-k", "true"]
+        parts += ["-sn", quote(attribut.short_name), "-ln", quote(attribut.long_name)]
+        if attribut.nice_name != nice_name_from(attribut.long_name) :
+            parts += ["-nn", quote(attribut.nice_name)]
+        if attribut.has_min :
+            parts += ["-min", format_value(attribut.min_value)]
+        if attribut.has_max :
+            parts += ["-max", format_value(attribut.max_value)]
+        if attribut.default :
+            parts += ["-dv", format_value(attribut.default)]
+        if attribut.attribute_type == "enum" :
+            parts += ["-en", quote(attribut.enum_name)]
+        parts += ["-at", quote(attribut.attribute_type)]
+        return "\t{};\n".format(" ".join(parts))
+
+    def set_attr_statements (self, attribut, force_value = False) -> str :
+        plug = quote("." + attribut.long_name)
+        lines = []
+        if attribut.channel_box and not attribut.keyable :
+            lines.append("\tsetAttr -cb on {};\n".format(plug))
+        if force_value or attribut.value != attribut.default :
+            lines.append("\tsetAttr {} {};\n".format(plug, format_value(attribut.value)))
+        if attribut.locked :
+            lines.append("\tsetAttr -l on {};\n".format(plug))
+        return "".join(lines)
+
+    def edits (self) -> list :
+        """
+        File changes for the current scene
+
+        Returns :
+            sorted [(start, end, replacement text)], end == start for insertions
+        """
+        edits = []
+        for block in self.blocks.values() :
+            if block.foreign :
+                continue
+            node_obj = self.nodes.get(block.name)
+            current = list(node_obj.attributs.values()) if node_obj is not None else []
+            current_ids = {id(attribut) for attribut in current}
+            recorded = set()
+            for record in block.records :
+                recorded.add(id(record.attribut))
+                if id(record.attribut) not in current_ids :
+                    for span in [record.add_span] + record.set_spans :
+                        edits.append((span[0], span[1], ""))
+                    continue
+                if attribut_state(record.attribut) == record.original :
+                    continue
+                edits.append((record.add_span[0], record.add_span[1], self.add_attr_statement(record.attribut, record.add_flags)))
+                # Value is written again if it changed or a setAttr held it
+                force_value = record.value_written or record.attribut.value != record.original[value_index]
+                set_text = self.set_attr_statements(record.attribut, force_value = force_value)
+                if record.set_spans :
+                    first = record.set_spans[0]
+                    edits.append((first[0], first[1], set_text))
+                    for span in record.set_spans[1:] :
+                        edits.append((span[0], span[1], ""))
+                elif set_text :
+                    edits.append((block.block_end, block.block_end, set_text))
+            for attribut in current :
+                if id(attribut) not in recorded :
+                    edits.append((block.last_add_end, block.last_add_end, self.add_attr_statement(attribut)))
+                    set_text = self.set_attr_statements(attribut)
+                    if set_text :
+                        edits.append((block.block_end, block.block_end, set_text))
+
+        recorded_connections = set()
+        for span, connection, original in self.connection_records :
+            recorded_connections.add(id(connection))
+            node_obj = self.nodes.get(connection[0])
+            if node_obj is None or not any(other is connection for other in node_obj.connections) :
+                edits.append((span[0], span[1], ""))
+            elif connection != original :
+                edits.append((span[0], span[1], self.connect_statement(connection)))
+        new_connections = {}
+        for node_obj in self.nodes.values() :
+            for connection in node_obj.connections :
+                if id(connection) not in recorded_connections :
+                    new_connections[id(connection)] = connection
+        for connection in new_connections.values() :
+            edits.append((self.last_statement_end, self.last_statement_end, self.connect_statement(connection)))
+
+        # Stable sort keeps insertion order of edits at the same offset
+        edits.sort(key = lambda edit : (edit[0], edit[1]))
+        return edits
+
+    def connect_statement (self, connection) -> str :
+        return "connectAttr {} {};\n".format(
+            quote("{}.{}".format(*connection[:2])), quote("{}.{}".format(*connection[2:])),
+            )
+
+    def write (self, path = None) -> int :
+        """
+        Write scene to path, source file if None. Bytes outside edited statements are copied
+
+        Returns :
+            count of changed statements
+        """
+        path = path or self.path
+        edits = self.edits()
+        temp_path = path + ".tmp"
+        with open(self.path, "rb") as source, open(temp_path, "wb") as output :
+            position = 0
+            for start, end, text in edits :
+                output.write(source.read(start - position))
+                source.seek(end)
+                position = end
+                output.write(text.encode("utf-8", "surrogateescape"))
+            while True :
+                chunk = source.read(1 << 20)
+                if not chunk :
+                    break
+                output.write(chunk)
+        os.replace(temp_path, path)
+        return len(edits)
+
+    def custom_nodes (self) -> list :
+        """Nodes with custom attributs that can be edited"""
+        return [name for name, node_obj in self.nodes.items() if node_obj.attributs]
+
+
+#######################################################################################################################
+#                Batch
+#######################################################################################################################
+
+def apply_edits (object_set, edits) -> int :
+    """
+    Apply edits on a MayaObjectSet
+
+    Keywords:
+        edits -- [(operation, pattern, values...)] :
+            ("lock" / "keyable" / "visible", pattern, state)
+            ("min" / "max", pattern, value)
+            ("rename", attribut, new name), ("delete", pattern), ("add", attribut, attribute type)
+
+    Returns :
+        count of edited attributs
+    """
+    methods = {"lock" : "set_lock", "keyable" : "set_keyable", "visible" : "set_visible"}
+    count = 0
+    for operation, pattern, *values in edits :
+        if operation in methods :
+            count += object_set.apply(pattern, methods[operation], *values)
+        elif operation == "min" :
+            count += object_set.set_limits(pattern, minimum = values[0])
+        elif operation == "max" :
+            count += object_set.set_limits(pattern, maximum = values[0])
+        elif operation == "rename" :
+            for maya_object, attr_class in object_set[pattern] :
+                maya_object.edit_long_name(pattern, values[0])
+                count += 1
+        elif operation == "delete" :
+            for maya_object, attr_class in object_set.match(pattern) :
+                maya_object.delete_attribut(attr_class.long_name)
+                count += 1
+        elif operation == "add" :
+            for maya_object in object_set :
+                if pattern not in maya_object.attributs :
+                    maya_object.add_attribut(pattern)
+                    maya_object.get_attribut_object(pattern).set_attribut_type(values[0])
+                    count += 1
+        else :
+            raise ValueError ("Unknown edit {}".format(operation))
+    if count :
+        object_set.reindex()
+    return count
+
+def process_file (path, edits, output_path = None, nodes = "*", dry_run = False) -> dict :
+    """
+    Read a .ma file, apply edits on nodes matching a glob pattern and write it
+
+    Returns :
+        {"path", "parse", "edit", "write" (seconds), "nodes", "attributs", "changes"}
+    """
+    from nb_attribut_control.object_set import MayaObjectSet
+
+    result = {"path" : path}
+    start = time.perf_counter()
+    backend = MaBackend(path)
+    result["parse"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    object_set = MayaObjectSet(fnmatch.filter(backend.custom_nodes(), nodes), backend = backend)
+    result["nodes"] = len(object_set)
+    result["attributs"] = apply_edits(object_set, edits)
+    object_set.commit()
+    result["edit"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result["changes"] = len(backend.edits()) if dry_run else backend.write(output_path)
+    result["write"] = time.perf_counter() - start
+    return result
+
+def find_ma_files (paths) -> list :
+    files = []
+    for path in paths :
+        if os.path.isdir(path) :
+            for root, dirs, names in os.walk(path) :
+                files += [os.path.join(root, name) for name in sorted(names) if name.endswith(".ma")]
+        else :
+            files.append(path)
+    return files
+
+def main (argv = None) -> int :
+    """Command line : python -m nb_attribut_control.ma_file <files or directories> [edits]"""
+    parser = argparse.ArgumentParser(description = "Edit custom attributs of .ma files without maya")
+    parser.add_argument("paths", nargs = "+", help = ".ma files or directories")
+    parser.add_argument("--nodes", default = "*", help = "glob pattern of nodes to edit")
+    parser.add_argument("--lock", action = "append", default = [], metavar = "PATTERN")
+    parser.add_argument("--unlock", action = "append", default = [], metavar = "PATTERN")
+    parser.add_argument("--keyable", action = "append", default = [], metavar = "PATTERN")
+    parser.add_argument("--unkeyable", action = "append", default = [], metavar = "PATTERN")
+    parser.add_argument("--min", nargs = 2, action = "append", default = [], metavar = ("PATTERN", "VALUE"))
+    parser.add_argument("--max", nargs = 2, action = "append", default = [], metavar = ("PATTERN", "VALUE"))
+    parser.add_argument("--rename", nargs = 2, action = "append", default = [], metavar = ("ATTRIBUT", "NEW_NAME"))
+    parser.add_argument("--delete", action = "append", default = [], metavar = "PATTERN")
+    parser.add_argument("--add", nargs = 2, action = "append", default = [], metavar = ("ATTRIBUT", "TYPE"))
+    parser.add_argument("--output-dir", help = "write edited files here, source files are replaced if not set")
+    parser.add_argument("--workers", type = int, default = os.cpu_count())
+    parser.add_argument("--dry-run", action = "store_true", help = "count changes, do not write files")
+    args = parser.parse_args(argv)
+
+    edits = (
+        [("lock", pattern, True) for pattern in args.lock]
+        + [("lock", pattern, False) for pattern in args.unlock]
+        + [("keyable", pattern, True) for pattern in args.keyable]
+        + [("keyable", pattern, False) for pattern in args.unkeyable]
+        + [("min", pattern, float(value)) for pattern, value in args.min]
+        + [("max", pattern, float(value)) for pattern, value in args.max]
+        + [("rename", name, new_name) for name, new_name in args.rename]
+        + [("delete", pattern) for pattern in args.delete]
+        + [("add", name, attribute_type) for name, attribute_type in args.add]
+        )
+
+    files = find_ma_files(args.paths)
+    outputs = [
+        os.path.join(args.output_dir, os.path.basename(path)) if args.output_dir else None for path in files
+        ]
+    if args.output_dir :
+        os.makedirs(args.output_dir, exist_ok = True)
+
+    start = time.perf_counter()
+    failed = 0
+    with ProcessPoolExecutor(max_workers = max(1, args.workers or 1)) as executor :
+        futures = [
+            executor.submit(process_file, path, edits, output, args.nodes, args.dry_run)
+            for path, output in zip(files, outputs)
+            ]
+        for path, future in zip(files, futures) :
+            try :
+                result = future.result()
+            except Exception as error :
+                failed += 1
+                print ("{} : failed, {}".format(path, error))
+                continue
+            print ("{path} : parse {parse:.3f}s, edit {edit:.3f}s, write {write:.3f}s, "
+                   "{nodes} nodes, {attributs} attributs, {changes} changes".format(**result))
+    print ("{} files in {:.3f}s, {} failed".format(len(files), time.perf_counter() - start, failed))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__" :
+    sys.exit(main())
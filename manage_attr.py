@@ -5,14 +5,23 @@ This is a module to catch maya control object, get custom attributs and edit the
 @Update : 2025/02/19
 """
 
-import maya.cmds as cmds
+import fnmatch
+import re
+import types
+
+from nb_attribut_control import snapshot as snap
+from nb_attribut_control.backend import get_backend
+from nb_attribut_control.connection_index import ConnectionIndex, reconnect
+from nb_attribut_control.instrument import operation
+from nb_attribut_control.transaction import CommitError, Transaction, validate
+from nb_attribut_control.attribut_index import AttributIndex, AttributDicView, AttributNamesView
 
 def is_type (type_) :
     """Custom decorator to check if data is correct type"""
     def decorator (func) :
         def wrapper (*args, **kwargs) :
             if isinstance(args[1], type_) :
-                func(*args)
+                return func(*args, **kwargs)
             else :
                 raise TypeError (
                     "Incorrect value type ({}); Needs {}, got {}".format(args[0], type_, type(args[1]))
@@ -27,45 +36,194 @@ attribut_type: list = [
     "enum", "matrix",
     ]
 
+# Attribut fields and the flag used to edit them in maya
+edit_fields: dict = {
+    "nice_name" : "niceName",
+    "defaut_value" : "defaultValue",
+    "has_max_value" : "hasMaxValue",
+    "has_min_value" : "hasMinValue",
+    "max_value" : "maxValue",
+    "min_value" : "minValue",
+    "enum_list" : "enumName",
+    }
+state_fields: dict = {
+    "in_channel_box" : "channelBox",
+    "keyable" : "keyable",
+    "locked" : "lock",
+    }
+# Attribut fields that can not be edited, attribut has to be created again
+recreate_fields: set = {"long_name", "short_name", "attribute_type"}
+# Fields checked by range checks when edited
+range_check_fields: set = {
+    "attribute_type", "value", "defaut_value", "max_value", "min_value", "has_max_value", "has_min_value",
+    }
+# Fields edited by MayaObject.edit_attributs and their value types. Names are edited one at a time
+bulk_fields: dict = {
+    "nice_name" : (str,),
+    "attribute_type" : (str,),
+    "enum_list" : (str,),
+    "value" : (int, float),
+    "defaut_value" : (int, float),
+    "max_value" : (int, float),
+    "min_value" : (int, float),
+    "has_max_value" : (bool,),
+    "has_min_value" : (bool,),
+    "in_channel_box" : (bool,),
+    "keyable" : (bool,),
+    "locked" : (bool,),
+    }
+
 
 #######################################################################################################################
 #                Utility
 #######################################################################################################################
 
-def get_custom_attr_names (object_) -> list :
+class BuiltInAttrCache () :
+    """
+    Cache of built-in attribut names, keyed by maya object type.
+
+    Each object type is filled once with a temporary node, then reused for every
+    object of the same type. The cache is cleared when a plugin is loaded or
+    unloaded, as plugins can add attributs to existing node types.
+    """
+
+    def __init__ (self) -> None :
+        self.built_in_attributs: dict = {}
+        self.hits: int = 0
+        self.misses: int = 0
+        self.temp_nodes_created: int = 0
+        self.callback_ids: list = []
+
+    def get (self, obj_type, backend = None) -> set :
+        """
+        Get built-in attributs of an object type, create a temporary node if type is not cached
+
+        Keywords:
+            obj_type -- maya object type
+            backend -- maya commands backend, current backend if None
+
+        Returns :
+            set of built-in attribut names
+        """
+        cmds = backend or get_backend()
+        # Backends do not share built-in attributs
+        cache_key = (cmds.name, obj_type)
+        if cache_key in self.built_in_attributs :
+            self.hits += 1
+            return self.built_in_attributs[cache_key]
+
+        self.misses += 1
+        if cmds.name == "maya" :
+            self.install_plugin_callbacks()
+
+        # Keep temporary node out of undo queue
+        undo_state = cmds.undoInfo(query = True, stateWithoutFlush = True)
+        cmds.undoInfo(stateWithoutFlush = False)
+        try :
+            built_in_object = cmds.createNode(obj_type, name = "temp_obj", skipSelect = True)
+            self.temp_nodes_created += 1
+            built_in_attributs = set(cmds.listAttr(built_in_object) or [])
+            cmds.delete(built_in_object)
+        finally :
+            cmds.undoInfo(stateWithoutFlush = undo_state)
+
+        self.built_in_attributs[cache_key] = built_in_attributs
+        return built_in_attributs
+
+    def clear (self, *args) -> None :
+        """Clear cached types, used as plugin load/unload callback"""
+        self.built_in_attributs.clear()
+
+    def stats (self) -> dict :
+        """Return cache hits, misses and count of temporary node created"""
+        return {
+            "hits" : self.hits,
+            "misses" : self.misses,
+            "temp_nodes_created" : self.temp_nodes_created,
+            "cached_types" : len(self.built_in_attributs),
+            }
+
+    def reset_stats (self) -> None :
+        """Set hits, misses and temporary node count to 0"""
+        self.hits = 0
+        self.misses = 0
+        self.temp_nodes_created = 0
+
+    def install_plugin_callbacks (self) -> None :
+        """Clear cache each time a plugin is loaded or unloaded"""
+        if self.callback_ids :
+            return
+        try :
+            import maya.OpenMaya as om
+        except ImportError :
+            return
+
+        for message in (om.MSceneMessage.kAfterPluginLoad, om.MSceneMessage.kAfterPluginUnload) :
+            self.callback_ids.append(
+                om.MSceneMessage.addStringArrayCallback(message, self.clear)
+                )
+
+    def remove_plugin_callbacks (self) -> None :
+        """Remove plugin load/unload callbacks"""
+        if not self.callback_ids :
+            return
+        import maya.OpenMaya as om
+
+        for callback_id in self.callback_ids :
+            om.MMessage.removeCallback(callback_id)
+        self.callback_ids = []
+
+built_in_attr_cache = BuiltInAttrCache()
+
+@operation("get_custom_attr_names")
+def get_custom_attr_names (object_, user_defined = True, backend = None) -> list :
     """
     Get a maya object custom attributs
 
     Keywords:
         object_ -- maya object
+        user_defined -- use maya's user defined attribut list, no temporary node needed.
+            If False, compare object attributs with cached built-in attributs of its type
+        backend -- maya commands backend, current backend if None
     
     Returns :
         list of custom attributs in the object or an empty list
     """
-    # Get object_ type and create another one
-    obj_type = cmds.objectType(object_)
-    built_in_object = cmds.createNode(obj_type, name = "temp_obj")
-    
-    # Get both objects attributs
-    object_attributs = cmds.listAttr(object_)
-    built_in_attributs = cmds.listAttr(built_in_object)
+    cmds = backend or get_backend()
+    if user_defined :
+        return cmds.listAttr(object_, userDefined = True) or []
 
-    # Compare oth lists and get custom attributs
-    custom_attributs = list(set(object_attributs)-set(built_in_attributs))
+    # Get object_ type built-in attributs
+    obj_type = cmds.objectType(object_)
+    built_in_attributs = built_in_attr_cache.get(obj_type, cmds)
 
-    # Delete built_in_object
-    cmds.delete(built_in_object)
+    # Compare both lists and get custom attributs, keep object attributs order
+    object_attributs = cmds.listAttr(object_) or []
+    custom_attributs = [attr for attr in object_attributs if attr not in built_in_attributs]
 
     return custom_attributs
 
+# Shared dirty fields of clean attributs, replaced by a dict on first edit
+no_dirty_fields: types.MappingProxyType = types.MappingProxyType({})
+# Commited value of fields edited by force_recreate, never equal to a field value
+forced_recreate: object = object()
+
 class Attribut () :
     """
     New object based on one of maya's object attribut.
     """
 
+    __slots__ = (
+        "cmds", "maya_obj", "long_name", "nice_name", "short_name",
+        "value", "defaut_value", "has_max_value", "has_min_value", "enum_list", "max_value", "min_value",
+        "attribute_type", "in_channel_box", "keyable", "locked",
+        "incom_connections", "outcom_connections",
+        "dirty_fields", "committed_name",
+        )
+
     def __init__ (
         self, maya_obj, long_name = "attribut1",
-        in_maya = False,
+        in_maya = False, snapshot = None, backend = None, lazy = False,
         ) -> object :
         """
         Create class variables.
@@ -73,81 +231,178 @@ class Attribut () :
         Keyword arguments:
             maya_obj -- maya's object that attribut is part of
             long_name -- attribut full name
+            in_maya -- load attribut from maya
+            snapshot -- attribut snapshot dict (see snapshot.load_node_snapshot), used instead of maya queries.
+                Fields missing from snapshot are loaded from maya when first read
+            backend -- maya commands backend (see backend module), current backend if None
+            lazy -- with in_maya, only load names, other fields are loaded when first read
         Returns:
             None
         """
 
+        self.cmds = backend or get_backend()
         self.maya_obj: str = maya_obj
         self.long_name: str = long_name
 
-        # Create variable and edit them later
-        self.nice_name: str = "Attribut 1"
-        self.short_name: str = "att1"
-
-        self.value: float = 0
-        self.defaut_value: float = 0
-        self.has_max_value: bool = False
-        self.has_min_value: bool = False
-        self.enum_list: str = ""
-        self.max_value: float = 0
-        self.min_value: float = 0
-        
-        self.attribute_type: str = "float"
-        
-        self.in_channel_box: bool = False
-        self.keyable: bool = False
-        self.locked: bool = False
-        
-        self.incom_connections: list = []
-        self.outcom_connections: list = []
-
-        if in_maya :
-            self.load_maya_attribut()
+        # {field edited since last commit : commited value}, and attribut name in maya (None if not created yet)
+        self.dirty_fields: dict = no_dirty_fields
+        self.committed_name: str = None
+
+        if snapshot is not None :
+            self.load_from_snapshot(snapshot)
+        elif in_maya :
+            self.load_maya_attribut(fields = ("names",) if lazy else None)
         else :
+            # Create variable and edit them later
+            self.nice_name: str = "Attribut 1"
+            self.short_name: str = "att1"
+
+            self.value: float = 0
+            self.defaut_value: float = 0
+            self.has_max_value: bool = False
+            self.has_min_value: bool = False
+            self.enum_list: str = ""
+            self.max_value: float = 0
+            self.min_value: float = 0
+            
+            self.attribute_type: str = "float"
+            
+            self.in_channel_box: bool = False
+            self.keyable: bool = False
+            self.locked: bool = False
+            
+            self.incom_connections: list = []
+            self.outcom_connections: list = []
+
             self.edit_nice_name(self.long_name)
             self.edit_short_name(self.long_name)
+            self.clear_dirty()
+            self.committed_name = None
+
+    def __getattr__ (self, field) :
+        """Called for fields not loaded yet : load field group from maya"""
+        group = snap.field_group.get(field)
+        if group is None or self.committed_name is None :
+            raise AttributeError ("'Attribut' object has no attribute '{}'".format(field))
+        if field == "value" and self.attribute_type in snap.lazy_value_types :
+            # Values that are not numbers are not in snapshots
+            self.value = self.cmds.getAttr("{}.{}".format(self.maya_obj, self.committed_name))
+            return self.value
+        self.prefetch((group,))
+        return getattr(self, field)
+
+    @operation("load_maya_attribut")
+    def load_maya_attribut (self, fields = None) -> None :
+        """
+        Load attribut from maya
 
+        Keywords:
+            fields -- fields or field groups to load (see snapshot.field_groups), all if None
+        """
+        name = self.committed_name or self.long_name
+        attr_snapshot = snap.load_node_snapshot(self.maya_obj, [name], self.cmds, fields)
+        self.load_from_snapshot(attr_snapshot[name])
 
-    def load_maya_attribut (self) -> None :
+    def load_from_snapshot (self, attr_snapshot) -> None :
+        """Set class variables from an attribut snapshot dict, snapshot can hold some fields only"""
+        for field, value in attr_snapshot.items() :
+            setattr(self, field, value)
+        self.clear_dirty()
 
-        obj_attribut = "{}.{}".format(self.maya_obj, self.long_name)
+    def prefetch (self, fields = None) -> None :
+        """
+        Load fields not loaded yet
 
-        self.nice_name = cmds.attributeQuery(long_name, node = maya_obj, niceName = True)
-        self.short_name = cmds.attributeQuery(long_name, node = maya_obj, shortName = True)
+        Keywords:
+            fields -- fields or field groups to load (see snapshot.field_groups), all if None
+        """
+        # Invalidated groups may keep their edited fields, a group is missing if any field is
+        missing = [
+            group for group in snap.resolve_groups(fields)
+            if not all(map(self.is_loaded, snap.field_groups[group]))
+            ]
+        if not missing :
+            return
+        name = self.committed_name
+        self.set_prefetched(snap.load_node_snapshot(self.maya_obj, [name], self.cmds, missing)[name])
+
+    def set_prefetched (self, attr_snapshot) -> None :
+        """Set fields read by a prefetch, loaded and edited fields are kept"""
+        for field, value in attr_snapshot.items() :
+            if field not in self.dirty_fields and not self.is_loaded(field) :
+                setattr(self, field, value)
+
+    def is_loaded (self, field) -> bool :
+        """Return True if field was loaded, does not load it"""
+        try :
+            Attribut.__dict__[field].__get__(self, Attribut)
+        except AttributeError :
+            return False
+        return True
 
-        self.value = cmds.getAttr(obj_attribut)
-        self.defaut_value = cmds.attributeQuery(long_name, node = maya_obj, listDefault = True)
-        self.has_max_value = cmds.attributeQuery(long_name, node = maya_obj, maxExists=True)
-        self.has_min_value = cmds.attributeQuery(long_name, node = maya_obj, minExists=True)
-        self.enum_list = cmds.attributeQuery(long_name, node = maya_obj, listEnum = True)
+    def invalidate (self, fields = None) -> None :
+        """
+        Forget loaded fields, they are loaded from maya again when read. Edited fields are kept
 
-        # Check if attribut has minimium or maximum value and set self.min_values and self.max_values
-        if self.has_max_value :
-            self.max_value = cmds.attributeQuery(long_name, node = maya_obj, maximum=True)
-        else :
-            self.max_value = None
-    
-        if self.has_min_value :
-            self.min_value = cmds.attributeQuery(long_name, node = maya_obj, minimum=True)
-        else :
-            self.min_value = None
-        
-        self.attribute_type = cmds.attributeQuery(long_name, node = maya_obj, attributeType = True)
-        
-        self.in_channel_box = cmds.attributeQuery(long_name, node = maya_obj, channelBox = True)
-        self.keyable = cmds.attributeQuery(long_name, node = maya_obj, keyable = True)
-        self.locked = cmds.getAttr(obj_attribut, lock = True)
-        
-        self.incom_connections = cmds.listConnections(obj_attribut, plugs = True, destination = True, source = False)
-        self.outcom_connections = cmds.listConnections(obj_attribut, plugs = True, destination = False, source = True)
+        Keywords:
+            fields -- fields or field groups to forget, all fields except names if None
+        """
+        groups = snap.resolve_groups(fields)
+        if fields is None or "names" not in fields :
+            groups.discard("names")
+        for group in groups :
+            for field in snap.field_groups[group] :
+                if field not in self.dirty_fields and self.is_loaded(field) :
+                    delattr(self, field)
+
+    #######################################################################################################################
+    #                Dirty tracking
+    #######################################################################################################################
+    def set_field (self, field, value) -> bool :
+        """Set a class variable and mark it dirty if value changed, a field set back to its commited value is clean"""
+        current = getattr(self, field)
+        if current != value :
+            setattr(self, field, value)
+            if self.dirty_fields is no_dirty_fields :
+                self.dirty_fields = {}
+            if field not in self.dirty_fields :
+                self.dirty_fields[field] = current
+            elif self.dirty_fields[field] == value :
+                del self.dirty_fields[field]
+        return True
+
+    def is_dirty (self) -> bool :
+        """Return True if attribut needs to be commited"""
+        return bool(self.dirty_fields) or self.committed_name is None
+
+    def needs_recreate (self) -> bool :
+        """Return True if attribut can not be edited and has to be deleted and created again"""
+        return self.committed_name is None or bool(self.dirty_fields.keys() & recreate_fields)
+
+    def force_recreate (self) -> None :
+        """Delete and create attribut again on next commit, moves it last in maya order"""
+        if self.dirty_fields is no_dirty_fields :
+            self.dirty_fields = {}
+        self.dirty_fields["long_name"] = forced_recreate
+
+    def clear_dirty (self) -> None :
+        """Mark attribut as commited"""
+        self.dirty_fields = no_dirty_fields
+        self.committed_name = self.long_name
 
     #######################################################################################################################
     #                Edit attribut
     #######################################################################################################################
     @is_type(str)
     def edit_long_name (self, new_name) -> None :
-        """Edit attribut long name""" 
-        self.long_name = new_name.replace(" ", "_")
+        """Edit attribut long name, names in maya are kept when attribut is renamed back to its commited name""" 
+        long_name = new_name.replace(" ", "_")
+        self.set_field("long_name", long_name)
+        if long_name == self.committed_name :
+            for field in ("nice_name", "short_name") :
+                if field in self.dirty_fields :
+                    self.set_field(field, self.dirty_fields[field])
+            return True
         self.edit_nice_name(new_name)
         self.edit_short_name(new_name)
         return True
@@ -156,170 +411,300 @@ class Attribut () :
     def edit_nice_name (self, new_nice_name) -> None :
         """Edit attribut nice name"""
         formated_name = new_nice_name.replace("_"," ")
-        self.nice_name = formated_name.title()
-        return True
+        return self.set_field("nice_name", formated_name.title())
 
     @is_type(str)
     def edit_short_name (self, new_short_name) -> None :
         """Edit attribut short name"""
         no_space = new_short_name.replace(" ","_")
-        initial_word = ''.join([word[0] for word in no_space.split("_")])       # Get initial of each word in attribut name
-        self.short_name = initial_word
-        return True
+        initial_word = ''.join([word[0] for word in no_space.split("_") if word])       # Get initial of each word in attribut name
+        return self.set_field("short_name", initial_word)
 
     #######################################################################################################################
     @is_type(bool)
     def set_has_maximum_state (self, value = False) :
         """Set self.has_max_value"""
-        self.has_max_value = value
-        return True
+        return self.set_field("has_max_value", value)
 
     @is_type(bool)   
     def set_has_minimum_state (self, value = False) :
         """Set self.has_min_value"""
-        self.has_min_value = value
-        return True
+        return self.set_field("has_min_value", value)
 
     @is_type(float)
     def set_maximum_value (self, value) :
         """Set self.maxValue"""
-        self.max_value = value
-        return True
+        return self.set_field("max_value", value)
 
     @is_type(float)    
     def set_minimum_value (self, value) :
         """Set self.min_value """
-        self.min_value = value
-        return True
+        return self.set_field("min_value", value)
 
     @is_type(float)   
     def set_defaut_value (self, value) :
         """Set self.dafaut_value"""
-        self.max_value = value
-        return True
+        return self.set_field("defaut_value", value)
 
     #######################################################################################################################
     @is_type(bool)
     def set_visible (self, state) -> None :
         """Set self.in_channel_box"""
-        self.in_channel_box = state
-        return True
+        return self.set_field("in_channel_box", state)
 
     @is_type(bool)
     def set_lock (self, state) -> None :
         """Set self.locked"""
-        self.locked = state
-        return True
+        return self.set_field("locked", state)
 
     @is_type(bool)
     def set_keyable (self, state) -> None :
         """Set self.keyable"""
-        self.keyable = state
-        return True
+        return self.set_field("keyable", state)
 
     @is_type(str)
     def set_attribut_type (self, new_type) -> bool :
         """Set self.attribut_type"""
         if new_type in attribut_type :
-            self.attribute_type = new_type
-            return True
-        cmds.error ("Unvalid attribut type {}".format(new_type))
+            return self.set_field("attribute_type", new_type)
+        self.cmds.error ("Unvalid attribut type {}".format(new_type))
         return False
 
-    def commit_attr (self) -> bool :                            
-        """Create a simple attribut"""
-
-        if self.attribute_type == "matrix" : 
-            cmds.addAttr(
-                self.maya_obj,
-                longName = self.long_name, 
-                niceName = self.nice_name,
-                shortName = self.short_name,
-                attributeType = self.attribute_type, 
-                hidden = self.in_channel_box,
-                keyable=self.keyable,
-                    )
+    #######################################################################################################################
+    #                Commit
+    #######################################################################################################################
+    @operation("commit_attr")
+    def commit_attr (self) -> int :                            
+        """
+        Create a simple attribut
 
-        else :
-            cmds.addAttr(
-                self.maya_obj,
-                longName = self.long_name, 
-                niceName = self.nice_name,
-                shortName = self.short_name, 
-                defaultValue = self.defaut_value,
-                hasMaxValue = self.has_max_value, 
-                hasMinValue = self.has_min_value, 
-                maxValue = self.max_value,
-                minValue = self.min_value, 
-                attributeType = self.attribute_type, 
-                hidden = self.in_channel_box,
-                keyable=self.keyable,
-                    )
+        Returns :
+            count of maya commands called
+        """
+        attr_flags = {
+            "longName" : self.long_name,
+            "niceName" : self.nice_name,
+            "shortName" : self.short_name,
+            "attributeType" : self.attribute_type,
+            "keyable" : self.keyable,
+            }
+
+        if self.attribute_type == "enum" :
+            attr_flags["enumName"] = self.enum_list
+        if self.attribute_type != "matrix" :
+            attr_flags["defaultValue"] = self.defaut_value
+            if self.has_max_value :
+                attr_flags["maxValue"] = self.max_value
+            if self.has_min_value :
+                attr_flags["minValue"] = self.min_value
+
+        self.cmds.addAttr(self.maya_obj, **attr_flags)
+        command_count = 1
 
-        cmds.setAttr("{}.{}".format(self.maya_obj, self.long_name), lock = self.locked)
-        if self.attribute_type is not "matrix" :
-            cmds.setAttr("{}.{}".format(self.maya_obj, self.long_name), self.value)
-        return True
+        obj_attribut = "{}.{}".format(self.maya_obj, self.long_name)
+        if self.attribute_type != "matrix" :
+            self.cmds.setAttr(obj_attribut, self.value)
+            command_count += 1
+
+        state_flags = {}
+        if self.in_channel_box and not self.keyable :
+            state_flags["channelBox"] = True
+        if self.locked :
+            state_flags["lock"] = True
+        if state_flags :
+            self.cmds.setAttr(obj_attribut, **state_flags)
+            command_count += 1
+
+        self.clear_dirty()
+        return command_count
+
+    @operation("commit_changes")
+    def commit_changes (self) -> int :
+        """
+        Commit dirty fields only, attribut is created again only if its name or type changed
+
+        Returns :
+            count of maya commands called
+        """
+        if not self.is_dirty() :
+            return 0
+
+        command_count = 0
+        if self.needs_recreate() :
+            if self.committed_name is not None :
+                old_attribut = "{}.{}".format(self.maya_obj, self.committed_name)
+                command_count += 1
+                if self.cmds.objExists(old_attribut) :
+                    # Fields not read yet are lost once attribut is deleted
+                    self.prefetch()
+                    # A rename or retype is not a delete for the backend, attributs recreated by
+                    # reorder_attributs go last
+                    if self.dirty_fields.get("long_name") is not forced_recreate :
+                        self.cmds.recreating_in_place(old_attribut)
+                    self.cmds.setAttr(old_attribut, lock = False)
+                    self.cmds.deleteAttr(old_attribut)
+                    command_count += 2
+            return command_count + self.commit_attr()
+
+        obj_attribut = "{}.{}".format(self.maya_obj, self.long_name)
+
+        # Attribut definition, one addAttr edit
+        edit_flags = {}
+        for field in self.dirty_fields.keys() & edit_fields.keys() :
+            edit_flags[edit_fields[field]] = getattr(self, field)
+        if edit_flags :
+            self.cmds.addAttr(obj_attribut, edit = True, **edit_flags)
+            command_count += 1
+
+        # Lock state in maya before this commit
+        maya_locked = self.dirty_fields.get("locked", self.locked)
+
+        # Value can only be set on unlocked attribut
+        if "value" in self.dirty_fields and self.attribute_type != "matrix" :
+            if maya_locked :
+                self.cmds.setAttr(obj_attribut, lock = False)
+                maya_locked = False
+                command_count += 1
+            self.cmds.setAttr(obj_attribut, self.value)
+            command_count += 1
+
+        # States, one setAttr
+        state_flags = {}
+        for field in self.dirty_fields.keys() & state_fields.keys() :
+            state_flags[state_fields[field]] = getattr(self, field)
+        if maya_locked != self.locked :
+            state_flags["lock"] = self.locked
+        if state_flags :
+            self.cmds.setAttr(obj_attribut, **state_flags)
+            command_count += 1
+
+        self.clear_dirty()
+        return command_count
 
 class MayaObject () :
     """Maya Object as python object"""
 
     def __init__ (
-        self, object_name
+        self, object_name, backend = None, node_snapshot = None, table = None, lazy = False,
         ) -> object :
+        """
+        Keywords:
+            object_name -- maya object
+            backend -- maya commands backend (see backend module), current backend if None
+            node_snapshot -- node snapshot dict (see snapshot.load_node_snapshot), used instead of maya queries
+            table -- attribut_table.AttributTable, loaded attributs are stored in it
+                and Attribut objects are views over its rows. Can be shared by many MayaObject
+            lazy -- only load attribut names, other fields are loaded when first read
+                or with prefetch. Ignored with a table, table rows hold every field
+        """
+        self.cmds = backend or get_backend()
         self.object_name = object_name
-        self.custom_attributs = get_custom_attr_names(object_name)
-        self.attributs_dic = {}
-        self.create_attributs_class()
-        self.custom_attributs_count = len(self.custom_attributs)
+        self.table = table
+        self.lazy = lazy and table is None
+        self.attributs = AttributIndex()
+        if node_snapshot is None :
+            self.create_attributs_class()
+        else :
+            self.create_attributs_class(list(node_snapshot), node_snapshot)
+        # Maya attributs deleted from class, deleted in maya on commit
+        self.deleted_attributs = []
+        # Connections put back by last commit
+        self.commit_report = None
+        # {attribut name : cached samples}, see sampling.sample_objects
+        self.sample_cache = {}
+
+    @property
+    def custom_attributs (self) -> list :
+        """Custom attribut names in order. Do not edit this list, use add, delete and move methods"""
+        return self.attributs.names()
+
+    @property
+    def attributs_dic (self) -> AttributDicView :
+        """{attribut name : {"class" : Attribut, "index" : int}}"""
+        return AttributDicView(self.attributs)
+
+    @property
+    def custom_attributs_count (self) -> int :
+        return len(self.attributs)
 
-    
     def check_attribut(func) :
         """Decorator to check if attribut exists"""
         def wrapper (*args, **kwargs) :
-            print ("in decorator")
-            attribut_obj = args[0].get_attribut_object(args[1])
-            if attribut_obj :
-                return func(*args)
-            print ("out func")
+            if args[1] in args[0].attributs :
+                return func(*args, **kwargs)
             return None
         return wrapper
 
     # Attribut object
+    @operation("create_attributs_class")
     def create_attributs_class (
-        self
+        self, attributs = None, node_snapshot = None,
         ) -> dict :
-        """Fil self.attributs_dic"""
-
-        for attr in self.custom_attributs :
-            attr_class = Attribut(self.object_name, long_name = attr)
-            attr_index = self.custom_attributs.index(attr)
-            self.attributs_dic[attr] = {"class" : attr_class, "index" : attr_index}
+        """Fill self.attributs, all attributs are read from maya in one snapshot"""
+        if attributs is None :
+            attributs = get_custom_attr_names(self.object_name, backend = self.cmds)
+
+        if node_snapshot is None :
+            fields = ("names",) if self.lazy else None
+            node_snapshot = snap.load_node_snapshot(self.object_name, attributs, self.cmds, fields)
+        for attr in attributs :
+            if self.table is None :
+                attr_class = Attribut(self.object_name, long_name = attr, snapshot = node_snapshot[attr], backend = self.cmds)
+            else :
+                attr_class = self.table.view(self.table.append(self.object_name, node_snapshot[attr]), self.cmds)
+            self.attributs.append(attr, attr_class)
 
         return self.attributs_dic
 
+    def prefetch (
+        self, fields = None, attributs = None
+        ) -> None :
+        """
+        Load fields of many attributs with one snapshot, fields already loaded or edited are kept
+
+        Keywords:
+            fields -- fields or field groups to load (see snapshot.field_groups), all if None
+            attributs -- attribut names, all attributs if None
+        """
+        if attributs is None :
+            attributs = self.custom_attributs
+        # First field of each group tells if group was loaded
+        group_fields = [snap.field_groups[group][0] for group in snap.resolve_groups(fields)]
+        attr_classes = {}
+        for attribut in attributs :
+            attr_class = self.attributs.get(attribut)
+            if attr_class is None or attr_class.committed_name is None :
+                continue
+            if not all(map(attr_class.is_loaded, group_fields)) :
+                attr_classes[attr_class.committed_name] = attr_class
+        if not attr_classes :
+            return
+
+        node_snapshot = snap.load_node_snapshot(self.object_name, list(attr_classes), self.cmds, fields)
+        for name, attr_class in attr_classes.items() :
+            attr_class.set_prefetched(node_snapshot[name])
+
     def get_attribut_object (
         self, attribut
         ) -> None or classmethod:
         """Get attribut class object"""
-        try  :
-            attribut_class = self.attributs_dic[attribut]["class"]
-        except KeyError :
-            return None
-        return attribut_class
+        return self.attributs.get(attribut)
     
     # Edit attributs parameters
     @check_attribut
     def edit_long_name (
         self, attribut, new_name
         ) -> None or str:
-        """Edit attribut long name and update class attribut list and dict"""
-        self.get_attribut_object(attribut).edit_long_name(new_name)
+        """Edit attribut long name and update class attribut index"""
+        attr_class = self.get_attribut_object(attribut)
+        if new_name.replace(" ", "_") != attribut and new_name.replace(" ", "_") in self.attributs :
+            self.cmds.warning("Attribut {} already exists".format(new_name))
+            return None
+        attr_class.edit_long_name(new_name)
 
-        # Update class attribut list and dict values
-        self.attributs_dic[new_name] = self.attributs_dic.pop(attribut)
-        attribut_index = self.custom_attributs.index(attribut)
-        self.custom_attributs[attribut_index] = new_name
+        # Update class attribut index, keep attribut position
+        self.attributs.rename(attribut, attr_class.long_name)
+        return attr_class.long_name
 
     @check_attribut
     def edit_nice_name (
@@ -400,20 +785,15 @@ class MayaObject () :
 
         Returns :
             ( 
-            self.custom_attributs -- list
+            custom attributs -- AttributNamesView, list is only built when read
             self.attribut_dic -- dict
             self.custom_attributs_count -- int
             )
         """
-        if attribut_name not in self.custom_attributs :
-            self.custom_attributs.append(attribut_name)
-            self.custom_attributs_count += 1
-
-        if attribut_name not in self.attributs_dic.keys() :
-            attr_class = Attribut(self.object_name, long_name = attribut_name)
-            attribut_index = len(self.custom_attributs) - 1
-            self.attributs_dic[attribut_name] = {"class" : attr_class, "index" : attribut_index}
-        return (self.custom_attributs, self.attributs_dic, self.custom_attributs_count)
+        if attribut_name not in self.attributs :
+            attr_class = Attribut(self.object_name, long_name = attribut_name, backend = self.cmds)
+            self.attributs.append(attribut_name, attr_class)
+        return (AttributNamesView(self.attributs), self.attributs_dic, self.custom_attributs_count)
 
     def delete_attribut (
         self, attribut_name
@@ -426,46 +806,405 @@ class MayaObject () :
 
         Returns : 
             (
-            self.custom_attributs -- list
+            custom attributs -- AttributNamesView, list is only built when read
             self.attribut_dic -- dict
             self.custom_attributs_count -- int
             )
         """
-        if attribut_name in self.custom_attributs :
-            self.custom_attributs.remove(attribut_name)
-            self.custom_attributs_count -= 1
-        if attribut_name in self.attributs_dic.keys() :
-            class_obj = self.attributs_dic[attribut_name]["class"]
-            print ("Deleting attribut {} class".format(attribut_name))
-            del class_obj
+        if attribut_name in self.attributs :
+            class_obj = self.attributs.remove(attribut_name)
+            if class_obj.committed_name is not None :
+                self.deleted_attributs.append(class_obj.committed_name)
+        return (AttributNamesView(self.attributs), self.attributs_dic, self.custom_attributs_count)
+
+    def move_attribut (
+        self, attribut_name, offset
+        ) -> tuple :
+        """
+        Move attribut in class order, negative offset move it up
+
+        Keywords : 
+            attribut_name -- attribut to move
+            offset -- count of positions to move
+
+        Returns : 
+            (
+            custom attributs -- AttributNamesView, list is only built when read
+            self.attribut_dic -- dict
+            self.custom_attributs_count -- int
+            )
+        """
+        if attribut_name in self.attributs :
+            self.attributs.move(attribut_name, offset)
+        return (AttributNamesView(self.attributs), self.attributs_dic, self.custom_attributs_count)
+
+    def move_attribut_up (self, attribut_name) -> tuple :
+        """Move attribut one position up, used by Up button"""
+        return self.move_attribut(attribut_name, -1)
+
+    def move_attribut_down (self, attribut_name) -> tuple :
+        """Move attribut one position down, used by Down button"""
+        return self.move_attribut(attribut_name, 1)
+
+    #######################################################################################################################
+    #                Bulk edit
+    #######################################################################################################################
+    def select_attributs (
+        self, pattern = "*", regex = False, attribute_type = None, states = None
+        ) -> list :
+        """
+        Attributs matching a selector, in class order
+
+            maya_object.select_attributs("*Switch", attribute_type = ("double", "float"), states = {"keyable" : True})
+
+        Keywords:
+            pattern -- glob pattern on long names, or regular expression if regex is True
+            regex -- use pattern as a regular expression
+            attribute_type -- attribut type or tuple of types, any type if None
+            states -- {field : value} every attribut field must match (keyable, locked, has_max_value, ...).
+                Fields of lazy attributs are read in one snapshot
+
+        Returns :
+            list of Attribut
+        """
+        names = self.custom_attributs
+        if regex :
+            matcher = re.compile(pattern)
+            names = [name for name in names if matcher.fullmatch(name)]
+        elif pattern != "*" :
+            names = fnmatch.filter(names, pattern)
+        attr_classes = [self.attributs.get(name) for name in names]
+
+        if attribute_type is not None :
+            types = (attribute_type,) if isinstance(attribute_type, str) else tuple(attribute_type)
+            attr_classes = [attr_class for attr_class in attr_classes if attr_class.attribute_type in types]
+        if states :
+            self.prefetch(list(states), [attr_class.long_name for attr_class in attr_classes])
+            attr_classes = [
+                attr_class for attr_class in attr_classes
+                if all(getattr(attr_class, field) == value for field, value in states.items())
+                ]
+        return attr_classes
+
+    @operation("edit_attributs")
+    def edit_attributs (
+        self, changes, pattern = "*", regex = False, attribute_type = None, states = None, clamp = False,
+        ) -> dict :
+        """
+        Set fields of every selected attribut, changes are checked once for the whole selection.
+        Nothing is edited if one attribut would get an unvalid range
+
+            maya_object.edit_attributs({"keyable" : False, "locked" : True}, "*Space")
+
+        Keywords:
+            changes -- {field : value}, fields in bulk_fields
+            pattern, regex, attribute_type, states -- selector, see select_attributs
+            clamp -- move values and defaut values out of new limits inside them instead of failing
+
+        Returns :
+            {"selected" : int, "edited" : int, "fields" : {field : edited attribut count}, "clamped" : int}
+
+        Raises :
+            ValueError -- unknown field, unknown attribut type or unvalid ranges
+            TypeError -- wrong value type
+        """
+        for field, value in changes.items() :
+            if field not in bulk_fields :
+                raise ValueError ("Field {} can not be edited in bulk; Available : {}".format(field, list(bulk_fields)))
+            if not isinstance(value, bulk_fields[field]) or (bool not in bulk_fields[field] and isinstance(value, bool)) :
+                raise TypeError (
+                    "Incorrect value type ({}); Needs {}, got {}".format(field, bulk_fields[field], type(value))
+                    )
+        if changes.get("attribute_type", attribut_type[0]) not in attribut_type :
+            raise ValueError ("Unvalid attribut type {}".format(changes["attribute_type"]))
+
+        attr_classes = self.select_attributs(pattern, regex, attribute_type, states)
+        summary = {"selected" : len(attr_classes), "edited" : 0, "fields" : {}, "clamped" : 0}
+        if not attr_classes or not changes :
+            return summary
+
+        # Changed fields and range check fields, one snapshot
+        check = bool(changes.keys() & range_check_fields)
+        self.prefetch(
+            list(changes) + list(range_check.range_groups if check else ()), [attr_class.long_name for attr_class in attr_classes],
+            )
+        # Previous fields and dirty state, put back if ranges are not valid
+        previous = [
+            (attr_class, {field : getattr(attr_class, field) for field in changes}, attr_class.dirty_fields)
+            for attr_class in attr_classes
+            ]
+        for attr_class, old_fields, dirty_fields in previous :
+            if dirty_fields is not no_dirty_fields :
+                attr_class.dirty_fields = dict(dirty_fields)
+            for field, value in changes.items() :
+                attr_class.set_field(field, value)
+
+        report = range_check.check_ranges(attr_classes if check else [], clamp)
+        # Maya clamps values to new limits, values out of range only fail when value is edited
+        ignored = () if "value" in changes or clamp else ("value_range",)
+        if clamp :
+            ignored += ("defaut_range", "value_range", "not_integer")
+        problems = [
+            (attr_class.long_name, message) for attr_class, check, message in report.items() if check not in ignored
+            ]
+        if problems :
+            # Clamped values of other attributs are put back too, dirty state is reset below
+            for attr_class, field, old_value, new_value in reversed(report.clamped) :
+                setattr(attr_class, field, old_value)
+            for attr_class, old_fields, dirty_fields in previous :
+                for field, value in old_fields.items() :
+                    setattr(attr_class, field, value)
+                attr_class.dirty_fields = dirty_fields
+            raise ValueError ("Unvalid edit of {} : {}".format(
+                self.object_name, "; ".join("{} {}".format(name, message) for name, message in problems)
+                ))
+
+        for attr_class, old_fields, dirty_fields in previous :
+            edited = [field for field, value in old_fields.items() if getattr(attr_class, field) != value]
+            if edited :
+                summary["edited"] += 1
+            for field in edited :
+                summary["fields"][field] = summary["fields"].get(field, 0) + 1
+        summary["clamped"] = len(report.clamped)
+        return summary
+
+    def query_attributs (
+        self, fields = ("long_name",), pattern = "*", regex = False, attribute_type = None, states = None, columns = False,
+        ) -> dict :
+        """
+        Read fields of every selected attribut, fields of lazy attributs are read in one snapshot
+
+        Keywords:
+            fields -- attribut fields (see snapshot.snapshot_fields)
+            pattern, regex, attribute_type, states -- selector, see select_attributs
+            columns -- return lists by field instead of dicts by attribut
+
+        Returns :
+            {attribut name : {field : value}}, or {field : [values]} in class order with columns
+        """
+        attr_classes = self.select_attributs(pattern, regex, attribute_type, states)
+        self.prefetch(fields, [attr_class.long_name for attr_class in attr_classes])
+        if columns :
+            return {field : [getattr(attr_class, field) for attr_class in attr_classes] for field in fields}
+        return {
+            attr_class.long_name : {field : getattr(attr_class, field) for field in fields}
+            for attr_class in attr_classes
+            }
+
+    def sample_attributs (self, start, end, step = 1.0, pattern = "*", regex = False) -> object :
+        """
+        Values of numeric custom attributs on every frame from start to end, read in a few
+        time based queries. Samples are cached until the attribut changes
+
+        Keywords:
+            start, end, step -- frame range, end included
+            pattern, regex -- attribut selector, see select_attributs
+
+        Returns :
+            sampling.Samples, values is a frames x attributs array
+        """
+        from nb_attribut_control import sampling
+
+        names = [attr_class.long_name for attr_class in self.select_attributs(pattern, regex)]
+        return sampling.sample_objects([self], sampling.frame_range(start, end, step), names)
+
+    def write_keys (self, samples, names = None, reduce = True, undo_chunk = True) -> int :
+        """
+        Write sampled values as keys in one undo chunk, see sampling.write_objects
+
+        Returns :
+            count of maya commands called
+        """
+        from nb_attribut_control import sampling
+
+        return sampling.write_objects([self], samples, names, reduce, undo_chunk)
+
+    def clear_samples (self, names = None) -> None :
+        """Forget cached samples, needed when keys were edited in maya"""
+        if names is None :
+            self.sample_cache.clear()
+        for name in names or () :
+            self.sample_cache.pop(name, None)
+
+    def reorder_plan (self, maya_order = None) -> list :
+        """
+        Attributs to create again so maya order matches class order.
+
+        Maya order only changes by creating attributs again, they go last. Attributs kept
+        in place are the longest start of class order found in the same order in maya,
+        every attribut after them is created again.
+
+        Keywords:
+            maya_order -- custom attributs in maya order, read from maya if None
+
+        Returns :
+            Attribut objects in maya, to create again, in class order.
+            Renamed, retyped and new attributs are created anyway and are not listed
+        """
+        if maya_order is None :
+            maya_order = self.cmds.listAttr(self.object_name, userDefined = True) or []
+        positions = {name : index for index, name in enumerate(maya_order)}
+        attr_classes = self.attributs.values()
+
+        kept = 0
+        cursor = -1
+        for attr_class in attr_classes :
+            position = positions.get(attr_class.committed_name)
+            if position is None or position < cursor or attr_class.needs_recreate() :
+                break
+            cursor = position
+            kept += 1
+
+        return [
+            attr_class for attr_class in attr_classes[kept:]
+            if attr_class.committed_name in positions and not attr_class.needs_recreate()
+            ]
+
+    @operation("reorder_attributs")
+    def reorder_attributs (self, target_order = None, undo_chunk = True) -> int :
+        """
+        Commit edits and change maya attribut order to class order, in one undo chunk.
+        Only the attributs after the longest kept start are created again, with their values,
+        limits, states and connections
+
+        Keywords:
+            target_order -- attribut names in wanted order, class order is changed first. Current class order if None
+            undo_chunk -- open an undo chunk, False when caller already opened one
+
+        Returns :
+            count of maya commands called
+        """
+        if target_order is not None :
+            for position, name in enumerate(target_order) :
+                offset = position - self.attributs.position(name)
+                if offset :
+                    self.attributs.move(name, offset)
+
+        plan = self.reorder_plan()
+        for attr_class in plan :
+            # Every field is created again, load the ones a lazy object did not read
+            attr_class.prefetch()
+            attr_class.force_recreate()
+        command_count = 1 + self.commit_attributs(undo_chunk)
+        self.commit_report["recreated"] = [attr_class.long_name for attr_class in plan]
+        return command_count
+
+    @operation("commit_attributs")
+    def commit_attributs (self, undo_chunk = True, connection_index = None, dry_run = False) -> int :
+        """
+        Commit edited attributs in maya, in one undo chunk. Unchanged attributs are skipped,
+        edited ones are updated in place, renamed or retyped ones are created again.
+
+        Edits are checked first (see validate), nothing is edited if one can not be commited.
+        If a maya command still fails, touched attributs are put back as before the commit.
+
+        Keywords:
+            undo_chunk -- open an undo chunk, False when caller already opened one
+            connection_index -- ConnectionIndex holding this node, shared by node set commits
+            dry_run -- only check edits, problems are in self.commit_report["problems"]
+
+        Returns :
+            count of maya commands called
+
+        Raises :
+            CommitError -- edits can not be commited, or commit failed and was rolled back
+        """
+        problems = self.validate()
+        if dry_run :
+            self.commit_report = {"reconnected" : [], "failed" : [], "commands" : 0, "problems" : problems}
+            return 0
+        if problems :
+            raise CommitError (
+                "Can not commit {} : {}".format(self.object_name, "; ".join(message for name, message in problems)),
+                problems = problems,
+                )
+
+        transaction = Transaction(self, connection_index).begin()
+        if undo_chunk :
+            self.cmds.undoInfo(openChunk = True, chunkName = "commit_attributs")
+        try :
             try :
-                class_obj
-            except NameError :
-                print("-> deleted")
-            else :
-                print("-> not deleted")
-            self.attributs_dic.pop(attribut_name)
-            index = 0
-            for attr in self.attributs_dic :
-                self.attributs_dic[attr]["index"] = index
-                index += 1
-        return (self.custom_attributs, self.attributs_dic, self.custom_attributs_count)
-
-    def commit_attributs (self) -> None :
-        """Creates all attributs in maya"""
-        for attribut in self.custom_attributs :
-            is_deleted = self.delete_maya_attribut(attribut)
-            if not is_deleted :
-                cmds.warning("Attribut {} does not exists".format(attribut))
-
-            attr_class = self.attributs_dic[attribut]["class"]
-            attr_class.commit_attr()
-            
+                return self.commit_changes(transaction.connection_index)
+            except Exception as error :
+                transaction.rollback()
+                raise CommitError (
+                    "Commit of {} failed, attributs were put back : {}".format(self.object_name, error),
+                    error = error, rolled_back = True,
+                    ) from error
+        finally :
+            if undo_chunk :
+                self.cmds.undoInfo(closeChunk = True)
+
+    def validate (self) -> list :
+        """
+        Check edits before commit, maya is only read
+
+        Returns :
+            [(attribut name, message)], empty if commit can run
+        """
+        return validate(self)
+
+    def recreated_attributs (self) -> list :
+        """Attributs in maya that next commit deletes and creates again (renamed or retyped)"""
+        return [
+            attr_class for attr_class in self.attributs.values()
+            if attr_class.committed_name is not None and attr_class.is_dirty() and attr_class.needs_recreate()
+            ]
+
+    def commit_changes (self, connection_index = None) -> int :
+        """
+        Delete removed attributs and commit dirty ones, without undo chunk.
+        Connections of attributs created again are connected back, see self.commit_report
+
+        Keywords:
+            connection_index -- ConnectionIndex holding this node, built if needed and None
+        """
+        command_count = 0
+        self.commit_report = {"reconnected" : [], "failed" : [], "commands" : 0}
+
+        # Save connections before attributs are deleted
+        recreated = self.recreated_attributs()
+        saved = []
+        if recreated :
+            if connection_index is None :
+                connection_index = ConnectionIndex([self.object_name], self.cmds)
+                command_count += connection_index.query_count
+            deleted_plugs = {"{}.{}".format(self.object_name, attribut) for attribut in self.deleted_attributs}
+            for attr_class in recreated :
+                connections = [
+                    connection for connection in connection_index.connections(self.object_name, attr_class.committed_name)
+                    if not deleted_plugs.intersection(connection)
+                    ]
+                if connections :
+                    saved.append((attr_class, "{}.{}".format(self.object_name, attr_class.committed_name), connections))
+
+        for attribut in self.deleted_attributs :
+            command_count += 1
+            if self.delete_maya_attribut(attribut) :
+                command_count += 1
+        self.deleted_attributs = []
+
+        for attr_class in self.attributs.values() :
+            if attr_class.is_dirty() :
+                command_count += attr_class.commit_changes()
+
+        if saved :
+            self.commit_report = reconnect([
+                (old_plug, "{}.{}".format(self.object_name, attr_class.long_name), attr_class.locked, connections)
+                for attr_class, old_plug, connections in saved
+                ], self.cmds)
+            command_count += self.commit_report["commands"]
+        return command_count
 
     def delete_maya_attribut (self, attribut) -> bool :
         """Delete maya object attribut"""
         obj_attr = "{}.{}".format(self.object_name, attribut)
-        if cmds.objExists(obj_attr) :
-            cmds.deleteAttr (obj_attr)
+        if self.cmds.objExists(obj_attr) :
+            self.cmds.setAttr(obj_attr, lock = False)
+            self.cmds.deleteAttr (obj_attr)
             return True
         return False
+
+
+# range_check reads attribut_type when imported, import it once this module is defined
+from nb_attribut_control import range_check
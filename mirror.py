@@ -0,0 +1,179 @@
+"""
+Copy custom attributs layout of a control on other controls, or mirror it on the
+controls of the other side. Source is read once, each target only gets the edits it
+needs, every target is commited in one undo chunk.
+@autor : Nathan Boyaval
+@Version : 0.0.4
+@Update : 2025/02/19
+"""
+
+import fnmatch
+import functools
+import re
+
+from nb_attribut_control import manage_attr as mattr
+from nb_attribut_control import schema as mschema
+from nb_attribut_control.backend import get_backend
+from nb_attribut_control.instrument import operation
+
+# (left, right) name parts swapped by mirror_name. "L_" is a prefix and "_L" a suffix of a name
+# token, other parts are whole tokens
+side_rules: tuple = (("L_", "R_"), ("_L", "_R"), ("left", "right"), ("Left", "Right"))
+# Characters between name tokens, namespace and dag path separators included
+token_separators: str = "_:|"
+# Field groups of a layout, schema fields and value
+layout_groups: tuple = mschema.schema_groups + ("value",)
+
+
+def side_pattern (side) -> "re.Pattern" :
+    """Regex matching side only on name token boundaries, "L_" does not match in "CTRL_01" """
+    separators = re.escape(token_separators)
+    pattern = re.escape(side)
+    if side[0] not in token_separators :
+        pattern = "(?<![^{}])".format(separators) + pattern
+    if side[-1] not in token_separators :
+        pattern += "(?![^{}])".format(separators)
+    return re.compile(pattern)
+
+@functools.lru_cache(maxsize = None)
+def side_patterns (rules) -> tuple :
+    """((pattern, other side), ...), longer sides first so "Left" is tried before "L_" """
+    sides = [pair for left, right in rules for pair in ((left, right), (right, left))]
+    sides.sort(key = lambda pair : -len(pair[0]))
+    return tuple((side_pattern(side), other) for side, other in sides)
+
+def mirror_name (node, rules = side_rules) -> str or None :
+    """
+    Name of the control on the other side, "L_arm_ctrl" -> "R_arm_ctrl".
+    Only the first side token found is swapped : "L_hand_CTRL_01" -> "R_hand_CTRL_01"
+
+    Returns :
+        mirrored name, None if no rule matches node
+    """
+    for pattern, other in side_patterns(tuple(rules)) :
+        mirrored, count = pattern.subn(other, node, count = 1)
+        if count :
+            return mirrored
+    return None
+
+def layout_of (node, backend = None) -> dict :
+    """
+    Attributs layout of a node : schema dict (see schema.object_schema) with attribut values
+
+    Returns :
+        {"node" : node, "attributs" : [attribut schema dicts with "value"]}
+    """
+    maya_object = mattr.MayaObject(node, backend = backend, lazy = True)
+    maya_object.prefetch(layout_groups)
+    layout = mschema.object_schema(maya_object)
+    for attribut, attr_class in zip(layout["attributs"], maya_object.attributs.values()) :
+        value = attr_class.value
+        attribut["value"] = value if isinstance(value, (int, float)) else None
+    return layout
+
+def is_negated (name, negate) -> bool :
+    return any(fnmatch.fnmatchcase(name, pattern) for pattern in negate)
+
+def negate_attribut (attribut) -> dict :
+    """
+    Mirrored attribut schema : value and defaut are negated, limits are negated and swapped.
+    Bool and enum attributs are kept as they are
+    """
+    if attribut["attribute_type"] in ("bool", "enum", "matrix") :
+        return attribut
+    mirrored = dict(attribut)
+    for field in ("value", "defaut_value") :
+        if mirrored.get(field) is not None :
+            mirrored[field] = -mirrored[field]
+    mirrored["has_min_value"], mirrored["has_max_value"] = attribut["has_max_value"], attribut["has_min_value"]
+    mirrored["min_value"] = -attribut["max_value"] if attribut["max_value"] is not None else None
+    mirrored["max_value"] = -attribut["min_value"] if attribut["min_value"] is not None else None
+    return mirrored
+
+
+#######################################################################################################################
+#                Copy
+#######################################################################################################################
+
+@operation("copy_layouts")
+def copy_layouts (layouts, backend = None, values = True, negate = (), delete_extra = False, dry_run = False) -> dict :
+    """
+    Apply layouts on target nodes and commit every target together, in one undo chunk.
+    A failed commit puts every target back (see MayaObjectSet.commit)
+
+    Keywords:
+        layouts -- {target node : layout dict (see layout_of)}
+        backend -- maya commands backend, current backend if None
+        values -- copy attribut values too
+        negate -- glob patterns of attributs negated on targets (see negate_attribut)
+        delete_extra -- delete target custom attributs not in layout
+        dry_run -- only check targets, nothing is commited
+
+    Returns :
+        {"diffs" : {target : [edited, added or deleted attribut names]}, "commands" : count of maya commands}
+    """
+    from nb_attribut_control.object_set import MayaObjectSet
+
+    object_set = MayaObjectSet(list(layouts), backend = backend, lazy = True)
+    diffs = {}
+    for maya_object in object_set :
+        layout = layouts[maya_object.object_name]
+        names = [attribut["long_name"] for attribut in layout["attributs"]]
+        # Current fields of targets, one snapshot per target
+        maya_object.prefetch(layout_groups if values else mschema.schema_groups)
+        for attribut in layout["attributs"] :
+            if is_negated(attribut["long_name"], negate) :
+                attribut = negate_attribut(attribut)
+            mschema.apply_attribut_schema(maya_object, attribut)
+            if values and attribut.get("value") is not None :
+                maya_object.get_attribut_object(attribut["long_name"]).set_field("value", attribut["value"])
+        if delete_extra :
+            for name in [name for name in maya_object.custom_attributs if name not in names] :
+                maya_object.delete_attribut(name)
+        mschema.order_attributs(maya_object, names)
+
+        diff = [attr_class.long_name for attr_class in maya_object.attributs.values() if attr_class.is_dirty()]
+        diffs[maya_object.object_name] = diff + list(maya_object.deleted_attributs)
+
+    return {"diffs" : diffs, "commands" : object_set.commit(dry_run = dry_run)}
+
+def copy_layout (source, targets, backend = None, values = True, negate = (), delete_extra = False) -> dict :
+    """
+    Copy custom attributs of source on every target, source is read once
+
+        copy_layout("L_arm_01_ctrl", ["L_arm_02_ctrl", "L_arm_03_ctrl"])
+
+    Returns :
+        see copy_layouts
+    """
+    layout = layout_of(source, backend)
+    return copy_layouts(
+        {target : layout for target in targets if target != source}, backend, values, negate, delete_extra,
+        )
+
+def mirror_layouts (sources, rules = side_rules, backend = None, values = True, negate = (), delete_extra = False) -> dict :
+    """
+    Copy custom attributs of each source on the control of the other side
+
+        mirror_layouts(["L_arm_ctrl", "L_leg_ctrl"], negate = ["*Twist"])
+
+    Keywords:
+        sources -- source nodes
+        rules -- (left, right) name parts, see mirror_name
+        negate -- glob patterns of attributs negated on mirrored controls
+
+    Returns :
+        see copy_layouts, with "skipped" : sources without existing mirrored control
+    """
+    cmds = backend or get_backend()
+    layouts = {}
+    skipped = []
+    for source in dict.fromkeys(sources) :
+        target = mirror_name(source, rules)
+        if target is None or target == source or not cmds.objExists(target) :
+            skipped.append(source)
+            continue
+        layouts[target] = layout_of(source, cmds)
+    result = copy_layouts(layouts, cmds, values, negate, delete_extra)
+    result["skipped"] = skipped
+    return result
@@ -0,0 +1,292 @@
+"""
+Many maya objects edited together : load, edit and commit custom attributs of
+thousands of controls at once.
+@autor : Nathan Boyaval
+@Version : 0.0.4
+@Update : 2025/02/19
+"""
+
+import fnmatch
+import re
+
+from nb_attribut_control import manage_attr as mattr
+from nb_attribut_control import snapshot as snap
+from nb_attribut_control.backend import get_backend
+from nb_attribut_control.connection_index import ConnectionIndex
+from nb_attribut_control.instrument import operation
+from nb_attribut_control.transaction import CommitError, Transaction
+
+
+class MayaObjectSet () :
+    """
+    MayaObject for many nodes.
+
+    Nodes are read in one pass (each node once), attributs can be addressed by name
+    or pattern on every node, and all nodes are commited in one undo chunk.
+    """
+
+    def __init__ (self, object_names, backend = None, compact = False, lazy = False) -> None :
+        """
+        Keywords:
+            object_names -- maya objects, duplicates are ignored
+            backend -- maya commands backend (see backend module), current backend if None
+            compact -- store attributs of every node in one shared AttributTable
+            lazy -- only load attribut names, other fields are loaded when first read.
+                Ignored when compact
+        """
+        self.cmds = backend or get_backend()
+        self.lazy = lazy and not compact
+        self.table = None
+        if compact :
+            from nb_attribut_control.attribut_table import AttributTable
+            self.table = AttributTable()
+        self.objects: dict = {}
+        # {attribut name : [MayaObject]}
+        self.objects_by_attribut: dict = {}
+        self.add_objects(object_names)
+
+    def __len__ (self) -> int :
+        return len(self.objects)
+
+    def __iter__ (self) :
+        return iter(self.objects.values())
+
+    def __getitem__ (self, attribut) -> list :
+        """Get (MayaObject, Attribut) pairs of every node having this attribut"""
+        return [
+            (maya_object, maya_object.get_attribut_object(attribut))
+            for maya_object in self.objects_by_attribut.get(attribut, [])
+            ]
+
+    @operation("object_set_load")
+    def add_objects (self, object_names) -> list :
+        """
+        Load nodes not in set yet
+
+        Returns :
+            list of added MayaObject
+        """
+        new_names = [name for name in dict.fromkeys(object_names) if name not in self.objects]
+        snapshots = snap.load_nodes_snapshot(new_names, self.cmds, ("names",) if self.lazy else None)
+
+        added = []
+        for name in new_names :
+            maya_object = mattr.MayaObject(
+                name, backend = self.cmds, node_snapshot = snapshots[name], table = self.table, lazy = self.lazy,
+                )
+            self.objects[name] = maya_object
+            for attribut in maya_object.custom_attributs :
+                self.objects_by_attribut.setdefault(attribut, []).append(maya_object)
+            added.append(maya_object)
+        return added
+
+    def get_object (self, object_name) -> mattr.MayaObject or None :
+        return self.objects.get(object_name)
+
+    def reindex (self) -> None :
+        """Build attribut name index again, needed after attributs were renamed, added or deleted"""
+        self.objects_by_attribut = {}
+        for maya_object in self.objects.values() :
+            for attribut in maya_object.custom_attributs :
+                self.objects_by_attribut.setdefault(attribut, []).append(maya_object)
+
+    #######################################################################################################################
+    #                Select
+    #######################################################################################################################
+    def attribut_names (self, pattern = "*", regex = False) -> list :
+        """
+        Attribut names matching a pattern, on any node
+
+        Keywords:
+            pattern -- glob pattern ("*Switch"), or regular expression if regex is True
+            regex -- use pattern as a regular expression
+        """
+        if regex :
+            matcher = re.compile(pattern)
+            return [name for name in self.objects_by_attribut if matcher.fullmatch(name)]
+        if not any(char in pattern for char in "*?[") :
+            return [pattern] if pattern in self.objects_by_attribut else []
+        return fnmatch.filter(self.objects_by_attribut, pattern)
+
+    def match (self, pattern = "*", regex = False) -> list :
+        """Get (MayaObject, Attribut) pairs of every attribut matching pattern on every node"""
+        pairs = []
+        for name in self.attribut_names(pattern, regex) :
+            pairs.extend(self[name])
+        return pairs
+
+    def sample_attributs (self, start, end, step = 1.0, pattern = None) -> object :
+        """
+        Values of numeric custom attributs of every node on every frame from start to end,
+        every node is read in the same few time based queries (see MayaObject.sample_attributs)
+
+        Keywords:
+            start, end, step -- frame range, end included
+            pattern -- only sample attributs matching this glob pattern
+
+        Returns :
+            sampling.Samples, columns are named "node.attribut"
+        """
+        from nb_attribut_control import sampling
+
+        names = None if pattern is None else self.attribut_names(pattern)
+        return sampling.sample_objects(
+            list(self.objects.values()), sampling.frame_range(start, end, step), names, plugs = True,
+            )
+
+    def write_keys (self, samples, names = None, reduce = True) -> int :
+        """
+        Write sampled values of "node.attribut" columns as keys, every node in one undo chunk
+
+        Returns :
+            count of maya commands called
+        """
+        from nb_attribut_control import sampling
+
+        return sampling.write_objects(list(self.objects.values()), samples, names, reduce)
+
+    #######################################################################################################################
+    #                Edit
+    #######################################################################################################################
+    @operation("object_set_apply")
+    def apply (self, pattern, method, *args, regex = False) -> int :
+        """
+        Call an Attribut edit method on every matching attribut of every node
+
+            object_set.apply("*Switch", "set_keyable", False)
+
+        Keywords:
+            pattern -- attribut name, glob pattern or regular expression
+            method -- Attribut method name (set_lock, set_keyable, set_maximum_value, ...)
+            args -- method arguments
+            regex -- use pattern as a regular expression
+
+        Returns :
+            count of edited attributs
+        """
+        if not hasattr(mattr.Attribut, method) :
+            raise AttributeError ("Attribut has no method {}".format(method))
+
+        count = 0
+        for maya_object, attr_class in self.match(pattern, regex) :
+            getattr(attr_class, method)(*args)
+            count += 1
+        return count
+
+    def set_limits (self, pattern, minimum = None, maximum = None, regex = False) -> int :
+        """Set minimum and / or maximum value on every matching attribut, None keep current limit"""
+        count = 0
+        for maya_object, attr_class in self.match(pattern, regex) :
+            if minimum is not None :
+                attr_class.set_has_minimum_state(True)
+                attr_class.set_minimum_value(float(minimum))
+            if maximum is not None :
+                attr_class.set_has_maximum_state(True)
+                attr_class.set_maximum_value(float(maximum))
+            count += 1
+        return count
+
+    def dirty_objects (self) -> list :
+        """MayaObject with at least one attribut to commit"""
+        return [
+            maya_object for maya_object in self.objects.values()
+            if maya_object.deleted_attributs or any(attr.is_dirty() for attr in maya_object.attributs.values())
+            ]
+
+    def check_ranges (self, clamp = False, pattern = None) -> object :
+        """
+        Check types, limits, defaut values and values of every attribut in one pass (see range_check)
+
+        Keywords:
+            clamp -- move defaut values and values out of range inside limits, edits are commited by commit
+            pattern -- only check attributs matching this glob pattern
+
+        Returns :
+            range_check.RangeReport
+        """
+        from nb_attribut_control import range_check
+
+        attributs = []
+        for maya_object in self.objects.values() :
+            names = maya_object.custom_attributs
+            if pattern is not None :
+                names = fnmatch.filter(names, pattern)
+            if maya_object.lazy :
+                maya_object.prefetch(range_check.range_groups, names)
+            attributs += [maya_object.get_attribut_object(name) for name in names]
+        return range_check.check_ranges(attributs, clamp)
+
+    def validate (self) -> dict :
+        """
+        Check edits of every node before commit, maya is only read
+
+        Returns :
+            {node : [(attribut name, message)]}, only nodes with problems
+        """
+        problems = {}
+        for maya_object in self.dirty_objects() :
+            node_problems = maya_object.validate()
+            if node_problems :
+                problems[maya_object.object_name] = node_problems
+        return problems
+
+    @operation("object_set_commit")
+    def commit (self, dry_run = False) -> int :
+        """
+        Commit every edited node in one undo chunk, connections of recreated attributs are put back
+        (see MayaObject.commit_report).
+        Every node is checked first, if a maya command fails every node is put back as before the commit
+
+        Keywords:
+            dry_run -- only check edits, problems are in commit_report["problems"] of each node
+
+        Returns :
+            count of maya commands called
+
+        Raises :
+            CommitError -- edits can not be commited, or commit failed and was rolled back
+        """
+        if dry_run :
+            for maya_object in self.dirty_objects() :
+                maya_object.commit_attributs(dry_run = True)
+            return 0
+        problems = self.validate()
+        if problems :
+            raise CommitError (
+                "Can not commit {} nodes : {}".format(len(problems), "; ".join(
+                    "{} {}".format(node, message) for node, node_problems in problems.items() for name, message in node_problems
+                    )),
+                problems = [problem for node_problems in problems.values() for problem in node_problems],
+                )
+
+        command_count = 0
+        dirty_objects = self.dirty_objects()
+        # One connection query for every node with attributs to delete or create again
+        recreating = [
+            maya_object.object_name for maya_object in dirty_objects
+            if maya_object.deleted_attributs or maya_object.recreated_attributs()
+            ]
+        connection_index = None
+        if recreating :
+            connection_index = ConnectionIndex(recreating, self.cmds)
+            command_count += connection_index.query_count
+
+        transactions = [Transaction(maya_object, connection_index).begin() for maya_object in dirty_objects]
+        self.cmds.undoInfo(openChunk = True, chunkName = "commit_object_set")
+        started = []
+        try :
+            for transaction in transactions :
+                started.append(transaction)
+                command_count += transaction.maya_object.commit_changes(transaction.connection_index)
+        except Exception as error :
+            for transaction in reversed(started) :
+                transaction.rollback()
+            raise CommitError (
+                "Commit of {} failed, {} nodes were put back : {}".format(
+                    started[-1].maya_object.object_name, len(started), error,
+                    ),
+                error = error, rolled_back = True,
+                ) from error
+        finally :
+            self.cmds.undoInfo(closeChunk = True)
+        return command_count
@@ -0,0 +1,331 @@
+"""
+Range checks of many attributs in one pass : attribut types, limits order, defaut values
+and values inside limits and inside integer type ranges.
+Numeric fields are read in columns, checked with numpy when it is installed.
+@autor : Nathan Boyaval
+@Version : 0.0.4
+@Update : 2025/02/19
+"""
+
+from operator import attrgetter
+
+try :
+    import numpy
+except ImportError :
+    numpy = None
+
+from nb_attribut_control import manage_attr as mattr
+from nb_attribut_control.instrument import operation
+
+# Values allowed by integer attribut types
+integer_ranges: dict = {
+    "bool" : (0, 1),
+    "byte" : (-128, 127),
+    "char" : (0, 255),
+    "short" : (-32768, 32767),
+    "long" : (-2147483648, 2147483647),
+    "enum" : (0, 32767),
+    }
+# Type code of each attribut type, -1 for unknown types
+type_codes: dict = {attribute_type : code for code, attribute_type in enumerate(mattr.attribut_type)}
+matrix_code: int = type_codes["matrix"]
+
+# Checks in report order, and their messages
+check_messages: dict = {
+    "unknown_type" : "Unvalid attribut type {attribute_type}",
+    "limits_order" : "Minimum value {min_value} is greater than maximum value {max_value}",
+    "integer_range" : "Limits [{min_value}, {max_value}] are out of {attribute_type} range",
+    "not_integer" : "{attribute_type} attribut needs integer defaut value and value",
+    "defaut_range" : "Defaut value {defaut_value} is out of limits [{min_value}, {max_value}]",
+    "value_range" : "Value {value} is out of limits [{min_value}, {max_value}]",
+    }
+# Fields read from each attribut, in column order
+column_fields: tuple = (
+    "attribute_type", "has_min_value", "has_max_value", "min_value", "max_value", "defaut_value", "value",
+    )
+# Field groups a lazy attribut needs for a check
+range_groups: tuple = ("defaut", "limits", "value")
+
+infinity: float = float("inf")
+nan: float = float("nan")
+
+
+def number (value) -> float :
+    """Float of a numeric field, nan for matrix values and missing limits"""
+    if isinstance(value, (int, float)) :
+        return float(value)
+    return nan
+
+def type_bounds (attribute_type) -> tuple :
+    """(minimum, maximum) allowed by attribut type"""
+    return integer_ranges.get(attribute_type, (-infinity, infinity))
+
+
+#######################################################################################################################
+#                Columns
+#######################################################################################################################
+
+def attribut_columns (attributs) -> dict :
+    """
+    Read numeric fields of Attribut objects in columns
+
+    Returns :
+        {"type" : type codes, "has_min", "has_max", "min", "max", "defaut", "value"},
+        numpy arrays when numpy is installed, lists otherwise. Non numbers are nan
+    """
+    types, has_min, has_max, *numbers = list(zip(*map(attrgetter(*column_fields), attributs))) or [()] * len(column_fields)
+    columns = {
+        "type" : [type_codes.get(attribute_type, -1) for attribute_type in types],
+        "has_min" : has_min,
+        "has_max" : has_max,
+        }
+    for name, column in zip(("min", "max", "defaut", "value"), numbers) :
+        columns[name] = column
+    if numpy is None :
+        columns["has_min"] = list(map(bool, has_min))
+        columns["has_max"] = list(map(bool, has_max))
+        for name in ("min", "max", "defaut", "value") :
+            columns[name] = list(map(number, columns[name]))
+        return columns
+
+    columns["type"] = numpy.array(columns["type"], dtype = numpy.int64)
+    columns["has_min"] = numpy.array(has_min, dtype = bool)
+    columns["has_max"] = numpy.array(has_max, dtype = bool)
+    for name in ("min", "max", "defaut") :
+        try :
+            # None is converted to nan
+            columns[name] = numpy.array(columns[name], dtype = float)
+        except (TypeError, ValueError) :
+            columns[name] = numpy.fromiter(map(number, columns[name]), float, len(types))
+    # Matrix values are lists
+    columns["value"] = numpy.fromiter(map(number, columns["value"]), float, len(types))
+    return columns
+
+def table_columns (table, rows) -> dict :
+    """
+    Read numeric fields of AttributTable rows in columns, without building Attribut views.
+    Same columns as attribut_columns, needs numpy
+    """
+    from nb_attribut_control.attribut_table import flag_bits
+
+    rows = numpy.asarray(rows, dtype = numpy.int64)
+    # Type code of each string of table string table
+    string_codes = numpy.array([type_codes.get(string, -1) for string in table.strings] or [-1], dtype = numpy.int64)
+    flags = numpy.frombuffer(table.flags, dtype = numpy.uint8)[rows]
+    columns = {
+        "type" : string_codes[numpy.frombuffer(table.string_columns["attribute_type"], dtype = numpy.uint32)[rows]],
+        "has_min" : (flags & flag_bits["has_min_value"]) != 0,
+        "has_max" : (flags & flag_bits["has_max_value"]) != 0,
+        }
+    for name, field in (("min", "min_value"), ("max", "max_value"), ("defaut", "defaut_value"), ("value", "value")) :
+        columns[name] = numpy.frombuffer(table.number_columns[field], dtype = numpy.float64)[rows]
+    if table.objects or table.unread_values :
+        # Matrix values are stored apart or not read yet
+        columns["value"] = columns["value"].copy()
+        columns["value"][numpy.isin(rows, list(table.objects) + list(table.unread_values))] = nan
+    return columns
+
+
+#######################################################################################################################
+#                Checks
+#######################################################################################################################
+
+def bounds_arrays (columns) -> tuple :
+    """(lower bounds, upper bounds) of defaut values and values : limits and integer type ranges"""
+    lower_types = numpy.full(len(mattr.attribut_type) + 1, -infinity)
+    upper_types = numpy.full(len(mattr.attribut_type) + 1, infinity)
+    for attribute_type, (lower, upper) in integer_ranges.items() :
+        lower_types[type_codes[attribute_type]], upper_types[type_codes[attribute_type]] = lower, upper
+    # Unknown types (-1) read the last bounds
+    type_lower, type_upper = lower_types[columns["type"]], upper_types[columns["type"]]
+    lower = numpy.where(columns["has_min"], numpy.maximum(columns["min"], type_lower), type_lower)
+    upper = numpy.where(columns["has_max"], numpy.minimum(columns["max"], type_upper), type_upper)
+    return type_lower, type_upper, lower, upper
+
+def check_arrays (columns) -> dict :
+    """Vectorized checks of numpy columns, {check : row indices}"""
+    codes = columns["type"]
+    known = codes >= 0
+    numeric = known & (codes != matrix_code)
+    has_min, has_max = columns["has_min"], columns["has_max"]
+    minimum, maximum = columns["min"], columns["max"]
+    defaut_value, value = columns["defaut"], columns["value"]
+    type_lower, type_upper, lower, upper = bounds_arrays(columns)
+    is_integer = numpy.isfinite(type_lower)
+    ordered = ~(has_min & has_max & (minimum > maximum))
+
+    masks = {
+        "unknown_type" : ~known,
+        "limits_order" : numeric & ~ordered,
+        "integer_range" : numeric & ordered & is_integer & ((has_min & (minimum < type_lower)) | (has_max & (maximum > type_upper))),
+        "not_integer" : numeric & ordered & is_integer & (
+            (numpy.isfinite(defaut_value) & (defaut_value != numpy.round(defaut_value))) |
+            (numpy.isfinite(value) & (value != numpy.round(value)))
+            ),
+        # nan (matrix, missing) never compares True
+        "defaut_range" : numeric & ordered & ((defaut_value < lower) | (defaut_value > upper)),
+        "value_range" : numeric & ordered & ((value < lower) | (value > upper)),
+        }
+    return {check : numpy.flatnonzero(mask).tolist() for check, mask in masks.items()}
+
+def check_lists (columns) -> dict :
+    """Same checks as check_arrays on list columns, one row at a time"""
+    errors = {check : [] for check in check_messages}
+    for row, code in enumerate(columns["type"]) :
+        if code < 0 :
+            errors["unknown_type"].append(row)
+            continue
+        if code == matrix_code :
+            continue
+        has_min, has_max = columns["has_min"][row], columns["has_max"][row]
+        minimum, maximum = columns["min"][row], columns["max"][row]
+        defaut_value, value = columns["defaut"][row], columns["value"][row]
+        type_lower, type_upper = type_bounds(mattr.attribut_type[code])
+        if has_min and has_max and minimum > maximum :
+            errors["limits_order"].append(row)
+            continue
+        if type_lower > -infinity :
+            if (has_min and minimum < type_lower) or (has_max and maximum > type_upper) :
+                errors["integer_range"].append(row)
+            if any(item == item and item != round(item) for item in (defaut_value, value)) :
+                errors["not_integer"].append(row)
+        lower = max(minimum, type_lower) if has_min else type_lower
+        upper = min(maximum, type_upper) if has_max else type_upper
+        if defaut_value < lower or defaut_value > upper :
+            errors["defaut_range"].append(row)
+        if value < lower or value > upper :
+            errors["value_range"].append(row)
+    return errors
+
+def clamped_values (columns, rows) -> dict :
+    """
+    Defaut values and values of rows moved inside limits and type range, integer types rounded
+
+    Returns :
+        {row : (defaut value, value)}, nan for fields that can not be clamped
+    """
+    clamped = {}
+    for row in rows :
+        code = columns["type"][row]
+        type_lower, type_upper = type_bounds(mattr.attribut_type[code])
+        lower = max(float(columns["min"][row]), type_lower) if columns["has_min"][row] else type_lower
+        upper = min(float(columns["max"][row]), type_upper) if columns["has_max"][row] else type_upper
+        fields = []
+        for name in ("defaut", "value") :
+            item = float(columns[name][row])
+            if item == item :
+                item = min(max(item, lower), upper)
+                if type_lower > -infinity :
+                    item = float(round(item))
+            fields.append(item)
+        clamped[row] = tuple(fields)
+    return clamped
+
+
+#######################################################################################################################
+#                Report
+#######################################################################################################################
+
+class RangeReport () :
+    """
+    Errors of a range check.
+
+    errors holds row indices in checked attribut list, by check name (see check_messages),
+    found before clamping. An attribut can fail more than one check.
+    """
+
+    def __init__ (self, attributs, errors) -> None :
+        self.attributs: list = attributs
+        # {check : [rows]}
+        self.errors: dict = errors
+        # Attributs edited by clamp, [(Attribut, field, old value, new value)]
+        self.clamped: list = []
+
+    def __bool__ (self) -> bool :
+        """True when every attribut passed"""
+        return not self.count
+
+    def __len__ (self) -> int :
+        return len(self.attributs)
+
+    @property
+    def count (self) -> int :
+        return sum(len(rows) for rows in self.errors.values())
+
+    def rows (self) -> set :
+        """Rows failing at least one check"""
+        return {row for rows in self.errors.values() for row in rows}
+
+    def items (self) :
+        """
+        Yields :
+            (Attribut, check, message) of each error
+        """
+        for check, rows in self.errors.items() :
+            for row in rows :
+                attr_class = self.attributs[row]
+                fields = {field : getattr(attr_class, field) for field in column_fields}
+                yield attr_class, check, check_messages[check].format(**fields)
+
+    def problems (self, checks = None) -> list :
+        """[(attribut name, message)] like transaction.validate, only checks in checks if given"""
+        return [
+            (attr_class.long_name, message) for attr_class, check, message in self.items()
+            if checks is None or check in checks
+            ]
+
+    def summary (self) -> dict :
+        """{check : error count}"""
+        return {check : len(rows) for check, rows in self.errors.items()}
+
+
+def shared_table (attributs) -> object :
+    """AttributTable holding every attribut, None if attributs are not all views of one table"""
+    try :
+        tables = set(map(attrgetter("table"), attributs))
+    except AttributeError :
+        return None
+    return tables.pop() if len(tables) == 1 else None
+
+@operation("check_ranges")
+def check_ranges (attributs, clamp = False) -> RangeReport :
+    """
+    Check types, limits, defaut values and values of many attributs in one pass
+
+    Attributs sharing one AttributTable are read from table columns, other attributs
+    are read field by field. Lazy attributs load their missing fields, prefetch them first
+    (see range_groups).
+
+    Keywords:
+        attributs -- Attribut or TableAttribut objects
+        clamp -- move defaut values and values out of range inside limits and integer type range.
+            Edited with set_field, clamped attributs are commited as any edit
+
+    Returns :
+        RangeReport
+    """
+    attributs = list(attributs)
+    table = shared_table(attributs)
+    if numpy is not None and table is not None :
+        columns = table_columns(table, list(map(attrgetter("row"), attributs)))
+    else :
+        columns = attribut_columns(attributs)
+
+    errors = check_arrays(columns) if numpy is not None else check_lists(columns)
+    report = RangeReport(attributs, errors)
+
+    if clamp :
+        rows = sorted(set(errors["defaut_range"]) | set(errors["value_range"]) | set(errors["not_integer"]))
+        for row, (defaut_value, value) in clamped_values(columns, rows).items() :
+            attr_class = attributs[row]
+            for field, new_value in (("defaut_value", defaut_value), ("value", value)) :
+                old_value = getattr(attr_class, field)
+                if new_value != new_value or new_value == old_value :
+                    continue
+                if attr_class.attribute_type == "bool" :
+                    new_value = bool(new_value)
+                elif attr_class.attribute_type in integer_ranges :
+                    new_value = int(new_value)
+                attr_class.set_field(field, new_value)
+                report.clamped.append((attr_class, field, old_value, new_value))
+    return report
@@ -0,0 +1,398 @@
+"""
+Custom attribut values over a frame range. Numeric attributs of one or many nodes are read
+in a few time based queries and stored in a frames x attributs array (numpy when it is
+installed, lists of rows otherwise), arrays are written back as keys.
+Samples are kept on each MayaObject until the attribut changes.
+@autor : Nathan Boyaval
+@Version : 0.0.4
+@Update : 2025/02/19
+"""
+
+try :
+    import numpy
+except ImportError :
+    numpy = None
+
+from nb_attribut_control import snapshot as snap
+from nb_attribut_control.instrument import operation
+
+# Attribut types with one numeric value
+sampled_types: set = {
+    "bool", "long", "short", "byte", "char", "enum", "float", "double", "doubleAngle", "doubleLinear",
+    }
+integer_types: set = {"bool", "long", "short", "byte", "char", "enum"}
+# Anim curves driven by time, read with one keyframe query.
+# Set driven key curves and other inputs are read frame by frame
+time_curve_types: list = ["animCurveTA", "animCurveTL", "animCurveTT", "animCurveTU"]
+
+
+def frame_range (start, end, step = 1.0) -> list :
+    """Frames from start to end included, "frame_range(1, 3)" -> [1.0, 2.0, 3.0]"""
+    if step <= 0 :
+        raise ValueError ("Frame step needs to be positive, got {}".format(step))
+    count = int((end - start) / step + 1e-9) + 1 if end >= start else 0
+    return [start + index * step for index in range(count)]
+
+def reduce_keys (frames, values, linear = True, tolerance = 1e-9) -> list :
+    """
+    (frame, value) keys that linear keys need to give values back on every frame
+
+    Keywords:
+        linear -- skip keys on the line between kept keys, else only keys equal to both neighbours
+        tolerance -- allowed distance to the line, relative to values above 1
+    """
+    last = len(values) - 1
+    keys = []
+    for index, value in enumerate(values) :
+        if index in (0, last) :
+            keys.append((frames[index], value))
+        elif not linear :
+            if value != values[index - 1] or value != values[index + 1] :
+                keys.append((frames[index], value))
+        else :
+            # Next value from line between last kept key and this one
+            key_frame, key_value = keys[-1]
+            slope = (value - key_value) / (frames[index] - key_frame)
+            expected = value + slope * (frames[index + 1] - frames[index])
+            if abs(expected - values[index + 1]) > tolerance * max(1.0, abs(values[index + 1])) :
+                keys.append((frames[index], value))
+    return keys
+
+
+class Samples () :
+    """
+    Values of attributs over frames
+
+    Attributes :
+        frames -- [frame]
+        names -- [attribut name], "node.attribut" plugs when sampled on many nodes
+        values -- frames x attributs numpy array of floats, list of rows without numpy
+    """
+
+    def __init__ (self, frames, names, columns) -> None :
+        self.frames: list = list(frames)
+        self.names: list = list(names)
+        if numpy is not None :
+            self.values = numpy.array(columns, dtype = float).reshape(len(self.names), len(self.frames)).T
+        else :
+            self.values = [list(row) for row in zip(*columns)] if columns else [[] for frame in self.frames]
+
+    def __len__ (self) -> int :
+        return len(self.frames)
+
+    def column (self, name) -> list :
+        """Values of an attribut on every frame"""
+        index = self.names.index(name)
+        if numpy is not None :
+            return self.values[:, index].tolist()
+        return [row[index] for row in self.values]
+
+    def columns (self) -> dict :
+        """{name : values on every frame}"""
+        return {name : self.column(name) for name in self.names}
+
+
+#######################################################################################################################
+#                Samplers
+#######################################################################################################################
+
+class CmdsSampler () :
+    """
+    Read and write attributs over frames with maya.cmds.
+
+    Attributs keyed with a time curve are read with one keyframe query for every curve,
+    other driven attributs with one getAttr per frame. Keys are written with one
+    setKeyframe per key, in the caller undo chunk.
+    """
+
+    name: str = "cmds"
+
+    def supports (self, backend) -> bool :
+        """Return True if sampler can use backend"""
+        return True
+
+    def evaluate_curves (self, curves, frames, cmds) -> dict :
+        """
+        Values of time anim curves on frames
+
+        Returns :
+            {curve : [value on each frame]}
+        """
+        if not curves :
+            return {}
+        times = [(frame, frame) for frame in frames]
+        # keyframe returns values curve by curve, frame by frame
+        values = cmds.keyframe(curves, query = True, eval = True, time = times) or []
+        count = len(frames)
+        if len(values) != len(curves) * count :
+            return {curve : cmds.keyframe(curve, query = True, eval = True, time = times) or [] for curve in curves}
+        return {curve : values[index * count:(index + 1) * count] for index, curve in enumerate(curves)}
+
+    def sample_plug (self, plug, frames, cmds) -> list :
+        """Values of a driven plug on frames, evaluated by maya frame by frame"""
+        return [float(cmds.getAttr(plug, time = frame)) for frame in frames]
+
+    def write_keys (self, plug, keys, attribute_type, cmds) -> int :
+        """
+        Replace keys of a plug between first and last key frames
+
+        Keywords:
+            keys -- [(frame, value)]
+            attribute_type -- integer attributs get step keys, others linear keys
+
+        Returns :
+            count of maya commands called
+        """
+        out_tangent = "step" if attribute_type in integer_types else "linear"
+        cmds.cutKey(plug, time = (keys[0][0], keys[-1][0]), clear = True)
+        for frame, value in keys :
+            cmds.setKeyframe(plug, time = frame, value = value, inTangentType = "linear", outTangentType = out_tangent)
+        return len(keys) + 1
+
+
+class ApiSampler (CmdsSampler) :
+    """
+    Write keys with maya OpenMayaAnim, one addKeys call for each attribut.
+    Old keys are cut with cmds, added keys are not in maya undo queue.
+    """
+
+    name: str = "api"
+
+    def supports (self, backend) -> bool :
+        """OpenMaya can only write in a maya session"""
+        return backend.name == "maya"
+
+    def write_keys (self, plug, keys, attribute_type, cmds) -> int :
+        import maya.api.OpenMaya as om2
+        import maya.api.OpenMayaAnim as om2anim
+
+        cmds.cutKey(plug, time = (keys[0][0], keys[-1][0]), clear = True)
+        selection = om2.MSelectionList()
+        selection.add(plug)
+        maya_plug = selection.getPlug(0)
+        curve_fn = om2anim.MFnAnimCurve()
+        curves = om2anim.MAnimUtil.findAnimation(maya_plug)
+        if curves :
+            curve_fn.setObject(curves[0])
+        else :
+            curve_fn.create(maya_plug)
+
+        # Curves store internal units
+        if attribute_type == "doubleAngle" :
+            unit = om2.MAngle.uiUnit()
+            convert = lambda value : om2.MAngle(value, unit).asRadians()
+        elif attribute_type == "doubleLinear" :
+            unit = om2.MDistance.uiUnit()
+            convert = lambda value : om2.MDistance(value, unit).asCentimeters()
+        else :
+            convert = float
+        time_unit = om2.MTime.uiUnit()
+        times = om2.MTimeArray()
+        values = om2.MDoubleArray()
+        for frame, value in keys :
+            times.append(om2.MTime(frame, time_unit))
+            values.append(convert(value))
+        out_tangent = om2anim.MFnAnimCurve.kTangentStep if attribute_type in integer_types else om2anim.MFnAnimCurve.kTangentLinear
+        curve_fn.addKeys(times, values, om2anim.MFnAnimCurve.kTangentLinear, out_tangent, True)
+        return 2
+
+
+samplers: dict = {
+    CmdsSampler.name : CmdsSampler,
+    ApiSampler.name : ApiSampler,
+    }
+default_sampler: CmdsSampler = CmdsSampler()
+current_sampler: list = [default_sampler]
+
+def set_sampler (name) -> object :
+    """Set sampler used to read and write attributs over frames (see samplers)"""
+    try :
+        current_sampler[0] = samplers[name]()
+    except KeyError :
+        raise ValueError ("Unknown sampler {}; Available : {}".format(name, list(samplers)))
+    return current_sampler[0]
+
+def get_sampler (backend) -> object :
+    """Current sampler, cmds sampler if current one can not use backend"""
+    sampler = current_sampler[0]
+    return sampler if sampler.supports(backend) else default_sampler
+
+
+#######################################################################################################################
+#                Sample
+#######################################################################################################################
+
+def sampled_attributs (maya_object, names = None) -> list :
+    """Numeric Attribut objects of a MayaObject, names order or MayaObject order"""
+    if names is None :
+        names = maya_object.custom_attributs
+    attr_classes = [maya_object.get_attribut_object(name) for name in names]
+    return [
+        attr_class for attr_class in attr_classes
+        if attr_class is not None and attr_class.attribute_type in sampled_types
+        ]
+
+def cached_column (maya_object, attr_class, frames_key) -> list or None :
+    """
+    Cached values of an attribut, None if frames differ or attribut changed since it was sampled :
+    edited, commited, created again, or its value or connections were read again (see Attribut.invalidate)
+    """
+    entry = maya_object.sample_cache.get(attr_class.long_name)
+    if entry is None :
+        return None
+    cached_class, cached_frames, sources, value, column = entry
+    if cached_class is not attr_class or cached_frames != frames_key or attr_class.is_dirty() :
+        return None
+    if not attr_class.is_loaded("outcom_connections") or list(attr_class.outcom_connections) != sources :
+        return None
+    if not sources and (not attr_class.is_loaded("value") or attr_class.value != value) :
+        return None
+    return column
+
+def load_inputs (maya_object, attr_classes) -> None :
+    """
+    Load connections of attributs with the two node level queries of the snapshot loader,
+    names are not read again
+    """
+    attr_classes = [attr_class for attr_class in attr_classes if not attr_class.is_loaded("outcom_connections")]
+    if not attr_classes :
+        return
+    node = maya_object.object_name
+    cmds = maya_object.cmds
+    destinations = snap.split_connections(node, cmds.listConnections(
+        node, connections = True, plugs = True, destination = True, source = False
+        ))
+    sources = snap.split_connections(node, cmds.listConnections(
+        node, connections = True, plugs = True, destination = False, source = True
+        ))
+    for attr_class in attr_classes :
+        attr_class.set_prefetched({
+            "incom_connections" : destinations.get(attr_class.committed_name, ()),
+            "outcom_connections" : sources.get(attr_class.committed_name, ()),
+            })
+
+@operation("sample_attributs")
+def sample_objects (maya_objects, frames, names = None, plugs = False) -> Samples :
+    """
+    Read numeric custom attributs of MayaObjects on frames.
+
+    Attributs without input keep their value, attributs keyed with time curves are read with one
+    keyframe query for every curve, other driven attributs with one getAttr per frame.
+    Keys edited in maya after sampling are not seen, see clear_samples.
+
+    Keywords:
+        maya_objects -- MayaObject, sharing one backend
+        frames -- [frame], see frame_range
+        names -- attribut names to read on each object, every numeric custom attribut if None
+        plugs -- name columns "node.attribut" instead of attribut names
+
+    Returns :
+        Samples
+    """
+    frames = [float(frame) for frame in frames]
+    frames_key = tuple(frames)
+    columns = {}
+    labels = []
+    missing = []
+    for maya_object in maya_objects :
+        for attr_class in sampled_attributs(maya_object, names) :
+            label = "{}.{}".format(maya_object.object_name, attr_class.long_name) if plugs else attr_class.long_name
+            labels.append(label)
+            column = cached_column(maya_object, attr_class, frames_key)
+            if column is None :
+                missing.append((maya_object, attr_class, label))
+            else :
+                columns[label] = column
+    if not missing :
+        return Samples(frames, labels, [columns[label] for label in labels])
+
+    # Inputs of attributs to read, two queries per node
+    by_object = {}
+    for maya_object, attr_class, label in missing :
+        by_object.setdefault(maya_object, []).append(attr_class)
+    for maya_object, attr_classes in by_object.items() :
+        load_inputs(maya_object, attr_classes)
+    cmds = missing[0][0].cmds
+    # Attributs without input keep their value, one getAttr if not loaded
+    for maya_object, attr_class, label in missing :
+        if not attr_class.outcom_connections and not attr_class.is_loaded("value") :
+            attr_class.set_prefetched({
+                "value" : cmds.getAttr("{}.{}".format(maya_object.object_name, attr_class.committed_name)),
+                })
+    sampler = get_sampler(cmds)
+    sources = [attr_class.outcom_connections[0] for maya_object, attr_class, label in missing if attr_class.outcom_connections]
+    curves = []
+    if sources :
+        curves = cmds.ls([source.split(".", 1)[0] for source in sources], type = time_curve_types) or []
+    curve_values = sampler.evaluate_curves(curves, frames, cmds)
+
+    for maya_object, attr_class, label in missing :
+        inputs = list(attr_class.outcom_connections)
+        value = None
+        if not inputs :
+            value = attr_class.value
+            column = [float(value)] * len(frames)
+        elif inputs[0].split(".", 1)[0] in curve_values :
+            column = [float(item) for item in curve_values[inputs[0].split(".", 1)[0]]]
+            # Curves give floats, maya rounds them on integer attributs
+            if attr_class.attribute_type in integer_types :
+                column = [float(round(item)) for item in column]
+        else :
+            column = sampler.sample_plug("{}.{}".format(maya_object.object_name, attr_class.long_name), frames, cmds)
+        maya_object.sample_cache[attr_class.long_name] = (attr_class, frames_key, inputs, value, column)
+        columns[label] = column
+    return Samples(frames, labels, [columns[label] for label in labels])
+
+@operation("write_keys")
+def write_objects (maya_objects, samples, names = None, reduce = True, undo_chunk = True) -> int :
+    """
+    Write sampled values as keys, keys between first and last frames are replaced
+
+    Keywords:
+        maya_objects -- MayaObject, sharing one backend
+        samples -- Samples, columns named by attribut or by "node.attribut" plug
+        names -- columns to write, every column if None
+        reduce -- only write keys needed to give back every sampled value, see reduce_keys
+        undo_chunk -- open an undo chunk, False when caller already opened one
+
+    Returns :
+        count of maya commands called
+    """
+    objects = {maya_object.object_name : maya_object for maya_object in maya_objects}
+    single = maya_objects[0] if len(maya_objects) == 1 else None
+    targets = []
+    for name in names if names is not None else samples.names :
+        if single is not None and name in single.attributs :
+            maya_object, attribut = single, name
+        else :
+            node, _, attribut = name.partition(".")
+            maya_object = objects.get(node)
+        attr_class = maya_object.get_attribut_object(attribut) if maya_object is not None else None
+        if attr_class is None or attr_class.attribute_type not in sampled_types :
+            raise ValueError ("{} is not a numeric attribut of sampled objects".format(name))
+        targets.append((maya_object, attr_class, samples.column(name)))
+    if not targets or not samples.frames :
+        return 0
+
+    cmds = targets[0][0].cmds
+    sampler = get_sampler(cmds)
+    command_count = 0
+    if undo_chunk :
+        cmds.undoInfo(openChunk = True, chunkName = "write_keys")
+    try :
+        for maya_object, attr_class, values in targets :
+            if attr_class.attribute_type in integer_types :
+                values = [int(round(value)) for value in values]
+            if reduce :
+                keys = reduce_keys(samples.frames, values, attr_class.attribute_type not in integer_types)
+            else :
+                keys = list(zip(samples.frames, values))
+            plug = "{}.{}".format(maya_object.object_name, attr_class.long_name)
+            command_count += sampler.write_keys(plug, keys, attr_class.attribute_type, cmds)
+            # Attribut is keyed now, value and inputs are read again
+            maya_object.sample_cache.pop(attr_class.long_name, None)
+            attr_class.invalidate(("value", "connections"))
+    finally :
+        if undo_chunk :
+            cmds.undoInfo(closeChunk = True)
+    return command_count
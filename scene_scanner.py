@@ -0,0 +1,232 @@
+"""
+Scene wide custom attributs index.
+Scan controls once, then find which nodes carry an attribut and where attribut
+definitions differ without building MayaObject for each node.
+@autor : Nathan Boyaval
+@Version : 0.0.4
+@Update : 2025/02/19
+"""
+
+import fnmatch
+
+from nb_attribut_control import manage_attr as mattr
+from nb_attribut_control import snapshot as snap
+from nb_attribut_control.backend import get_backend
+from nb_attribut_control.instrument import operation
+
+# Fields read by a scan, enough to compare attribut definitions
+scan_fields: tuple = ("names", "defaut", "limits", "enum")
+# Attribut definition, values in this order
+signature_fields: tuple = (
+    "attribute_type", "defaut_value", "has_min_value", "min_value", "has_max_value", "max_value", "enum_list",
+    )
+
+def make_signature (attr_snapshot) -> tuple :
+    """Hashable attribut definition from a snapshot dict"""
+    return tuple(
+        tuple(value) if isinstance(value, list) else value
+        for value in (attr_snapshot.get(field) for field in signature_fields)
+        )
+
+def signature_dict (signature) -> dict :
+    """Readable attribut definition"""
+    return dict(zip(signature_fields, signature))
+
+def group_definitions (items) -> dict :
+    """
+    Keep attributs defined in more than one way
+
+    Keywords:
+        items -- [(attribut name, {signature : nodes})]
+
+    Returns :
+        {attribut name : {signature : sorted nodes}}
+    """
+    return {
+        attribut : {signature : sorted(nodes) for signature, nodes in definitions.items()}
+        for attribut, definitions in items if len(definitions) > 1
+        }
+
+
+class SceneScanner () :
+    """
+    Inverted index of custom attributs over many nodes.
+
+    Maya is only read by scan and rescan, in chunks of nodes. Queries only read the
+    index, in caller thread : comparisons are python work a thread pool would not speed up,
+    and maya commands can only run in main thread.
+    """
+
+    def __init__ (
+        self, backend = None, node_types = ("transform",), chunk_size = 500, user_defined = True,
+        ) -> None :
+        """
+        Keywords:
+            backend -- maya commands backend, current backend if None
+            node_types -- node types scanned when no node list is given
+            chunk_size -- nodes read between two progress callbacks, and checked with one ls
+            user_defined -- use maya user defined attribut list, or compare with built-in
+                attributs cached by node type (see manage_attr.get_custom_attr_names)
+        """
+        self.cmds = backend or get_backend()
+        self.node_types = node_types
+        self.chunk_size = chunk_size
+        self.user_defined = user_defined
+        # {node : {attribut name : signature}}
+        self.definitions: dict = {}
+        # {attribut name : set of nodes}
+        self.nodes_by_attribut: dict = {}
+        # {attribut name : {signature : set of nodes}}
+        self.nodes_by_signature: dict = {}
+        # Called with (scanned node count, total node count) after each chunk
+        self.progress_callbacks: list = []
+
+    def __len__ (self) -> int :
+        return len(self.definitions)
+
+    def __contains__ (self, attribut) -> bool :
+        return attribut in self.nodes_by_attribut
+
+    #######################################################################################################################
+    #                Scan
+    #######################################################################################################################
+    @operation("scene_scan")
+    def scan (self, nodes = None) -> int :
+        """
+        Index custom attributs of nodes, index is cleared first
+
+        Keywords:
+            nodes -- nodes to scan, every node of node_types if None
+
+        Returns :
+            count of scanned nodes
+        """
+        if nodes is None :
+            nodes = self.cmds.ls(type = list(self.node_types)) or []
+        self.definitions = {}
+        self.nodes_by_attribut = {}
+        self.nodes_by_signature = {}
+        return self.rescan(nodes)
+
+    def rescan (self, nodes) -> int :
+        """Index nodes again, other nodes keep their entries. Deleted nodes are removed"""
+        nodes = list(dict.fromkeys(nodes))
+        for start in range(0, len(nodes), self.chunk_size) :
+            chunk = nodes[start : start + self.chunk_size]
+            # One ls for the chunk, names listed differently (dag paths) are checked one by one
+            existing = set(self.cmds.ls(chunk) or [])
+            for node in chunk :
+                if node not in existing and not self.cmds.objExists(node) :
+                    self.remove_node(node)
+                    continue
+                attributs = None
+                if not self.user_defined :
+                    attributs = mattr.get_custom_attr_names(node, False, self.cmds)
+                self.update_node(node, snap.load_node_snapshot(node, attributs, self.cmds, scan_fields))
+            for callback in self.progress_callbacks :
+                callback(min(start + self.chunk_size, len(nodes)), len(nodes))
+        return len(nodes)
+
+    def update_node (self, node, node_snapshot) -> None :
+        """Replace node entries with a snapshot (see snapshot.load_node_snapshot)"""
+        self.remove_node(node)
+        definitions = {attr : make_signature(attr_snapshot) for attr, attr_snapshot in node_snapshot.items()}
+        self.definitions[node] = definitions
+        for attr, signature in definitions.items() :
+            self.nodes_by_attribut.setdefault(attr, set()).add(node)
+            self.nodes_by_signature.setdefault(attr, {}).setdefault(signature, set()).add(node)
+
+    def remove_node (self, node) -> None :
+        """Remove node entries, do nothing if node was not scanned"""
+        definitions = self.definitions.pop(node, None)
+        if not definitions :
+            return
+        for attr, signature in definitions.items() :
+            nodes = self.nodes_by_attribut[attr]
+            nodes.discard(node)
+            if not nodes :
+                del self.nodes_by_attribut[attr]
+            signatures = self.nodes_by_signature[attr]
+            signatures[signature].discard(node)
+            if not signatures[signature] :
+                del signatures[signature]
+            if not signatures :
+                del self.nodes_by_signature[attr]
+
+    #######################################################################################################################
+    #                Queries
+    #######################################################################################################################
+    def attribut_names (self, pattern = "*") -> list :
+        """Indexed attribut names matching a glob pattern"""
+        if not any(char in pattern for char in "*?[") :
+            return [pattern] if pattern in self.nodes_by_attribut else []
+        return fnmatch.filter(self.nodes_by_attribut, pattern)
+
+    def find (self, pattern) -> list :
+        """Sorted nodes carrying an attribut matching a glob pattern ("ikFkSwitch", "*Switch")"""
+        nodes = set()
+        for attr in self.attribut_names(pattern) :
+            nodes |= self.nodes_by_attribut[attr]
+        return sorted(nodes)
+
+    def find_definition (self, attribut, **fields) -> list :
+        """
+        Sorted nodes where attribut definition matches fields
+
+            scanner.find_definition("ikFkSwitch", attribute_type = "double", max_value = 1.0)
+        """
+        nodes = set()
+        for signature, signature_nodes in self.nodes_by_signature.get(attribut, {}).items() :
+            definition = signature_dict(signature)
+            if all(definition[field] == value for field, value in fields.items()) :
+                nodes |= signature_nodes
+        return sorted(nodes)
+
+    def definitions_of (self, attribut) -> dict :
+        """{signature : sorted nodes} of one attribut"""
+        return {
+            signature : sorted(nodes)
+            for signature, nodes in self.nodes_by_signature.get(attribut, {}).items()
+            }
+
+    def diff_definitions (self, node, other_node) -> dict :
+        """
+        Compare custom attributs of two scanned nodes
+
+        Returns :
+            {attribut name : (definition on node or None, definition on other_node or None)},
+            only attributs missing on one node or defined differently
+        """
+        definitions = self.definitions.get(node, {})
+        other_definitions = self.definitions.get(other_node, {})
+        diff = {}
+        for attr in list(definitions) + [attr for attr in other_definitions if attr not in definitions] :
+            signature = definitions.get(attr)
+            other_signature = other_definitions.get(attr)
+            if signature != other_signature :
+                diff[attr] = (
+                    signature_dict(signature) if signature else None,
+                    signature_dict(other_signature) if other_signature else None,
+                    )
+        return diff
+
+    def diff_against (self, reference, nodes = None) -> dict :
+        """
+        Compare nodes with a reference node
+
+        Returns :
+            {node : diff_definitions(reference, node)}, nodes without difference are skipped
+        """
+        if nodes is None :
+            nodes = [node for node in self.definitions if node != reference]
+        diffs = ((node, self.diff_definitions(reference, node)) for node in nodes)
+        return {node : diff for node, diff in diffs if diff}
+
+    def inconsistent (self, pattern = "*") -> dict :
+        """
+        Attributs defined in more than one way across nodes
+
+        Returns :
+            {attribut name : {signature : sorted nodes}}
+        """
+        return group_definitions((attr, self.nodes_by_signature[attr]) for attr in self.attribut_names(pattern))
@@ -0,0 +1,263 @@
+"""
+Custom attributs layout of controls : names, types, limits, defaut values, states,
+enum lists and order. Saved as readable json or compact binary, and applied on many
+nodes.
+@autor : Nathan Boyaval
+@Version : 0.0.4
+@Update : 2025/02/19
+"""
+
+import contextlib
+import json
+import struct
+
+from nb_attribut_control.instrument import operation
+
+# Attribut fields saved in a schema, in this order
+schema_fields: tuple = (
+    "long_name", "nice_name", "short_name", "attribute_type", "enum_list",
+    "defaut_value", "has_min_value", "min_value", "has_max_value", "max_value",
+    "in_channel_box", "keyable", "locked",
+    )
+# Field groups needed by a schema (see snapshot.field_groups)
+schema_groups: tuple = ("names", "defaut", "limits", "enum", "flags")
+
+# Binary format :
+#   header       magic, version
+#   records      one type byte, then
+#       S  string     length (uint32), utf8 bytes. Strings get ids in order of appearance
+#       N  node       node name string id, attribut count
+#       A  attribut   5 string ids (names, type, enum), flag bits, defaut, minimum, maximum
+# Strings are written before the first record using them, a reader only keeps the string table.
+binary_magic: bytes = b"NBAS"
+binary_version: int = 1
+header_struct = struct.Struct("<4sH")
+string_struct = struct.Struct("<I")
+node_struct = struct.Struct("<II")
+attribut_struct = struct.Struct("<5IB3d")
+string_fields: tuple = ("long_name", "nice_name", "short_name", "attribute_type", "enum_list")
+flag_bits: dict = {
+    "has_max_value" : 1,
+    "has_min_value" : 2,
+    "in_channel_box" : 4,
+    "keyable" : 8,
+    "locked" : 16,
+    }
+# Defaut value is not a number (matrix, string)
+no_defaut_bit: int = 32
+
+
+#######################################################################################################################
+#                Schema dicts
+#######################################################################################################################
+
+def attribut_schema (attr_class) -> dict :
+    """Schema dict of an Attribut, limits are None when attribut has no limit"""
+    schema = {field : getattr(attr_class, field) for field in schema_fields}
+    for limit, state in (("min_value", "has_min_value"), ("max_value", "has_max_value")) :
+        schema[state] = bool(schema[state])
+        schema[limit] = float(schema[limit]) if schema[state] and schema[limit] is not None else None
+    for field in ("in_channel_box", "keyable", "locked") :
+        schema[field] = bool(schema[field])
+    schema["enum_list"] = schema["enum_list"] or ""
+    # Matrix and string defauts are not saved
+    defaut_value = schema["defaut_value"]
+    schema["defaut_value"] = float(defaut_value) if isinstance(defaut_value, (int, float)) else None
+    return schema
+
+def object_schema (maya_object) -> dict :
+    """
+    Schema dict of a MayaObject, attributs in MayaObject order
+
+    Returns :
+        {"node" : object name, "attributs" : [attribut schema dicts]}
+    """
+    # One snapshot for every field a lazy object did not load yet
+    maya_object.prefetch(schema_groups)
+    return {
+        "node" : maya_object.object_name,
+        "attributs" : [attribut_schema(attr_class) for attr_class in maya_object.attributs.values()],
+        }
+
+@contextlib.contextmanager
+def open_file (path_or_file, mode) :
+    """Open a path, or use an already open file object as is"""
+    if hasattr(path_or_file, "read") or hasattr(path_or_file, "write") :
+        yield path_or_file
+        return
+    with open(path_or_file, mode) as file_ :
+        yield file_
+
+
+#######################################################################################################################
+#                Json
+#######################################################################################################################
+
+def write_json (schemas, path_or_file) -> None :
+    """Write node schemas as a readable json list"""
+    with open_file(path_or_file, "w") as file_ :
+        json.dump(list(schemas), file_, indent = 2)
+
+def read_json (path_or_file) -> list :
+    """Read node schemas written by write_json"""
+    with open_file(path_or_file, "r") as file_ :
+        return json.load(file_)
+
+
+#######################################################################################################################
+#                Binary
+#######################################################################################################################
+
+class BinaryWriter () :
+    """Write node schemas one at a time in binary format"""
+
+    def __init__ (self, file_) -> None :
+        self.file = file_
+        self.string_ids: dict = {}
+        self.file.write(header_struct.pack(binary_magic, binary_version))
+
+    def string_id (self, string) -> int :
+        """Id of a string, written first if new"""
+        string_id = self.string_ids.get(string)
+        if string_id is None :
+            string_id = self.string_ids[string] = len(self.string_ids)
+            data = string.encode("utf-8")
+            self.file.write(b"S")
+            self.file.write(string_struct.pack(len(data)))
+            self.file.write(data)
+        return string_id
+
+    def write (self, schema) -> None :
+        """Write one node schema dict"""
+        attributs = schema["attributs"]
+        node_id = self.string_id(schema["node"])
+        self.file.write(b"N")
+        self.file.write(node_struct.pack(node_id, len(attributs)))
+        for attribut in attributs :
+            string_ids = [self.string_id(attribut[field] or "") for field in string_fields]
+            flags = 0
+            for field, bit in flag_bits.items() :
+                if attribut[field] :
+                    flags |= bit
+            defaut_value = attribut["defaut_value"]
+            if defaut_value is None :
+                flags |= no_defaut_bit
+            self.file.write(b"A")
+            self.file.write(attribut_struct.pack(
+                *string_ids, flags, defaut_value or 0.0, attribut["min_value"] or 0.0, attribut["max_value"] or 0.0,
+                ))
+
+def write_binary (schemas, path_or_file) -> None :
+    """Write node schemas in binary format, schemas can be any iterable"""
+    with open_file(path_or_file, "wb") as file_ :
+        writer = BinaryWriter(file_)
+        for schema in schemas :
+            writer.write(schema)
+
+def iter_binary (path_or_file) :
+    """
+    Read node schemas one at a time from a binary file, only the string table stays in memory
+
+    Yields :
+        node schema dicts
+    """
+    with open_file(path_or_file, "rb") as file_ :
+        magic, version = header_struct.unpack(file_.read(header_struct.size))
+        if magic != binary_magic :
+            raise ValueError ("Not an attribut schema file")
+        if version > binary_version :
+            raise ValueError ("Schema file version {} is newer than {}".format(version, binary_version))
+
+        strings = []
+        schema = None
+        remaining = 0
+        while True :
+            record = file_.read(1)
+            if not record :
+                break
+            if record == b"S" :
+                length, = string_struct.unpack(file_.read(string_struct.size))
+                strings.append(file_.read(length).decode("utf-8"))
+            elif record == b"N" :
+                node_id, remaining = node_struct.unpack(file_.read(node_struct.size))
+                schema = {"node" : strings[node_id], "attributs" : []}
+                if not remaining :
+                    yield schema
+            elif record == b"A" :
+                values = attribut_struct.unpack(file_.read(attribut_struct.size))
+                flags = values[5]
+                attribut = {field : strings[string_id] for field, string_id in zip(string_fields, values[:5])}
+                for field, bit in flag_bits.items() :
+                    attribut[field] = bool(flags & bit)
+                attribut["defaut_value"] = None if flags & no_defaut_bit else values[6]
+                attribut["min_value"] = values[7] if attribut["has_min_value"] else None
+                attribut["max_value"] = values[8] if attribut["has_max_value"] else None
+                schema["attributs"].append({field : attribut[field] for field in schema_fields})
+                remaining -= 1
+                if not remaining :
+                    yield schema
+            else :
+                raise ValueError ("Unknown record {!r} in schema file".format(record))
+
+def read_binary (path_or_file) -> list :
+    """Read every node schema of a binary file"""
+    return list(iter_binary(path_or_file))
+
+
+#######################################################################################################################
+#                Apply
+#######################################################################################################################
+
+def apply_attribut_schema (maya_object, attribut) -> None :
+    """Edit or add one attribut of a MayaObject from an attribut schema dict, not commited"""
+    name = attribut["long_name"]
+    attr_class = maya_object.get_attribut_object(name)
+    if attr_class is None :
+        maya_object.add_attribut(name)
+        attr_class = maya_object.get_attribut_object(name)
+    for field in schema_fields[1:] :
+        value = attribut[field]
+        if value is None and field in ("min_value", "max_value", "defaut_value") :
+            continue
+        attr_class.set_field(field, value)
+
+def order_attributs (maya_object, names) -> None :
+    """Move attributs of a MayaObject to names order, first, other attributs keep their order after them"""
+    for position, name in enumerate(names) :
+        offset = position - maya_object.attributs.position(name)
+        if offset :
+            maya_object.move_attribut(name, offset)
+
+@operation("apply_schema")
+def apply_schema (schema, nodes, backend = None, batch_size = 200, delete_extra = False) -> int :
+    """
+    Apply an attribut schema on many nodes, each batch of nodes is commited in one undo chunk
+
+    Keywords:
+        schema -- node schema dict (see object_schema), its node name is not used
+        nodes -- maya objects to edit
+        backend -- maya commands backend, current backend if None
+        batch_size -- nodes loaded and commited together
+        delete_extra -- delete custom attributs not in schema
+
+    Returns :
+        count of maya commands called
+    """
+    from nb_attribut_control.object_set import MayaObjectSet
+
+    nodes = list(dict.fromkeys(nodes))
+    names = [attribut["long_name"] for attribut in schema["attributs"]]
+    command_count = 0
+    for start in range(0, len(nodes), batch_size) :
+        object_set = MayaObjectSet(nodes[start : start + batch_size], backend = backend, lazy = True)
+        for maya_object in object_set :
+            # Only read fields that a schema can edit
+            maya_object.prefetch(schema_groups)
+            for attribut in schema["attributs"] :
+                apply_attribut_schema(maya_object, attribut)
+            if delete_extra :
+                for name in [name for name in maya_object.custom_attributs if name not in names] :
+                    maya_object.delete_attribut(name)
+            order_attributs(maya_object, names)
+        command_count += object_set.commit()
+    return command_count
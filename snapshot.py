@@ -0,0 +1,481 @@
+"""
+Bulk snapshot of a maya object custom attributs.
+Read every custom attribut of a node in one pass, used to fill Attribut objects.
+@autor : Nathan Boyaval
+@Version : 0.0.4
+@Update : 2025/02/19
+"""
+
+from nb_attribut_control.backend import get_backend
+from nb_attribut_control.instrument import operation
+
+# Attribut fields filled by a snapshot, same names as Attribut class variables
+snapshot_fields: tuple = (
+    "long_name", "nice_name", "short_name",
+    "value", "defaut_value",
+    "has_max_value", "has_min_value", "max_value", "min_value",
+    "enum_list", "attribute_type",
+    "in_channel_box", "keyable", "locked",
+    "incom_connections", "outcom_connections",
+    )
+
+# Fields loaded together, names are always loaded, other groups can be loaded on demand
+field_groups: dict = {
+    "names" : ("long_name", "nice_name", "short_name", "attribute_type"),
+    "value" : ("value",),
+    "defaut" : ("defaut_value",),
+    "limits" : ("has_max_value", "has_min_value", "max_value", "min_value"),
+    "enum" : ("enum_list",),
+    "flags" : ("in_channel_box", "keyable", "locked"),
+    "connections" : ("incom_connections", "outcom_connections"),
+    }
+# {field : group}
+field_group: dict = {field : group for group, fields in field_groups.items() for field in fields}
+
+# Attribut types read with the node level attribut queries, other types are queried one by one
+batched_types: set = {
+    "bool", "long", "short", "byte", "char", "enum", "float", "double", "doubleAngle", "doubleLinear", "matrix",
+    }
+integer_types: set = {"long", "short", "byte", "char", "enum"}
+# Attribut types whose value is not a number : snapshots leave their value out,
+# Attribut reads it with getAttr when first used
+lazy_value_types: set = {"matrix"}
+# Groups read with query_attribut_numbers
+number_groups: set = {"value", "defaut", "limits"}
+
+def resolve_groups (fields = None) -> set :
+    """Convert field and group names to a set of groups, every group if fields is None"""
+    if fields is None :
+        return set(field_groups)
+    groups = {"names"}
+    for field in fields :
+        groups.add(field if field in field_groups else field_group[field])
+    return groups
+
+
+def empty_snapshot (long_name) -> dict :
+    """Return an attribut snapshot with defaut values"""
+    return {
+        "long_name" : long_name,
+        "nice_name" : long_name,
+        "short_name" : long_name,
+        "value" : 0,
+        "defaut_value" : 0,
+        "has_max_value" : False,
+        "has_min_value" : False,
+        "max_value" : None,
+        "min_value" : None,
+        "enum_list" : "",
+        "attribute_type" : "float",
+        "in_channel_box" : False,
+        "keyable" : False,
+        "locked" : False,
+        "incom_connections" : [],
+        "outcom_connections" : [],
+        }
+
+def cast_number (attribute_type, value) :
+    """Number read as float back to attribut type, like getAttr values. None is kept"""
+    if value is None :
+        return None
+    if attribute_type == "bool" :
+        return bool(value)
+    if attribute_type in integer_types :
+        return int(round(value))
+    return value
+
+def first_item (value) :
+    """attributeQuery returns list for single values, get the value itself"""
+    if isinstance(value, (list, tuple)) :
+        return value[0] if value else None
+    return value
+
+def split_connections (node, connections) -> dict :
+    """
+    Convert a flat listConnections(connections = True) result to a dict
+
+    Keywords:
+        node -- maya object connections were listed on
+        connections -- [node.attr, other_plug, node.attr, other_plug, ...]
+
+    Returns :
+        {attribut name : [other plugs]}
+    """
+    connection_dic = {}
+    connections = connections or []
+    for node_plug, other_plug in zip(connections[::2], connections[1::2]) :
+        attr = node_plug.split(".", 1)[-1]
+        connection_dic.setdefault(attr, []).append(other_plug)
+    return connection_dic
+
+
+#######################################################################################################################
+#                Loaders
+#######################################################################################################################
+
+class CmdsSnapshotLoader () :
+    """
+    Snapshot loader using maya.cmds.
+
+    Flags (keyable, locked, channel box) and connections are listed once for the
+    whole node. Names, type, enum, limits, defaut and value are read with the backend
+    node level queries (query_attribut_strings, query_attribut_numbers), they are
+    queried per attribut for other attribut types or backends without these queries.
+    """
+
+    name: str = "cmds"
+
+    def supports (self, backend) -> bool :
+        """Return True if loader can read from backend"""
+        return True
+
+    def load (self, node, attributs = None, backend = None, fields = None) -> dict :
+        """
+        Read custom attributs of a maya object
+
+        Keywords:
+            node -- maya object
+            attributs -- attribut names to read, all user defined attributs if None
+            backend -- maya commands backend, current backend if None
+            fields -- fields or field groups to read (see field_groups), all fields if None.
+                Names are always read
+
+        Returns :
+            {attribut name : snapshot dict}, snapshot dicts only hold read fields
+        """
+        cmds = backend or get_backend()
+        groups = resolve_groups(fields)
+        if attributs is None :
+            attributs = cmds.listAttr(node, userDefined = True) or []
+        if not attributs :
+            return {}
+
+        # Node level queries, one call for all attributs
+        if "flags" in groups :
+            keyable = set(cmds.listAttr(node, userDefined = True, keyable = True) or [])
+            locked = set(cmds.listAttr(node, userDefined = True, locked = True) or [])
+            in_channel_box = set(cmds.listAttr(node, userDefined = True, channelBox = True) or [])
+        if "connections" in groups :
+            destinations = split_connections(node, cmds.listConnections(
+                node, connections = True, plugs = True, destination = True, source = False
+                ))
+            sources = split_connections(node, cmds.listConnections(
+                node, connections = True, plugs = True, destination = False, source = True
+                ))
+
+        snapshot = {}
+        attribut_datas = self.load_attributs(node, attributs, cmds, groups)
+        for attr in attributs :
+            data = attribut_datas[attr]
+            if "flags" in groups :
+                data["keyable"] = attr in keyable
+                data["locked"] = attr in locked
+                data["in_channel_box"] = attr in in_channel_box
+            if "connections" in groups :
+                # Unconnected attributs share one empty tuple
+                data["incom_connections"] = destinations.get(attr, ())
+                data["outcom_connections"] = sources.get(attr, ())
+            snapshot[attr] = data
+
+        return snapshot
+
+    def load_attributs (self, node, attributs, cmds, groups) -> dict :
+        """
+        Query attribut fields that can not be listed for the whole node, with one or two
+        node level queries
+
+        Returns :
+            {attribut name : snapshot dict holding fields of groups}
+        """
+        query_strings = getattr(cmds, "query_attribut_strings", None)
+        if query_strings is None :
+            return {attr : self.load_attribut(node, attr, cmds, groups) for attr in attributs}
+
+        strings = query_strings(node, attributs)
+        numbers = None
+        if groups & number_groups :
+            numbers = cmds.query_attribut_numbers(node, attributs, "value" in groups)
+
+        attribut_datas = {}
+        for index, attr in enumerate(attributs) :
+            attribute_type, nice_name, short_name, enum_list = strings[index * 4:index * 4 + 4]
+            if attribute_type not in batched_types :
+                attribut_datas[attr] = self.load_attribut(node, attr, cmds, groups)
+                continue
+            data = attribut_datas[attr] = self.group_data(attr, groups)
+            if "names" in groups :
+                data["nice_name"] = nice_name
+                data["short_name"] = short_name
+                data["attribute_type"] = attribute_type
+            if attribute_type in lazy_value_types :
+                data.pop("value", None)
+                continue
+            if attribute_type == "enum" and "enum" in groups :
+                data["enum_list"] = enum_list
+            if numbers is None :
+                continue
+
+            value, defaut_value, has_min, min_value, has_max, max_value = numbers[index * 6:index * 6 + 6]
+            # Numbers are floats, they keep getAttr types
+            if "value" in groups :
+                data["value"] = cast_number(attribute_type, value)
+            if "defaut" in groups :
+                data["defaut_value"] = cast_number(attribute_type, defaut_value)
+            if "limits" in groups and attribute_type != "enum" :
+                data["has_min_value"] = bool(has_min)
+                data["has_max_value"] = bool(has_max)
+                if has_min :
+                    data["min_value"] = cast_number(attribute_type, min_value)
+                if has_max :
+                    data["max_value"] = cast_number(attribute_type, max_value)
+        return attribut_datas
+
+    def group_data (self, attr, groups) -> dict :
+        """Empty snapshot holding fields of groups only"""
+        full_data = empty_snapshot(attr)
+        return {field : full_data[field] for group in groups for field in field_groups[group]}
+
+    def load_attribut (self, node, attr, cmds, groups = None) -> dict :
+        """Query attribut fields that can not be listed for the whole node"""
+        if groups is None :
+            groups = set(field_groups)
+        data = self.group_data(attr, groups)
+
+        if "names" in groups :
+            data["nice_name"] = cmds.attributeQuery(attr, node = node, niceName = True)
+            data["short_name"] = cmds.attributeQuery(attr, node = node, shortName = True)
+            attribute_type = data["attribute_type"] = cmds.attributeQuery(attr, node = node, attributeType = True)
+        elif groups & {"value", "defaut", "limits", "enum"} :
+            attribute_type = cmds.attributeQuery(attr, node = node, attributeType = True)
+        else :
+            return data
+
+        if attribute_type in lazy_value_types :
+            data.pop("value", None)
+            return data
+
+        if "value" in groups :
+            data["value"] = cmds.getAttr("{}.{}".format(node, attr))
+        if "defaut" in groups :
+            data["defaut_value"] = cast_number(
+                attribute_type, first_item(cmds.attributeQuery(attr, node = node, listDefault = True)),
+                )
+
+        if attribute_type == "enum" :
+            if "enum" in groups :
+                data["enum_list"] = first_item(cmds.attributeQuery(attr, node = node, listEnum = True)) or ""
+            return data
+
+        if "limits" in groups :
+            data["has_max_value"] = cmds.attributeQuery(attr, node = node, maxExists = True)
+            data["has_min_value"] = cmds.attributeQuery(attr, node = node, minExists = True)
+            if data["has_max_value"] :
+                data["max_value"] = cast_number(attribute_type, first_item(cmds.attributeQuery(attr, node = node, maximum = True)))
+            if data["has_min_value"] :
+                data["min_value"] = cast_number(attribute_type, first_item(cmds.attributeQuery(attr, node = node, minimum = True)))
+
+        return data
+
+
+class ApiSnapshotLoader (CmdsSnapshotLoader) :
+    """
+    Snapshot loader using maya OpenMaya 2.0.
+
+    Attributs are read from their function sets and plugs, no command per field.
+    Only nice names still need a command.
+    """
+
+    name: str = "api"
+
+    numeric_types: dict = {}
+
+    def supports (self, backend) -> bool :
+        """OpenMaya can only read a maya session"""
+        return backend.name == "maya"
+
+    def load (self, node, attributs = None, backend = None, fields = None) -> dict :
+        """Read every field of attributs, fields is ignored as all fields come from one plug"""
+        import maya.api.OpenMaya as om2
+
+        cmds = backend or get_backend()
+
+        if not self.numeric_types :
+            self.numeric_types.update({
+                om2.MFnNumericData.kBoolean : "bool",
+                om2.MFnNumericData.kByte : "byte",
+                om2.MFnNumericData.kChar : "char",
+                om2.MFnNumericData.kShort : "short",
+                om2.MFnNumericData.kLong : "long",
+                om2.MFnNumericData.kInt : "long",
+                om2.MFnNumericData.kFloat : "float",
+                om2.MFnNumericData.kDouble : "double",
+                })
+
+        if attributs is None :
+            attributs = cmds.listAttr(node, userDefined = True) or []
+
+        selection = om2.MSelectionList()
+        selection.add(node)
+        node_fn = om2.MFnDependencyNode(selection.getDependNode(0))
+
+        snapshot = {}
+        for attr in attributs :
+            attr_obj = node_fn.attribute(attr)
+            plug = node_fn.findPlug(attr_obj, False)
+            data = self.read_attribut(om2, attr_obj, plug)
+            if data is None :
+                # Unsupported attribut, use cmds
+                data = CmdsSnapshotLoader.load(self, node, [attr], cmds)[attr]
+            else :
+                data["nice_name"] = cmds.attributeName(plug.name(), nice = True)
+            snapshot[attr] = data
+
+        return snapshot
+
+    def read_attribut (self, om2, attr_obj, plug) -> dict or None :
+        """Read attribut fields from function sets, None if attribut type is not handled"""
+        attr_fn = om2.MFnAttribute(attr_obj)
+        data = empty_snapshot(attr_fn.name)
+        data["short_name"] = attr_fn.shortName
+        data["keyable"] = plug.isKeyable
+        data["locked"] = plug.isLocked
+        data["in_channel_box"] = plug.isChannelBox
+        data["incom_connections"] = [
+            dst.partialName(includeNodeName = True, useLongNames = True) for dst in plug.destinations()
+            ]
+        source = plug.source()
+        if not source.isNull :
+            data["outcom_connections"] = [source.partialName(includeNodeName = True, useLongNames = True)]
+
+        if attr_obj.hasFn(om2.MFn.kEnumAttribute) :
+            enum_fn = om2.MFnEnumAttribute(attr_obj)
+            data["attribute_type"] = "enum"
+            data["value"] = plug.asShort()
+            data["defaut_value"] = enum_fn.default
+            fields = []
+            for index in range(enum_fn.getMin(), enum_fn.getMax() + 1) :
+                try :
+                    fields.append(enum_fn.fieldName(index))
+                except RuntimeError :
+                    continue
+            data["enum_list"] = ":".join(fields)
+
+        elif attr_obj.hasFn(om2.MFn.kNumericAttribute) :
+            numeric_fn = om2.MFnNumericAttribute(attr_obj)
+            attr_type = self.numeric_types.get(numeric_fn.numericType())
+            if attr_type is None :
+                return None
+            data["attribute_type"] = attr_type
+            data["value"] = cast_number(attr_type, plug.asDouble())
+            data["defaut_value"] = cast_number(attr_type, numeric_fn.default)
+            data["has_max_value"] = numeric_fn.hasMax()
+            data["has_min_value"] = numeric_fn.hasMin()
+            if data["has_max_value"] :
+                data["max_value"] = cast_number(attr_type, numeric_fn.getMax())
+            if data["has_min_value"] :
+                data["min_value"] = cast_number(attr_type, numeric_fn.getMin())
+
+        elif attr_obj.hasFn(om2.MFn.kUnitAttribute) :
+            unit_fn = om2.MFnUnitAttribute(attr_obj)
+            if unit_fn.unitType() == om2.MFnUnitAttribute.kAngle :
+                data["attribute_type"] = "doubleAngle"
+                to_ui = lambda angle : angle.asUnits(om2.MAngle.uiUnit())
+                data["value"] = to_ui(plug.asMAngle())
+            elif unit_fn.unitType() == om2.MFnUnitAttribute.kDistance :
+                data["attribute_type"] = "doubleLinear"
+                to_ui = lambda distance : distance.asUnits(om2.MDistance.uiUnit())
+                data["value"] = to_ui(plug.asMDistance())
+            else :
+                return None
+            data["defaut_value"] = to_ui(unit_fn.default)
+            data["has_max_value"] = unit_fn.hasMax()
+            data["has_min_value"] = unit_fn.hasMin()
+            if data["has_max_value"] :
+                data["max_value"] = to_ui(unit_fn.getMax())
+            if data["has_min_value"] :
+                data["min_value"] = to_ui(unit_fn.getMin())
+
+        elif attr_obj.hasFn(om2.MFn.kMatrixAttribute) :
+            data["attribute_type"] = "matrix"
+            del data["value"]
+
+        else :
+            return None
+
+        return data
+
+
+#######################################################################################################################
+#                Loader registry
+#######################################################################################################################
+
+snapshot_loaders: dict = {
+    CmdsSnapshotLoader.name : CmdsSnapshotLoader,
+    ApiSnapshotLoader.name : ApiSnapshotLoader,
+    }
+default_loader: CmdsSnapshotLoader = CmdsSnapshotLoader()
+current_loader: list = [default_loader]
+
+def register_snapshot_loader (name, loader_class) -> None :
+    """
+    Add a loader class, it needs a load(node, attributs = None, backend = None, fields = None)
+    method returning a snapshot dict and a supports(backend) method
+    """
+    snapshot_loaders[name] = loader_class
+
+def set_snapshot_loader (name) -> object :
+    """Set loader used by load_node_snapshot"""
+    try :
+        current_loader[0] = snapshot_loaders[name]()
+    except KeyError :
+        raise ValueError ("Unknown snapshot loader {}; Available : {}".format(name, list(snapshot_loaders)))
+    return current_loader[0]
+
+def get_snapshot_loader () -> object :
+    """Get loader used by load_node_snapshot"""
+    return current_loader[0]
+
+@operation("load_node_snapshot")
+def load_node_snapshot (node, attributs = None, backend = None, fields = None) -> dict :
+    """
+    Read custom attributs of a maya object with current loader,
+    or with cmds loader if current one can not read from backend
+
+    Keywords:
+        node -- maya object
+        attributs -- attribut names to read, all user defined attributs if None
+        backend -- maya commands backend, current backend if None
+        fields -- fields or field groups to read, all fields if None
+
+    Returns :
+        {attribut name : snapshot dict}
+    """
+    backend = backend or get_backend()
+    loader = current_loader[0]
+    if not loader.supports(backend) :
+        loader = default_loader
+    return loader.load(node, attributs, backend, fields)
+
+@operation("load_nodes_snapshot")
+def load_nodes_snapshot (nodes, backend = None, fields = None) -> dict :
+    """
+    Read custom attributs of many maya objects, each node is read once
+
+    Keywords:
+        nodes -- maya objects, duplicates are ignored
+        backend -- maya commands backend, current backend if None
+        fields -- fields or field groups to read, all fields if None
+
+    Returns :
+        {node : {attribut name : snapshot dict}}
+    """
+    backend = backend or get_backend()
+    loader = current_loader[0]
+    if not loader.supports(backend) :
+        loader = default_loader
+
+    snapshots = {}
+    for node in nodes :
+        if node not in snapshots :
+            snapshots[node] = loader.load(node, None, backend, fields)
+    return snapshots
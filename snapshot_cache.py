@@ -0,0 +1,457 @@
+"""
+Snapshot cache saved on disk between sessions : attribut definitions of nodes are kept in
+one file, opening the tool again on a heavy rig does not query every attribut again.
+
+Entries are keyed by scene file and node, and checked with a node fingerprint : custom
+attributs names and order, keyable, locked and channel box lists, connections, and the
+definition strings and numbers of the package query commands (types, names, enum lists,
+defaut values and limits, without values). Flags and connections come from these queries,
+names, defaut values, limits and enum lists from the cache, values are read when needed.
+Edits made outside of this package change the fingerprint, commits made with this package
+drop their node entry (see forget). Backends without the package query commands can not
+fingerprint definitions, their nodes are always read from maya.
+
+The file is memory mapped, its index is sorted by key : an entry is found and read without
+reading others. Entries used least recently are dropped when the file grows over max_bytes.
+@autor : Nathan Boyaval
+@Version : 0.0.4
+@Update : 2025/02/19
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+
+from nb_attribut_control import schema as mschema
+from nb_attribut_control import snapshot as snap
+from nb_attribut_control.backend import get_backend
+from nb_attribut_control.instrument import operation
+
+# Field groups saved in the cache, others are read with the fingerprint or when needed
+cached_groups: tuple = ("names", "defaut", "limits", "enum")
+
+# File format :
+#   header   magic, version, use clock, entry count
+#   index    one entry by node sorted by key : key, fingerprint, last use, record offset and size
+#   records  string count, strings (size, utf8 bytes), attribut count,
+#            attributs (5 string ids, flag bits, defaut, minimum, maximum, see schema.attribut_struct)
+cache_magic: bytes = b"NBSC"
+cache_version: int = 1
+header_struct = struct.Struct("<4sHQI")
+entry_struct = struct.Struct("<16s16sQQI")
+count_struct = struct.Struct("<I")
+# Fingerprint of discarded entries, never matches a node
+no_fingerprint: bytes = bytes(16)
+
+
+def default_path () -> str :
+    """Cache file in user temporary folder"""
+    return os.path.join(tempfile.gettempdir(), "nb_attribut_control", "snapshot_cache.bin")
+
+def make_key (scene, node) -> bytes :
+    return hashlib.md5("{}\0{}".format(scene, node).encode("utf-8")).digest()
+
+def scene_name (cmds) -> str :
+    """Open scene file, empty string for an unsaved scene"""
+    return cmds.file(query = True, sceneName = True) or ""
+
+def definitions (node, attributs, cmds) -> tuple or None :
+    """
+    Definition fields of attributs read with the package query commands, values excluded
+
+    Returns :
+        (strings, numbers) see backend query_attribut_strings and query_attribut_numbers,
+        None if backend has no package query commands
+    """
+    query_strings = getattr(cmds, "query_attribut_strings", None)
+    if query_strings is None :
+        return None
+    if not attributs :
+        return ((), ())
+    return (tuple(query_strings(node, attributs)), tuple(cmds.query_attribut_numbers(node, attributs, False)))
+
+def node_state (node, cmds) -> tuple :
+    """
+    Node level queries of a node
+
+    Returns :
+        (custom attributs, keyable, locked, channel box, destination connections, source connections,
+        definitions or None)
+    """
+    attributs = cmds.listAttr(node, userDefined = True) or []
+    return (
+        attributs,
+        cmds.listAttr(node, userDefined = True, keyable = True) or [],
+        cmds.listAttr(node, userDefined = True, locked = True) or [],
+        cmds.listAttr(node, userDefined = True, channelBox = True) or [],
+        cmds.listConnections(node, connections = True, plugs = True, destination = True, source = False) or [],
+        cmds.listConnections(node, connections = True, plugs = True, destination = False, source = True) or [],
+        definitions(node, attributs, cmds),
+        )
+
+def fingerprint (state) -> bytes :
+    """Digest of a node state (see node_state)"""
+    return hashlib.md5(repr(state).encode("utf-8")).digest()
+
+def add_state (node, node_snapshot, state) -> dict :
+    """Fill flags and connections of a node snapshot from node queries, like the snapshot loader"""
+    attributs, keyable, locked, in_channel_box, destinations, sources = state[:6]
+    keyable, locked, in_channel_box = set(keyable), set(locked), set(in_channel_box)
+    destinations = snap.split_connections(node, destinations)
+    sources = snap.split_connections(node, sources)
+    for attr, data in node_snapshot.items() :
+        data["keyable"] = attr in keyable
+        data["locked"] = attr in locked
+        data["in_channel_box"] = attr in in_channel_box
+        data["incom_connections"] = destinations.get(attr, ())
+        data["outcom_connections"] = sources.get(attr, ())
+    return node_snapshot
+
+
+#######################################################################################################################
+#                Records
+#######################################################################################################################
+
+def encode_record (node_snapshot) -> bytes :
+    """Cached fields of a node snapshot as bytes"""
+    strings = {}
+    rows = []
+    for data in node_snapshot.values() :
+        string_ids = [strings.setdefault(data[field] or "", len(strings)) for field in mschema.string_fields]
+        flags = 0
+        for field in ("has_max_value", "has_min_value") :
+            if data[field] :
+                flags |= mschema.flag_bits[field]
+        defaut_value = data["defaut_value"]
+        if not isinstance(defaut_value, (int, float)) :
+            flags |= mschema.no_defaut_bit
+            defaut_value = 0.0
+        rows.append(mschema.attribut_struct.pack(
+            *string_ids, flags, defaut_value, data["min_value"] or 0.0, data["max_value"] or 0.0,
+            ))
+    parts = [count_struct.pack(len(strings))]
+    for string in strings :
+        data = string.encode("utf-8")
+        parts += [count_struct.pack(len(data)), data]
+    parts.append(count_struct.pack(len(rows)))
+    return b"".join(parts + rows)
+
+def decode_record (data) -> dict :
+    """Node snapshot holding cached fields, from encode_record bytes"""
+    offset = count_struct.size
+    strings = []
+    for index in range(count_struct.unpack_from(data, 0)[0]) :
+        size, = count_struct.unpack_from(data, offset)
+        offset += count_struct.size
+        strings.append(bytes(data[offset:offset + size]).decode("utf-8"))
+        offset += size
+    count, = count_struct.unpack_from(data, offset)
+    offset += count_struct.size
+
+    node_snapshot = {}
+    for index in range(count) :
+        values = mschema.attribut_struct.unpack_from(data, offset + index * mschema.attribut_struct.size)
+        attr_snapshot = {field : strings[string_id] for field, string_id in zip(mschema.string_fields, values[:5])}
+        flags = values[5]
+        attr_snapshot["has_max_value"] = bool(flags & mschema.flag_bits["has_max_value"])
+        attr_snapshot["has_min_value"] = bool(flags & mschema.flag_bits["has_min_value"])
+        attribute_type = attr_snapshot["attribute_type"]
+        attr_snapshot["defaut_value"] = None if flags & mschema.no_defaut_bit else snap.cast_number(attribute_type, values[6])
+        # Limits are only read when they exist
+        attr_snapshot["min_value"] = snap.cast_number(attribute_type, values[7]) if attr_snapshot["has_min_value"] else None
+        attr_snapshot["max_value"] = snap.cast_number(attribute_type, values[8]) if attr_snapshot["has_max_value"] else None
+        node_snapshot[attr_snapshot["long_name"]] = attr_snapshot
+    return node_snapshot
+
+
+#######################################################################################################################
+#                Cache
+#######################################################################################################################
+
+class SnapshotCache () :
+    """
+    Node snapshots saved in a memory mapped file.
+
+    Reads only touch the index entry and the record of a node. New entries are kept in memory
+    until save, which writes the whole file again and drops least recently used entries.
+    """
+
+    def __init__ (self, path = None, max_bytes = 64 * 1024 * 1024) -> None :
+        """
+        Keywords:
+            path -- cache file, see default_path if None
+            max_bytes -- file size kept by save, least recently used entries are dropped first
+        """
+        self.path: str = path or default_path()
+        self.max_bytes: int = max_bytes
+        self.file = None
+        self.mapped = None
+        self.count: int = 0
+        self.clock: int = 0
+        # {key : (fingerprint, record bytes)} entries not saved yet
+        self.updates: dict = {}
+        self.stats: dict = {"hits" : 0, "misses" : 0, "stale" : 0, "evictions" : 0, "saves" : 0, "failed_saves" : 0}
+        self.open()
+
+    def __len__ (self) -> int :
+        return len(set(self.keys()) | set(self.updates))
+
+    def open (self) -> None :
+        """Map cache file, an unreadable file is used as an empty cache"""
+        self.close()
+        self.count = 0
+        try :
+            self.file = open(self.path, "r+b")
+        except OSError :
+            return
+        try :
+            self.mapped = mmap.mmap(self.file.fileno(), 0)
+            magic, version, self.clock, self.count = header_struct.unpack_from(self.mapped, 0)
+            if magic != cache_magic or version != cache_version or \
+               header_struct.size + self.count * entry_struct.size > len(self.mapped) :
+                raise ValueError ("Not a snapshot cache file")
+        except (ValueError, struct.error, OSError) :
+            self.close()
+            self.count = 0
+
+    def close (self) -> None :
+        """Unmap cache file, entries not saved are kept"""
+        if self.mapped is not None :
+            self.mapped.close()
+            self.mapped = None
+        if self.file is not None :
+            self.file.close()
+            self.file = None
+
+    def entry (self, index) -> tuple :
+        """(key, fingerprint, last use, offset, size) of an index entry"""
+        return entry_struct.unpack_from(self.mapped, header_struct.size + index * entry_struct.size)
+
+    def keys (self) -> list :
+        """Keys saved in file, sorted"""
+        return [self.entry(index)[0] for index in range(self.count)]
+
+    def find (self, key) -> int or None :
+        """Index entry of a key, binary search in mapped index"""
+        low, high = 0, self.count
+        while low < high :
+            middle = (low + high) // 2
+            offset = header_struct.size + middle * entry_struct.size
+            middle_key = self.mapped[offset:offset + 16]
+            if middle_key == key :
+                return middle
+            if middle_key < key :
+                low = middle + 1
+            else :
+                high = middle
+        return None
+
+    def get (self, scene, node, node_fingerprint) -> dict or None :
+        """
+        Cached node snapshot, None if node is not cached or its fingerprint changed
+
+        Returns :
+            {attribut name : snapshot dict with cached fields}
+        """
+        key = make_key(scene, node)
+        self.clock += 1
+        if key in self.updates :
+            cached_fingerprint, record = self.updates[key]
+        else :
+            index = self.find(key)
+            if index is None :
+                self.stats["misses"] += 1
+                return None
+            key, cached_fingerprint, last_use, offset, size = self.entry(index)
+            record = memoryview(self.mapped)[offset:offset + size]
+            if cached_fingerprint == node_fingerprint :
+                # Last use is written in place, no save needed for hits
+                entry_struct.pack_into(
+                    self.mapped, header_struct.size + index * entry_struct.size,
+                    key, cached_fingerprint, self.clock, offset, size,
+                    )
+                header_struct.pack_into(self.mapped, 0, cache_magic, cache_version, self.clock, self.count)
+        if cached_fingerprint != node_fingerprint :
+            self.stats["stale"] += 1
+            return None
+        self.stats["hits"] += 1
+        node_snapshot = decode_record(record)
+        if isinstance(record, memoryview) :
+            record.release()
+        return node_snapshot
+
+    def put (self, scene, node, node_fingerprint, node_snapshot) -> None :
+        """Cache a node snapshot, written on next save"""
+        key = make_key(scene, node)
+        self.updates[key] = (node_fingerprint, encode_record(node_snapshot))
+
+    def discard (self, scene, node) -> None :
+        """Make a node entry stale, its fingerprint is cleared in place and no save is needed"""
+        key = make_key(scene, node)
+        self.updates.pop(key, None)
+        index = self.find(key)
+        if index is not None :
+            key, entry_fingerprint, last_use, offset, size = self.entry(index)
+            entry_struct.pack_into(
+                self.mapped, header_struct.size + index * entry_struct.size, key, no_fingerprint, last_use, offset, size,
+                )
+
+    @operation("snapshot_cache_save")
+    def save (self) -> int :
+        """
+        Write cache file with new entries, least recently used entries are dropped until file
+        fits in max_bytes. Nothing is written if no entry was added, or if file can not be written
+
+        Returns :
+            count of entries in file
+        """
+        if not self.updates :
+            return self.count
+
+        # {key : (fingerprint, last use, record bytes)}
+        entries = {}
+        for index in range(self.count) :
+            key, entry_fingerprint, last_use, offset, size = self.entry(index)
+            if key not in self.updates :
+                entries[key] = (entry_fingerprint, last_use, self.mapped[offset:offset + size])
+        for key, (entry_fingerprint, record) in self.updates.items() :
+            self.clock += 1
+            entries[key] = (entry_fingerprint, self.clock, record)
+
+        # Least recently used entries are dropped until file fits, most recent one is always kept
+        by_use = sorted(entries.items(), key = lambda item : item[1][1])
+        size = header_struct.size + sum(entry_struct.size + len(entry[2]) for key, entry in by_use)
+        dropped = 0
+        while size > self.max_bytes and dropped < len(by_use) - 1 :
+            size -= entry_struct.size + len(by_use[dropped][1][2])
+            dropped += 1
+        self.stats["evictions"] += dropped
+        kept = sorted(by_use[dropped:])
+
+        temp_path = "{}.{}.tmp".format(self.path, os.getpid())
+        try :
+            directory = os.path.dirname(self.path)
+            if directory and not os.path.isdir(directory) :
+                os.makedirs(directory)
+            with open(temp_path, "wb") as file_ :
+                file_.write(header_struct.pack(cache_magic, cache_version, self.clock, len(kept)))
+                offset = header_struct.size + len(kept) * entry_struct.size
+                for key, (entry_fingerprint, last_use, record) in kept :
+                    file_.write(entry_struct.pack(key, entry_fingerprint, last_use, offset, len(record)))
+                    offset += len(record)
+                for key, (entry_fingerprint, last_use, record) in kept :
+                    file_.write(record)
+            # Mapped file can not be replaced on Windows
+            self.close()
+            os.replace(temp_path, self.path)
+        except OSError :
+            # Read only folder, or file mapped by another maya on Windows : skip save,
+            # new entries stay in memory and are written by the next save
+            self.stats["failed_saves"] += 1
+            if os.path.exists(temp_path) :
+                try :
+                    os.remove(temp_path)
+                except OSError :
+                    pass
+            self.open()
+            return self.count
+
+        self.updates = {}
+        self.stats["saves"] += 1
+        self.open()
+        return self.count
+
+    def clear (self) -> None :
+        """Delete cache file and every entry"""
+        self.close()
+        self.updates = {}
+        if os.path.exists(self.path) :
+            os.remove(self.path)
+        self.count = 0
+
+    def report (self) -> dict :
+        """Hit and miss counts, entries and file size"""
+        lookups = self.stats["hits"] + self.stats["misses"] + self.stats["stale"]
+        report = dict(self.stats)
+        report["entries"] = len(self)
+        report["bytes"] = len(self.mapped) if self.mapped is not None else 0
+        report["hit_rate"] = self.stats["hits"] / lookups if lookups else 0.0
+        return report
+
+
+#######################################################################################################################
+#                Load
+#######################################################################################################################
+
+current_cache: list = [None]
+
+def set_cache (cache) -> object :
+    """Set cache used when no cache is given, None to use the default file again"""
+    if current_cache[0] is not None and current_cache[0] is not cache :
+        current_cache[0].close()
+    current_cache[0] = cache
+    return cache
+
+def get_cache () -> SnapshotCache :
+    """Current cache, cache in default file if none was set"""
+    if current_cache[0] is None :
+        current_cache[0] = SnapshotCache()
+    return current_cache[0]
+
+@operation("load_cached_snapshots")
+def load_snapshots (nodes, cache = None, backend = None, scene = None) -> dict :
+    """
+    Node snapshots without values, from cache when node fingerprint did not change.
+    Changed and new nodes are read from maya and cached, cache is saved if needed
+
+    Keywords:
+        nodes -- maya objects
+        cache -- SnapshotCache, current cache if None
+        backend -- maya commands backend, current backend if None
+        scene -- scene file of entries, open scene if None
+
+    Returns :
+        {node : node snapshot}
+    """
+    cache = get_cache() if cache is None else cache
+    cmds = backend or get_backend()
+    if scene is None :
+        scene = scene_name(cmds)
+    snapshots = {}
+    for node in dict.fromkeys(nodes) :
+        state = node_state(node, cmds)
+        if state[6] is None :
+            # Definitions edited outside of this package would not change the fingerprint
+            node_snapshot = snap.load_node_snapshot(node, state[0], cmds, cached_groups)
+            snapshots[node] = add_state(node, node_snapshot, state)
+            continue
+        node_fingerprint = fingerprint(state)
+        node_snapshot = cache.get(scene, node, node_fingerprint)
+        if node_snapshot is None or list(node_snapshot) != state[0] :
+            node_snapshot = snap.load_node_snapshot(node, state[0], cmds, cached_groups)
+            cache.put(scene, node, node_fingerprint, node_snapshot)
+        snapshots[node] = add_state(node, node_snapshot, state)
+    cache.save()
+    return snapshots
+
+def load_object (node, cache = None, backend = None) -> object :
+    """
+    Lazy MayaObject of a node built from cache (see load_snapshots), values are read when needed
+
+    Returns :
+        manage_attr.MayaObject
+    """
+    from nb_attribut_control import manage_attr as mattr
+
+    cmds = backend or get_backend()
+    node_snapshot = load_snapshots([node], cache, cmds)[node]
+    return mattr.MayaObject(node, backend = cmds, node_snapshot = node_snapshot, lazy = True)
+
+def forget (nodes, cache = None, backend = None) -> None :
+    """Drop cache entries of nodes edited by this package, next load reads them from maya"""
+    cache = get_cache() if cache is None else cache
+    scene = scene_name(backend or get_backend())
+    for node in nodes :
+        cache.discard(scene, node)
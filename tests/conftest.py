@@ -0,0 +1,24 @@
+"""
+Tests run on the in memory scene (see backend.MemoryBackend), maya is not needed.
+This folder is inside the nb_attribut_control package, the package is loaded from its
+folder when it is not installed under that name.
+@autor : Nathan Boyaval
+@Version : 0.0.4
+@Update : 2025/02/19
+"""
+
+import importlib.util
+import os
+import sys
+
+package_folder = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+try :
+    import nb_attribut_control
+except ImportError :
+    spec = importlib.util.spec_from_file_location(
+        "nb_attribut_control", os.path.join(package_folder, "__init__.py"), submodule_search_locations = [package_folder],
+        )
+    nb_attribut_control = importlib.util.module_from_spec(spec)
+    sys.modules["nb_attribut_control"] = nb_attribut_control
+    spec.loader.exec_module(nb_attribut_control)
@@ -0,0 +1,95 @@
+"""
+Attribut index : same order and positions as a plain list through adds, renames, moves and deletes
+@autor : Nathan Boyaval
+@Version : 0.0.4
+@Update : 2025/02/19
+"""
+
+import random
+
+import pytest
+
+from nb_attribut_control import manage_attr as mattr
+from nb_attribut_control.attribut_index import AttributIndex, AttributNamesView
+from nb_attribut_control.backend import MemoryBackend
+
+
+def check_index (index, names) -> None :
+    assert index.names() == names
+    assert len(index) == len(names)
+    for position, name in enumerate(names) :
+        assert index.position(name) == position
+        assert index[name] == name.upper()
+
+
+def test_index_matches_list () :
+    rng = random.Random(4)
+    index = AttributIndex()
+    names = []
+    for step in range(3000) :
+        action = rng.random()
+        if action < 0.4 or not names :
+            name = "attr{}".format(step)
+            index.append(name, name.upper())
+            names.append(name)
+        elif action < 0.6 :
+            name = names.pop(rng.randrange(len(names)))
+            assert index.remove(name) == name.upper()
+        elif action < 0.9 :
+            name = rng.choice(names)
+            offset = rng.randint(-3, 3)
+            position = names.index(name)
+            new_position = min(max(position + offset, 0), len(names) - 1)
+            names.insert(new_position, names.pop(position))
+            assert index.move(name, offset) == new_position
+        else :
+            position = rng.randrange(len(names))
+            new_name = "renamed{}".format(step)
+            index.rename(names[position], new_name)
+            index.nodes[new_name].value = new_name.upper()
+            names[position] = new_name
+        if step % 100 == 0 :
+            check_index(index, names)
+    check_index(index, names)
+    # Deleted slots are dropped once they are more than used ones
+    assert len(index.slots) <= 2 * len(index) + 16
+
+def test_index_errors () :
+    index = AttributIndex([("a", 1), ("b", 2)])
+    with pytest.raises(KeyError) :
+        index.append("a", 3)
+    with pytest.raises(KeyError) :
+        index.rename("a", "b")
+    with pytest.raises(KeyError) :
+        index.position("c")
+    assert index.get("c", 0) == 0
+
+def test_names_view_is_list_like () :
+    index = AttributIndex([("a", 1), ("b", 2), ("c", 3)])
+    view = AttributNamesView(index)
+    assert view == ["a", "b", "c"]
+    assert view[-1] == "c" and "b" in view and len(view) == 3
+    assert view.index("b") == 1
+    assert view.index("b", 1, 2) == 1
+    for args in (("missing",), ("a", 1), ("c", 0, 2)) :
+        with pytest.raises(ValueError) :
+            view.index(*args)
+    index.remove("a")
+    assert view == ("b", "c")
+
+def test_maya_object_edits_return_name_views () :
+    backend = MemoryBackend()
+    node = backend.createNode("transform", name = "L_arm_ctrl")
+    for name in ("ikFk", "twist") :
+        backend.addAttr(node, longName = name, attributeType = "double")
+    maya_object = mattr.MayaObject(node, backend = backend)
+    for edit, args, expected in (
+            (maya_object.add_attribut, ("space",), ["ikFk", "twist", "space"]),
+            (maya_object.move_attribut_up, ("space",), ["ikFk", "space", "twist"]),
+            (maya_object.delete_attribut, ("ikFk",), ["space", "twist"]),
+            ) :
+        names, attributs_dic, count = edit(*args)
+        assert isinstance(names, AttributNamesView)
+        assert names == expected and count == len(expected)
+    assert attributs_dic["twist"]["index"] == 1
+    assert maya_object.deleted_attributs == ["ikFk"]
@@ -0,0 +1,82 @@
+"""
+Attribut list model : rows fetched by batch, only edited rows are updated, names filtered and sorted by proxy
+Needs PySide2, skipped outside of maya
+@autor : Nathan Boyaval
+@Version : 0.0.4
+@Update : 2025/02/19
+"""
+
+import pytest
+
+QtCore = pytest.importorskip("PySide2.QtCore")
+
+from nb_attribut_control import attribut_model
+from nb_attribut_control import manage_attr as mattr
+from nb_attribut_control.backend import MemoryBackend
+from nb_attribut_control.benchmark import CountingBackend
+
+
+@pytest.fixture(scope = "module")
+def application () :
+    return QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+@pytest.fixture
+def backend () -> MemoryBackend :
+    backend = MemoryBackend()
+    node = backend.createNode("transform", name = "ctrl")
+    for index in range(600) :
+        backend.addAttr(node, longName = "attr{}".format(index), attributeType = "double")
+    return backend
+
+@pytest.fixture
+def model (application, backend) -> attribut_model.AttributListModel :
+    return attribut_model.AttributListModel(mattr.MayaObject("ctrl", backend = backend, lazy = True))
+
+
+def test_rows_are_fetched_by_batch (model) :
+    assert model.rowCount() == attribut_model.fetch_batch_size
+    assert model.canFetchMore()
+    while model.canFetchMore() :
+        model.fetchMore()
+    assert model.rowCount() == 600
+    assert model.index(599, 0).data() == "attr599"
+
+def test_display_only_reads_names (application, backend) :
+    counter = CountingBackend(backend)
+    model = attribut_model.AttributListModel(mattr.MayaObject("ctrl", backend = counter, lazy = True))
+    counter.reset()
+    assert [model.index(row, 0).data() for row in range(10)] == ["attr{}".format(row) for row in range(10)]
+    assert counter.total() == 0
+    attr_class = model.index(3, 0).data(attribut_model.AttributRole)
+    assert not attr_class.is_loaded("value")
+
+def test_index_of_fetches_rows (model) :
+    assert model.row_of("attr500") == -1
+    assert model.index_of("attr500").row() == 500
+    assert model.row_of("attr500") == 500
+    assert not model.index_of("missing").isValid()
+
+def test_edits_update_rows (model) :
+    changed, moved = [], []
+    model.dataChanged.connect(lambda first, last, *args : changed.append(first.row()))
+    model.rowsMoved.connect(lambda *args : moved.append(args[1]))
+    assert model.rename_attribut("attr2", "blend") == "blend"
+    assert changed == [2] and model.index(2, 0).data() == "blend"
+    assert model.move_attribut("blend", 1) == 3
+    assert moved == [2] and model.index(3, 0).data() == "blend"
+    model.delete_attribut("blend")
+    assert model.rowCount() == attribut_model.fetch_batch_size - 1
+    assert model.total_count() == 599
+
+def test_filter_and_sort (model) :
+    proxy = attribut_model.AttributFilterModel()
+    proxy.setSourceModel(model)
+    proxy.set_pattern("attr59?")
+    assert proxy.rowCount() == 10
+    assert proxy.attribut_name(proxy.index(0, 0)) == "attr590"
+    proxy.set_pattern("")
+    proxy.set_sorted(True)
+    assert proxy.attribut_name(proxy.index(1, 0)) == "attr1"
+    assert proxy.attribut_name(proxy.index(2, 0)) == "attr10"
+    proxy.set_sorted(False)
+    assert proxy.attribut_name(proxy.index(2, 0)) == "attr2"
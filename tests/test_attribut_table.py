@@ -0,0 +1,74 @@
+"""
+Attribut table : table rows give the same fields and types as Attribut objects
+@autor : Nathan Boyaval
+@Version : 0.0.4
+@Update : 2025/02/19
+"""
+
+import pytest
+
+from nb_attribut_control import manage_attr as mattr
+from nb_attribut_control import snapshot as snap
+from nb_attribut_control.attribut_table import AttributTable
+from nb_attribut_control.backend import MemoryBackend
+
+node: str = "L_arm_ctrl"
+
+
+@pytest.fixture
+def backend () -> MemoryBackend :
+    backend = MemoryBackend()
+    backend.createNode("transform", name = node)
+    backend.addAttr(node, longName = "ikFk", attributeType = "double", minValue = -0.5, maxValue = 1.5, keyable = True)
+    backend.addAttr(node, longName = "fingers", attributeType = "long", minValue = 1, maxValue = 5, defaultValue = 2)
+    backend.addAttr(node, longName = "count", shortName = "cnt", attributeType = "short", maxValue = 8)
+    backend.addAttr(node, longName = "visible", attributeType = "bool", defaultValue = 1)
+    backend.addAttr(node, longName = "space", attributeType = "enum", enumName = "world:local:parent", defaultValue = 1)
+    backend.addAttr(node, longName = "twist", attributeType = "doubleAngle", niceName = "Twist Angle")
+    backend.setAttr(node + ".fingers", 4)
+    backend.setAttr(node + ".count", lock = True)
+    backend.connectAttr(node + ".fingers", node + ".count")
+    return backend
+
+def fields_of (attr_class) -> dict :
+    return {field : getattr(attr_class, field) for field in snap.snapshot_fields}
+
+
+def test_table_rows_match_attributs (backend) :
+    objects = mattr.MayaObject(node, backend = backend)
+    table_objects = mattr.MayaObject(node, backend = backend, table = AttributTable())
+    for name in objects.custom_attributs :
+        fields = fields_of(objects.get_attribut_object(name))
+        table_fields = fields_of(table_objects.get_attribut_object(name))
+        assert table_fields == fields
+        for field, value in fields.items() :
+            assert type(table_fields[field]) is type(value), (name, field)
+
+def test_integer_fields_are_ints (backend) :
+    table_objects = mattr.MayaObject(node, backend = backend, table = AttributTable())
+    fingers = table_objects.get_attribut_object("fingers")
+    assert [fingers.value, fingers.defaut_value, fingers.min_value, fingers.max_value] == [4, 2, 1, 5]
+    assert all(type(value) is int for value in (fingers.value, fingers.defaut_value, fingers.min_value, fingers.max_value))
+    assert table_objects.get_attribut_object("count").min_value is None
+    assert table_objects.get_attribut_object("visible").defaut_value is True
+    ik_fk = table_objects.get_attribut_object("ikFk")
+    assert (ik_fk.min_value, ik_fk.max_value) == (-0.5, 1.5)
+
+def test_table_edits_are_commited (backend) :
+    table = AttributTable()
+    maya_object = mattr.MayaObject(node, backend = backend, table = table)
+    maya_object.set_maximum_value("fingers", 10.0)
+    maya_object.set_keyable("space", True)
+    maya_object.edit_long_name("twist", "roll")
+    maya_object.commit_attributs()
+    assert backend.attributeQuery("fingers", node = node, maximum = True) == [10.0]
+    assert backend.getAttr(node + ".space", keyable = True)
+    assert "roll" in backend.listAttr(node, userDefined = True)
+    assert not any(maya_object.get_attribut_object(name).is_dirty() for name in maya_object.custom_attributs)
+
+def test_strings_are_shared (backend) :
+    table = AttributTable()
+    for index in range(3) :
+        mattr.MayaObject(node, backend = backend, table = table)
+    assert len(table) == 18
+    assert table.strings.count("double") == 1
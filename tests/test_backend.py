@@ -0,0 +1,92 @@
+"""
+In memory scene : maya like answers and errors for nodes, typed attributs, limits, locks and connections
+@autor : Nathan Boyaval
+@Version : 0.0.4
+@Update : 2025/02/19
+"""
+
+import pytest
+
+from nb_attribut_control import backend as bk
+from nb_attribut_control import manage_attr as mattr
+
+
+@pytest.fixture
+def backend () -> bk.MemoryBackend :
+    backend = bk.MemoryBackend()
+    node = backend.createNode("transform", name = "ctrl")
+    backend.addAttr(node, longName = "ikFkSwitch", shortName = "ifs", attributeType = "double", minValue = 0.0, maxValue = 1.0)
+    backend.addAttr(node, longName = "space", attributeType = "enum", enumName = "world:local")
+    backend.addAttr(node, longName = "count", attributeType = "long", defaultValue = 2)
+    return backend
+
+@pytest.fixture
+def current_backend (backend) :
+    previous = bk.current_backend[0]
+    yield bk.set_backend(backend)
+    bk.set_backend(previous)
+
+
+def test_nodes (backend) :
+    assert backend.objectType("ctrl") == "transform"
+    assert backend.objExists("ctrl.ifs") and backend.objExists("ctrl.translateX")
+    assert not backend.objExists("ctrl.missing") and not backend.objExists("other")
+    with pytest.raises(ValueError) :
+        backend.objectType("other")
+    assert backend.listAttr("ctrl", userDefined = True) == ["ikFkSwitch", "space", "count"]
+    backend.createNode("transform", name = "empty")
+    assert backend.listAttr("empty", userDefined = True) is None
+
+def test_attribut_queries (backend) :
+    assert backend.attributeQuery("ikFkSwitch", node = "ctrl", niceName = True) == "Ik Fk Switch"
+    assert backend.attributeQuery("ifs", node = "ctrl", longName = True) == "ikFkSwitch"
+    assert backend.attributeQuery("ikFkSwitch", node = "ctrl", maximum = True) == [1.0]
+    assert backend.attributeQuery("space", node = "ctrl", listEnum = True) == ["world:local"]
+    assert backend.attributeQuery("count", node = "ctrl", listDefault = True) == [2]
+    assert not backend.attributeQuery("count", node = "ctrl", maxExists = True)
+    with pytest.raises(RuntimeError) :
+        backend.attributeQuery("missing", node = "ctrl", niceName = True)
+
+def test_values_are_typed_and_clamped (backend) :
+    backend.setAttr("ctrl.ikFkSwitch", 3.0)
+    assert backend.getAttr("ctrl.ikFkSwitch") == 1.0
+    backend.setAttr("ctrl.count", 4.0)
+    assert type(backend.getAttr("ctrl.count")) is int
+    assert backend.getAttr("ctrl.count", type = True) == "long"
+
+def test_locked_attribut (backend) :
+    backend.setAttr("ctrl.count", lock = True)
+    with pytest.raises(RuntimeError) :
+        backend.setAttr("ctrl.count", 4)
+    with pytest.raises(RuntimeError) :
+        backend.deleteAttr("ctrl.count")
+    backend.setAttr("ctrl.count", lock = False)
+    backend.deleteAttr("ctrl.count")
+    assert not backend.objExists("ctrl.count")
+
+def test_add_errors (backend) :
+    with pytest.raises(RuntimeError) :
+        backend.addAttr("ctrl", longName = "space", attributeType = "double")
+    with pytest.raises(RuntimeError) :
+        backend.addAttr("ctrl", longName = "other", attributeType = "unknown")
+    with pytest.raises(RuntimeError) :
+        backend.addAttr("ctrl.ikFkSwitch", edit = True, minValue = 2.0)
+
+def test_connections (backend) :
+    backend.createNode("transform", name = "driver")
+    backend.connectAttr("driver.translateX", "ctrl.ikFkSwitch")
+    assert backend.listConnections("ctrl.ikFkSwitch", source = True, destination = False, plugs = True) == ["driver.translateX"]
+    assert backend.listConnections("driver", connections = True, plugs = True) == ["driver.translateX", "ctrl.ikFkSwitch"]
+    with pytest.raises(RuntimeError) :
+        backend.connectAttr("driver.translateY", "ctrl.ikFkSwitch")
+    backend.connectAttr("driver.translateY", "ctrl.ikFkSwitch", force = True)
+    backend.disconnectAttr("driver.translateY", "ctrl.ikFkSwitch")
+    assert backend.listConnections("ctrl.ikFkSwitch") is None
+    with pytest.raises(RuntimeError) :
+        backend.disconnectAttr("driver.translateY", "ctrl.ikFkSwitch")
+
+def test_maya_object_uses_current_backend (current_backend) :
+    maya_object = mattr.MayaObject("ctrl")
+    assert maya_object.cmds is current_backend
+    assert maya_object.custom_attributs == ["ikFkSwitch", "space", "count"]
+    assert maya_object.get_attribut_object("count").value == 2
@@ -0,0 +1,47 @@
+"""
+Scaling benchmarks : synthetic controls, measures and baseline comparison
+@autor : Nathan Boyaval
+@Version : 0.0.4
+@Update : 2025/02/19
+"""
+
+import json
+
+from nb_attribut_control import benchmark
+from nb_attribut_control.backend import MemoryBackend
+
+
+def test_build_scene () :
+    backend = MemoryBackend()
+    controls = benchmark.build_scene(backend, 3, 12)
+    assert controls == ["ctrl0", "ctrl1", "ctrl2"]
+    assert len(backend.listAttr("ctrl2", userDefined = True)) == 12
+
+def test_measure_counts_calls () :
+    backend = MemoryBackend()
+    measures = benchmark.measure(lambda counter : benchmark.build_control(counter, "ctrl", 5), backend)
+    assert measures["calls"] == 6
+    assert measures["seconds"] >= 0 and measures["peak_bytes"] > 0
+
+def test_commit_one_does_not_scale () :
+    small, large = benchmark.bench_object(10), benchmark.bench_object(200)
+    assert small["commit_one"]["calls"] == large["commit_one"]["calls"]
+    assert large["init"]["calls"] == small["init"]["calls"]
+
+def test_compare_results () :
+    baseline = {"object" : {"10" : {"init" : {"seconds" : 1.0, "calls" : 5, "peak_bytes" : 100}}}}
+    same = {"object" : {"10" : {"init" : {"seconds" : 1.1, "calls" : 5, "peak_bytes" : 100}}}}
+    slower = {"object" : {"10" : {"init" : {"seconds" : 2.0, "calls" : 6, "peak_bytes" : 100}}}}
+    assert benchmark.flatten_results(baseline) == {"object/10/init" : baseline["object"]["10"]["init"]}
+    assert benchmark.compare_results(same, baseline) == []
+    assert benchmark.compare_results(slower, baseline) == [
+        ("object/10/init", "seconds", 1.0, 2.0), ("object/10/init", "calls", 5, 6),
+        ]
+
+def test_main_writes_and_compares (tmp_path, capsys) :
+    output = tmp_path / "results.json"
+    assert benchmark.main(["--attributs", "10", "--controls", "2", "--output", str(output)]) == 0
+    results = json.loads(output.read_text())
+    assert set(results["object"]) == {"10"} and set(results["scene"]) == {"2"}
+    # Backend calls of the same run do not change
+    assert benchmark.main(["--attributs", "10", "--controls", "2", "--baseline", str(output), "--tolerance", "1000"]) == 0
@@ -0,0 +1,60 @@
+"""
+Bulk attribut edits : one validation pass, nothing is edited when one attribut fails
+@autor : Nathan Boyaval
+@Version : 0.0.4
+@Update : 2025/02/19
+"""
+
+import pytest
+
+from nb_attribut_control import manage_attr as mattr
+from nb_attribut_control.backend import MemoryBackend
+
+
+@pytest.fixture
+def backend () -> MemoryBackend :
+    return MemoryBackend()
+
+@pytest.fixture
+def maya_object (backend) -> mattr.MayaObject :
+    node = backend.createNode("transform", name = "L_arm_ctrl")
+    backend.addAttr(node, longName = "ikFk", attributeType = "double", minValue = 0.0, maxValue = 10.0)
+    backend.addAttr(node, longName = "twist", attributeType = "double", minValue = 6.0, maxValue = 10.0)
+    backend.addAttr(node, longName = "space", attributeType = "enum", enumName = "world:local")
+    backend.setAttr(node + ".ikFk", 8.0)
+    backend.setAttr(node + ".twist", 7.0)
+    return mattr.MayaObject(node, backend = backend)
+
+
+def test_edit_selected_attributs (maya_object, backend) :
+    summary = maya_object.edit_attributs({"keyable" : True}, "*k")
+    assert summary["selected"] == summary["edited"] == 1
+    maya_object.commit_attributs()
+    assert backend.getAttr("L_arm_ctrl.ikFk", keyable = True)
+    assert not backend.getAttr("L_arm_ctrl.twist", keyable = True)
+
+def test_wrong_value_type (maya_object) :
+    with pytest.raises(TypeError) :
+        maya_object.edit_attributs({"keyable" : 1})
+    with pytest.raises(ValueError) :
+        maya_object.edit_attributs({"unknown" : 1})
+
+def test_clamp_moves_values_inside_limits (maya_object, backend) :
+    summary = maya_object.edit_attributs({"max_value" : 7.5}, "ikFk", clamp = True)
+    assert summary["clamped"] == 1
+    ik_fk = maya_object.get_attribut_object("ikFk")
+    assert ik_fk.value == 7.5
+    maya_object.commit_attributs()
+    assert backend.getAttr("L_arm_ctrl.ikFk") == 7.5
+
+def test_failed_clamp_edit_puts_clamped_values_back (maya_object, backend) :
+    # ikFk value is clamped to 3.0 before twist fails on limits order
+    with pytest.raises(ValueError) :
+        maya_object.edit_attributs({"max_value" : 3.0}, "ikFk|twist", regex = True, clamp = True)
+    for name, value in (("ikFk", 8.0), ("twist", 7.0)) :
+        attr_class = maya_object.get_attribut_object(name)
+        assert attr_class.value == value
+        assert attr_class.max_value == 10.0
+        assert not attr_class.dirty_fields
+    assert maya_object.commit_attributs() == 0
+    assert backend.getAttr("L_arm_ctrl.ikFk") == 8.0
@@ -0,0 +1,95 @@
+"""
+Dirty fields commit : only edited fields are sent to maya, renamed or retyped attributs are created again
+@autor : Nathan Boyaval
+@Version : 0.0.4
+@Update : 2025/02/19
+"""
+
+import pytest
+
+from nb_attribut_control import manage_attr as mattr
+from nb_attribut_control.backend import MemoryBackend
+from nb_attribut_control.benchmark import CountingBackend
+
+# Commands editing maya, validation before commit only reads
+write_commands: tuple = ("addAttr", "setAttr", "deleteAttr", "connectAttr", "disconnectAttr")
+
+def writes (counter) -> dict :
+    return {command : counter.calls[command] for command in write_commands if counter.calls[command]}
+
+@pytest.fixture
+def backend () -> MemoryBackend :
+    backend = MemoryBackend()
+    node = backend.createNode("transform", name = "L_arm_ctrl")
+    for index in range(200) :
+        backend.addAttr(node, longName = "attr{}".format(index), attributeType = "double", keyable = True)
+    backend.createNode("transform", name = "driver")
+    backend.addAttr("driver", longName = "out", attributeType = "double")
+    backend.connectAttr("driver.out", "L_arm_ctrl.attr10")
+    backend.connectAttr("L_arm_ctrl.attr10", "driver.translateX")
+    return backend
+
+@pytest.fixture
+def counter (backend) -> CountingBackend :
+    return CountingBackend(backend)
+
+@pytest.fixture
+def maya_object (counter) -> mattr.MayaObject :
+    maya_object = mattr.MayaObject("L_arm_ctrl", backend = counter)
+    counter.reset()
+    return maya_object
+
+
+def test_clean_commit_calls_nothing (maya_object, counter) :
+    assert maya_object.commit_attributs(undo_chunk = False) == 0
+    assert counter.total() == 0
+
+def test_one_flag_is_one_command (maya_object, counter, backend) :
+    maya_object.set_lock("attr10", True)
+    assert maya_object.commit_attributs(undo_chunk = False) == 1
+    assert writes(counter) == {"setAttr" : 1}
+    assert backend.getAttr("L_arm_ctrl.attr10", lock = True)
+    assert backend.listConnections("L_arm_ctrl.attr10", source = True, destination = False, plugs = True) == ["driver.out"]
+
+def test_field_set_back_is_clean (maya_object, counter) :
+    attr_class = maya_object.get_attribut_object("attr3")
+    attr_class.set_keyable(False)
+    assert attr_class.dirty_fields == {"keyable" : True}
+    attr_class.set_keyable(True)
+    assert not attr_class.is_dirty()
+    assert maya_object.commit_attributs(undo_chunk = False) == 0
+
+def test_limits_are_one_edit (maya_object, counter, backend) :
+    maya_object.set_has_maximum_state("attr3", True)
+    maya_object.set_maximum_value("attr3", 5.0)
+    maya_object.commit_attributs(undo_chunk = False)
+    assert writes(counter) == {"addAttr" : 1}
+    assert backend.attributeQuery("attr3", node = "L_arm_ctrl", maximum = True) == [5.0]
+
+def test_value_of_locked_attribut (maya_object, backend) :
+    backend.setAttr("L_arm_ctrl.attr4", lock = True)
+    maya_object = mattr.MayaObject("L_arm_ctrl", backend = backend)
+    maya_object.get_attribut_object("attr4").set_field("value", 2.0)
+    maya_object.commit_attributs(undo_chunk = False)
+    assert backend.getAttr("L_arm_ctrl.attr4") == 2.0
+    assert backend.getAttr("L_arm_ctrl.attr4", lock = True)
+
+def test_rename_keeps_value_and_connections (maya_object, counter, backend) :
+    backend.setAttr("L_arm_ctrl.attr10", lock = False)
+    maya_object.get_attribut_object("attr10").set_field("value", 0.5)
+    maya_object.edit_long_name("attr10", "blend")
+    maya_object.commit_attributs(undo_chunk = False)
+    assert counter.calls["deleteAttr"] == 1
+    assert not backend.objExists("L_arm_ctrl.attr10")
+    assert backend.listConnections("L_arm_ctrl.blend", source = True, destination = False, plugs = True) == ["driver.out"]
+    assert backend.listConnections("L_arm_ctrl.blend", source = False, destination = True, plugs = True) == ["driver.translateX"]
+    assert maya_object.commit_report["reconnected"]
+    assert not maya_object.get_attribut_object("blend").is_dirty()
+
+def test_commited_values_are_kept (maya_object) :
+    attr_class = maya_object.get_attribut_object("attr5")
+    attr_class.set_keyable(False)
+    attr_class.set_lock(True)
+    assert attr_class.dirty_fields == {"keyable" : True, "locked" : False}
+    maya_object.commit_attributs(undo_chunk = False)
+    assert attr_class.dirty_fields is mattr.no_dirty_fields
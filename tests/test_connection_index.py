@@ -0,0 +1,78 @@
+"""
+Connection index : connections of many nodes in two queries, put back in one batch after attributs are created again
+@autor : Nathan Boyaval
+@Version : 0.0.4
+@Update : 2025/02/19
+"""
+
+import pytest
+
+from nb_attribut_control import connection_index as ci
+from nb_attribut_control import manage_attr as mattr
+from nb_attribut_control.backend import MemoryBackend
+from nb_attribut_control.benchmark import CountingBackend
+
+
+@pytest.fixture
+def backend () -> MemoryBackend :
+    backend = MemoryBackend()
+    for name in ("ctrl", "driver", "driven") :
+        backend.createNode("transform", name = name)
+    for index in range(6) :
+        backend.addAttr("ctrl", longName = "attr{}".format(index), attributeType = "double")
+    for source, destination in (
+        ("driver.translateY", "ctrl.attr0"), ("ctrl.attr0", "driven.translateX"), ("ctrl.attr3", "driver.visibility"),
+        ("ctrl.attr4", "ctrl.translateX"), ("ctrl.attr4", "ctrl.attr5"),
+        ) :
+        backend.connectAttr(source, destination)
+    return backend
+
+
+def test_build_reads_two_queries (backend) :
+    counter = CountingBackend(backend)
+    index = ci.ConnectionIndex(["ctrl", "driver", "ctrl"], counter)
+    assert counter.calls == {"listConnections" : 2} and index.query_count == 2
+    assert index.incoming("ctrl", "attr0") == ["driver.translateY"]
+    assert index.outgoing("ctrl", "attr0") == ["driven.translateX"]
+    assert index.connections("driver", "visibility") == [("ctrl.attr3", "driver.visibility")]
+    # A connection inside one node is stored once
+    assert index.connections("ctrl", "attr4") == [("ctrl.attr4", "ctrl.translateX"), ("ctrl.attr4", "ctrl.attr5")]
+    # Nodes already indexed are not read again
+    index.build(["ctrl"])
+    assert index.query_count == 2
+
+def test_rename_plug () :
+    renames = {"ctrl.old" : "ctrl.new"}
+    assert ci.rename_plug("ctrl.old", renames) == "ctrl.new"
+    assert ci.rename_plug("ctrl.old[2].child", renames) == "ctrl.new[2].child"
+    assert ci.rename_plug("ctrl.older", renames) == "ctrl.older"
+
+def test_reconnect_locked_and_renamed_plugs (backend) :
+    backend.addAttr("ctrl", longName = "new4", attributeType = "double")
+    backend.addAttr("ctrl", longName = "new5", attributeType = "double")
+    backend.setAttr("ctrl.new5", lock = True)
+    saved = [
+        ("ctrl.attr4", "ctrl.new4", False, [("ctrl.attr4", "ctrl.attr5"), ("driver.missing", "ctrl.attr4")]),
+        ("ctrl.attr5", "ctrl.new5", True, [("ctrl.attr4", "ctrl.attr5")]),
+        ]
+    report = ci.reconnect(saved, backend)
+    assert report["reconnected"] == [("ctrl.new4", "ctrl.new5")]
+    assert [failed[:2] for failed in report["failed"]] == [("driver.missing", "ctrl.new4")]
+    assert report["commands"] == 4
+    assert backend.getAttr("ctrl.new5", lock = True)
+
+def test_retype_commit_puts_connections_back (backend) :
+    counter = CountingBackend(backend)
+    maya_object = mattr.MayaObject("ctrl", backend = counter)
+    for name in ("attr0", "attr4", "attr5") :
+        maya_object.set_attribut_type(name, "float")
+    counter.reset()
+    maya_object.commit_attributs()
+    assert counter.calls["listConnections"] == 2
+    assert sorted(maya_object.commit_report["reconnected"]) == [
+        ("ctrl.attr0", "driven.translateX"), ("ctrl.attr4", "ctrl.attr5"), ("ctrl.attr4", "ctrl.translateX"),
+        ("driver.translateY", "ctrl.attr0"),
+        ]
+    assert maya_object.commit_report["failed"] == []
+    assert backend.listConnections("ctrl.attr5", source = True, destination = False, plugs = True) == ["ctrl.attr4"]
+    assert backend.getAttr("ctrl.attr0", type = True) == "float"
@@ -0,0 +1,59 @@
+"""
+Custom attribut names : built-in attributs are cached by node type, one temporary node per type
+@autor : Nathan Boyaval
+@Version : 0.0.4
+@Update : 2025/02/19
+"""
+
+import pytest
+
+from nb_attribut_control import manage_attr as mattr
+from nb_attribut_control.backend import MemoryBackend
+from nb_attribut_control.benchmark import CountingBackend
+
+
+@pytest.fixture
+def cache (monkeypatch) -> mattr.BuiltInAttrCache :
+    cache = mattr.BuiltInAttrCache()
+    monkeypatch.setattr(mattr, "built_in_attr_cache", cache)
+    return cache
+
+@pytest.fixture
+def backend () -> MemoryBackend :
+    backend = MemoryBackend()
+    for index in range(3) :
+        node = backend.createNode("transform", name = "ctrl{}".format(index))
+        backend.addAttr(node, longName = "ikFk", attributeType = "double")
+        backend.addAttr(node, longName = "space", attributeType = "enum", enumName = "world:local")
+    backend.createNode("joint", name = "jnt0")
+    backend.select("ctrl1")
+    return backend
+
+
+def test_names_match_user_defined_list (cache, backend) :
+    for node in ("ctrl0", "ctrl1", "jnt0") :
+        assert mattr.get_custom_attr_names(node, False, backend) == mattr.get_custom_attr_names(node, True, backend)
+
+def test_one_temporary_node_per_type (cache, backend) :
+    counter = CountingBackend(backend)
+    for node in ("ctrl0", "ctrl1", "ctrl2", "jnt0", "ctrl0") :
+        mattr.get_custom_attr_names(node, False, counter)
+    assert counter.calls["createNode"] == counter.calls["delete"] == 2
+    assert cache.stats() == {"hits" : 3, "misses" : 2, "temp_nodes_created" : 2, "cached_types" : 2}
+    # Temporary nodes are deleted and selection is kept
+    assert backend.ls() == ["ctrl0", "ctrl1", "ctrl2", "jnt0"]
+    assert backend.ls(selection = True) == ["ctrl1"]
+
+def test_clear_reads_types_again (cache, backend) :
+    mattr.get_custom_attr_names("ctrl0", False, backend)
+    cache.clear()
+    cache.reset_stats()
+    mattr.get_custom_attr_names("ctrl0", False, backend)
+    assert cache.stats()["misses"] == 1
+
+def test_backends_do_not_share_types (cache, backend) :
+    other = CountingBackend(backend)
+    other.name = "other"
+    mattr.get_custom_attr_names("ctrl0", False, backend)
+    mattr.get_custom_attr_names("ctrl0", False, other)
+    assert cache.stats()["misses"] == 2
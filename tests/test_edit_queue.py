@@ -0,0 +1,113 @@
+"""
+Edit queue : repeated edits of a field are merged, the batch is commited once edits pause
+@autor : Nathan Boyaval
+@Version : 0.0.4
+@Update : 2025/02/19
+"""
+
+import pytest
+
+from nb_attribut_control import manage_attr as mattr
+from nb_attribut_control.backend import MemoryBackend
+from nb_attribut_control.benchmark import CountingBackend
+from nb_attribut_control.edit_queue import EditQueue
+
+
+class Timer () :
+    """Single shot timer started by hand"""
+
+    def __init__ (self) -> None :
+        self.active = False
+
+    def start (self) -> None :
+        self.active = True
+
+    def stop (self) -> None :
+        self.active = False
+
+
+@pytest.fixture
+def backend () -> MemoryBackend :
+    backend = MemoryBackend()
+    node = backend.createNode("transform", name = "ctrl")
+    backend.addAttr(node, longName = "ikFk", attributeType = "double", maxValue = 1.0)
+    backend.addAttr(node, longName = "twist", attributeType = "double")
+    return backend
+
+@pytest.fixture
+def counter (backend) -> CountingBackend :
+    return CountingBackend(backend)
+
+@pytest.fixture
+def scheduled () -> list :
+    return []
+
+@pytest.fixture
+def queue (counter, scheduled) -> EditQueue :
+    return EditQueue(mattr.MayaObject("ctrl", backend = counter), timer = Timer(), scheduler = scheduled.append)
+
+
+def test_edits_are_merged (queue, counter, backend, scheduled) :
+    for value in (2.0, 3.0, 4.0) :
+        queue.push("ikFk", "set_maximum_value", value)
+    queue.push("twist", "set_lock", True)
+    queue.push("missing", "set_lock", True)
+    assert len(queue) == 2 and queue.timer.active
+    assert queue.stats() == {"pushed" : 4, "merged" : 2, "flushes" : 0, "pending" : 2}
+
+    # Timer timeout asks for one flush, maya is not touched before it runs
+    counter.reset()
+    queue.flush_deferred()
+    queue.flush_deferred()
+    assert len(scheduled) == 1 and counter.total() == 0
+    scheduled.pop()()
+    assert not queue.timer.active and len(queue) == 0
+    assert counter.calls["undoInfo"] == 2
+    assert backend.attributeQuery("ikFk", node = "ctrl", maximum = True) == [4.0]
+    assert backend.getAttr("ctrl.twist", lock = True)
+
+def test_rename_keeps_other_edits (queue, backend) :
+    queue.push("ikFk", "edit_long_name", "blend")
+    queue.push("ikFk", "set_keyable", True)
+    flushed = []
+    queue.flush_callbacks.append(flushed.append)
+    queue.flush()
+    assert flushed == [["blend"]]
+    assert backend.getAttr("ctrl.blend", keyable = True)
+
+def test_deleted_attribut_is_skipped (queue, backend) :
+    queue.push("twist", "set_lock", True)
+    queue.maya_object.delete_attribut("twist")
+    queue.flush()
+    assert not backend.objExists("ctrl.twist")
+
+def test_clear_and_empty_flush (queue, counter, scheduled) :
+    queue.push("twist", "set_lock", True)
+    queue.clear()
+    assert not queue.timer.active
+    queue.flush_deferred()
+    assert scheduled == []
+    counter.reset()
+    assert queue.flush() == 0 and counter.total() == 0
+
+def test_order_change_reorders_maya (queue, backend) :
+    queue.maya_object.move_attribut_down("ikFk")
+    queue.push_order()
+    queue.flush()
+    assert backend.listAttr("ctrl", userDefined = True) == ["twist", "ikFk"]
+
+def test_failed_flush_calls_error_callbacks (queue, backend) :
+    queue.push("ikFk", "set_minimum_value", 5.0)
+    queue.push("ikFk", "set_has_minimum_state", True)
+    errors = []
+    queue.error_callbacks.append(lambda error, names : errors.append((type(error), names)))
+    assert queue.flush() == 0
+    assert errors == [(mattr.CommitError, ["ikFk"])]
+    # Edits stay on the object
+    assert queue.maya_object.get_attribut_object("ikFk").is_dirty()
+
+def test_failed_flush_raises_without_callback (queue) :
+    queue.push("ikFk", "set_minimum_value", 5.0)
+    queue.push("ikFk", "set_has_minimum_state", True)
+    with pytest.raises(mattr.CommitError) :
+        queue.flush()
@@ -0,0 +1,77 @@
+"""
+Instrumentation : commands and operations recorded while a recorder is active, nothing after
+@autor : Nathan Boyaval
+@Version : 0.0.4
+@Update : 2025/02/19
+"""
+
+import json
+
+import pytest
+
+from nb_attribut_control import backend as bk
+from nb_attribut_control import instrument
+from nb_attribut_control import manage_attr as mattr
+
+
+@pytest.fixture
+def backend () :
+    previous = bk.current_backend[0]
+    backend = bk.set_backend(bk.MemoryBackend())
+    node = backend.createNode("transform", name = "ctrl")
+    backend.addAttr(node, longName = "ikFk", attributeType = "double")
+    yield backend
+    instrument.disable()
+    bk.set_backend(previous)
+
+
+def test_profile_records_commands_and_operations (backend, tmp_path) :
+    trace_path, report_path = tmp_path / "trace.json", tmp_path / "report.json"
+    with instrument.profile(str(trace_path), str(report_path)) as recorder :
+        assert isinstance(bk.get_backend(), instrument.InstrumentedBackend)
+        mattr.MayaObject("ctrl")
+    assert bk.get_backend() is backend
+
+    report = recorder.report()
+    assert report["operations"]["create_attributs_class"]["count"] == 1
+    assert report["commands"]["listAttr"]["count"] >= 1
+    # Commands count for innermost operation
+    assert report["commands_by_operation"]["get_custom_attr_names"] == {"listAttr" : 1}
+    assert json.loads(report_path.read_text()) == json.loads(json.dumps(report))
+    events = json.loads(trace_path.read_text())["traceEvents"]
+    assert {event["cat"] for event in events} == {"command", "operation"}
+    assert "create_attributs_class" in recorder.report_text()
+
+def test_nothing_recorded_after_disable (backend) :
+    recorder = instrument.enable()
+    maya_object = mattr.MayaObject("ctrl")
+    assert instrument.disable() is recorder
+    count = recorder.commands["listAttr"].count
+    maya_object.set_lock("ikFk", True)
+    maya_object.commit_attributs()
+    assert recorder.commands["listAttr"].count == count
+    assert "commit_attributs" not in recorder.operations
+    assert backend.getAttr("ctrl.ikFk", lock = True)
+    assert instrument.disable() is None
+
+def test_latency_stats () :
+    stats = instrument.LatencyStats()
+    for seconds in (1e-6, 3e-6, 1e-3) :
+        stats.add(seconds)
+    assert stats.count == 3 and stats.minimum == 1e-6 and stats.maximum == 1e-3
+    assert stats.percentile(0.5) == 4e-6
+    assert stats.percentile(1.0) == 1e-3
+    assert sum(stats.as_dict()["histogram_us"].values()) == 3
+
+def test_enable_from_environment (backend, monkeypatch) :
+    written = []
+    monkeypatch.setattr(instrument.atexit, "register", written.append)
+    monkeypatch.delenv("NB_ATTR_PROFILE", raising = False)
+    monkeypatch.delenv("NB_ATTR_TRACE", raising = False)
+    assert instrument.enable_from_environment() is None
+
+    monkeypatch.setenv("NB_ATTR_PROFILE", "1")
+    recorder = instrument.enable_from_environment()
+    assert instrument.active_recorder[0] is recorder and len(written) == 1
+    mattr.MayaObject("ctrl")
+    assert recorder.commands["listAttr"].count >= 1
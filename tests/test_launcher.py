@@ -0,0 +1,82 @@
+"""
+Window launcher : light import, one window built on first open and refreshed on next opens
+@autor : Nathan Boyaval
+@Version : 0.0.4
+@Update : 2025/02/19
+"""
+
+import os
+import subprocess
+import sys
+import types
+
+import pytest
+
+import nb_attribut_control
+from nb_attribut_control import launcher
+
+
+class Window () :
+    """Records launcher calls, stands for AttributManagerUI"""
+
+    built: list = []
+
+    def __init__ (self, parent = None) -> None :
+        self.parent = parent
+        self.calls = []
+        self.closed = False
+        Window.built.append(self)
+
+    def refresh (self, object_name = None) -> None :
+        self.calls.append(("refresh", object_name))
+
+    def show (self) -> None :
+        self.calls.append(("show",))
+
+    def raise_ (self) -> None :
+        pass
+
+    def activateWindow (self) -> None :
+        pass
+
+    def close (self) -> None :
+        self.closed = True
+
+    def deleteLater (self) -> None :
+        pass
+
+
+@pytest.fixture
+def window_module (monkeypatch) :
+    module = types.SimpleNamespace(AttributManagerUI = Window)
+    monkeypatch.setitem(sys.modules, "nb_attribut_control.ui", module)
+    monkeypatch.setattr(nb_attribut_control, "ui", module, raising = False)
+    monkeypatch.setattr(launcher, "window_instance", [None])
+    Window.built = []
+    return module
+
+
+def test_import_is_light () :
+    conftest = os.path.join(os.path.dirname(os.path.abspath(__file__)), "conftest.py")
+    code = (
+        "import runpy, sys; runpy.run_path({!r}); from nb_attribut_control import launcher; "
+        "print(sorted(name for name in sys.modules if name.split('.')[0] in ('PySide2', 'shiboken2', 'maya') "
+        "or name in ('nb_attribut_control.ui', 'nb_attribut_control.manage_attr')))"
+        ).format(conftest)
+    process = subprocess.run([sys.executable, "-c", code], stdout = subprocess.PIPE, universal_newlines = True, check = True)
+    assert process.stdout.strip() == "[]"
+
+def test_window_is_built_once (window_module) :
+    first = launcher.show("ctrl", parent = "main_window")
+    second = launcher.show()
+    assert first is second and len(Window.built) == 1
+    assert first.parent == "main_window"
+    assert first.calls == [("refresh", "ctrl"), ("show",), ("refresh", None), ("show",)]
+
+def test_close_forgets_window (window_module) :
+    first = launcher.show("ctrl")
+    launcher.close()
+    assert first.closed and launcher.window_instance[0] is None
+    assert launcher.show("ctrl") is not first
+    launcher.close()
+    launcher.close()
@@ -0,0 +1,90 @@
+"""
+Lazy attribut fields : names are loaded first, other field groups when first read or with prefetch
+@autor : Nathan Boyaval
+@Version : 0.0.4
+@Update : 2025/02/19
+"""
+
+import pytest
+
+from nb_attribut_control import manage_attr as mattr
+from nb_attribut_control.backend import MemoryBackend
+from nb_attribut_control.benchmark import CountingBackend
+
+
+@pytest.fixture
+def backend () -> MemoryBackend :
+    backend = MemoryBackend()
+    node = backend.createNode("transform", name = "ctrl")
+    for index in range(50) :
+        backend.addAttr(node, longName = "attr{}".format(index), attributeType = "double", maxValue = 5.0)
+    backend.addAttr(node, longName = "space", attributeType = "enum", enumName = "world:local")
+    backend.setAttr("ctrl.attr3", 2.5)
+    backend.createNode("transform", name = "driver")
+    backend.connectAttr("driver.translateX", "ctrl.attr3")
+    return backend
+
+@pytest.fixture
+def counter (backend) -> CountingBackend :
+    return CountingBackend(backend)
+
+
+def test_only_names_are_loaded (counter) :
+    maya_object = mattr.MayaObject("ctrl", backend = counter, lazy = True)
+    attr_class = maya_object.get_attribut_object("attr3")
+    assert attr_class.is_loaded("long_name") and attr_class.is_loaded("attribute_type")
+    for field in ("value", "max_value", "keyable", "enum_list", "incom_connections") :
+        assert not attr_class.is_loaded(field)
+    assert "listConnections" not in counter.calls
+
+def test_field_group_is_read_once (counter) :
+    maya_object = mattr.MayaObject("ctrl", backend = counter, lazy = True)
+    attr_class = maya_object.get_attribut_object("attr3")
+    counter.reset()
+    assert attr_class.max_value == 5.0
+    calls = counter.total()
+    assert attr_class.has_max_value and not attr_class.has_min_value
+    assert counter.total() == calls
+    assert not attr_class.is_loaded("value")
+    assert attr_class.value == 2.5
+    # Connection fields keep original names : incom lists destinations, outcom lists sources
+    assert list(attr_class.outcom_connections) == ["driver.translateX"]
+    assert maya_object.get_attribut_object("space").enum_list == "world:local"
+
+def test_prefetch_reads_many_attributs_at_once (counter) :
+    maya_object = mattr.MayaObject("ctrl", backend = counter, lazy = True)
+    counter.reset()
+    maya_object.prefetch(("value", "flags"))
+    calls = counter.total()
+    assert all(attr_class.is_loaded("locked") for attr_class in maya_object.attributs.values())
+    # Loaded groups are not read again
+    maya_object.prefetch(("value",))
+    assert counter.total() == calls
+    assert [attr_class.value for attr_class in maya_object.attributs.values()][3] == 2.5
+    assert counter.total() == calls
+
+def test_edited_fields_are_kept (backend) :
+    maya_object = mattr.MayaObject("ctrl", backend = backend, lazy = True)
+    attr_class = maya_object.get_attribut_object("attr3")
+    attr_class.set_keyable(True)
+    attr_class.prefetch()
+    assert attr_class.keyable and attr_class.dirty_fields == {"keyable" : False}
+    attr_class.invalidate()
+    assert attr_class.keyable and not attr_class.is_loaded("locked")
+    assert attr_class.is_loaded("long_name")
+    maya_object.commit_attributs()
+    assert backend.getAttr("ctrl.attr3", keyable = True)
+
+def test_invalidate_reads_maya_again (backend) :
+    attr_class = mattr.Attribut("ctrl", "attr3", in_maya = True, backend = backend, lazy = True)
+    assert attr_class.value == 2.5
+    backend.setAttr("ctrl.attr3", 1.0)
+    assert attr_class.value == 2.5
+    attr_class.invalidate(("value",))
+    assert attr_class.value == 1.0
+
+def test_new_attribut_is_not_loaded_from_maya () :
+    attr_class = mattr.Attribut("ctrl", "new_attr", backend = MemoryBackend())
+    with pytest.raises(AttributeError) :
+        attr_class.unknown_field
+    assert attr_class.value == 0
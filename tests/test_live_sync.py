@@ -0,0 +1,120 @@
+"""
+Live sync : attribut events of a local event source patch a MayaObject once per idle cycle
+@autor : Nathan Boyaval
+@Version : 0.0.4
+@Update : 2025/02/19
+"""
+
+import pytest
+
+from nb_attribut_control import live_sync
+from nb_attribut_control import manage_attr as mattr
+from nb_attribut_control.backend import MemoryBackend
+
+node: str = "L_arm_ctrl"
+
+
+class IdleQueue () :
+    """Scheduler keeping callbacks until run, stands in for maya idle queue"""
+
+    def __init__ (self) -> None :
+        self.callbacks: list = []
+
+    def __call__ (self, callback) -> None :
+        self.callbacks.append(callback)
+
+    def run (self) -> list :
+        callbacks, self.callbacks = self.callbacks, []
+        return [callback() for callback in callbacks]
+
+
+@pytest.fixture
+def backend () -> MemoryBackend :
+    backend = MemoryBackend()
+    backend.createNode("transform", name = node)
+    for name in ("ikFk", "twist", "space") :
+        backend.addAttr(node, longName = name, attributeType = "double", maxValue = 10.0)
+    return backend
+
+@pytest.fixture
+def sync (backend) -> live_sync.LiveSync :
+    maya_object = mattr.MayaObject(node, backend = backend)
+    return live_sync.LiveSync(maya_object, live_sync.LocalEventSource(), IdleQueue()).start()
+
+def names (sync) -> list :
+    return list(sync.maya_object.attributs.names())
+
+
+def test_event_source_is_abstract () :
+    with pytest.raises(TypeError) :
+        live_sync.EventSource()
+
+def test_events_are_merged_once_per_idle (sync, backend) :
+    backend.setAttr(node + ".twist", 4.0)
+    backend.addAttr(node + ".twist", edit = True, maxValue = 5.0)
+    for fields in (("value",), ("limits",), ("value",)) :
+        sync.source.emit("changed", node, "twist", fields = fields)
+    assert len(sync.scheduler.callbacks) == 1
+    assert sync.scheduler.run() == [["twist"]]
+    assert sync.apply_count == 1 and sync.event_count == 3
+    twist = sync.maya_object.get_attribut_object("twist")
+    assert twist.value == 4.0
+    assert twist.max_value == 5.0
+
+def test_other_node_events_are_ignored (sync, backend) :
+    sync.source.emit("changed", "R_arm_ctrl", "twist", fields = ("value",))
+    assert not sync.scheduler.callbacks
+
+def test_chained_renames_patch_one_attribut (sync, backend) :
+    twist = sync.maya_object.get_attribut_object("twist")
+    backend.renameAttr(node + ".twist", "roll")
+    sync.source.emit("renamed", node, "bend", old_name = "twist")
+    sync.source.emit("renamed", node, "roll", old_name = "bend")
+    sync.scheduler.run()
+    assert names(sync) == ["ikFk", "roll", "space"]
+    assert sync.maya_object.get_attribut_object("roll") is twist
+    assert twist.committed_name == "roll"
+
+def test_rename_without_old_name (sync, backend) :
+    backend.renameAttr(node + ".space", "parentSpace")
+    sync.source.emit("renamed", node, "parentSpace")
+    sync.scheduler.run()
+    assert names(sync) == ["ikFk", "twist", "parentSpace"]
+
+def test_local_rename_is_kept (sync, backend) :
+    sync.maya_object.edit_long_name("twist", "localTwist")
+    backend.renameAttr(node + ".twist", "mayaTwist")
+    sync.source.emit("renamed", node, "mayaTwist", old_name = "twist")
+    sync.scheduler.run()
+    twist = sync.maya_object.get_attribut_object("localTwist")
+    assert twist.committed_name == "mayaTwist"
+    sync.commit()
+    assert sorted(backend.listAttr(node, userDefined = True)) == ["ikFk", "localTwist", "space"]
+    assert not sync.scheduler.callbacks
+
+def test_added_and_removed_attributs (sync, backend) :
+    backend.addAttr(node, longName = "stretch", attributeType = "double", defaultValue = 1.0)
+    backend.deleteAttr(node + ".ikFk")
+    sync.source.emit("added", node, "stretch")
+    sync.source.emit("removed", node, "ikFk")
+    assert sorted(sync.scheduler.run()[0]) == ["ikFk", "stretch"]
+    assert names(sync) == ["twist", "space", "stretch"]
+    assert sync.maya_object.get_attribut_object("stretch").defaut_value == 1.0
+
+def test_removed_dirty_attribut_is_kept (sync, backend) :
+    sync.maya_object.set_maximum_value("ikFk", 3.0)
+    backend.deleteAttr(node + ".ikFk")
+    sync.source.emit("removed", node, "ikFk")
+    assert sync.scheduler.run() == [[]]
+    assert "ikFk" in names(sync)
+
+def test_own_commit_is_not_synced (sync, backend) :
+    sync.maya_object.set_maximum_value("twist", 3.0)
+    with sync.suspended() :
+        sync.source.emit("changed", node, "twist", fields = ("limits",))
+    assert sync.event_count == 0 and not sync.scheduler.callbacks
+
+def test_stop_unsubscribes (sync) :
+    sync.stop()
+    sync.source.emit("changed", node, "twist")
+    assert not sync.scheduler.callbacks
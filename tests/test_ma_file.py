@@ -0,0 +1,78 @@
+"""
+Maya ascii edits : only edited statements change, renames are rewritten in place
+@autor : Nathan Boyaval
+@Version : 0.0.4
+@Update : 2025/02/19
+"""
+
+import pytest
+
+from nb_attribut_control import ma_file
+from nb_attribut_control import manage_attr as mattr
+
+scene_text: str = """//Maya ASCII 2022 scene
+requires maya "2022";
+createNode transform -n "L_arm_ctrl";
+\taddAttr -ci true -k true -sn "ik" -ln "ikFk" -min 0 -max 1 -at "double";
+\taddAttr -ci true -sn "space" -ln "space" -en "world:local" -at "enum";
+\taddAttr -ci true -sn "tw" -ln "twist" -at "double";
+\tsetAttr -k on ".ikFk" 0.5;
+\tsetAttr -cb on ".space";
+\tsetAttr ".tw" 3;
+createNode transform -n "other";
+"""
+
+
+@pytest.fixture
+def scene_path (tmp_path) -> str :
+    path = tmp_path / "rig.ma"
+    path.write_text(scene_text)
+    return str(path)
+
+def statements (path) -> list :
+    with open(path) as file_ :
+        return [line.strip() for line in file_]
+
+def statements_of (text) -> list :
+    return [line.strip() for line in text.splitlines(True)]
+
+
+def test_unedited_file_is_unchanged (scene_path) :
+    ma_file.process_file(scene_path, [])
+    assert statements(scene_path) == statements_of(scene_text)
+
+def test_rename_rewrites_statements_in_place (scene_path) :
+    ma_file.process_file(scene_path, [("rename", "twist", "roll")])
+    lines = statements(scene_path)
+    expected = statements_of(scene_text)
+    changed = [(old, new) for old, new in zip(expected, lines) if old != new]
+    assert len(lines) == len(expected)
+    assert changed == [
+        ('addAttr -ci true -sn "tw" -ln "twist" -at "double";', 'addAttr -ci true -sn "r" -ln "roll" -at "double";'),
+        ('setAttr ".tw" 3;', 'setAttr ".roll" 3;'),
+        ]
+
+def test_rename_keeps_attribut_order (scene_path) :
+    backend = ma_file.MaBackend(scene_path)
+    maya_object = mattr.MayaObject("L_arm_ctrl", backend = backend)
+    maya_object.edit_long_name("ikFk", "blend")
+    maya_object.commit_attributs()
+    assert backend.listAttr("L_arm_ctrl", userDefined = True) == ["blend", "space", "twist"]
+    backend.write()
+    assert ma_file.MaBackend(scene_path).listAttr("L_arm_ctrl", userDefined = True) == ["blend", "space", "twist"]
+
+def test_lock_only_adds_lock_statement (scene_path) :
+    ma_file.process_file(scene_path, [("lock", "space", True)])
+    lines = statements(scene_path)
+    assert lines.count('setAttr -l on ".space";') == 1
+    assert not [line for line in lines if line.startswith('setAttr ".space"')]
+    assert len(lines) == len(statements_of(scene_text)) + 1
+
+def test_reorder_moves_recreated_attributs_last (scene_path) :
+    backend = ma_file.MaBackend(scene_path)
+    mattr.MayaObject("L_arm_ctrl", backend = backend).reorder_attributs(["twist", "ikFk", "space"])
+    backend.write()
+    reread = ma_file.MaBackend(scene_path)
+    assert reread.listAttr("L_arm_ctrl", userDefined = True) == ["twist", "ikFk", "space"]
+    assert reread.getAttr("L_arm_ctrl.ikFk") == 0.5
+    assert reread.getAttr("L_arm_ctrl.twist") == 3.0
@@ -0,0 +1,39 @@
+"""
+Mirror names : side tokens are only swapped on name token boundaries
+@autor : Nathan Boyaval
+@Version : 0.0.4
+@Update : 2025/02/19
+"""
+
+import pytest
+
+from nb_attribut_control import mirror
+
+
+@pytest.mark.parametrize("node, expected", [
+    ("L_arm_ctrl", "R_arm_ctrl"),
+    ("R_arm_ctrl", "L_arm_ctrl"),
+    ("arm_ctrl_L", "arm_ctrl_R"),
+    ("arm_L_ctrl", "arm_R_ctrl"),
+    ("L_hand_CTRL_01", "R_hand_CTRL_01"),
+    ("arm_Left_ctrl", "arm_Right_ctrl"),
+    ("arm_right_ctrl", "arm_left_ctrl"),
+    ("Left_L_arm", "Right_L_arm"),
+    ("rig:L_arm_ctrl", "rig:R_arm_ctrl"),
+    ("grp|L_arm_ctrl", "grp|R_arm_ctrl"),
+    ])
+def test_mirror_name (node, expected) :
+    assert mirror.mirror_name(node) == expected
+
+@pytest.mark.parametrize("node", ["cleft_ctrl", "CTRL_01", "Leftover_ctrl", "body_LR", "spine_ctrl"])
+def test_mirror_name_without_side (node) :
+    assert mirror.mirror_name(node) is None
+
+def test_mirror_name_round_trip () :
+    for node in ("L_hand_CTRL_01", "arm_Left_ctrl", "leg_ctrl_L") :
+        assert mirror.mirror_name(mirror.mirror_name(node)) == node
+
+def test_mirror_name_custom_rules () :
+    rules = (("lf", "rt"),)
+    assert mirror.mirror_name("arm_lf_ctrl", rules) == "arm_rt_ctrl"
+    assert mirror.mirror_name("half_ctrl", rules) is None
@@ -0,0 +1,79 @@
+"""
+Attribut sets over many nodes : one load pass, edits by name or pattern, one commit
+@autor : Nathan Boyaval
+@Version : 0.0.4
+@Update : 2025/02/19
+"""
+
+import pytest
+
+from nb_attribut_control.backend import MemoryBackend
+from nb_attribut_control.benchmark import CountingBackend
+from nb_attribut_control.object_set import MayaObjectSet
+
+
+@pytest.fixture
+def backend () -> MemoryBackend :
+    backend = MemoryBackend()
+    for index in range(4) :
+        node = backend.createNode("transform", name = "fk{}_ctrl".format(index))
+        backend.addAttr(node, longName = "ikFkSwitch", attributeType = "double", keyable = True)
+        backend.addAttr(node, longName = "stretch", attributeType = "double", keyable = True)
+    backend.addAttr("fk0_ctrl", longName = "space", attributeType = "enum", enumName = "world:local")
+    return backend
+
+@pytest.fixture
+def nodes () -> list :
+    return ["fk{}_ctrl".format(index) for index in range(4)]
+
+
+def test_nodes_are_loaded_once (backend, nodes) :
+    object_set = MayaObjectSet(nodes + nodes[:2], backend = backend)
+    assert len(object_set) == 4
+    assert [maya_object.object_name for maya_object in object_set] == nodes
+    assert object_set.add_objects(nodes[:1]) == []
+    assert [maya_object.object_name for maya_object, attr_class in object_set["space"]] == ["fk0_ctrl"]
+    assert object_set["missing"] == []
+
+def test_select_by_pattern (backend, nodes) :
+    object_set = MayaObjectSet(nodes, backend = backend)
+    assert sorted(object_set.attribut_names("*")) == ["ikFkSwitch", "space", "stretch"]
+    assert object_set.attribut_names("s.*", regex = True) == ["stretch", "space"]
+    assert len(object_set.match("*Switch")) == 4
+
+def test_apply_and_commit (backend, nodes) :
+    counter = CountingBackend(backend)
+    object_set = MayaObjectSet(nodes, backend = counter)
+    assert object_set.apply("*Switch", "set_keyable", False) == 4
+    assert object_set.set_limits("stretch", 0.0, 2.0) == 4
+    assert len(object_set.dirty_objects()) == 4
+    with pytest.raises(AttributeError) :
+        object_set.apply("*", "unknown")
+
+    counter.reset()
+    command_count = object_set.commit()
+    # One setAttr and one addAttr edit per node, in one undo chunk
+    assert counter.calls["setAttr"] == counter.calls["addAttr"] == 4
+    assert counter.calls["undoInfo"] == 2
+    assert command_count == 8
+    assert object_set.dirty_objects() == []
+    for node in nodes :
+        assert not backend.getAttr(node + ".ikFkSwitch", keyable = True)
+        assert backend.attributeQuery("stretch", node = node, maximum = True) == [2.0]
+
+@pytest.mark.parametrize("options", [{"lazy" : True}, {"compact" : True}])
+def test_lazy_and_compact (backend, nodes, options) :
+    object_set = MayaObjectSet(nodes, backend = backend, **options)
+    object_set.apply("stretch", "set_lock", True)
+    object_set.commit()
+    assert all(backend.getAttr(node + ".stretch", lock = True) for node in nodes)
+    assert object_set.get_object("fk2_ctrl").get_attribut_object("ikFkSwitch").keyable
+
+def test_reindex_after_rename (backend, nodes) :
+    object_set = MayaObjectSet(nodes, backend = backend)
+    object_set.get_object("fk1_ctrl").edit_long_name("stretch", "squash")
+    object_set.reindex()
+    assert [maya_object.object_name for maya_object, attr_class in object_set["squash"]] == ["fk1_ctrl"]
+    assert len(object_set["stretch"]) == 3
+    object_set.commit()
+    assert backend.objExists("fk1_ctrl.squash") and not backend.objExists("fk1_ctrl.stretch")
@@ -0,0 +1,92 @@
+"""
+Range checks : types, limits order, integer ranges, defaut values and values in one pass, with or without numpy
+@autor : Nathan Boyaval
+@Version : 0.0.4
+@Update : 2025/02/19
+"""
+
+import pytest
+
+from nb_attribut_control import manage_attr as mattr
+from nb_attribut_control import range_check
+from nb_attribut_control.attribut_table import AttributTable
+from nb_attribut_control.backend import MemoryBackend
+
+
+def make_attribut (name, attribute_type = "double", minimum = None, maximum = None, defaut_value = 0.0, value = 0.0) :
+    attr_class = mattr.Attribut("ctrl", long_name = name, backend = MemoryBackend())
+    attr_class.attribute_type = attribute_type
+    attr_class.has_min_value, attr_class.min_value = minimum is not None, minimum or 0.0
+    attr_class.has_max_value, attr_class.max_value = maximum is not None, maximum or 0.0
+    attr_class.defaut_value = defaut_value
+    attr_class.value = value
+    return attr_class
+
+@pytest.fixture
+def attributs () -> list :
+    return [
+        make_attribut("good", minimum = 0.0, maximum = 1.0, value = 0.5),
+        make_attribut("unknown", "vector"),
+        make_attribut("order", minimum = 2.0, maximum = 1.0),
+        make_attribut("byte", "byte", maximum = 500.0),
+        make_attribut("half", "long", value = 1.5),
+        make_attribut("defaut", minimum = 0.0, maximum = 1.0, defaut_value = 2.0),
+        make_attribut("value", minimum = 0.0, maximum = 1.0, value = -1.0),
+        make_attribut("short", "short", value = 40000),
+        make_attribut("matrix", "matrix", value = [1.0] * 16),
+        ]
+
+expected_errors: dict = {
+    "unknown_type" : [1],
+    "limits_order" : [2],
+    "integer_range" : [3],
+    "not_integer" : [4],
+    "defaut_range" : [5],
+    "value_range" : [6, 7],
+    }
+
+@pytest.fixture(params = ["numpy", "lists"])
+def numpy_mode (request, monkeypatch) :
+    if request.param == "numpy" :
+        pytest.importorskip("numpy")
+    else :
+        monkeypatch.setattr(range_check, "numpy", None)
+    return request.param
+
+
+def test_errors (attributs, numpy_mode) :
+    report = range_check.check_ranges(attributs)
+    assert report.errors == expected_errors
+    assert not report and report.count == 7 and len(report) == 9
+    assert report.rows() == {1, 2, 3, 4, 5, 6, 7}
+    assert report.summary()["value_range"] == 2
+    assert ("order", "Minimum value 2.0 is greater than maximum value 1.0") in report.problems()
+    assert report.problems(("defaut_range",)) == [("defaut", "Defaut value 2.0 is out of limits [0.0, 1.0]")]
+
+def test_clamp (attributs, numpy_mode) :
+    report = range_check.check_ranges(attributs, clamp = True)
+    clamped = {(attr_class.long_name, field) : new_value for attr_class, field, old_value, new_value in report.clamped}
+    assert clamped == {("half", "value") : 2, ("defaut", "defaut_value") : 1.0, ("value", "value") : 0.0, ("short", "value") : 32767}
+    assert type(clamped[("half", "value")]) is int
+    assert attributs[7].dirty_fields == {"value" : 40000}
+    assert range_check.check_ranges(attributs[4:8])
+
+def test_empty () :
+    assert range_check.check_ranges([]).count == 0
+
+def test_table_rows_match_attributs () :
+    pytest.importorskip("numpy")
+    backend = MemoryBackend()
+    node = backend.createNode("transform", name = "ctrl")
+    backend.addAttr(node, longName = "limited", attributeType = "double", minValue = 0.0, maxValue = 1.0)
+    backend.addAttr(node, longName = "count", attributeType = "long")
+    backend.addAttr(node, longName = "matrix", attributeType = "matrix")
+    table = AttributTable()
+    views = mattr.MayaObject(node, backend = backend, table = table).attributs.values()
+    views[0].value = 3.0
+    views[1].value = 2.5
+    report = range_check.check_ranges(views)
+    assert report.errors["value_range"] == [0] and report.errors["not_integer"] == [1]
+    plain = mattr.MayaObject(node, backend = backend).attributs.values()
+    plain[0].value, plain[1].value = 3.0, 2.5
+    assert range_check.check_ranges(plain).errors == report.errors
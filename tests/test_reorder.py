@@ -0,0 +1,75 @@
+"""
+Attribut reorder : only the attributs after the longest kept start are created again
+@autor : Nathan Boyaval
+@Version : 0.0.4
+@Update : 2025/02/19
+"""
+
+import pytest
+
+from nb_attribut_control import manage_attr as mattr
+from nb_attribut_control import snapshot as snap
+from nb_attribut_control.backend import MemoryBackend
+from nb_attribut_control.benchmark import CountingBackend
+
+
+@pytest.fixture
+def backend () -> MemoryBackend :
+    backend = MemoryBackend()
+    node = backend.createNode("transform", name = "ctrl")
+    for index in range(150) :
+        backend.addAttr(node, longName = "attr{}".format(index), attributeType = "double", minValue = -5.0, maxValue = 5.0)
+        backend.setAttr("ctrl.attr{}".format(index), index % 5)
+    backend.setAttr("ctrl.attr148", keyable = True)
+    backend.setAttr("ctrl.attr149", lock = True)
+    backend.createNode("transform", name = "driver")
+    backend.connectAttr("driver.translateX", "ctrl.attr149")
+    return backend
+
+@pytest.fixture
+def maya_object (backend) -> mattr.MayaObject :
+    return mattr.MayaObject("ctrl", backend = backend)
+
+
+def names (attr_classes) -> list :
+    return [attr_class.long_name for attr_class in attr_classes]
+
+def test_plan_is_minimal_suffix (maya_object) :
+    assert maya_object.reorder_plan() == []
+    # attr149 keeps its place, attr148 is created again after it
+    maya_object.move_attribut_up("attr149")
+    assert names(maya_object.reorder_plan()) == ["attr148"]
+    maya_object.move_attribut("attr149", -147)
+    assert len(maya_object.reorder_plan()) == 148
+
+def test_plan_from_given_order (maya_object) :
+    order = maya_object.custom_attributs
+    maya_order = order[:1] + order[2:3] + order[1:2] + order[3:]
+    assert names(maya_object.reorder_plan(maya_order)) == order[2:]
+
+def test_plan_skips_recreated_attributs (maya_object) :
+    maya_object.move_attribut("attr149", -2)
+    maya_object.edit_long_name("attr148", "renamed")
+    # Renamed attribut is created again anyway, last in maya
+    assert names(maya_object.reorder_plan()) == ["attr147"]
+
+def test_reorder_moves_one_attribut (maya_object, backend) :
+    before = snap.load_node_snapshot("ctrl", None, backend)
+    counter = CountingBackend(backend)
+    maya_object.cmds = counter
+    for attr_class in maya_object.attributs.values() :
+        attr_class.cmds = counter
+    maya_object.move_attribut_up("attr149")
+    maya_object.reorder_attributs()
+    assert counter.calls["deleteAttr"] == 1
+    assert counter.calls["undoInfo"] == 2
+    assert maya_object.commit_report["recreated"] == ["attr148"]
+    assert backend.listAttr("ctrl", userDefined = True)[-2:] == ["attr149", "attr148"]
+    # Values, limits, states and connections are carried
+    assert snap.load_node_snapshot("ctrl", None, backend) == before
+
+def test_reorder_to_target_order (maya_object, backend) :
+    target = ["attr2", "attr0", "attr1"]
+    maya_object.reorder_attributs(target + ["attr{}".format(index) for index in range(3, 150)])
+    assert backend.listAttr("ctrl", userDefined = True)[:3] == target
+    assert maya_object.custom_attributs[:3] == target
@@ -0,0 +1,111 @@
+"""
+Sampling : frame ranges, key reduction, batched reads, sample cache and key write back
+@autor : Nathan Boyaval
+@Version : 0.0.4
+@Update : 2025/02/19
+"""
+
+import pytest
+
+from nb_attribut_control import manage_attr as mattr
+from nb_attribut_control import sampling
+from nb_attribut_control.backend import MemoryBackend
+from nb_attribut_control.benchmark import CountingBackend
+
+node: str = "L_arm_ctrl"
+
+
+@pytest.fixture
+def backend () -> CountingBackend :
+    """Control with a static, a keyed, a second keyed and a driven attribut"""
+    memory = MemoryBackend()
+    memory.createNode("transform", name = node)
+    driver = memory.createNode("transform", name = "driver")
+    memory.addAttr(driver, longName = "drive", attributeType = "double")
+    for name in ("static", "keyed", "stepped", "driven") :
+        memory.addAttr(node, longName = name, attributeType = "long" if name == "stepped" else "double")
+    memory.setAttr(node + ".static", 2.5)
+    memory.setKeyframe(node + ".keyed", time = 1.0, value = 0.0)
+    memory.setKeyframe(node + ".keyed", time = 5.0, value = 8.0)
+    memory.setKeyframe(node + ".stepped", time = 1.0, value = 0.0)
+    memory.setKeyframe(node + ".stepped", time = 5.0, value = 3.0)
+    memory.connectAttr(driver + ".drive", node + ".driven")
+    return CountingBackend(memory)
+
+@pytest.fixture
+def maya_object (backend) -> mattr.MayaObject :
+    maya_object = mattr.MayaObject(node, backend = backend)
+    backend.reset()
+    return maya_object
+
+
+def test_frame_range () :
+    assert sampling.frame_range(1, 3) == [1.0, 2.0, 3.0]
+    assert sampling.frame_range(1, 2, 0.25) == [1.0, 1.25, 1.5, 1.75, 2.0]
+    assert len(sampling.frame_range(0, 1, 0.1)) == 11
+    assert sampling.frame_range(3, 1) == []
+    with pytest.raises(ValueError) :
+        sampling.frame_range(1, 3, 0)
+
+def test_reduce_keys () :
+    frames = [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert sampling.reduce_keys(frames, [0.0, 1.0, 2.0, 3.0, 4.0]) == [(1.0, 0.0), (5.0, 4.0)]
+    assert sampling.reduce_keys(frames, [0.0, 1.0, 2.0, 2.0, 2.0]) == [(1.0, 0.0), (3.0, 2.0), (5.0, 2.0)]
+    # Values off the line by less than tolerance are dropped
+    assert len(sampling.reduce_keys(frames, [0.0, 1.0, 2.0 + 1e-12, 3.0, 4.0])) == 2
+    assert len(sampling.reduce_keys(frames, [0.0, 1.0, 2.01, 3.0, 4.0], tolerance = 1e-3)) == 5
+    assert len(sampling.reduce_keys(frames, [0.0, 1.0, 2.01, 3.0, 4.0], tolerance = 0.05)) == 2
+    # Step keys only drop values equal to both neighbours
+    assert sampling.reduce_keys(frames, [0, 0, 0, 1, 1], linear = False) == [(1.0, 0), (3.0, 0), (4.0, 1), (5.0, 1)]
+
+def test_sample_reads_curves_in_one_query (maya_object, backend) :
+    samples = maya_object.sample_attributs(1, 5)
+    assert samples.names == ["static", "keyed", "stepped", "driven"]
+    assert samples.column("static") == [2.5] * 5
+    assert samples.column("keyed") == [0.0, 2.0, 4.0, 6.0, 8.0]
+    assert samples.column("stepped") == [0.0, 1.0, 2.0, 2.0, 3.0]
+    assert samples.column("driven") == [0.0] * 5
+    assert backend.calls["keyframe"] == 1
+    # Static attribut value was loaded with the object, driven attribut is read once per frame
+    assert backend.calls["getAttr"] == 5
+
+def test_samples_are_cached (maya_object, backend) :
+    maya_object.sample_attributs(1, 5)
+    backend.reset()
+    samples = maya_object.sample_attributs(1, 5)
+    assert backend.total() == 0
+    assert samples.column("keyed") == [0.0, 2.0, 4.0, 6.0, 8.0]
+    # Other frames are read again
+    maya_object.sample_attributs(1, 3)
+    assert backend.calls["keyframe"] == 1
+
+def test_changed_attribut_is_sampled_again (maya_object, backend) :
+    maya_object.sample_attributs(1, 5)
+    maya_object.get_attribut_object("static").set_field("value", 4.0)
+    backend.reset()
+    samples = maya_object.sample_attributs(1, 5)
+    assert samples.column("static") == [4.0] * 5
+    assert backend.calls["keyframe"] == 0
+
+    maya_object.commit_attributs()
+    maya_object.get_attribut_object("keyed").invalidate(("connections",))
+    backend.reset()
+    samples = maya_object.sample_attributs(1, 5)
+    assert backend.calls["keyframe"] == 1
+    assert samples.column("static") == [4.0] * 5
+
+def test_write_keys (maya_object, backend) :
+    samples = sampling.Samples(sampling.frame_range(1, 5), ["keyed"], [[0.0, 5.0, 10.0, 9.0, 8.0]])
+    backend.reset()
+    command_count = maya_object.write_keys(samples)
+    # cutKey, then first, corner and last keys
+    assert backend.calls["setKeyframe"] == 3
+    assert command_count == 4
+    assert backend.calls["undoInfo"] == 2
+    assert maya_object.sample_attributs(1, 5, pattern = "keyed").column("keyed") == [0.0, 5.0, 10.0, 9.0, 8.0]
+
+def test_write_keys_on_static_attribut (maya_object, backend) :
+    samples = maya_object.sample_attributs(1, 3, pattern = "static")
+    maya_object.write_keys(samples, reduce = False)
+    assert backend.keyframe(node + ".static", query = True) == [1.0, 2.0, 3.0]
+    assert not maya_object.sample_cache
@@ -0,0 +1,81 @@
+"""
+Scene scanner : inverted attribut index, definition queries and rescans
+@autor : Nathan Boyaval
+@Version : 0.0.4
+@Update : 2025/02/19
+"""
+
+import pytest
+
+from nb_attribut_control.backend import MemoryBackend
+from nb_attribut_control.benchmark import CountingBackend
+from nb_attribut_control.scene_scanner import SceneScanner
+
+controls: tuple = ("L_arm_ctrl", "R_arm_ctrl", "spine_ctrl")
+
+
+@pytest.fixture
+def backend () -> MemoryBackend :
+    backend = MemoryBackend()
+    for node in controls :
+        backend.createNode("transform", name = node)
+        backend.addAttr(node, longName = "ikFkSwitch", attributeType = "double", minValue = 0.0, maxValue = 1.0)
+    for node in controls[:2] :
+        backend.addAttr(node, longName = "space", attributeType = "enum", enumName = "world:local")
+    return backend
+
+@pytest.fixture
+def scanner (backend) -> SceneScanner :
+    scanner = SceneScanner(backend = backend, chunk_size = 2)
+    scanner.scan(controls)
+    return scanner
+
+
+def test_scan_indexes_attributs (scanner) :
+    assert len(scanner) == 3
+    assert scanner.find("ikFkSwitch") == sorted(controls)
+    assert scanner.find("sp*") == ["L_arm_ctrl", "R_arm_ctrl"]
+    assert scanner.find("missing") == []
+    assert scanner.find_definition("ikFkSwitch", max_value = 1.0) == sorted(controls)
+    assert scanner.inconsistent() == {}
+
+def test_scan_lists_nodes_by_type (backend) :
+    backend.createNode("joint", name = "L_arm_jnt")
+    scanner = SceneScanner(backend = backend)
+    assert scanner.scan() == 3
+
+def test_scan_checks_nodes_by_chunk (backend) :
+    counter = CountingBackend(backend)
+    progress = []
+    scanner = SceneScanner(backend = counter, chunk_size = 2)
+    scanner.progress_callbacks.append(lambda done, total : progress.append((done, total)))
+    scanner.scan(controls)
+    assert counter.calls["ls"] == 2
+    assert counter.calls["objExists"] == 0
+    assert progress == [(2, 3), (3, 3)]
+
+def test_rescan_updates_inverted_index (scanner, backend) :
+    backend.addAttr("spine_ctrl.ikFkSwitch", edit = True, maxValue = 2.0)
+    backend.addAttr("spine_ctrl", longName = "space", attributeType = "enum", enumName = "world:local")
+    backend.deleteAttr("R_arm_ctrl.space")
+    scanner.rescan(["spine_ctrl", "R_arm_ctrl"])
+
+    assert scanner.find("space") == ["L_arm_ctrl", "spine_ctrl"]
+    assert scanner.find_definition("ikFkSwitch", max_value = 2.0) == ["spine_ctrl"]
+    assert scanner.find_definition("ikFkSwitch", max_value = 1.0) == ["L_arm_ctrl", "R_arm_ctrl"]
+    inconsistent = scanner.inconsistent("ikFk*")
+    assert list(inconsistent) == ["ikFkSwitch"]
+    assert sorted(inconsistent["ikFkSwitch"].values()) == [["L_arm_ctrl", "R_arm_ctrl"], ["spine_ctrl"]]
+
+def test_rescan_removes_deleted_nodes (scanner, backend) :
+    backend.delete("L_arm_ctrl", "R_arm_ctrl")
+    scanner.rescan(controls)
+    assert len(scanner) == 1
+    assert "space" not in scanner
+    assert scanner.nodes_by_signature["ikFkSwitch"] == {scanner.definitions["spine_ctrl"]["ikFkSwitch"] : {"spine_ctrl"}}
+
+def test_diff_against_reference (scanner) :
+    diffs = scanner.diff_against("L_arm_ctrl")
+    assert list(diffs) == ["spine_ctrl"]
+    definition, other_definition = diffs["spine_ctrl"]["space"]
+    assert definition["attribute_type"] == "enum" and other_definition is None
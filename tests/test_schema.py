@@ -0,0 +1,110 @@
+"""
+Schema files : json and binary round trips, binary streaming and schema apply
+@autor : Nathan Boyaval
+@Version : 0.0.4
+@Update : 2025/02/19
+"""
+
+import io
+
+import pytest
+
+from nb_attribut_control import manage_attr as mattr
+from nb_attribut_control import schema as mschema
+from nb_attribut_control.backend import MemoryBackend
+
+
+@pytest.fixture
+def backend () -> MemoryBackend :
+    return MemoryBackend()
+
+def build_control (backend, name = "L_arm_ctrl") -> str :
+    """Control with limits, enum, states, a matrix and a nice name"""
+    node = backend.createNode("transform", name = name)
+    backend.addAttr(node, longName = "ikFkSwitch", attributeType = "double", minValue = 0.0, maxValue = 1.0, keyable = True)
+    backend.addAttr(node, longName = "twist", attributeType = "doubleAngle", defaultValue = -12.5, minValue = -90.0)
+    backend.addAttr(node, longName = "space", attributeType = "enum", enumName = "world:local:parent", keyable = True)
+    backend.addAttr(node, longName = "visible", shortName = "vis", attributeType = "bool", defaultValue = 1)
+    backend.addAttr(node, longName = "count", attributeType = "long", maxValue = 10, niceName = "Finger Count")
+    backend.addAttr(node, longName = "offsetMatrix", attributeType = "matrix")
+    backend.setAttr("{}.twist".format(node), channelBox = True)
+    backend.setAttr("{}.count".format(node), lock = True)
+    return node
+
+def node_schema (backend, node) -> dict :
+    return mschema.object_schema(mattr.MayaObject(node, backend = backend, lazy = True))
+
+def json_round_trip (schemas) -> list :
+    json_file = io.StringIO()
+    mschema.write_json(schemas, json_file)
+    json_file.seek(0)
+    return mschema.read_json(json_file)
+
+def binary_round_trip (schemas) -> list :
+    binary_file = io.BytesIO()
+    mschema.write_binary(schemas, binary_file)
+    binary_file.seek(0)
+    return mschema.read_binary(binary_file)
+
+
+@pytest.mark.parametrize("round_trip", [json_round_trip, binary_round_trip], ids = ["json", "binary"])
+def test_round_trip (backend, round_trip) :
+    schema = node_schema(backend, build_control(backend))
+    assert [attribut["long_name"] for attribut in schema["attributs"]] == [
+        "ikFkSwitch", "twist", "space", "visible", "count", "offsetMatrix",
+        ]
+    assert round_trip([schema]) == [schema]
+
+def test_round_trip_many_nodes (backend, tmp_path) :
+    schemas = [node_schema(backend, build_control(backend, "ctrl{}".format(index))) for index in range(3)]
+    schemas.append({"node" : "empty_ctrl", "attributs" : []})
+    for path, write, read in (
+        (tmp_path / "rig.json", mschema.write_json, mschema.read_json),
+        (tmp_path / "rig.nbas", mschema.write_binary, mschema.read_binary),
+        ) :
+        write(schemas, str(path))
+        assert read(str(path)) == schemas
+
+def test_binary_is_smaller_than_json (backend) :
+    schema = node_schema(backend, build_control(backend))
+    schemas = [dict(schema, node = "ctrl{}".format(index)) for index in range(50)]
+    json_file = io.StringIO()
+    mschema.write_json(schemas, json_file)
+    binary_file = io.BytesIO()
+    mschema.write_binary(schemas, binary_file)
+    assert len(binary_file.getvalue()) < len(json_file.getvalue().encode("utf-8")) / 4
+
+def test_iter_binary_streams_schemas (backend) :
+    schema = node_schema(backend, build_control(backend))
+    binary_file = io.BytesIO()
+    mschema.write_binary((dict(schema, node = "ctrl{}".format(index)) for index in range(3)), binary_file)
+    # A broken record after the first node does not stop the first schema from being read,
+    # second node record follows its name string
+    data = binary_file.getvalue()
+    broken = io.BytesIO(data[:data.index(b"ctrl1") + len(b"ctrl1")] + b"X")
+
+    schemas = mschema.iter_binary(broken)
+    assert next(schemas) == dict(schema, node = "ctrl0")
+    with pytest.raises(ValueError) :
+        next(schemas)
+
+    binary_file.seek(0)
+    assert [node_schema["node"] for node_schema in mschema.iter_binary(binary_file)] == ["ctrl0", "ctrl1", "ctrl2"]
+
+def test_iter_binary_checks_header () :
+    with pytest.raises(ValueError) :
+        list(mschema.iter_binary(io.BytesIO(b"JSON\x01\x00")))
+
+def test_apply_schema (backend) :
+    schema = node_schema(backend, build_control(backend))
+    targets = [backend.createNode("transform", name = "ctrl{}".format(index)) for index in range(3)]
+    mschema.apply_schema(schema, targets, backend = backend)
+    for target in targets :
+        assert node_schema(backend, target) == dict(schema, node = target)
+
+def test_apply_binary_schema (backend) :
+    """Schema read back from a binary file builds the same layout"""
+    schema = node_schema(backend, build_control(backend))
+    target = backend.createNode("transform", name = "R_arm_ctrl")
+    mschema.apply_schema(binary_round_trip([schema])[0], [target], backend = backend)
+    assert node_schema(backend, target) == dict(schema, node = target)
@@ -0,0 +1,77 @@
+"""
+Snapshot loader : node level queries, value types and values left out of snapshots
+@autor : Nathan Boyaval
+@Version : 0.0.4
+@Update : 2025/02/19
+"""
+
+import pytest
+
+from nb_attribut_control import manage_attr as mattr
+from nb_attribut_control import snapshot as snap
+from nb_attribut_control.attribut_table import AttributTable
+from nb_attribut_control.backend import MemoryBackend
+from nb_attribut_control.benchmark import CountingBackend
+
+node: str = "L_arm_ctrl"
+identity: list = [1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0]
+offset: list = identity[:12] + [1.0, 2.0, 3.0, 1.0]
+
+
+@pytest.fixture
+def backend () -> CountingBackend :
+    memory = MemoryBackend()
+    memory.createNode("transform", name = node)
+    memory.addAttr(node, longName = "ikFk", attributeType = "double", minValue = 0.0, maxValue = 1.0, defaultValue = 0.5)
+    memory.addAttr(node, longName = "fingers", attributeType = "long", maxValue = 5)
+    memory.addAttr(node, longName = "visible", attributeType = "bool", defaultValue = 1)
+    memory.addAttr(node, longName = "space", attributeType = "enum", enumName = "world:local")
+    memory.addAttr(node, longName = "offsetMatrix", attributeType = "matrix")
+    memory.setAttr(node + ".fingers", 3)
+    memory.setAttr(node + ".offsetMatrix", offset, type = "matrix")
+    memory.setAttr(node + ".ikFk", lock = True)
+    return CountingBackend(memory)
+
+
+def test_node_queries (backend) :
+    node_snapshot = snap.load_node_snapshot(node, None, backend)
+    assert list(node_snapshot) == ["ikFk", "fingers", "visible", "space", "offsetMatrix"]
+    # Attribut list, 3 flag lists, 2 connection lists, strings and numbers
+    assert backend.total() == 8
+    assert backend.calls["attributeQuery"] == backend.calls["getAttr"] == 0
+
+def test_value_types (backend) :
+    node_snapshot = snap.load_node_snapshot(node, None, backend)
+    ik_fk = node_snapshot["ikFk"]
+    assert (ik_fk["value"], ik_fk["defaut_value"], ik_fk["min_value"], ik_fk["max_value"]) == (0.5, 0.5, 0.0, 1.0)
+    assert ik_fk["locked"] and not ik_fk["keyable"]
+    assert node_snapshot["fingers"]["value"] == 3 and isinstance(node_snapshot["fingers"]["value"], int)
+    assert node_snapshot["fingers"]["has_max_value"] and not node_snapshot["fingers"]["has_min_value"]
+    assert node_snapshot["visible"]["value"] is True
+    assert node_snapshot["space"]["enum_list"] == "world:local"
+
+def test_fields_of_groups_only (backend) :
+    node_snapshot = snap.load_node_snapshot(node, ["ikFk"], backend, ("limits",))
+    assert set(node_snapshot["ikFk"]) == set(snap.field_groups["names"] + snap.field_groups["limits"])
+    assert backend.calls["listAttr"] == backend.calls["listConnections"] == 0
+
+def test_matrix_value_is_left_out (backend) :
+    node_snapshot = snap.load_node_snapshot(node, None, backend)
+    assert "value" not in node_snapshot["offsetMatrix"]
+    assert node_snapshot["offsetMatrix"]["attribute_type"] == "matrix"
+
+@pytest.mark.parametrize("use_table", [False, True], ids = ["attribut", "table"])
+def test_matrix_value_is_read_when_used (backend, use_table) :
+    maya_object = mattr.MayaObject(node, backend = backend, table = AttributTable() if use_table else None)
+    matrix = maya_object.get_attribut_object("offsetMatrix")
+    assert not matrix.is_loaded("value")
+    backend.reset()
+    assert matrix.value == offset
+    assert matrix.value == offset
+    assert backend.calls["getAttr"] == 1
+    assert matrix.is_loaded("value")
+
+def test_lazy_object_reads_matrix_value (backend) :
+    maya_object = mattr.MayaObject(node, backend = backend, lazy = True)
+    assert maya_object.get_attribut_object("offsetMatrix").value == offset
+    assert maya_object.get_attribut_object("fingers").value == 3
@@ -0,0 +1,112 @@
+"""
+Snapshot cache : definition edits made outside of the cache, eviction and failed saves
+@autor : Nathan Boyaval
+@Version : 0.0.4
+@Update : 2025/02/19
+"""
+
+import os
+
+import pytest
+
+from nb_attribut_control import snapshot_cache
+from nb_attribut_control.backend import MemoryBackend
+
+
+class PlainBackend () :
+    """Backend without package query commands, like maya.cmds"""
+
+    def __init__ (self, backend) -> None :
+        self.backend = backend
+
+    def __getattr__ (self, command) :
+        if command in ("query_attribut_strings", "query_attribut_numbers") :
+            raise AttributeError (command)
+        return getattr(self.backend, command)
+
+
+@pytest.fixture
+def backend () -> MemoryBackend :
+    backend = MemoryBackend()
+    backend.scene_name = "rig.ma"
+    return backend
+
+@pytest.fixture
+def cache_path (tmp_path) -> str :
+    return str(tmp_path / "snapshot_cache.bin")
+
+def build_control (backend, name = "L_arm_ctrl", attribut_count = 3) -> str :
+    node = backend.createNode("transform", name = name)
+    for index in range(attribut_count) :
+        backend.addAttr(node, longName = "attr{}".format(index), attributeType = "double", maxValue = 10.0)
+    return node
+
+def load (node, path, backend) -> dict :
+    cache = snapshot_cache.SnapshotCache(path)
+    node_snapshot = snapshot_cache.load_snapshots([node], cache, backend)[node]
+    cache.close()
+    return node_snapshot, cache
+
+
+@pytest.mark.parametrize("flags, field, expected", [
+    ({"niceName" : "Edited"}, "nice_name", "Edited"),
+    ({"maxValue" : 5.0}, "max_value", 5.0),
+    ({"defaultValue" : 2.0}, "defaut_value", 2.0),
+    ], ids = ["nice_name", "maximum", "defaut"])
+def test_definition_edit_is_seen (backend, cache_path, flags, field, expected) :
+    node = build_control(backend)
+    load(node, cache_path, backend)
+    backend.addAttr(node + ".attr1", edit = True, **flags)
+    node_snapshot, cache = load(node, cache_path, backend)
+    assert node_snapshot["attr1"][field] == expected
+    assert cache.stats["stale"] == 1
+
+def test_value_edit_keeps_entry (backend, cache_path) :
+    node = build_control(backend)
+    load(node, cache_path, backend)
+    backend.setAttr(node + ".attr1", 3.0)
+    node_snapshot, cache = load(node, cache_path, backend)
+    assert cache.stats["hits"] == 1
+
+def test_backend_without_query_commands_skips_cache (backend, cache_path) :
+    node = build_control(backend)
+    plain = PlainBackend(backend)
+    load(node, cache_path, plain)
+    backend.addAttr(node + ".attr1", edit = True, niceName = "Edited")
+    node_snapshot, cache = load(node, cache_path, plain)
+    assert node_snapshot["attr1"]["nice_name"] == "Edited"
+    assert cache.stats["hits"] == cache.stats["misses"] == 0
+
+def test_eviction_stops_once_file_fits (backend, cache_path) :
+    nodes = [build_control(backend, "ctrl_{}".format(index), index + 1) for index in range(6)]
+    cache = snapshot_cache.SnapshotCache(cache_path)
+    snapshot_cache.load_snapshots(nodes, cache, backend)
+    full_size = os.path.getsize(cache_path)
+    cache.close()
+
+    # Room for every entry but the first (least recently used) one
+    cache = snapshot_cache.SnapshotCache(cache_path, max_bytes = full_size - 1)
+    snapshot_cache.load_snapshots(nodes, cache, backend)
+    cache.put("rig.ma", "new_node", snapshot_cache.no_fingerprint, {})
+    cache.save()
+    assert cache.stats["evictions"] == 1
+    assert len(cache) == len(nodes)
+    assert cache.find(snapshot_cache.make_key("rig.ma", nodes[0])) is None
+    assert os.path.getsize(cache_path) <= full_size - 1
+    cache.close()
+
+def test_failed_replace_skips_save (backend, cache_path, monkeypatch) :
+    node = build_control(backend)
+    load(node, cache_path, backend)
+
+    def replace (source, target) :
+        raise PermissionError ("File mapped by another process")
+    monkeypatch.setattr(snapshot_cache.os, "replace", replace)
+    other = build_control(backend, "R_arm_ctrl")
+    cache = snapshot_cache.SnapshotCache(cache_path)
+    snapshots = snapshot_cache.load_snapshots([node, other], cache, backend)
+    assert list(snapshots) == [node, other]
+    assert cache.stats["failed_saves"] == 1
+    assert cache.count == 1 and len(cache) == 2
+    assert not [name for name in os.listdir(os.path.dirname(cache_path)) if name.endswith(".tmp")]
+    cache.close()
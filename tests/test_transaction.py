@@ -0,0 +1,120 @@
+"""
+Transactional commits : edits checked before maya is touched, attributs put back when a maya command fails
+@autor : Nathan Boyaval
+@Version : 0.0.4
+@Update : 2025/02/19
+"""
+
+import pytest
+
+from nb_attribut_control import benchmark
+from nb_attribut_control import manage_attr as mattr
+from nb_attribut_control import snapshot as snap
+from nb_attribut_control.backend import MemoryBackend
+from nb_attribut_control.object_set import MayaObjectSet
+from nb_attribut_control.transaction import Transaction
+
+
+@pytest.fixture
+def backend () -> MemoryBackend :
+    backend = MemoryBackend()
+    for node in ("ctrl0", "ctrl1", "ctrl2") :
+        benchmark.build_control(backend, node, 10)
+    backend.createNode("transform", name = "driver")
+    backend.connectAttr("ctrl0.customAttr1", "driver.translateX")
+    backend.connectAttr("driver.translateY", "ctrl0.customAttr2")
+    backend.setAttr("ctrl0.customAttr1", lock = True)
+    return backend
+
+def node_state (backend, node) -> tuple :
+    """Attribut order, fields and connections of a node"""
+    return (
+        backend.listAttr(node, userDefined = True),
+        snap.load_node_snapshot(node, None, backend),
+        )
+
+def edit (maya_object) -> None :
+    maya_object.edit_long_name("customAttr1", "renamed")
+    maya_object.set_keyable("customAttr3", False)
+    maya_object.get_attribut_object("customAttr4").set_field("value", 0.25)
+    maya_object.delete_attribut("customAttr2")
+    maya_object.add_attribut("new_attr")
+
+
+@pytest.mark.parametrize("failing_call", [1, 2])
+def test_check_commit_rollback (failing_call) :
+    assert benchmark.check_commit_rollback(failing_call = failing_call) == []
+
+@pytest.mark.parametrize("command, failing_call", [("addAttr", 2), ("setAttr", 1), ("setAttr", 3), ("deleteAttr", 2)])
+def test_failed_commit_is_put_back (backend, command, failing_call) :
+    before = node_state(backend, "ctrl0")
+    maya_object = mattr.MayaObject("ctrl0", backend = benchmark.FailingBackend(backend, command, failing_call))
+    edit(maya_object)
+    dirty = {name : dict(maya_object.get_attribut_object(name).dirty_fields) for name in ("renamed", "customAttr3")}
+    with pytest.raises(mattr.CommitError) as error :
+        maya_object.commit_attributs()
+    assert error.value.rolled_back and isinstance(error.value.error, RuntimeError)
+    assert node_state(backend, "ctrl0") == before
+
+    # Object keeps its edits, commit can run again
+    assert maya_object.deleted_attributs == ["customAttr2"]
+    for name, dirty_fields in dirty.items() :
+        assert maya_object.get_attribut_object(name).dirty_fields == dirty_fields
+    assert maya_object.get_attribut_object("new_attr").committed_name is None
+    maya_object.cmds = backend
+    for attr_class in maya_object.attributs.values() :
+        attr_class.cmds = backend
+    maya_object.commit_attributs()
+    assert backend.listAttr("ctrl0", userDefined = True)[-2:] == ["renamed", "new_attr"]
+    assert backend.listConnections("ctrl0.renamed", source = False, destination = True, plugs = True) == ["driver.translateX"]
+
+def test_snapshot_holds_touched_attributs_only (backend) :
+    maya_object = mattr.MayaObject("ctrl0", backend = backend)
+    maya_object.set_keyable("customAttr3", False)
+    maya_object.delete_attribut("customAttr5")
+    transaction = Transaction(maya_object).begin()
+    assert sorted(transaction.snapshot) == ["customAttr3", "customAttr5"]
+    assert Transaction(mattr.MayaObject("ctrl1", backend = backend)).begin().snapshot == {}
+
+def test_refused_commit_touches_nothing (backend) :
+    counter = benchmark.CountingBackend(backend)
+    maya_object = mattr.MayaObject("ctrl0", backend = counter)
+    maya_object.edit_long_name("customAttr3", "translateX")
+    attr_class = maya_object.get_attribut_object("customAttr5")
+    attr_class.set_has_minimum_state(True)
+    attr_class.set_has_maximum_state(True)
+    attr_class.set_minimum_value(2.0)
+    attr_class.set_maximum_value(1.0)
+    maya_object.get_attribut_object("customAttr2").set_field("value", 0.5)
+    counter.reset()
+    with pytest.raises(mattr.CommitError) as error :
+        maya_object.commit_attributs()
+    assert not error.value.rolled_back
+    assert sorted({name for name, message in error.value.problems}) == ["customAttr2", "customAttr5", "translateX"]
+    assert not {"addAttr", "setAttr", "deleteAttr", "undoInfo"} & set(counter.calls)
+
+def test_dry_run (backend) :
+    before = node_state(backend, "ctrl0")
+    maya_object = mattr.MayaObject("ctrl0", backend = backend)
+    edit(maya_object)
+    assert maya_object.commit_attributs(dry_run = True) == 0
+    assert maya_object.commit_report["problems"] == []
+    assert node_state(backend, "ctrl0") == before
+    assert maya_object.get_attribut_object("customAttr3").is_dirty()
+
+def test_object_set_rollback_across_nodes (backend) :
+    nodes = ["ctrl0", "ctrl1", "ctrl2"]
+    before = {node : node_state(backend, node) for node in nodes}
+    # Each node renames one attribut, third node rename fails
+    failing = benchmark.FailingBackend(backend, "addAttr", 3)
+    object_set = MayaObjectSet(nodes, backend = failing)
+    for maya_object in object_set :
+        maya_object.edit_long_name("customAttr1", "renamed")
+        maya_object.set_lock("customAttr6", True)
+    with pytest.raises(mattr.CommitError) as error :
+        object_set.commit()
+    assert error.value.rolled_back
+    assert "3 nodes were put back" in str(error.value)
+    for node in nodes :
+        assert node_state(backend, node) == before[node]
+    assert len(object_set.dirty_objects()) == 3
@@ -0,0 +1,277 @@
+"""
+Transactional commits : check a commit before touching maya, and put edited attributs
+back as they were if a maya command fails halfway.
+Only attributs touched by the commit are saved.
+@autor : Nathan Boyaval
+@Version : 0.0.4
+@Update : 2025/02/19
+"""
+
+from nb_attribut_control import snapshot as snap
+from nb_attribut_control.connection_index import ConnectionIndex, reconnect
+from nb_attribut_control.instrument import operation
+
+# Field groups saved before a commit, connections are saved by a ConnectionIndex
+saved_groups: tuple = ("names", "value", "defaut", "limits", "enum", "flags")
+# Edited fields checked by range checks
+range_fields: set = {
+    "attribute_type", "defaut_value", "has_max_value", "has_min_value", "max_value", "min_value", "value",
+    }
+
+
+class CommitError (RuntimeError) :
+    """
+    Commit refused or failed. Maya errors are RuntimeError too, callers catching them keep working.
+
+    Attributes :
+        problems -- [(attribut name, message)] found by validate, empty if a maya command failed
+        error -- maya error that stopped the commit, None if commit was refused
+        rolled_back -- True if attributs were put back after a failed commit
+    """
+
+    def __init__ (self, message, problems = (), error = None, rolled_back = False) -> None :
+        super().__init__(message)
+        self.problems: list = list(problems)
+        self.error = error
+        self.rolled_back: bool = rolled_back
+
+
+#######################################################################################################################
+#                Validate
+#######################################################################################################################
+
+@operation("validate_commit")
+def validate (maya_object) -> list :
+    """
+    Check edits of a MayaObject the way maya would, nothing is edited in maya
+
+    Checks names clashes of created attributs, enum lists, values set on connected attributs,
+    and types, limits, defaut values and values of edited attributs (see range_check).
+
+    Returns :
+        [(attribut name, message)], empty if commit can run
+    """
+    from nb_attribut_control import range_check
+
+    dirty = [attr_class for attr_class in maya_object.attributs.values() if attr_class.is_dirty()]
+    if not dirty and not maya_object.deleted_attributs :
+        return []
+
+    node = maya_object.object_name
+    cmds = maya_object.cmds
+    problems = []
+
+    # Names left in maya once removed and recreated attributs are deleted
+    recreated = [attr_class for attr_class in dirty if attr_class.needs_recreate()]
+    freed = set(maya_object.deleted_attributs)
+    freed.update(attr_class.committed_name for attr_class in recreated if attr_class.committed_name is not None)
+    maya_names = set(cmds.listAttr(node) or []) - freed
+
+    # Long and short names used by class attributs
+    name_counts = {}
+    for attr_class in maya_object.attributs.values() :
+        for name in {attr_class.long_name, attr_class.short_name} :
+            name_counts[name] = name_counts.get(name, 0) + 1
+
+    for attr_class in recreated :
+        for name in dict.fromkeys((attr_class.long_name, attr_class.short_name)) :
+            if name in maya_names or name_counts.get(name, 0) > 1 :
+                problems.append((attr_class.long_name, "Attribut name clash on {}.{}".format(node, name)))
+
+    # Fields checked by range checks, read in one snapshot
+    in_place = [attr_class for attr_class in dirty if not attr_class.needs_recreate()]
+    checked = [
+        attr_class for attr_class in in_place if attr_class.dirty_fields.keys() & range_fields
+        ] + [attr_class for attr_class in recreated if attr_class.attribute_type != "matrix"]
+    maya_object.prefetch(range_check.range_groups, [attr_class.long_name for attr_class in checked])
+    maya_object.prefetch(("connections",), [
+        attr_class.long_name for attr_class in in_place if "value" in attr_class.dirty_fields
+        ])
+
+    for attr_class in dirty :
+        name = attr_class.long_name
+        recreate = attr_class.needs_recreate()
+        if attr_class.attribute_type == "enum" and (recreate or "enum_list" in attr_class.dirty_fields) :
+            if not attr_class.enum_list :
+                problems.append((name, "Enum attribut needs at least one field"))
+        # Driven attributs can not be set, value set on recreated attributs is replaced by reconnection
+        if not recreate and "value" in attr_class.dirty_fields and attr_class.outcom_connections :
+            problems.append((name, "Value can not be set on connected attribut {}.{}".format(node, name)))
+
+    # Maya clamps values to new limits, values out of range only stop a commit when edited
+    report = range_check.check_ranges(checked)
+    for attr_class, check, message in report.items() :
+        if check != "value_range" or "value" in attr_class.dirty_fields :
+            problems.append((attr_class.long_name, message))
+    return problems
+
+
+#######################################################################################################################
+#                Transaction
+#######################################################################################################################
+
+class Transaction () :
+    """
+    Attributs of a MayaObject saved before a commit, put back by rollback.
+
+    Saved : fields of attributs the commit edits, deletes or creates again, maya attribut
+    order (names only), and connections when attributs are deleted. Dirty state of
+    Attribut objects is saved too, so a rolled back commit can be fixed and run again.
+    """
+
+    def __init__ (self, maya_object, connection_index = None) -> None :
+        """
+        Keywords:
+            maya_object -- MayaObject about to be commited
+            connection_index -- ConnectionIndex holding this node, built on begin if None and needed
+        """
+        self.maya_object = maya_object
+        self.cmds = maya_object.cmds
+        self.connection_index = connection_index
+        # {committed name : snapshot dict}
+        self.snapshot: dict = {}
+        # Custom attributs in maya order before commit
+        self.maya_order: list = []
+        # {Attribut : (dirty fields, committed name)}
+        self.states: dict = {}
+        self.deleted_attributs: list = []
+
+    @operation("transaction_begin")
+    def begin (self) -> "Transaction" :
+        """Save attributs touched by next commit"""
+        maya_object = self.maya_object
+        node = maya_object.object_name
+        self.deleted_attributs = list(maya_object.deleted_attributs)
+        affected = list(self.deleted_attributs)
+        for attr_class in maya_object.attributs.values() :
+            if attr_class.is_dirty() :
+                self.states[attr_class] = (dict(attr_class.dirty_fields), attr_class.committed_name)
+                if attr_class.committed_name is not None :
+                    affected.append(attr_class.committed_name)
+        if not self.states and not affected :
+            return self
+
+        self.maya_order = self.cmds.listAttr(node, userDefined = True) or []
+        maya_set = set(self.maya_order)
+        affected = [name for name in dict.fromkeys(affected) if name in maya_set]
+        if affected :
+            self.snapshot = snap.load_node_snapshot(node, affected, self.cmds, saved_groups)
+
+        # Deleted attributs lose their connections
+        if self.deleted_attributs or maya_object.recreated_attributs() :
+            if self.connection_index is None or node not in self.connection_index.nodes :
+                self.connection_index = ConnectionIndex([node], self.cmds)
+        return self
+
+    @operation("transaction_rollback")
+    def rollback (self) -> int :
+        """
+        Put saved attributs back in maya and in MayaObject. Attributs still matching their saved
+        definition are edited in place, others are created again with the attributs after them
+        to keep maya order
+
+        Returns :
+            count of maya commands called
+        """
+        from nb_attribut_control import manage_attr as mattr
+
+        maya_object = self.maya_object
+        node = maya_object.object_name
+        cmds = self.cmds
+        command_count = 1
+        current = cmds.listAttr(node, userDefined = True) or []
+        saved_set = set(self.maya_order)
+
+        # Attributs created by the commit
+        for name in current :
+            if name not in saved_set :
+                command_count += self.delete(name)
+
+        # Saved attributs missing, or deleted and created again with another definition
+        recreate = set()
+        for name, attr_snapshot in self.snapshot.items() :
+            if name not in current :
+                recreate.add(name)
+                continue
+            command_count += 2
+            if cmds.attributeQuery(name, node = node, attributeType = True) != attr_snapshot["attribute_type"] or \
+               cmds.attributeQuery(name, node = node, shortName = True) != attr_snapshot["short_name"] :
+                command_count += self.delete(name)
+                recreate.add(name)
+
+        # Attributs after first recreated one are created again too, in saved order
+        suffix = []
+        if recreate :
+            suffix = self.maya_order[min(self.maya_order.index(name) for name in recreate):]
+        suffix_set = set(suffix)
+
+        for name, attr_snapshot in self.snapshot.items() :
+            if name not in suffix_set :
+                command_count += self.restore(attr_snapshot)
+
+        if suffix :
+            untouched = [name for name in suffix if name not in self.snapshot]
+            if untouched :
+                self.snapshot.update(snap.load_node_snapshot(node, untouched, cmds, saved_groups))
+            for name in suffix :
+                if name not in recreate :
+                    command_count += self.delete(name)
+            saved = []
+            for name in suffix :
+                attr_class = mattr.Attribut(node, long_name = name, snapshot = self.snapshot[name], backend = cmds)
+                command_count += attr_class.commit_attr()
+                plug = "{}.{}".format(node, name)
+                connections = self.connection_index.connections(node, name) if self.connection_index else []
+                if connections :
+                    saved.append((plug, plug, attr_class.locked, connections))
+            if saved :
+                command_count += reconnect(saved, cmds)["commands"]
+
+        # MayaObject as before commit
+        for attr_class, (dirty_fields, committed_name) in self.states.items() :
+            attr_class.dirty_fields = dirty_fields or mattr.no_dirty_fields
+            attr_class.committed_name = committed_name
+        maya_object.deleted_attributs = list(self.deleted_attributs)
+        return command_count
+
+    def delete (self, name) -> int :
+        """Unlock and delete an attribut"""
+        plug = "{}.{}".format(self.maya_object.object_name, name)
+        self.cmds.setAttr(plug, lock = False)
+        self.cmds.deleteAttr(plug)
+        return 2
+
+    def restore (self, attr_snapshot) -> int :
+        """Edit an attribut back to a snapshot, attribut keeps its connections and position"""
+        plug = "{}.{}".format(self.maya_object.object_name, attr_snapshot["long_name"])
+        command_count = 1
+        self.cmds.setAttr(plug, lock = False)
+        if attr_snapshot["attribute_type"] != "matrix" :
+            edit_flags = {
+                "niceName" : attr_snapshot["nice_name"],
+                "defaultValue" : attr_snapshot["defaut_value"],
+                "hasMinValue" : attr_snapshot["has_min_value"],
+                "hasMaxValue" : attr_snapshot["has_max_value"],
+                }
+            if attr_snapshot["has_min_value"] :
+                edit_flags["minValue"] = attr_snapshot["min_value"]
+            if attr_snapshot["has_max_value"] :
+                edit_flags["maxValue"] = attr_snapshot["max_value"]
+            if attr_snapshot["attribute_type"] == "enum" :
+                edit_flags["enumName"] = attr_snapshot["enum_list"]
+            self.cmds.addAttr(plug, edit = True, **edit_flags)
+            command_count += 1
+            # Driven attributs keep their input value
+            if not self.cmds.listConnections(plug, source = True, destination = False) :
+                self.cmds.setAttr(plug, attr_snapshot["value"])
+                command_count += 1
+            command_count += 1
+        else :
+            self.cmds.addAttr(plug, edit = True, niceName = attr_snapshot["nice_name"])
+            command_count += 1
+        self.cmds.setAttr(
+            plug, keyable = attr_snapshot["keyable"],
+            channelBox = attr_snapshot["in_channel_box"] and not attr_snapshot["keyable"],
+            lock = attr_snapshot["locked"],
+            )
+        return command_count + 1
@@ -4,23 +4,29 @@ This is a module to catch maya control object, get custom attributs and edit the
 @Version : 0.0.4
 @Update : 2025/02/19
 """
-# UI modules
+# UI modules, maya ui and shiboken are imported when the main window is first needed
 from PySide2 import QtWidgets
 from PySide2 import QtCore
 from PySide2 import QtGui
-import maya.OpenMayaUI as omui
-from shiboken2 import wrapInstance
 
 import sys
 
-# Script modules
-from nb_attribut_control import manage_attr as mattr
+# Script modules, manage_attr is imported when an object is first loaded
+from nb_attribut_control.attribut_model import AttributListModel, AttributFilterModel
+from nb_attribut_control.backend import get_backend
+from nb_attribut_control.edit_queue import EditQueue
+
+# Milliseconds without edit before queued edits are commited
+commit_delay: int = 400
 
 
 def maya_main_windows() :
     '''
     Return maya main window widget as python object
     '''
+    import maya.OpenMayaUI as omui
+    from shiboken2 import wrapInstance
+
     maya_main_window = omui.MQtUtil.mainWindow()
     
     # Return int value if current python version is 3 or upper, 
@@ -39,10 +45,18 @@ def maya_main_windows() :
 class AttributManagerUI (QtWidgets.QDialog) :
     """Main Window class"""
     
-    def __init__ (self, parent = maya_main_windows()) -> None :
+    def __init__ (self, parent = None) -> None :
+        """
+        Keywords:
+            parent -- parent widget, maya main window if None
+        """
+        if parent is None :
+            parent = maya_main_windows()
         super(AttributManagerUI, self).__init__(parent)
         
         self.setWindowTitle("Attribut Manager")
+        self.maya_object = None
+        self.edit_queue = None
         
         self.create_actions()
         self.create_widgets()
@@ -55,7 +69,18 @@ class AttributManagerUI (QtWidgets.QDialog) :
         
     def create_widgets (self) -> None :
         """Create all widget for UI"""
-        self.attribut_list = QtWidgets.QListWidget()
+        # Model rows are fetched while scrolling, only visible rows are drawn
+        self.attribut_model = AttributListModel()
+        self.attribut_proxy = AttributFilterModel()
+        self.attribut_proxy.setSourceModel(self.attribut_model)
+        self.attribut_list = QtWidgets.QListView()
+        self.attribut_list.setModel(self.attribut_proxy)
+        self.attribut_list.setUniformItemSizes(True)
+        self.attribut_list.setSelectionMode(QtWidgets.QAbstractItemView.SingleSelection)
+        self.filter_le = QtWidgets.QLineEdit()
+        self.filter_le.setPlaceholderText("Filter (*Switch*)")
+        self.sort_cb = QtWidgets.QCheckBox()
+        self.sort_cb.setText("Sort")
         self.up_btn = QtWidgets.QPushButton("Up")
         self.up_btn.setSizePolicy(
                                     QtWidgets.QSizePolicy.Maximum, 
@@ -106,10 +131,44 @@ class AttributManagerUI (QtWidgets.QDialog) :
         
         self.attribut_combo = QtWidgets.QComboBox()
         
+        # Last commit error, hidden while commits succeed
+        self.status_label = QtWidgets.QLabel()
+        self.status_label.setWordWrap(True)
+        self.status_label.setStyleSheet("color: #e05050")
+        self.status_label.hide()
+        
+        # Restarted on each edit, queued edits are commited when it times out
+        self.commit_timer = QtCore.QTimer(self)
+        self.commit_timer.setSingleShot(True)
+        self.commit_timer.setInterval(commit_delay)
+        
         return True
         
     def create_connection (self) -> None :
         """ Order widgets"""
+        self.filter_le.textChanged.connect(self.attribut_proxy.set_pattern)
+        self.sort_cb.toggled.connect(self.attribut_proxy.set_sorted)
+        self.attribut_list.selectionModel().currentChanged.connect(self.on_current_changed)
+        self.up_btn.clicked.connect(lambda : self.move_current(-1))
+        self.down_btn.clicked.connect(lambda : self.move_current(1))
+        
+        # Editor widgets only queue edits
+        edit_signals = (
+            (self.long_name_le.textEdited, "edit_long_name"),
+            (self.nice_name_le.textEdited, "edit_nice_name"),
+            (self.short_name_le.textEdited, "edit_short_name"),
+            (self.has_max_cb.toggled, "set_has_maximum_state"),
+            (self.has_min_cb.toggled, "set_has_minimum_state"),
+            (self.max_value_float.valueChanged, "set_maximum_value"),
+            (self.min_value_float.valueChanged, "set_minimum_value"),
+            (self.defaut_value_float.valueChanged, "set_defaut_value"),
+            (self.visible_cb.toggled, "set_visible"),
+            (self.lock_cb.toggled, "set_lock"),
+            (self.keyable_cb.toggled, "set_keyable"),
+            )
+        for signal, method in edit_signals :
+            signal.connect(lambda value, method = method : self.queue_edit(method, value))
+        self.commit_timer.timeout.connect(self.on_commit_timeout)
         return True
         
     def create_layout (self) -> None :
@@ -123,8 +182,16 @@ class AttributManagerUI (QtWidgets.QDialog) :
         button_layout.addWidget(self.delete_btn)
         button_layout.addWidget(self.down_btn)
         
+        filter_layout = QtWidgets.QHBoxLayout()
+        filter_layout.addWidget(self.filter_le)
+        filter_layout.addWidget(self.sort_cb)
+        
+        list_layout = QtWidgets.QVBoxLayout()
+        list_layout.addLayout(filter_layout)
+        list_layout.addWidget(self.attribut_list)
+        
         attribut_layout = QtWidgets.QHBoxLayout()
-        attribut_layout.addWidget(self.attribut_list)
+        attribut_layout.addLayout(list_layout)
         attribut_layout.addLayout(button_layout)
         
         type_layout = QtWidgets.QHBoxLayout()
@@ -175,5 +242,137 @@ class AttributManagerUI (QtWidgets.QDialog) :
         main_layout.addWidget(separator)
         main_layout.addWidget(type_group)
         main_layout.addLayout(settings_layout)
+        main_layout.addWidget(self.status_label)
+        
+        return True
+
+    #######################################################################################################################
+    #                Attribut list
+    #######################################################################################################################
+    def load_object (self, object_name) -> "MayaObject" :
+        """
+        Show custom attributs of a maya object, definitions come from the snapshot cache when
+        the object did not change since last open, values are read when a row is selected
+        """
+        from nb_attribut_control import snapshot_cache
+
+        if self.edit_queue is not None :
+            self.edit_queue.flush()
+        self.maya_object = snapshot_cache.load_object(object_name)
+        self.edit_queue = EditQueue(self.maya_object, timer = self.commit_timer)
+        self.edit_queue.flush_callbacks.append(self.on_edits_commited)
+        self.edit_queue.error_callbacks.append(self.on_commit_failed)
+        self.attribut_model.set_maya_object(self.maya_object)
+        return self.maya_object
+
+    def refresh (self, object_name = None) -> None :
+        """
+        Read attributs again when an open window is shown again, widgets are kept
+
+        Keywords:
+            object_name -- maya object to show, first selected object if None,
+                or object already shown if nothing is selected
+        """
+        if object_name is None :
+            selection = get_backend().ls(selection = True) or []
+            if selection :
+                object_name = selection[0]
+            elif self.maya_object is not None :
+                object_name = self.maya_object.object_name
+        if object_name is not None :
+            self.load_object(object_name)
+        
+    def current_attribut (self) -> str or None :
+        """Name of selected attribut"""
+        return self.attribut_proxy.attribut_name(self.attribut_list.currentIndex())
+        
+    def on_current_changed (self, current, previous) -> None :
+        attribut = self.attribut_proxy.attribut_name(current)
+        if attribut is not None :
+            self.show_attribut(attribut)
+        
+    def show_attribut (self, attribut) -> None :
+        """Fill editor widgets with one attribut, its fields are read in one snapshot"""
+        self.maya_object.prefetch(attributs = [attribut])
+        attr_class = self.maya_object.get_attribut_object(attribut)
+        
+        widgets = (
+            self.long_name_le, self.nice_name_le, self.short_name_le, self.has_max_cb, self.has_min_cb,
+            self.max_value_float, self.min_value_float, self.defaut_value_float, self.current_value_float,
+            self.enum_values, self.visible_cb, self.lock_cb, self.keyable_cb,
+            )
+        for widget in widgets :
+            widget.blockSignals(True)
+        
+        self.long_name_le.setText(attr_class.long_name)
+        self.nice_name_le.setText(attr_class.nice_name or "")
+        self.short_name_le.setText(attr_class.short_name or "")
+        self.has_max_cb.setChecked(bool(attr_class.has_max_value))
+        self.has_min_cb.setChecked(bool(attr_class.has_min_value))
+        if attr_class.max_value is not None :
+            self.max_value_float.setValue(attr_class.max_value)
+        if attr_class.min_value is not None :
+            self.min_value_float.setValue(attr_class.min_value)
+        if isinstance(attr_class.defaut_value, (int, float)) :
+            self.defaut_value_float.setValue(attr_class.defaut_value)
+        if isinstance(attr_class.value, (int, float)) :
+            self.current_value_float.setValue(attr_class.value)
+        self.enum_values.setText((attr_class.enum_list or "").replace(":", ";"))
+        self.visible_cb.setChecked(bool(attr_class.in_channel_box))
+        self.lock_cb.setChecked(bool(attr_class.locked))
+        self.keyable_cb.setChecked(bool(attr_class.keyable))
+        
+        for widget in widgets :
+            widget.blockSignals(False)
+        
+    def move_current (self, offset) -> None :
+        """Move selected attribut, only the moved rows are updated in the view. Maya order is commited with queued edits"""
+        attribut = self.current_attribut()
+        if attribut is None :
+            return
+        self.attribut_model.move_attribut(attribut, offset)
+        self.edit_queue.push_order()
+        self.attribut_list.setCurrentIndex(
+            self.attribut_proxy.mapFromSource(self.attribut_model.index_of(attribut))
+            )
+
+    #######################################################################################################################
+    #                Edits
+    #######################################################################################################################
+    def queue_edit (self, method, value) -> None :
+        """Queue an edit of selected attribut, repeated edits are merged until commit timer times out"""
+        attribut = self.current_attribut()
+        if attribut is None or self.edit_queue is None :
+            return
+        self.edit_queue.push(attribut, method, value)
+        
+    def on_commit_timeout (self) -> None :
+        # Commit runs from maya idle queue, not inside widget signal
+        self.edit_queue.flush_deferred()
+        
+    def on_edits_commited (self, attributs) -> None :
+        from nb_attribut_control import snapshot_cache
+
+        # Commited definitions may keep the node fingerprint
+        snapshot_cache.forget([self.maya_object.object_name])
+        self.status_label.hide()
+        for attribut in attributs :
+            self.attribut_model.refresh_attribut(attribut)
+        
+    def on_commit_failed (self, error, attributs) -> None :
+        """Show why queued edits were not commited, edits stay on the object and are commited with the next ones"""
+        lines = ["Edits not commited : {}".format(error.error)] if error.error is not None else ["Edits not commited"]
+        lines += ["{} : {}".format(name, message) for name, message in error.problems]
+        if error.rolled_back :
+            lines.append("Maya attributs were put back as before the commit")
+        self.status_label.setText("\n".join(lines))
+        self.status_label.show()
+        get_backend().warning(str(error))
+        for attribut in attributs :
+            if self.maya_object.get_attribut_object(attribut) is not None :
+                self.attribut_model.refresh_attribut(attribut)
         
-        return True
\ No newline at end of file
+    def closeEvent (self, event) -> None :
+        if self.edit_queue is not None :
+            self.edit_queue.flush()
+        super(AttributManagerUI, self).closeEvent(event)